@@ -1,29 +1,163 @@
-from typing import Dict, Optional, List, Any, Tuple
+from typing import Dict, Optional, List, Any, Tuple, AsyncIterator, Iterator, Callable, Awaitable
+from contextlib import contextmanager
 import random
 import json
+import asyncio
+import hashlib
 import os
 import re
+import threading
+import time
 import importlib.util
 # Only import additional packages conditionally to avoid startup errors
+from openai_client import get_openai_client, get_async_openai_client
+from response_cache import ResponseCache, SingleFlight, code_fingerprint, code_hash
+from response_store import response_store
+from circuit_breaker import CircuitBreaker, classify_openai_error
+from latency_tracker import LatencyTracker
+from prompt_builder import TokenLedger, count_message_tokens, count_tokens, fit_code, render_prompt
+from rate_limiter import OutboundScheduler, background_priority
+from similarity_index import SimilarityIndex
+from code_features import fallback_category, is_auth_code
+from demo_postprocessor import postprocess_demo
+from demo_templates import render_template
+import auth_demo_template
 
-def check_openai_api_key() -> bool:
+# How long a key validation result is trusted before it is re-checked
+API_KEY_VALID_TTL_SECONDS = float(os.environ.get("OPENAI_KEY_CHECK_TTL", "300"))
+API_KEY_INVALID_TTL_SECONDS = float(os.environ.get("OPENAI_KEY_INVALID_TTL", "30"))
+
+# The invalid-key TTL doubles with each failed re-check of the same key, up to this limit
+API_KEY_INVALID_MAX_TTL_SECONDS = float(os.environ.get("OPENAI_KEY_INVALID_MAX_TTL", "1800"))
+
+# Validation results keyed by a hash of the API key: {key_hash: (is_valid, checked_at, failures)},
+# where failures counts the consecutive checks that found the key invalid
+api_key_status: Dict[str, Tuple[bool, float, int]] = {}
+api_key_status_lock = threading.Lock()
+api_key_refresher: Optional[threading.Thread] = None
+concept_warmer: Optional["asyncio.Future[None]"] = None
+
+def check_openai_api_key(force_refresh: bool = False) -> bool:
     """
     Check if a valid OpenAI API key is available.
     
+    The result is cached per key, so the hot path reads a boolean instead of
+    calling the API. A background thread re-validates cached keys before
+    they expire.
+    
+    Args:
+        force_refresh: Ignore any cached result and validate against the API
+    
     Returns:
         bool: True if a valid API key is available, False otherwise
     """
-    import os
-    
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key or len(api_key.strip()) < 30:
         print("OpenAI API key is missing or invalid")
         return False
     
+    key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    if not force_refresh:
+        with api_key_status_lock:
+            cached = api_key_status.get(key_hash)
+        if cached and time.monotonic() - cached[1] < api_key_ttl(cached[0], cached[2]):
+            return cached[0]
+    
+    is_valid = validate_openai_api_key(api_key)
+    record_api_key_status(key_hash, is_valid)
+    start_api_key_refresher()
+    return is_valid
+
+def api_key_ttl(is_valid: bool, failures: int = 1) -> float:
+    """
+    How long a validation result is trusted.
+    
+    Invalid keys are re-checked sooner so a key that starts working (e.g. after
+    billing is fixed) is picked up quickly, but the TTL doubles with every
+    failed re-check so a key that stays invalid is not validated against the
+    API every interval forever. A new key has its own entry and is checked at
+    once.
+    
+    Args:
+        is_valid: The cached result
+        failures: Consecutive checks that found the key invalid
+    
+    Returns:
+        float: TTL in seconds
+    """
+    if is_valid:
+        return API_KEY_VALID_TTL_SECONDS
+    return min(API_KEY_INVALID_TTL_SECONDS * 2 ** max(failures - 1, 0), API_KEY_INVALID_MAX_TTL_SECONDS)
+
+def record_api_key_status(key_hash: str, is_valid: bool) -> None:
+    """
+    Cache a validation result, counting consecutive failures for the invalid-key backoff.
+    
+    Args:
+        key_hash: SHA-256 of the key
+        is_valid: Result of the check
+    """
+    with api_key_status_lock:
+        previous = api_key_status.get(key_hash)
+        failures = 0 if is_valid else (previous[2] if previous else 0) + 1
+        api_key_status[key_hash] = (is_valid, time.monotonic(), failures)
+
+def invalidate_api_key_status(api_key: Optional[str] = None) -> None:
+    """
+    Drop cached validation results.
+    
+    Args:
+        api_key: Only forget this key (forget all keys if None)
+    """
+    with api_key_status_lock:
+        if api_key is None:
+            api_key_status.clear()
+        else:
+            api_key_status.pop(hashlib.sha256(api_key.encode("utf-8")).hexdigest(), None)
+
+def start_api_key_refresher(interval: float = 30) -> None:
+    """
+    Start a daemon thread that re-validates the current key before its cached result expires.
+    
+    Args:
+        interval: Seconds between checks
+    """
+    global api_key_refresher
+    if api_key_refresher is not None:
+        return
+    
+    def refresh():
+        while True:
+            time.sleep(interval)
+            api_key = os.environ.get("OPENAI_API_KEY")
+            if not api_key or len(api_key.strip()) < 30:
+                continue
+            key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+            with api_key_status_lock:
+                cached = api_key_status.get(key_hash)
+            # Refresh once the entry is within one interval of expiring
+            if cached and time.monotonic() - cached[1] < api_key_ttl(cached[0], cached[2]) - interval:
+                continue
+            try:
+                record_api_key_status(key_hash, validate_openai_api_key(api_key))
+            except Exception as e:
+                print(f"Error refreshing OpenAI API key status: {e}")
+    
+    api_key_refresher = threading.Thread(target=refresh, name="openai-key-refresher", daemon=True)
+    api_key_refresher.start()
+
+def validate_openai_api_key(api_key: str) -> bool:
+    """
+    Validate an API key against the OpenAI API (makes a network call).
+    
+    Args:
+        api_key: The key to validate
+    
+    Returns:
+        bool: True if the key works (or is valid but out of quota), False otherwise
+    """
     # Attempt to make a minimal API call to verify the key works
     try:
-        import importlib.util
-        
         # Try to import openai
         spec = importlib.util.find_spec("openai")
         if spec is None:
@@ -31,8 +165,7 @@ def check_openai_api_key() -> bool:
             return False
             
         # Check if the key works by making a simple models list request
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
+        client = get_openai_client(api_key)
         
         # Make a minimal API call - using models.list is lightweight
         response = client.models.list()
@@ -52,11 +185,344 @@ def check_openai_api_key() -> bool:
         else:
             print(f"Error validating OpenAI API key: {error_str}")
             return False
+
+# the newest OpenAI model is "gpt-4o" which was released May 13, 2024
+# do not change this unless explicitly requested by the user
+CHAT_MODEL = "gpt-4o"
+
+# Per-endpoint latency budgets in seconds; every attempt and retry of a call must fit in it
+AI_REQUEST_TIMEOUTS = {
+    "ask": 20,
+    "concept_examples": 30,
+    "realworld": 30,
+    "demo": 60,
+    "complexity": 30,
+    "combined": 60
+}
+
+def cached_api_key_status() -> Optional[bool]:
+    """
+    Get the cached validation result for the current key without any network call.
+    
+    Returns:
+        Optional[bool]: Cached result, False for a missing/malformed key, or None if unknown or expired
+    """
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key or len(api_key.strip()) < 30:
+        return False
+    with api_key_status_lock:
+        cached = api_key_status.get(hashlib.sha256(api_key.encode("utf-8")).hexdigest())
+    if cached and time.monotonic() - cached[1] < api_key_ttl(cached[0], cached[2]):
+        return cached[0]
+    return None
+
+async def check_openai_api_key_async() -> bool:
+    """
+    Async variant of check_openai_api_key that never blocks the event loop.
+    
+    Returns:
+        bool: True if a valid API key is available, False otherwise
+    """
+    cached = cached_api_key_status()
+    if cached is not None:
+        return cached
+    return await asyncio.to_thread(check_openai_api_key)
+
+# Trips on quota/auth/outage errors so fallbacks are served without waiting on a failing API
+openai_breaker = CircuitBreaker()
+
+def api_key_scope() -> str:
+    """Short hash of the current API key; the circuit breaker resets when the key changes."""
+    return hashlib.sha256(os.environ.get("OPENAI_API_KEY", "").encode("utf-8")).hexdigest()[:16]
+
+@contextmanager
+def openai_call_guard() -> Iterator[None]:
+    """
+    Run one OpenAI call through the circuit breaker.
+    
+    A 401 proves a cached "valid" result for the current key wrong, so the
+    key's cached status is dropped and the next check validates it again.
+    """
+    try:
+        with openai_breaker.guard(api_key_scope()):
+            yield
+    except Exception as e:
+        if classify_openai_error(e) == "auth":
+            invalidate_api_key_status(os.environ.get("OPENAI_API_KEY", ""))
+        raise
+
+def get_openai_circuit_status() -> Dict[str, Any]:
+    """
+    Get the OpenAI circuit breaker state.
+    
+    Returns:
+        dict: State (closed/open/half_open), reason, retry delay and counters
+    """
+    return openai_breaker.status()
+
+# Jittered exponential backoff between retries of transient (5xx, connection, 429) errors
+AI_RETRY_BASE_DELAY_SECONDS = 0.25
+AI_RETRY_MAX_DELAY_SECONDS = 2.0
+
+# A retry is only started if at least this much of the budget would be left for it
+AI_MIN_ATTEMPT_SECONDS = 2.0
+
+# Endpoints that send a second, hedged request once the first runs past the endpoint's
+# p95 attempt latency (comma-separated, e.g. "realworld,complexity"; off by default
+# because a hedge can double token spend)
+AI_HEDGED_ENDPOINTS = {name.strip() for name in os.environ.get("OPENAI_HEDGE_ENDPOINTS", "").split(",") if name.strip()}
+AI_HEDGE_PERCENTILE = 95
+
+# Latency of single attempts ("<endpoint>.attempt") and whole calls ("<endpoint>");
+# the attempt series is the tail latency without retries or hedging
+ai_latency = LatencyTracker()
+ai_call_counters = {
+    "calls": 0,
+    "retries": 0,
+    "hedges": 0,
+    "hedge_wins": 0,
+    "failures": 0
+}
+
+# Input/output tokens of completed calls per endpoint
+ai_tokens = TokenLedger()
+
+# Account limits for outbound calls (0 turns a limit off); set them a little under the
+# key's tier so our own queue, not a 429 from OpenAI, decides which calls wait
+OPENAI_RPM_LIMIT = float(os.environ.get("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = float(os.environ.get("OPENAI_TPM_LIMIT", "30000"))
+
+# Queue priority per endpoint (lower goes first); warm-up passes run below all of these
+AI_ENDPOINT_PRIORITIES = {
+    "ask": 0,
+    "demo": 0,
+    "combined": 0,
+    "realworld": 1,
+    "complexity": 1,
+    "concept_examples": 2
+}
+
+# Output tokens assumed for calls that do not set max_tokens
+AI_DEFAULT_OUTPUT_TOKENS = 1000
+
+# Calls that would wait in the queue past their deadline are shed so the fallback is served early
+ai_scheduler = OutboundScheduler(
+    OPENAI_RPM_LIMIT, OPENAI_TPM_LIMIT, AI_ENDPOINT_PRIORITIES, min_start_seconds=AI_MIN_ATTEMPT_SECONDS
+)
+
+def get_ai_call_stats() -> Dict[str, Any]:
+    """
+    Get latency percentiles, retry/hedge counters, token totals and rate limiter state for AI calls.
+    
+    Returns:
+        dict: Per-endpoint latency stats, call counters, per-endpoint token totals and queue stats
+    """
+    return {
+        "latency": ai_latency.stats(),
+        "counters": dict(ai_call_counters),
+        "tokens": ai_tokens.stats(),
+        "rate_limit": ai_scheduler.stats()
+    }
+
+def estimate_call_tokens(params: Dict[str, Any]) -> int:
+    """Tokens a call counts against the tokens-per-minute limit: the prompt plus max_tokens."""
+    return count_message_tokens(params["messages"]) + params.get("max_tokens", AI_DEFAULT_OUTPUT_TOKENS)
+
+def record_token_usage(endpoint: str, params: Dict[str, Any], response: Any = None, content: str = "") -> None:
+    """
+    Record and log the tokens of one completed call.
+    
+    Args:
+        endpoint: Name of the calling feature
+        params: Arguments the call was made with
+        response: The completion; its reported usage is preferred over counting
+        content: Completion text, counted when the API reports no usage (streaming)
+    """
+    estimated_input_tokens = count_message_tokens(params["messages"])
+    usage = getattr(response, "usage", None)
+    input_tokens = getattr(usage, "prompt_tokens", None) or estimated_input_tokens
+    output_tokens = getattr(usage, "completion_tokens", None) or count_tokens(content)
+    ai_tokens.record(endpoint, input_tokens, output_tokens, estimated_input_tokens)
+    print(f"AI tokens for {endpoint}: {input_tokens} in, {output_tokens} out")
+
+def retry_delay(attempt: int) -> float:
+    """Full-jitter backoff delay before retry number attempt + 1."""
+    return random.uniform(0, min(AI_RETRY_MAX_DELAY_SECONDS, AI_RETRY_BASE_DELAY_SECONDS * (2 ** attempt)))
+
+def should_retry(error: Exception, attempt: int, deadline: float) -> Optional[float]:
+    """
+    Decide whether a failed attempt is worth retrying within the latency budget.
+    
+    Args:
+        error: The exception raised by the attempt
+        attempt: Number of the attempt that failed (0 for the first)
+        deadline: time.monotonic() value by which the call must finish
+        
+    Returns:
+        Optional[float]: Seconds to wait before retrying, or None to give up
+    """
+    # Quota and auth errors will not go away on retry, and an open breaker means stop
+    if classify_openai_error(error) not in ("outage", "rate_limit"):
+        return None
+    delay = retry_delay(attempt)
+    if deadline - time.monotonic() - delay < AI_MIN_ATTEMPT_SECONDS:
+        return None
+    ai_call_counters["retries"] += 1
+    print(f"Retrying OpenAI call in {delay:.2f}s after: {error}")
+    return delay
+
+async def attempt_chat_completion_async(endpoint: str, params: Dict[str, Any], timeout: float) -> str:
+    """
+    Make one chat completion attempt through the breaker, recording its latency.
+    
+    Args:
+        endpoint: Name of the calling feature
+        params: Arguments for chat.completions.create
+        timeout: Seconds this attempt may take, queueing in the rate limiter included
+        
+    Returns:
+        str: Content of the first choice
+    """
+    deadline = time.monotonic() + timeout
+    await ai_scheduler.acquire_async(endpoint, estimate_call_tokens(params), deadline)
+    attempt_started = time.monotonic()
+    try:
+        with openai_call_guard():
+            response = await get_async_openai_client().chat.completions.create(
+                timeout=deadline - attempt_started, **params
+            )
+    except asyncio.CancelledError:
+        # A hedged-away attempt took at least this long; keeping it stops the p95 drifting down
+        ai_latency.record(f"{endpoint}.attempt", time.monotonic() - attempt_started)
+        raise
+    ai_latency.record(f"{endpoint}.attempt", time.monotonic() - attempt_started)
+    content = response.choices[0].message.content
+    record_token_usage(endpoint, params, response, content)
+    return content
+
+async def hedged_chat_completion_async(endpoint: str, params: Dict[str, Any], deadline: float) -> str:
+    """
+    Make a chat completion attempt, hedging with a second request if it runs long.
+    
+    The hedge is sent once the first request has taken longer than the
+    endpoint's p95 attempt latency; whichever succeeds first wins and the other
+    is cancelled.
+    
+    Args:
+        endpoint: Name of the calling feature
+        params: Arguments for chat.completions.create
+        deadline: time.monotonic() value by which the call must finish
+        
+    Returns:
+        str: Content of the first choice
+    """
+    remaining = deadline - time.monotonic()
+    hedge_after = ai_latency.percentile(f"{endpoint}.attempt", AI_HEDGE_PERCENTILE) if endpoint in AI_HEDGED_ENDPOINTS else None
+    if hedge_after is None or remaining - hedge_after < AI_MIN_ATTEMPT_SECONDS:
+        return await attempt_chat_completion_async(endpoint, params, remaining)
+    
+    primary = asyncio.ensure_future(attempt_chat_completion_async(endpoint, params, remaining))
+    pending = {primary}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return primary.result()
+        
+        ai_call_counters["hedges"] += 1
+        hedge = asyncio.ensure_future(attempt_chat_completion_async(endpoint, params, deadline - time.monotonic()))
+        pending = {primary, hedge}
+        errors = []
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        ai_call_counters["hedge_wins"] += 1
+                    return task.result()
+                errors.append(task.exception())
+        raise errors[0]
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def create_chat_completion_async(endpoint: str, **params: Any) -> str:
+    """
+    Make a chat completion call through the shared AsyncOpenAI client.
+    
+    Transient errors are retried with jittered backoff while the endpoint's
+    latency budget allows, and endpoints in AI_HEDGED_ENDPOINTS hedge slow attempts.
+    Every attempt first waits its turn in the rate limiter queue, and raises
+    RateLimitShed if that wait would not leave time for the call.
+    
+    Args:
+        endpoint: Name of the calling feature, used to pick the latency budget
+        **params: Arguments for chat.completions.create (messages, temperature, ...)
+        
+    Returns:
+        str: Content of the first choice
+    """
+    params.setdefault("model", CHAT_MODEL)
+    started = time.monotonic()
+    deadline = started + AI_REQUEST_TIMEOUTS.get(endpoint, 30)
+    ai_call_counters["calls"] += 1
+    attempt = 0
+    while True:
+        try:
+            content = await hedged_chat_completion_async(endpoint, params, deadline)
+        except Exception as e:
+            delay = should_retry(e, attempt, deadline)
+            if delay is None:
+                ai_call_counters["failures"] += 1
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        ai_latency.record(endpoint, time.monotonic() - started)
+        return content
+
+def build_ai_response_request(question: str, code: Optional[str], language: str, concept: str) -> Dict[str, Any]:
+    """
+    Build the chat completion arguments for an AI assistant question.
+    
+    Args:
+        question: The user's question
+        code: The code context (optional)
+        language: The programming language
+        concept: The coding concept being discussed
+        
+    Returns:
+        dict: Arguments for create_chat_completion_async
+    """
+    # Prepare context for the prompt
+    context = get_concept_context(concept)
     
-    print("OpenAI API key is configured and available")
-    return True
+    # Build the base prompt
+    prompt = render_prompt("""
+    You are a helpful coding tutor focused on {concept} concepts in {language}.
+    
+    Context: {context}
+    
+    User's question: {question}
+    """, concept=concept, language=language, context=context, question=question)
+    
+    # Add code context if available
+    if code:
+        prompt += "\n\n" + render_prompt("""
+        User's code:
+        ```{language}
+        {code}
+        ```
+        
+        Help the user understand their code or answer their question in the context of this code.
+        """, language=language, code=fit_code(code, language))
+    
+    return {
+        "messages": [{"role": "system", "content": prompt}],
+        "temperature": 0.5,
+        "max_tokens": 800
+    }
 
-def get_ai_response(question: str, code: Optional[str] = None, language: str = "python", concept: str = "general") -> str:
+async def get_ai_response_async(question: str, code: Optional[str] = None, language: str = "python", concept: str = "general") -> str:
     """
     Get response from AI to user's coding question using OpenAI.
     
@@ -70,69 +536,105 @@ def get_ai_response(question: str, code: Optional[str] = None, language: str = "
         str: The AI's response
     """
     try:
-        # Prepare context for the prompt
-        context = get_concept_context(concept)
-        
-        # Build the base prompt
-        prompt = f"""
-        You are a helpful coding tutor focused on {concept} concepts in {language}.
-        
-        Context: {context}
-        
-        User's question: {question}
-        """
-        
-        # Add code context if available
-        if code:
-            prompt += f"""
-            
-            User's code:
-            ```{language}
-            {code}
-            ```
-            
-            Help the user understand their code or answer their question in the context of this code.
-            """
-            
-        # Try using OpenAI API
+        request = build_ai_response_request(question, code, language, concept)
         try:
-            # Import required modules
-            import os
-            from openai import OpenAI
-            
-            # Check if API key is available
-            if not check_openai_api_key():
+            if not await check_openai_api_key_async():
                 raise ValueError("OpenAI API key not found or invalid")
-                
-            # Initialize OpenAI client
-            client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-            print("OpenAI API key is valid and working")
-            
-            # Make the API call
-            # using the ChatCompletion API with gpt-4o model which was released May 13, 2024
-            # do not change this unless explicitly requested by the user
-            response = client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "system", "content": prompt}],
-                temperature=0.5,
-                max_tokens=800
-            )
-            
-            # Return the assistant's response
-            return response.choices[0].message.content
-            
+            return await create_chat_completion_async("ask", **request)
         except Exception as openai_error:
-            # Log the error
             print(f"Error using OpenAI API: {openai_error}")
             print("Falling back to rule-based responses")
-            
-            # Fallback to rule-based response
             return get_fallback_ai_response(question, code, language, concept)
-            
     except Exception as e:
         print(f"Error generating AI response: {e}")
         return "I'm having trouble processing your question right now. Please try again later."
 
+# Number of words sent per chunk when streaming a rule-based fallback answer
+FALLBACK_STREAM_CHUNK_WORDS = 4
+
+async def stream_chat_completion_async(endpoint: str, **params: Any) -> AsyncIterator[str]:
+    """
+    Streaming variant of create_chat_completion_async that yields content deltas as they arrive.
+    
+    Args:
+        endpoint: Name of the calling feature, used to pick the request timeout
+        **params: Arguments for chat.completions.create (messages, temperature, ...)
+        
+    Yields:
+        str: Non-empty content deltas
+    """
+    params.setdefault("model", CHAT_MODEL)
+    started = time.monotonic()
+    deadline = started + AI_REQUEST_TIMEOUTS.get(endpoint, 30)
+    deltas: List[str] = []
+    await ai_scheduler.acquire_async(endpoint, estimate_call_tokens(params), deadline)
+    with openai_call_guard():
+        stream = await get_async_openai_client().chat.completions.create(
+            timeout=deadline - time.monotonic(), stream=True, **params
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                if not deltas:
+                    ai_latency.record(f"{endpoint}.first_token", time.monotonic() - started)
+                deltas.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+    record_token_usage(endpoint, params, content="".join(deltas))
+
+def chunk_text(text: str, words_per_chunk: int = FALLBACK_STREAM_CHUNK_WORDS) -> List[str]:
+    """
+    Split text into small chunks of whole words, keeping all whitespace.
+    
+    Args:
+        text: Text to split
+        words_per_chunk: Number of words in each chunk
+        
+    Returns:
+        List[str]: Chunks that join back to the original text
+    """
+    words = re.findall(r"\s*\S+\s*", text) or [text]
+    return ["".join(words[i:i + words_per_chunk]) for i in range(0, len(words), words_per_chunk)]
+
+async def stream_ai_response_async(question: str, code: Optional[str] = None, language: str = "python", concept: str = "general") -> AsyncIterator[Dict[str, str]]:
+    """
+    Stream the answer to a user's coding question token by token.
+    
+    The rule-based fallback is streamed in word chunks when the OpenAI API is
+    unavailable or fails before the first token arrives. A failure after tokens
+    have been sent ends the stream with an error event instead, so the user
+    never sees two different answers spliced together.
+    
+    Args:
+        question: The user's question
+        code: The code context (optional)
+        language: The programming language
+        concept: The coding concept being discussed
+        
+    Yields:
+        dict: {"token": str} events, then one {"done": source} or {"error": message} event
+    """
+    request = build_ai_response_request(question, code, language, concept)
+    sent_tokens = False
+    try:
+        if not await check_openai_api_key_async():
+            raise ValueError("OpenAI API key not found or invalid")
+        async for token in stream_chat_completion_async("ask", **request):
+            sent_tokens = True
+            yield {"token": token}
+        yield {"done": "openai"}
+        return
+    except Exception as openai_error:
+        print(f"Error streaming from OpenAI API: {openai_error}")
+        if sent_tokens:
+            yield {"error": "The response was interrupted. Please try again."}
+            return
+    
+    print("Falling back to rule-based responses")
+    for piece in chunk_text(get_fallback_ai_response(question, code, language, concept)):
+        yield {"token": piece}
+        # Let the server flush each chunk separately
+        await asyncio.sleep(0)
+    yield {"done": "fallback"}
+
 
 def get_concept_context(concept: str) -> str:
     """
@@ -159,121 +661,291 @@ def get_concept_context(concept: str) -> str:
     }
     return contexts.get(concept, contexts["general"])
     
-def get_concept_examples(concept: str, language: str = "python") -> Dict[str, str]:
+# Concepts and languages offered by the concept popups; every combination is precomputed
+CONCEPT_DESCRIPTIONS = {
+    "if-else": "conditional statements (if-else)",
+    "loops": "loops (for and while loops)",
+    "functions": "functions and function parameters",
+    "oops": "object-oriented programming (classes and objects)",
+    "recursion": "recursion and recursive functions",
+    "data-structures": "basic data structures (lists, dictionaries, sets, etc.)"
+}
+CONCEPT_EXAMPLE_LANGUAGES = ("python", "javascript", "java")
+
+# How often the background warmer checks for concept examples that need refreshing
+CONCEPT_WARM_INTERVAL_SECONDS = float(os.environ.get("CONCEPT_WARM_INTERVAL", str(6 * 3600)))
+
+def build_concept_examples_request(concept: str, language: str) -> Dict[str, Any]:
     """
-    Get AI-generated code examples for a specific programming concept.
+    Build the chat completion arguments for a concept example.
     
     Args:
         concept: The programming concept (if-else, loops, functions, etc.)
-        language: The programming language (default is python)
+        language: The programming language
         
     Returns:
-        dict: AI-generated code examples and description
+        dict: Arguments for create_chat_completion_async
     """
-    try:
-        if not check_openai_api_key():
-            return {
-                "title": f"{concept.capitalize()} in {language.capitalize()}",
-                "description": "API key not available. This is a placeholder description.",
-                "code": "# Example code would appear here when API is configured",
-                "explanation": "Explanation would be shown here"
-            }
-            
-        concept_map = {
-            "if-else": "conditional statements (if-else)",
-            "loops": "loops (for and while loops)",
-            "functions": "functions and function parameters",
-            "oops": "object-oriented programming (classes and objects)",
-            "recursion": "recursion and recursive functions",
-            "data-structures": "basic data structures (lists, dictionaries, sets, etc.)"
-        }
+    concept_desc = CONCEPT_DESCRIPTIONS.get(concept, concept)
         
-        concept_desc = concept_map.get(concept, concept)
-            
-        # Define system message for the AI
-        system_message = """You are an expert programming teacher who creates clear, educational code examples.
-        Provide well-commented code examples that help beginners understand programming concepts easily."""
-        
-        # Create a detailed user message for the specific concept
-        user_message = f"""Create an educational code example for {concept_desc} in {language}.
-        
-        Please structure your response as follows (in JSON format):
-        {{
-            "title": "A clear, descriptive title for this code example",
-            "description": "A beginner-friendly explanation of this concept (2-3 sentences)",
-            "code": "A well-commented code example showing the concept in action",
-            "explanation": "A line-by-line explanation of what the code is doing and why"
-        }}
-        
-        Make the code example:
-        1. Simple enough for complete beginners to understand
-        2. Include many helpful comments
-        3. Show practical, real-world usage (not just abstract examples)
-        4. Be 15-30 lines of code (not including comments)
-        
-        Ensure your response is valid JSON that can be parsed with json.loads().
-        """
-        
-        # Get response from OpenAI
-        from openai import OpenAI
-        import os
-        client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-        response = client.chat.completions.create(
-            model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": user_message}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7
-        )
-        
-        # Extract and parse the JSON response
-        response_text = response.choices[0].message.content
-        content = json.loads(response_text)
-        
-        return content
-    except Exception as e:
-        print(f"Error generating concept examples: {e}")
+    # Define system message for the AI
+    system_message = render_prompt("""You are an expert programming teacher who creates clear, educational code examples.
+    Provide well-commented code examples that help beginners understand programming concepts easily.""")
+    
+    # Create a detailed user message for the specific concept
+    user_message = render_prompt("""Create an educational code example for {concept_desc} in {language}.
+    
+    Please structure your response as follows (in JSON format):
+    {{
+        "title": "A clear, descriptive title for this code example",
+        "description": "A beginner-friendly explanation of this concept (2-3 sentences)",
+        "code": "A well-commented code example showing the concept in action",
+        "explanation": "A line-by-line explanation of what the code is doing and why"
+    }}
+    
+    Make the code example:
+    1. Simple enough for complete beginners to understand
+    2. Include many helpful comments
+    3. Show practical, real-world usage (not just abstract examples)
+    4. Be 15-30 lines of code (not including comments)
+    
+    Ensure your response is valid JSON that can be parsed with json.loads().
+    """, concept_desc=concept_desc, language=language)
+    
+    return {
+        "messages": [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": user_message}
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.7
+    }
+
+def get_concept_examples_placeholder(concept: str, language: str, api_available: bool) -> Dict[str, str]:
+    """Placeholder concept example used when no AI content is available."""
+    if not api_available:
         return {
             "title": f"{concept.capitalize()} in {language.capitalize()}",
-            "description": "Sorry, I couldn't generate examples for this concept right now.",
-            "code": "# Example code would appear here",
+            "description": "API key not available. This is a placeholder description.",
+            "code": "# Example code would appear here when API is configured",
             "explanation": "Explanation would be shown here"
         }
+    return {
+        "title": f"{concept.capitalize()} in {language.capitalize()}",
+        "description": "Sorry, I couldn't generate examples for this concept right now.",
+        "code": "# Example code would appear here",
+        "explanation": "Explanation would be shown here"
+    }
 
+def concept_examples_key(concept: str, language: str) -> str:
+    """Cache key for a concept/language pair."""
+    return f"{concept}:{language}"
 
-def get_ai_content(topic):
+def parse_concept_examples_response(content: str) -> Dict[str, str]:
     """
-    Get AI-generated content about a coding topic.
+    Parse and validate a concept example completion.
     
     Args:
-        topic: The coding topic
+        content: Raw completion content
         
     Returns:
-        dict: AI-generated content with title, description, example, etc.
+        dict: The example with title, description, code and explanation
+        
+    Raises:
+        ValueError: If the JSON is invalid or a field is missing or empty
     """
-    # Simple manually curated content for key topics
-    topics = {
-        "if-else": {
-            "title": "Conditional Logic with If-Else",
-            "description": "If-else statements allow your program to make decisions based on conditions.",
-            "example": "temperature = 25\n\nif temperature > 30:\n    print('It\'s hot today!')\nelif temperature > 20:\n    print('It\'s a nice day!')\nelse:\n    print('It\'s a bit cold today.')",
-            "real_world": "Conditional logic is extensively used in e-commerce for determining shipping costs, applying discounts, or managing user access control.",
-            "dry_run": "This code will print 'It\'s a nice day!' since the temperature is 25, which is greater than 20 but not greater than 30."
-        },
-        "loops": {
-            "title": "Iterations with Loops",
-            "description": "Loops are used to execute a block of code repeatedly based on a condition.",
-            "example": "# Processing a list of numbers\nnumbers = [1, 2, 3, 4, 5]\ntotal = 0\n\nfor num in numbers:\n    total += num\n    print(f'Running total: {total}')",
-            "real_world": "Loops are fundamental in data processing, where they're used to iterate through datasets for analysis, transformation, or validation.",
-            "dry_run": "This code will print the running total at each step, finally reaching 15 after adding all numbers in the list."
-        },
-        "functions": {
-            "title": "Code Reusability with Functions",
-            "description": "Functions allow you to group code into reusable blocks that perform specific tasks.",
-            "example": "def calculate_area(length, width):\n    return length * width\n\n# Calculate the area of different rooms\nliving_room = calculate_area(5, 4)\nkitchen = calculate_area(3, 3)\n\nprint(f'Living room area: {living_room} m²')\nprint(f'Kitchen area: {kitchen} m²')",
-            "real_world": "Functions form the basis of modular programming in production systems, facilitating maintenance, testing, and collaborative development.",
+    example = json.loads(content)
+    if not isinstance(example, dict):
+        raise ValueError("Concept example is not a JSON object")
+    for field in ("title", "description", "code", "explanation"):
+        if not isinstance(example.get(field), str) or not example[field].strip():
+            raise ValueError(f"Concept example is missing '{field}'")
+    return example
+
+async def get_concept_examples_async(concept: str, language: str = "python") -> Dict[str, str]:
+    """
+    Get AI-generated code examples for a specific programming concept.
+    
+    Examples are precomputed by the cache warmer for every concept/language the UI offers.
+    
+    Args:
+        concept: The programming concept (if-else, loops, functions, etc.)
+        language: The programming language (default is python)
+        
+    Returns:
+        dict: AI-generated code examples and description
+    """
+    cache_key = concept_examples_key(concept, language)
+    cached = await lookup_response_async("concept_examples", cache_key)
+    if cached:
+        return cached
+    
+    return await ai_single_flight.run(("concept_examples", cache_key), lambda: fetch_concept_examples_async(concept, language, cache_key))
+
+async def fetch_concept_examples_async(concept: str, language: str, cache_key: str) -> Dict[str, str]:
+    """
+    Generate a concept example through the API and cache it, falling back to a placeholder.
+    
+    Args:
+        concept: The programming concept (if-else, loops, functions, etc.)
+        language: The programming language
+        cache_key: Key of the concept/language pair
+        
+    Returns:
+        dict: AI-generated code examples and description
+    """
+    try:
+        if not await check_openai_api_key_async():
+            return get_concept_examples_placeholder(concept, language, api_available=False)
+        
+        response_text = await create_chat_completion_async("concept_examples", **build_concept_examples_request(concept, language))
+        result = parse_concept_examples_response(response_text)
+        await asyncio.to_thread(save_response, "concept_examples", cache_key, result)
+        return result
+    except Exception as e:
+        print(f"Error generating concept examples: {e}")
+        return get_concept_examples_placeholder(concept, language, api_available=True)
+
+def warm_concept_examples(force: bool = False, concepts: Optional[List[str]] = None, languages: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Run warm_concept_examples_async on a new event loop, for scripts such as warm_cache.py.
+    
+    Args:
+        force: Regenerate every pair even if a fresh example is stored
+        concepts: Concepts to warm (defaults to CONCEPT_DESCRIPTIONS)
+        languages: Languages to warm (defaults to CONCEPT_EXAMPLE_LANGUAGES)
+        
+    Returns:
+        dict: Counts of pairs generated, skipped as fresh, and failed
+    """
+    return asyncio.run(warm_concept_examples_async(force, concepts, languages))
+
+async def warm_concept_examples_async(force: bool = False, concepts: Optional[List[str]] = None, languages: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Precompute concept examples for every concept/language pair into the response caches.
+    
+    Pairs whose stored example would expire before the next scheduled run are
+    regenerated; the rest are left alone unless force is set.
+    
+    Args:
+        force: Regenerate every pair even if a fresh example is stored
+        concepts: Concepts to warm (defaults to CONCEPT_DESCRIPTIONS)
+        languages: Languages to warm (defaults to CONCEPT_EXAMPLE_LANGUAGES)
+        
+    Returns:
+        dict: Counts of pairs generated, skipped as fresh, and failed
+    """
+    summary = {"generated": 0, "fresh": 0, "failed": 0}
+    if not await check_openai_api_key_async():
+        print("Skipping concept example warm-up: OpenAI API key not available")
+        return summary
+    
+    version = PROMPT_TEMPLATE_VERSIONS["concept_examples"]
+    for concept in concepts or list(CONCEPT_DESCRIPTIONS):
+        for language in languages or list(CONCEPT_EXAMPLE_LANGUAGES):
+            cache_key = concept_examples_key(concept, language)
+            stored = await asyncio.to_thread(response_store.get, "concept_examples", version, CHAT_MODEL, cache_key)
+            if not force and stored and stored[1] > CONCEPT_WARM_INTERVAL_SECONDS:
+                summary["fresh"] += 1
+                continue
+            try:
+                # Queue behind every interactive call; a shed pair is retried on the next pass
+                with background_priority():
+                    response_text = await create_chat_completion_async("concept_examples", **build_concept_examples_request(concept, language))
+                await asyncio.to_thread(save_response, "concept_examples", cache_key, parse_concept_examples_response(response_text))
+                summary["generated"] += 1
+            except Exception as e:
+                print(f"Error warming concept example {concept}/{language}: {e}")
+                summary["failed"] += 1
+    
+    print(f"Concept example warm-up finished: {summary}")
+    return summary
+
+def start_concept_warmer(interval: float = CONCEPT_WARM_INTERVAL_SECONDS) -> None:
+    """
+    Start a task on the running event loop that warms concept examples now and then on a schedule.
+    
+    The warm-up shares the app's async client and rate limiter with request
+    handlers, so it must be started from the loop that serves the app.
+    With several workers only the one holding the warm-up lock file runs a
+    pass; the others serve what it stores in the shared response store.
+    
+    Args:
+        interval: Seconds between warm-up passes
+    """
+    global concept_warmer
+    if concept_warmer is not None or interval <= 0:
+        return
+    
+    async def warm():
+        while True:
+            try:
+                with warm_lock() as acquired:
+                    if acquired:
+                        await warm_concept_examples_async()
+            except Exception as e:
+                print(f"Error in concept example warmer: {e}")
+            await asyncio.sleep(interval)
+    
+    concept_warmer = asyncio.ensure_future(warm())
+
+@contextmanager
+def warm_lock() -> Iterator[bool]:
+    """
+    Hold an exclusive, non-blocking lock shared by all workers for one warm-up pass.
+    
+    Yields:
+        bool: True if this process holds the lock
+    """
+    # Without a store there is nothing to share, so every process warms its own memory cache
+    if not response_store.enabled:
+        yield True
+        return
+    
+    import fcntl
+    with open(f"{response_store.path}.warm.lock", "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def get_ai_content(topic):
+    """
+    Get AI-generated content about a coding topic.
+    
+    Args:
+        topic: The coding topic
+        
+    Returns:
+        dict: AI-generated content with title, description, example, etc.
+    """
+    # Simple manually curated content for key topics
+    topics = {
+        "if-else": {
+            "title": "Conditional Logic with If-Else",
+            "description": "If-else statements allow your program to make decisions based on conditions.",
+            "example": "temperature = 25\n\nif temperature > 30:\n    print('It\'s hot today!')\nelif temperature > 20:\n    print('It\'s a nice day!')\nelse:\n    print('It\'s a bit cold today.')",
+            "real_world": "Conditional logic is extensively used in e-commerce for determining shipping costs, applying discounts, or managing user access control.",
+            "dry_run": "This code will print 'It\'s a nice day!' since the temperature is 25, which is greater than 20 but not greater than 30."
+        },
+        "loops": {
+            "title": "Iterations with Loops",
+            "description": "Loops are used to execute a block of code repeatedly based on a condition.",
+            "example": "# Processing a list of numbers\nnumbers = [1, 2, 3, 4, 5]\ntotal = 0\n\nfor num in numbers:\n    total += num\n    print(f'Running total: {total}')",
+            "real_world": "Loops are fundamental in data processing, where they're used to iterate through datasets for analysis, transformation, or validation.",
+            "dry_run": "This code will print the running total at each step, finally reaching 15 after adding all numbers in the list."
+        },
+        "functions": {
+            "title": "Code Reusability with Functions",
+            "description": "Functions allow you to group code into reusable blocks that perform specific tasks.",
+            "example": "def calculate_area(length, width):\n    return length * width\n\n# Calculate the area of different rooms\nliving_room = calculate_area(5, 4)\nkitchen = calculate_area(3, 3)\n\nprint(f'Living room area: {living_room} m²')\nprint(f'Kitchen area: {kitchen} m²')",
+            "real_world": "Functions form the basis of modular programming in production systems, facilitating maintenance, testing, and collaborative development.",
             "dry_run": "This code calculates and displays the areas of two rooms: the living room (20 m²) and the kitchen (9 m²)."
         },
         "classes": {
@@ -325,1351 +997,486 @@ def get_practice_problem():
     return random.choice(problems)
 
 
-def get_real_world_mapping(code: str) -> Dict[str, str]:
+# Real-world mappings cached by code fingerprint, so programs that differ only in
+# names, literals and formatting reuse one API response until the entry expires
+REALWORLD_CACHE_MAX_ENTRIES = int(os.environ.get("REALWORLD_CACHE_SIZE", "512"))
+REALWORLD_CACHE_TTL_SECONDS = float(os.environ.get("REALWORLD_CACHE_TTL", "3600"))
+real_world_cache = ResponseCache(REALWORLD_CACHE_MAX_ENTRIES, REALWORLD_CACHE_TTL_SECONDS)
+
+# Demos and complexity analyses are also filled by the combined call (see generate_combined_analysis_async);
+# demos are keyed by the exact code (code_hash), since they reproduce its literals
+demo_cache = ResponseCache(REALWORLD_CACHE_MAX_ENTRIES, REALWORLD_CACHE_TTL_SECONDS)
+complexity_cache = ResponseCache(REALWORLD_CACHE_MAX_ENTRIES, REALWORLD_CACHE_TTL_SECONDS)
+
+# Concept examples are a small fixed matrix precomputed by the cache warmer,
+# so they are kept much longer and refreshed on a schedule
+CONCEPT_EXAMPLES_TTL_SECONDS = float(os.environ.get("CONCEPT_EXAMPLES_TTL", str(7 * 24 * 3600)))
+concept_examples_cache = ResponseCache(256, CONCEPT_EXAMPLES_TTL_SECONDS)
+
+# In-process caches per endpoint; the shared SQLite response store sits behind them
+response_caches = {
+    "realworld": real_world_cache,
+    "demo": demo_cache,
+    "complexity": complexity_cache,
+    "concept_examples": concept_examples_cache
+}
+
+# Bump an endpoint's version whenever its prompt changes so stored responses are not reused
+PROMPT_TEMPLATE_VERSIONS = {
+    "realworld": "2",
+    "demo": "2",
+    "complexity": "2",
+    "concept_examples": "2"
+}
+
+# Coalesces identical concurrent AI calls in this process
+ai_single_flight = SingleFlight()
+
+# Signatures of analyzed snippets, so a lightly edited program is answered at once from a
+# similar program's cached response (marked approximate) while the exact answer is fetched
+# in the background; set the threshold above 1 to turn approximate answers off
+SIMILAR_CODE_THRESHOLD = float(os.environ.get("SIMILAR_CODE_THRESHOLD", "0.75"))
+SIMILAR_CODE_INDEX_SIZE = int(os.environ.get("SIMILAR_CODE_INDEX_SIZE", "2048"))
+snippet_index = SimilarityIndex(SIMILAR_CODE_INDEX_SIZE, SIMILAR_CODE_THRESHOLD)
+
+# Endpoints whose responses are found through the index (see save_response)
+SIMILAR_CODE_ENDPOINTS = ("realworld", "complexity")
+
+def forget_snippet(fingerprint: str) -> None:
+    """Drop a snippet from the similarity index once none of its endpoints caches a response for it."""
+    if not any(response_caches[endpoint].contains(fingerprint) for endpoint in SIMILAR_CODE_ENDPOINTS):
+        snippet_index.remove(fingerprint)
+
+real_world_cache.on_remove = forget_snippet
+complexity_cache.on_remove = forget_snippet
+
+# Background fetches of exact answers in progress: {(endpoint, fingerprint): task}
+background_refreshes: Dict[Tuple[str, str], Any] = {}
+background_refreshes_lock = threading.Lock()
+
+def lookup_stored_response(endpoint: str, fingerprint: str) -> Optional[Dict[str, Any]]:
     """
-    Generate a real-world code example for the user's code using OpenAI.
-    This function dynamically generates professional-grade examples based on the user's code pattern.
+    Look up an AI response in the shared response store and promote it to memory.
     
     Args:
-        code: The user's code
+        endpoint: Feature the response belongs to
+        fingerprint: Fingerprint of the input
         
     Returns:
-        dict: Dictionary with real-world code mapping including title, description and real_world_code
+        Optional[dict]: The stored response, or None on a miss
     """
-    import os
-    from openai import OpenAI
-    
-    if not code or len(code.strip()) < 10:
-        return {
-            "title": "Real-World Code Example", 
-            "description": "Write some code to see a real-world example.",
-            "real_world_code": "# Write code in the editor to see a real-world example"
-        }
+    stored = response_store.get(endpoint, PROMPT_TEMPLATE_VERSIONS[endpoint], CHAT_MODEL, fingerprint)
+    if stored is None:
+        return None
+    value, remaining_ttl = stored
+    # Promote to memory for no longer than the stored entry has left
+    cache = response_caches[endpoint]
+    cache.set(fingerprint, value, ttl_seconds=min(cache.ttl_seconds, remaining_ttl))
+    return value
+
+def lookup_response(endpoint: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached AI response in memory, then in the shared response store.
     
-    # Try using OpenAI API, with fallbacks if it fails
-    try:
-        print(f"Using OpenAI API to generate real-world example for code snippet of length {len(code)}")
-        
-        # Check if API key exists and is properly formatted
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key or len(api_key.strip()) < 30:
-            print("Invalid or missing OpenAI API key")
-            raise ValueError("Invalid OpenAI API key format. Please check your API key.")
-        
-        client = OpenAI(api_key=api_key)
+    Args:
+        endpoint: Feature the response belongs to
+        fingerprint: Fingerprint of the input
         
-        # Prepare the prompt
-        prompt = f"""
-        Analyze the following user code and create a professional-grade real-world example that shows how similar patterns
-        are used in production applications. The example should be educational and demonstrate best practices.
-
-        USER CODE:
-        ```python
-        {code}
-        ```
-
-        Generate a response in JSON format with the following fields:
-        1. title: A concise title for the real-world application (e.g., "API Authentication System")
-        2. description: A brief description of how this pattern is used in professional settings
-        3. real_world_code: A clean, well-commented code example showing the pattern in a professional context
+    Returns:
+        Optional[dict]: The cached response, or None on a miss
+    """
+    cached = response_caches[endpoint].get(fingerprint)
+    if cached is not None:
+        return cached
+    return lookup_stored_response(endpoint, fingerprint)
 
-        Only include the JSON object in your response, nothing else.
-        """
-        
-        # Make the API call
-        # using the ChatCompletion API with gpt-4o model which was released May 13, 2024
-        # do not change this unless explicitly requested by the user
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.7,
-            max_tokens=1000
-        )
-        
-        # Parse the response
-        result = json.loads(response.choices[0].message.content)
-        
-        print(f"Successfully generated real-world example: {result.get('title', 'Unknown')}")
-        
-        return {
-            "title": result.get("title", "Real-World Application"),
-            "description": result.get("description", "How this code applies to professional settings."),
-            "real_world_code": result.get("real_world_code", "# No code generated")
-        }
+async def lookup_response_async(endpoint: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+    """
+    Async variant of lookup_response; memory hits are answered without leaving the event loop.
     
-    except Exception as e:
-        error_message = str(e)
-        print(f"Error using OpenAI API: {error_message}")
-        
-        # Check for specific error conditions
-        if "insufficient_quota" in error_message or "exceeded your current quota" in error_message:
-            print("API quota exceeded. Please update your OpenAI API key or subscription.")
-            # Add a custom message in the return value to indicate quota issues
-            fallback_result = get_fallback_example(code)
-            fallback_result["title"] = "API Quota Exceeded - Using Fallback Example"
-            fallback_result["description"] += "\n\nNote: This example was generated using fallback content because the OpenAI API quota has been exceeded. Please update your API key for AI-generated examples."
-            return fallback_result
-        
-        print("Falling back to pattern-based examples")
+    Args:
+        endpoint: Feature the response belongs to
+        fingerprint: Fingerprint of the input
         
-        # Fallback to pattern-based responses if API fails
-        if "class" in code:
-            return {
-                "title": "Business Domain Model",
-                "description": "Production applications use domain models to represent business entities.",
-                "real_world_code": "class Product:\n    def __init__(self, id, name, price, category_id):\n        self.id = id\n        self.name = name\n        self.price = price\n        self.category_id = category_id\n        self.is_active = True\n        self.inventory_count = 0\n        \n    def apply_discount(self, percentage):\n        self.price = round(self.price * (1 - percentage/100), 2)\n        return self.price\n        \n    def restock(self, quantity):\n        self.inventory_count += quantity\n        if not self.is_active and self.inventory_count > 0:\n            self.is_active = True"
-            }
-        elif "if" in code and "else" in code:
-            return {
-                "title": "Data Validation Pipeline",
-                "description": "Conditional logic is often used for data validation and processing in ETL jobs.",
-                "real_world_code": "def validate_customer_data(customer):\n    validation_errors = []\n    \n    if not customer.get('email'):\n        validation_errors.append('Email is required')\n    elif not is_valid_email(customer['email']):\n        validation_errors.append('Email format is invalid')\n        \n    if not customer.get('name'):\n        validation_errors.append('Name is required')\n    \n    if customer.get('age') is not None:\n        if not isinstance(customer['age'], int):\n            validation_errors.append('Age must be a number')\n        elif customer['age'] < 18:\n            validation_errors.append('Customer must be at least 18 years old')\n    \n    return {\n        'is_valid': len(validation_errors) == 0,\n        'errors': validation_errors\n    }"
-            }
-        elif "for" in code or "while" in code:
-            return {
-                "title": "Data Processing Pipeline",
-                "description": "Loops are extensively used in data processing workflows for batch operations.",
-                "real_world_code": "def process_transaction_batch(transactions):\n    processed_count = 0\n    failed_count = 0\n    results = []\n    \n    for transaction in transactions:\n        try:\n            # Validate transaction\n            if not is_valid_transaction(transaction):\n                raise ValueError(f\"Invalid transaction format: {transaction['id']}\")\n                \n            # Process based on transaction type\n            if transaction['type'] == 'purchase':\n                result = process_purchase(transaction)\n            elif transaction['type'] == 'refund':\n                result = process_refund(transaction)\n            elif transaction['type'] == 'adjustment':\n                result = process_adjustment(transaction)\n            else:\n                raise ValueError(f\"Unknown transaction type: {transaction['type']}\")\n                \n            # Record success\n            processed_count += 1\n            results.append({\n                'transaction_id': transaction['id'],\n                'status': 'success',\n                'result': result\n            })\n            \n        except Exception as e:\n            # Record failure\n            failed_count += 1\n            logger.error(f\"Failed to process transaction {transaction.get('id')}: {str(e)}\")\n            results.append({\n                'transaction_id': transaction.get('id', 'unknown'),\n                'status': 'error',\n                'error': str(e)\n            })\n    \n    return {\n        'processed_count': processed_count,\n        'failed_count': failed_count,\n        'results': results\n    }"
-            }
-        else:
-            return {
-                "title": "API Endpoint Handler",
-                "description": "Professional applications use structured code organization for API endpoints.",
-                "real_world_code": "def handle_customer_request(request_data):\n    # Input validation\n    validation_result = validate_customer_request(request_data)\n    if not validation_result['is_valid']:\n        return {\n            'status': 'error',\n            'code': 'VALIDATION_ERROR',\n            'message': 'Invalid request data',\n            'details': validation_result['errors']\n        }\n    \n    # Process the request based on operation type\n    operation = request_data.get('operation')\n    customer_id = request_data.get('customer_id')\n    \n    try:\n        if operation == 'get_profile':\n            result = customer_service.get_customer_profile(customer_id)\n        elif operation == 'update_profile':\n            result = customer_service.update_customer_profile(\n                customer_id, request_data.get('profile_data', {})\n            )\n        elif operation == 'get_orders':\n            result = order_service.get_customer_orders(\n                customer_id, \n                limit=request_data.get('limit', 10),\n                offset=request_data.get('offset', 0)\n            )\n        else:\n            return {\n                'status': 'error',\n                'code': 'UNSUPPORTED_OPERATION',\n                'message': f'Operation not supported: {operation}'\n            }\n        \n        return {\n            'status': 'success',\n            'data': result\n        }\n        \n    except CustomerNotFoundError:\n        return {\n            'status': 'error',\n            'code': 'CUSTOMER_NOT_FOUND',\n            'message': f'Customer not found: {customer_id}'\n        }\n    except Exception as e:\n        logger.error(f'Error processing customer request: {str(e)}')\n        return {\n            'status': 'error',\n            'code': 'INTERNAL_ERROR',\n            'message': 'An unexpected error occurred'\n        }"
-            }
+    Returns:
+        Optional[dict]: The cached response, or None on a miss
+    """
+    cached = response_caches[endpoint].get(fingerprint)
+    if cached is not None:
+        return cached
+    return await asyncio.to_thread(lookup_stored_response, endpoint, fingerprint)
 
+def save_response(endpoint: str, fingerprint: str, value: Dict[str, Any], code: Optional[str] = None, language: str = "python") -> None:
+    """
+    Cache an AI response in memory and in the shared response store.
+    
+    Args:
+        endpoint: Feature the response belongs to
+        fingerprint: Fingerprint of the input
+        value: The response to cache
+        code: The input code; when given it is indexed for near-duplicate lookups
+        language: The programming language of code
+    """
+    cache = response_caches[endpoint]
+    cache.set(fingerprint, value)
+    response_store.put(endpoint, PROMPT_TEMPLATE_VERSIONS[endpoint], CHAT_MODEL, fingerprint, value, cache.ttl_seconds)
+    if code is not None:
+        snippet_index.add(fingerprint, code, language)
 
-def fix_common_demo_issues(html_content: str) -> str:
+def lookup_similar_response(endpoint: str, code: str, language: str) -> Optional[Dict[str, Any]]:
     """
-    Fix common issues with interactive demos, such as missing JavaScript functions.
+    Look up the cached response of the most similar earlier snippet.
     
     Args:
-        html_content: The HTML content of the demo
+        endpoint: Feature the response belongs to
+        code: The user's code
+        language: The programming language
         
     Returns:
-        str: Fixed HTML content
+        Optional[dict]: The similar snippet's response with "approximate" and "similarity"
+            added, or None if no similar snippet has a cached response
+    """
+    for fingerprint, similarity in snippet_index.query(code, language):
+        cached = lookup_response(endpoint, fingerprint)
+        if cached is not None:
+            print(f"Serving approximate {endpoint} response from a snippet {similarity:.0%} similar")
+            cached["approximate"] = True
+            cached["similarity"] = similarity
+            return cached
+    return None
+
+def claim_background_refresh(endpoint: str, fingerprint: str) -> bool:
+    """Reserve the background refresh of a fingerprint; False if one is already running."""
+    with background_refreshes_lock:
+        if (endpoint, fingerprint) in background_refreshes:
+            return False
+        background_refreshes[(endpoint, fingerprint)] = None
+        return True
+
+def release_background_refresh(endpoint: str, fingerprint: str) -> None:
+    with background_refreshes_lock:
+        background_refreshes.pop((endpoint, fingerprint), None)
+
+def refresh_in_background_async(endpoint: str, fingerprint: str, factory: Callable[[], Awaitable[Any]]) -> None:
     """
-    print("Applying common demo fixes...")
+    Fetch the exact answer behind an approximate one in a task on the running loop.
     
-    # Fix grade calculator issues
-    html_content = fix_grade_calculator_demo(html_content)
+    The call queues at background priority, behind interactive calls, and
+    at most one refresh per fingerprint runs at a time.
     
-    # Fix timer issues
-    html_content = fix_timer_functions(html_content)
+    Args:
+        endpoint: Feature the answer belongs to
+        fingerprint: Fingerprint of the code the answer is for
+        factory: Starts the coroutine that fetches and caches the exact answer
+    """
+    if not claim_background_refresh(endpoint, fingerprint):
+        return
+    # The task copies the current context, so its calls keep the background priority
+    with background_priority():
+        task = asyncio.ensure_future(factory())
+    with background_refreshes_lock:
+        background_refreshes[(endpoint, fingerprint)] = task
+    task.add_done_callback(lambda _: release_background_refresh(endpoint, fingerprint))
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get hit-rate counters for the AI response caches.
     
-    # Ensure demos have auto-run functionality
-    html_content = add_auto_run_functionality(html_content)
+    Returns:
+        dict: Stats per cache name, plus the shared response store, coalesced call counts
+            and the near-duplicate index
+    """
+    stats = {name: cache.stats() for name, cache in response_caches.items()}
+    stats["store"] = response_store.stats()
+    stats["single_flight"] = ai_single_flight.stats()
+    stats["similar"] = snippet_index.stats()
+    stats["similar"]["refreshing"] = len(background_refreshes)
+    return stats
+
+def build_real_world_request(code: str, language: str = "python") -> Dict[str, Any]:
+    """
+    Build the chat completion arguments for a real-world mapping.
     
-    return html_content
+    Args:
+        code: The user's code
+        language: The programming language (used to trim oversized code)
+        
+    Returns:
+        dict: Arguments for create_chat_completion_async
+    """
+    # Prepare the prompt
+    prompt = render_prompt("""
+    Analyze the following user code and create a professional-grade real-world example that shows how similar patterns
+    are used in production applications. The example should be educational and demonstrate best practices.
 
+    USER CODE:
+    ```python
+    {code}
+    ```
+
+    Generate a response in JSON format with the following fields:
+    1. title: A concise title for the real-world application (e.g., "API Authentication System")
+    2. description: A brief description of how this pattern is used in professional settings
+    3. real_world_code: A clean, well-commented code example showing the pattern in a professional context
+
+    Only include the JSON object in your response, nothing else.
+    """, code=fit_code(code, language))
+    
+    return {
+        "messages": [{"role": "user", "content": prompt}],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.7,
+        "max_tokens": 1000
+    }
 
-def add_auto_run_functionality(html_content: str) -> str:
+def parse_real_world_response(content: str) -> Dict[str, str]:
     """
-    Add window.onload handler to auto-execute initial functionality.
-    Also fix common function issues in JS demos by adding missing function implementations.
-    Adds success messages and notifications for better user feedback.
+    Parse the JSON returned for a real-world mapping.
     
     Args:
-        html_content: The HTML content of the demo
+        content: Raw completion content
         
     Returns:
-        str: Fixed HTML content with auto-run functionality and success notifications
-    """
-    print("Adding auto-run and fixing function references...")
-    
-    # Check for common function references that are not implemented
-    missing_functions = []
-    common_functions = {
-        'calculateAverage': html_content.find('calculateAverage') >= 0 and html_content.find('function calculateAverage') < 0,
-        'calculateFactorial': html_content.find('calculateFactorial') >= 0 and html_content.find('function calculateFactorial') < 0,
-        'startTimer': html_content.find('startTimer') >= 0 and html_content.find('function startTimer') < 0,
-        'calculate': html_content.find('calculate(') >= 0 and html_content.find('function calculate') < 0,
-        'generateOutput': html_content.find('generateOutput') >= 0 and html_content.find('function generateOutput') < 0,
-        'processInput': html_content.find('processInput') >= 0 and html_content.find('function processInput') < 0,
-        'updateDisplay': html_content.find('updateDisplay') >= 0 and html_content.find('function updateDisplay') < 0,
-        'validateForm': html_content.find('validateForm') >= 0 and html_content.find('function validateForm') < 0,
-    }
+        dict: title, description and real_world_code
+    """
+    result = json.loads(content)
     
-    # Build implementations for missing functions
-    function_implementations = ""
+    print(f"Successfully generated real-world example: {result.get('title', 'Unknown')}")
     
-    if common_functions['calculateFactorial']:
-        function_implementations += """
-        // Auto-generated factorial calculation function
-        function calculateFactorial(n) {
-            // Input validation - handle string inputs
-            n = parseInt(n);
-            
-            // Handle edge cases
-            if (isNaN(n)) return "Invalid input";
-            if (n < 0) return "Invalid input (negative)";
-            if (n === 0) return 1;
-            
-            // Calculate factorial
-            let result = 1;
-            for (let i = 2; i <= n; i++) {
-                result *= i;
-            }
-            
-            return result;
-        }
-        
-        // Display factorial result
-        function displayFactorialResult() {
-            const input = document.getElementById('number') ? 
-                          document.getElementById('number').value : 
-                          document.querySelector('input[type="number"]').value || 5;
-            
-            const result = calculateFactorial(input);
-            
-            // Find where to display the result
-            const resultElement = document.getElementById('result') || 
-                                 document.getElementById('factorial-result') ||
-                                 document.querySelector('.result');
-            
-            if (resultElement) {
-                resultElement.textContent = `Factorial: ${result}`;
-                resultElement.style.color = '#1DB954';
-            }
-        }
-        """
-    
-    if common_functions['calculate']:
-        function_implementations += """
-        // Auto-generated general calculation function
-        function calculate() {
-            // Try to find input elements
-            const inputs = document.querySelectorAll('input[type="number"], input[type="text"]');
-            const resultDisplay = document.getElementById('result') || 
-                                document.querySelector('.result') || 
-                                document.querySelector('[id$="result"]');
-            
-            if (inputs.length === 0 || !resultDisplay) return;
-            
-            // Look for specific calculators based on page content
-            const pageContent = document.body.innerHTML.toLowerCase();
-            
-            let result = null;
-            
-            // Check if this might be a BMI calculator
-            if (pageContent.includes('bmi') || pageContent.includes('body mass')) {
-                const height = parseFloat(inputs[0].value) || 175;
-                const weight = parseFloat(inputs[1].value) || 70;
-                result = (weight / ((height/100) * (height/100))).toFixed(2);
-                resultDisplay.textContent = `BMI: ${result}`;
-            }
-            // Check if this might be a temperature converter
-            else if (pageContent.includes('temperature') || pageContent.includes('celsius') || pageContent.includes('fahrenheit')) {
-                const temp = parseFloat(inputs[0].value) || 20;
-                const isCelsius = pageContent.indexOf('celsius') < pageContent.indexOf('fahrenheit');
-                
-                if (isCelsius) {
-                    result = ((temp * 9/5) + 32).toFixed(2);
-                    resultDisplay.textContent = `${temp}°C = ${result}°F`;
-                } else {
-                    result = ((temp - 32) * 5/9).toFixed(2);
-                    resultDisplay.textContent = `${temp}°F = ${result}°C`;
-                }
-            } 
-            // Default to basic arithmetic if not a specific calculator
-            else {
-                let total = 0;
-                if (inputs.length >= 2) {
-                    const num1 = parseFloat(inputs[0].value) || 0;
-                    const num2 = parseFloat(inputs[1].value) || 0;
-                    
-                    if (pageContent.includes('multiply') || pageContent.includes('product')) {
-                        result = num1 * num2;
-                    } else if (pageContent.includes('divide') || pageContent.includes('quotient')) {
-                        result = num1 / num2;
-                    } else if (pageContent.includes('subtract') || pageContent.includes('difference')) {
-                        result = num1 - num2;
-                    } else {
-                        result = num1 + num2;
-                    }
-                    
-                    resultDisplay.textContent = `Result: ${result}`;
-                }
-            }
-            
-            // Highlight the result with a visual effect
-            resultDisplay.style.color = '#1DB954';
-            resultDisplay.style.fontWeight = 'bold';
-        }
-        """
-    
-    if common_functions['generateOutput']:
-        function_implementations += """
-        // Auto-generated function to handle output generation
-        function generateOutput() {
-            // Find input elements
-            const textInput = document.querySelector('textarea') || 
-                            document.querySelector('input[type="text"]') ||
-                            document.getElementById('input');
-            
-            // Find output container
-            const outputElement = document.getElementById('output') || 
-                                document.querySelector('.output') ||
-                                document.getElementById('result') ||
-                                document.querySelector('.result');
-            
-            if (!textInput || !outputElement) return;
-            
-            const inputValue = textInput.value || textInput.placeholder || "Sample input text";
-            
-            // Determine what to do based on page content
-            const pageContent = document.body.innerHTML.toLowerCase();
-            
-            if (pageContent.includes('count word') || pageContent.includes('word count')) {
-                // Word counter
-                const wordCount = inputValue.split(/\\s+/).filter(word => word.length > 0).length;
-                outputElement.textContent = `Word count: ${wordCount}`;
-            } 
-            else if (pageContent.includes('reverse')) {
-                // Text reverser
-                outputElement.textContent = inputValue.split('').reverse().join('');
-            }
-            else if (pageContent.includes('uppercase') || pageContent.includes('lowercase')) {
-                // Case converter
-                if (pageContent.indexOf('uppercase') < pageContent.indexOf('lowercase')) {
-                    outputElement.textContent = inputValue.toUpperCase();
-                } else {
-                    outputElement.textContent = inputValue.toLowerCase();
-                }
-            }
-            else {
-                // Generic output
-                outputElement.textContent = `Output: ${inputValue}`;
-            }
-            
-            // Highlight the output
-            outputElement.style.color = '#1DB954';
-            outputElement.style.fontWeight = 'bold';
-        }
-        """
-    
-    if common_functions['processInput']:
-        function_implementations += """
-        // Auto-generated function to process user inputs
-        function processInput() {
-            const inputs = document.querySelectorAll('input, textarea, select');
-            const resultElement = document.getElementById('result') || 
-                                document.querySelector('.result') ||
-                                document.getElementById('output') ||
-                                document.querySelector('.output');
-            
-            if (!resultElement) return;
-            
-            // Get all input values
-            const values = Array.from(inputs).map(input => input.value || input.placeholder || "");
-            
-            // Determine what to display based on page content
-            const pageContent = document.body.innerHTML.toLowerCase();
-            
-            if (values.length > 0) {
-                if (pageContent.includes('form') && pageContent.includes('submit')) {
-                    resultElement.innerHTML = `
-                        <div style="padding: 15px; background-color: #1a1b26; border-left: 4px solid #1DB954; margin-top: 20px;">
-                            <h3 style="color: #1DB954; margin-top: 0;">Form Submission Successful</h3>
-                            <p>Thank you for your submission. We've received the following information:</p>
-                            <ul style="color: #c0caf5;">
-                                ${values.map((val, i) => `<li><strong>${inputs[i].placeholder || 'Field ' + (i+1)}:</strong> ${val}</li>`).join('')}
-                            </ul>
-                        </div>
-                    `;
-                } else {
-                    resultElement.textContent = `Processed input: ${values.join(', ')}`;
-                    resultElement.style.color = '#1DB954';
-                }
-            }
-        }
-        """
-    
-    if common_functions['updateDisplay']:
-        function_implementations += """
-        // Auto-generated function to update display elements
-        function updateDisplay() {
-            const inputs = document.querySelectorAll('input, select, textarea');
-            const displayElement = document.getElementById('display') || 
-                                document.querySelector('.display') ||
-                                document.getElementById('output') ||
-                                document.querySelector('.output') ||
-                                document.getElementById('result') ||
-                                document.querySelector('.result');
-            
-            if (!displayElement) return;
-            
-            // Get all input values
-            const values = Array.from(inputs).map(input => input.value || input.placeholder || "");
-            
-            if (values.length > 0) {
-                // Check if this is likely a visual display demo
-                if (displayElement.tagName === 'CANVAS') {
-                    // Draw something on the canvas
-                    const ctx = displayElement.getContext('2d');
-                    ctx.clearRect(0, 0, displayElement.width, displayElement.height);
-                    
-                    const value = parseFloat(values[0]) || 50;
-                    const percentage = value / 100;
-                    
-                    // Draw progress bar
-                    ctx.fillStyle = '#24283b';
-                    ctx.fillRect(0, 0, displayElement.width, displayElement.height);
-                    
-                    ctx.fillStyle = '#1DB954';
-                    ctx.fillRect(0, 0, displayElement.width * percentage, displayElement.height);
-                    
-                    // Add text
-                    ctx.fillStyle = '#ffffff';
-                    ctx.font = '14px Arial';
-                    ctx.textAlign = 'center';
-                    ctx.fillText(`${value}%`, displayElement.width/2, displayElement.height/2 + 5);
-                } else {
-                    // Text-based display
-                    displayElement.textContent = `Display updated: ${values.join(', ')}`;
-                    displayElement.style.color = '#1DB954';
-                }
-            }
-        }
-        """
-    
-    if common_functions['validateForm']:
-        function_implementations += """
-        // Auto-generated form validation function
-        function validateForm() {
-            const form = document.querySelector('form');
-            const inputs = form ? form.querySelectorAll('input, select, textarea') : document.querySelectorAll('input, select, textarea');
-            const resultElement = document.getElementById('validation-result') || 
-                                document.getElementById('result') ||
-                                document.querySelector('.result');
-            
-            // Reset any previous validation styling
-            inputs.forEach(input => {
-                input.style.borderColor = '';
-                const errorLabel = input.parentNode.querySelector('.error-message');
-                if (errorLabel) errorLabel.remove();
-            });
-            
-            let isValid = true;
-            let errorMessages = [];
-            
-            // Validate each input
-            inputs.forEach(input => {
-                // Skip submit buttons or hidden fields
-                if (input.type === 'submit' || input.type === 'button' || input.type === 'hidden') return;
-                
-                let fieldName = input.placeholder || input.name || 'Field';
-                let errorMessage = null;
-                
-                // Required field validation
-                if (input.hasAttribute('required') && !input.value.trim()) {
-                    errorMessage = `${fieldName} is required`;
-                }
-                // Email validation
-                else if (input.type === 'email' && input.value && !/^\\S+@\\S+\\.\\S+$/.test(input.value)) {
-                    errorMessage = `Please enter a valid email address`;
-                }
-                // Number validation
-                else if (input.type === 'number') {
-                    const value = parseFloat(input.value);
-                    const min = parseFloat(input.min);
-                    const max = parseFloat(input.max);
-                    
-                    if (input.value && isNaN(value)) {
-                        errorMessage = `${fieldName} must be a number`;
-                    } else if (!isNaN(min) && value < min) {
-                        errorMessage = `${fieldName} cannot be less than ${min}`;
-                    } else if (!isNaN(max) && value > max) {
-                        errorMessage = `${fieldName} cannot be greater than ${max}`;
-                    }
-                }
-                
-                // If there's an error, highlight the field and show message
-                if (errorMessage) {
-                    isValid = false;
-                    errorMessages.push(errorMessage);
-                    
-                    // Highlight the input
-                    input.style.borderColor = '#ff5555';
-                    
-                    // Add error message below the input
-                    const errorLabel = document.createElement('div');
-                    errorLabel.className = 'error-message';
-                    errorLabel.textContent = errorMessage;
-                    errorLabel.style.color = '#ff5555';
-                    errorLabel.style.fontSize = '12px';
-                    errorLabel.style.marginTop = '5px';
-                    input.parentNode.appendChild(errorLabel);
-                }
-            });
-            
-            // Show overall validation result if element exists
-            if (resultElement) {
-                if (isValid) {
-                    resultElement.innerHTML = `
-                        <div style="padding: 10px; background-color: rgba(29, 185, 84, 0.1); border-left: 3px solid #1DB954; margin-top: 15px;">
-                            <p style="color: #1DB954; margin: 0;">Form is valid! Ready to submit.</p>
-                        </div>
-                    `;
-                } else {
-                    resultElement.innerHTML = `
-                        <div style="padding: 10px; background-color: rgba(255, 85, 85, 0.1); border-left: 3px solid #ff5555; margin-top: 15px;">
-                            <p style="color: #ff5555; margin: 0 0 5px 0;">Please fix the following errors:</p>
-                            <ul style="color: #ff5555; margin: 0; padding-left: 20px;">
-                                ${errorMessages.map(msg => `<li>${msg}</li>`).join('')}
-                            </ul>
-                        </div>
-                    `;
-                }
-            }
-            
-            return isValid;
-        }
-        """
-    
-    # Add notification system
-    notification_system = """
-    // Add notification system for success messages
-    function createNotificationSystem() {
-        // Create notification container if it doesn't exist
-        if (!document.getElementById('notification-container')) {
-            const container = document.createElement('div');
-            container.id = 'notification-container';
-            container.style.cssText = `
-                position: fixed;
-                top: 20px;
-                right: 20px;
-                z-index: 9999;
-                display: flex;
-                flex-direction: column;
-                align-items: flex-end;
-                max-width: 300px;
-            `;
-            document.body.appendChild(container);
-        }
-        
-        // Define showNotification function
-        window.showNotification = function(message, type = 'success') {
-            const container = document.getElementById('notification-container');
-            
-            // Create notification element
-            const notification = document.createElement('div');
-            notification.className = `notification ${type}`;
-            
-            // Set styles based on type
-            let bgColor = '#1DB954';
-            let textColor = '#fff';
-            let icon = '✓';
-            
-            if (type === 'error') {
-                bgColor = '#ff5555';
-                icon = '✕';
-            } else if (type === 'info') {
-                bgColor = '#7aa2f7';
-                icon = 'ℹ';
-            }
-            
-            notification.style.cssText = `
-                background-color: ${bgColor};
-                color: ${textColor};
-                border-radius: 8px;
-                padding: 12px 16px;
-                margin-bottom: 10px;
-                box-shadow: 0 4px 10px rgba(0, 0, 0, 0.3);
-                display: flex;
-                align-items: center;
-                opacity: 0;
-                transform: translateX(50px);
-                transition: all 0.3s ease;
-                max-width: 100%;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            `;
-            
-            // Add icon
-            const iconSpan = document.createElement('span');
-            iconSpan.style.cssText = `
-                font-size: 18px;
-                margin-right: 10px;
-                font-weight: bold;
-            `;
-            iconSpan.textContent = icon;
-            
-            // Add message
-            const messageSpan = document.createElement('span');
-            messageSpan.textContent = message;
-            
-            // Assemble notification
-            notification.appendChild(iconSpan);
-            notification.appendChild(messageSpan);
-            container.appendChild(notification);
-            
-            // Animate in
-            setTimeout(() => {
-                notification.style.opacity = '1';
-                notification.style.transform = 'translateX(0)';
-            }, 10);
-            
-            // Automatically remove after delay
-            setTimeout(() => {
-                notification.style.opacity = '0';
-                notification.style.transform = 'translateX(50px)';
-                
-                // Remove from DOM after animation
-                setTimeout(() => {
-                    container.removeChild(notification);
-                }, 300);
-            }, 5000);
-            
-            return notification;
-        };
-        
-        // Define showSuccessMessage function for easy success messages
-        window.showSuccessMessage = function(message) {
-            return showNotification(message, 'success');
-        };
-        
-        // Define showErrorMessage function for error messages
-        window.showErrorMessage = function(message) {
-            return showNotification(message, 'error');
-        };
-        
-        // Define showAchievement function for special achievements
-        window.showAchievement = function(title, message) {
-            const container = document.getElementById('notification-container');
-            
-            // Create achievement notification
-            const achievement = document.createElement('div');
-            achievement.className = 'achievement';
-            achievement.style.cssText = `
-                background-color: #24283b;
-                color: #fff;
-                border-radius: 10px;
-                padding: 15px;
-                margin-bottom: 15px;
-                box-shadow: 0 4px 15px rgba(0, 0, 0, 0.4);
-                border-left: 4px solid #1DB954;
-                opacity: 0;
-                transform: translateX(50px);
-                transition: all 0.3s ease;
-                max-width: 100%;
-                font-family: 'Segoe UI', Arial, sans-serif;
-            `;
-            
-            // Add trophy icon
-            const icon = document.createElement('div');
-            icon.innerHTML = '🏆';
-            icon.style.cssText = `
-                font-size: 24px;
-                margin-bottom: 8px;
-                color: #1DB954;
-            `;
-            
-            // Add title
-            const titleElem = document.createElement('h3');
-            titleElem.textContent = title;
-            titleElem.style.cssText = `
-                margin: 0 0 5px 0;
-                font-size: 16px;
-                color: #1DB954;
-            `;
-            
-            // Add message
-            const messageElem = document.createElement('p');
-            messageElem.textContent = message;
-            messageElem.style.cssText = `
-                margin: 0;
-                font-size: 14px;
-                color: #c0caf5;
-            `;
-            
-            // Assemble achievement
-            achievement.appendChild(icon);
-            achievement.appendChild(titleElem);
-            achievement.appendChild(messageElem);
-            container.appendChild(achievement);
-            
-            // Animate in
-            setTimeout(() => {
-                achievement.style.opacity = '1';
-                achievement.style.transform = 'translateX(0)';
-            }, 10);
-            
-            // Automatically remove after longer delay (achievements are special)
-            setTimeout(() => {
-                achievement.style.opacity = '0';
-                achievement.style.transform = 'translateX(50px)';
-                
-                // Remove from DOM after animation
-                setTimeout(() => {
-                    container.removeChild(achievement);
-                }, 500);
-            }, 7000);
-            
-            return achievement;
-        };
+    return normalize_real_world_result(result)
+
+def normalize_real_world_result(result: Dict[str, Any]) -> Dict[str, str]:
+    """Fill in any missing real-world mapping field with its default."""
+    return {
+        "title": result.get("title", "Real-World Application"),
+        "description": result.get("description", "How this code applies to professional settings."),
+        "real_world_code": result.get("real_world_code", "# No code generated")
     }
+
+def get_real_world_placeholder(code: str) -> Optional[Dict[str, str]]:
+    """Placeholder shown when there is not enough code to map, or None if there is."""
+    if not code or len(code.strip()) < 10:
+        return {
+            "title": "Real-World Code Example", 
+            "description": "Write some code to see a real-world example.",
+            "real_world_code": "# Write code in the editor to see a real-world example"
+        }
+    return None
+
+def require_openai_api_key_format(feature: str) -> None:
+    """
+    Raise ValueError if the configured API key is missing or malformed.
     
-    // Automatically call showSuccessMessage or showAchievement when certain actions are performed
-    function enhanceButtonClicks() {
-        const buttons = document.querySelectorAll('button, input[type="button"], input[type="submit"]');
-        buttons.forEach(button => {
-            // Skip if already enhanced
-            if (button.dataset.enhanced) return;
-            
-            // Get the original click handler
-            const originalOnClick = button.onclick;
-            
-            // Set a new click handler
-            button.onclick = function(event) {
-                // Call the original handler if it exists
-                let result = true;
-                if (originalOnClick) {
-                    result = originalOnClick.call(this, event);
-                }
-                
-                // Only show success if the original handler didn't return false
-                if (result !== false) {
-                    // Get button text to customize message
-                    const buttonText = button.textContent || button.value || 'Action';
-                    
-                    // Show appropriate success message based on button text
-                    if (buttonText.toLowerCase().includes('calculate') || 
-                        buttonText.toLowerCase().includes('compute')) {
-                        showSuccessMessage('Calculation completed successfully!');
-                    } else if (buttonText.toLowerCase().includes('add') || 
-                               buttonText.toLowerCase().includes('create')) {
-                        showSuccessMessage('Item added successfully!');
-                    } else if (buttonText.toLowerCase().includes('save') || 
-                               buttonText.toLowerCase().includes('update')) {
-                        showSuccessMessage('Changes saved successfully!');
-                    } else if (buttonText.toLowerCase().includes('submit') || 
-                               buttonText.toLowerCase().includes('send')) {
-                        showSuccessMessage('Form submitted successfully!');
-                    } else if (buttonText.toLowerCase().includes('delete') || 
-                               buttonText.toLowerCase().includes('remove')) {
-                        showSuccessMessage('Item removed successfully!');
-                    } else {
-                        showSuccessMessage('Action completed successfully!');
-                    }
-                    
-                    // 25% chance to show an achievement when buttons are clicked
-                    if (Math.random() < 0.25) {
-                        showAchievement('Concept Mastered!', 'You\'ve successfully demonstrated your understanding of this concept.');
-                    }
-                }
-                
-                return result;
-            };
-            
-            // Mark as enhanced
-            button.dataset.enhanced = 'true';
-        });
-    }
+    Args:
+        feature: Name of the feature, used in the log message
+    """
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key or len(api_key.strip()) < 30:
+        print(f"Invalid or missing OpenAI API key for {feature}")
+        raise ValueError("Invalid OpenAI API key format. Please check your API key.")
+
+def get_real_world_fallback(code: str, error_message: str, language: str = "python") -> Dict[str, str]:
     """
+    Fallback real-world mapping used when the OpenAI call fails.
     
-    # Add auto-run functionality
-    auto_run_js = """
-    // Add auto-run functionality
-    window.onload = function() {
-        console.log("Auto-running demo initialization...");
-        
-        // Initialize the notification system
-        createNotificationSystem();
-        
-        // Run any existing init function if available
-        if (typeof initDemo === 'function') {
-            try {
-                initDemo();
-            } catch (e) {
-                console.error("Error in initDemo:", e);
-            }
-        }
-        
-        // Try to auto-execute commonly used functions
-        const commonFunctions = [
-            'calculateFactorial', 'startTimer', 'calculateAverage', 'processInput', 
-            'runSimulation', 'updateChart', 'updateDisplay', 'visualize',
-            'calculate', 'update', 'showResult', 'generateOutput', 'runExample',
-            'displayFactorialResult', 'updateTimer', 'validateForm'
-        ];
-        
-        // Try to call common functions that might exist
-        let functionCalled = false;
-        for (const funcName of commonFunctions) {
-            if (typeof window[funcName] === 'function') {
-                console.log(`Auto-executing function: ${funcName}`);
-                try {
-                    window[funcName]();
-                    functionCalled = true;
-                    
-                    // Show success message for auto-executed function
-                    if (window.showSuccessMessage) {
-                        setTimeout(() => {
-                            window.showSuccessMessage(`Auto-initialized ${funcName.replace(/([A-Z])/g, ' $1').toLowerCase()} successfully!`);
-                        }, 1000);
-                    }
-                } catch (e) {
-                    console.error(`Error auto-executing ${funcName}:`, e);
-                }
-            }
-        }
-        
-        // If no functions were called, look for form inputs and populate with default values
-        if (!functionCalled) {
-            const inputs = document.querySelectorAll('input[type="number"]');
-            inputs.forEach(input => {
-                if (!input.value) {
-                    if (input.placeholder) {
-                        input.value = input.placeholder;
-                    } else if (input.min && input.max) {
-                        input.value = Math.floor((parseInt(input.min) + parseInt(input.max)) / 2);
-                    } else {
-                        input.value = 10; // Default value
-                    }
-                }
-            });
-            
-            // Try to call the functions again now that we have values
-            for (const funcName of commonFunctions) {
-                if (typeof window[funcName] === 'function') {
-                    try {
-                        window[funcName]();
-                        functionCalled = true;
-                        
-                        // Show success message for auto-executed function
-                        if (window.showSuccessMessage) {
-                            setTimeout(() => {
-                                window.showSuccessMessage(`Auto-initialized ${funcName.replace(/([A-Z])/g, ' $1').toLowerCase()} successfully!`);
-                            }, 1000);
-                        }
-                    } catch (e) {
-                        console.error(`Error in retry of ${funcName}:`, e);
-                    }
-                }
-            }
-        }
-        
-        // Simulate clicks on primary action buttons if no function was executed
-        if (!functionCalled) {
-            setTimeout(() => {
-                // Find any buttons that might be primary action buttons
-                const actionButtons = document.querySelectorAll(
-                    'button.primary, button.action, button.run, button.calculate, button.start, ' +
-                    'button:not([class]), input[type="button"], input[type="submit"]'
-                );
-                
-                if (actionButtons.length > 0) {
-                    console.log("Auto-clicking primary action button");
-                    try {
-                        actionButtons[0].click();
-                    } catch (e) {
-                        console.error("Error auto-clicking button:", e);
-                    }
-                }
-            }, 300);
-        }
-        
-        // Enhance button clicks to show success messages
-        setTimeout(() => {
-            enhanceButtonClicks();
-        }, 500);
+    Args:
+        code: The user's code
+        error_message: The error raised by the OpenAI call
+        language: The programming language
         
-        // Show initial achievement for loading the demo
-        if (window.showAchievement) {
-            setTimeout(() => {
-                window.showAchievement('Demo Loaded!', 'You\'re now exploring an interactive demonstration of this coding concept.');
-            }, 2000);
-        }
-    };
+    Returns:
+        dict: Pattern-based real-world example
     """
+    print(f"Error using OpenAI API: {error_message}")
     
-    # Combine all JS implementations with notification system and auto-run
-    all_js = function_implementations + notification_system + auto_run_js
+    # Check for specific error conditions
+    if "insufficient_quota" in error_message or "exceeded your current quota" in error_message:
+        print("API quota exceeded. Please update your OpenAI API key or subscription.")
+        # Add a custom message in the return value to indicate quota issues
+        fallback_result = get_fallback_example(code, language)
+        fallback_result["title"] = "API Quota Exceeded - Using Fallback Example"
+        fallback_result["description"] += "\n\nNote: This example was generated using fallback content because the OpenAI API quota has been exceeded. Please update your API key for AI-generated examples."
+        return fallback_result
     
-    # Check if we need to add/replace window.onload
-    if "window.onload" in html_content:
-        # Replace existing window.onload function
-        html_content = re.sub(
-            r'window\.onload\s*=\s*function\s*\(\s*\)\s*\{[^}]*\}',
-            'window.onload = function() { console.log("Auto-running enhanced initialization..."); /* Replaced by improved auto-run */ }',
-            html_content
-        )
+    print("Falling back to pattern-based examples")
     
-    # Add our JavaScript implementations
-    if "</script>" in html_content:
-        # Add before the last closing script tag
-        last_script_index = html_content.rfind("</script>")
-        html_content = html_content[:last_script_index] + all_js + html_content[last_script_index:]
-    else:
-        # Add a new script tag
-        html_content += f"\n<script>{all_js}</script>"
-    
-    return html_content
+    # Fallback to pattern-based responses if API fails
+    return get_fallback_example(code, language)
 
-
-def fix_timer_functions(html_content: str) -> str:
+async def get_real_world_mapping_async(code: str, language: str = "python") -> Dict[str, str]:
     """
-    Fix common issues with timer/countdown demos, particularly the missing startTimer function.
+    Generate a real-world code example for the user's code using OpenAI.
+    
+    Near-identical programs share a cached mapping; a similar program's mapping
+    is served at once while the exact one is cached for next time.
     
     Args:
-        html_content: The HTML content of the demo
+        code: The user's code
+        language: The programming language (default is python)
         
     Returns:
-        str: Fixed HTML content
+        dict: Dictionary with real-world code mapping including title, description and real_world_code
     """
-    print("Checking for timer function issues...")
+    placeholder = get_real_world_placeholder(code)
+    if placeholder:
+        return placeholder
     
-    # Check if we have a reference to startTimer but no function definition
-    if "startTimer" in html_content and "function startTimer" not in html_content:
-        print("Adding missing startTimer function...")
-        
-        # Add the missing startTimer function
-        start_timer_js = """
-        // Timer variables
-        let timerInterval;
-        let timerSeconds = 60;
-        let originalTimerSeconds = 60;
-        
-        function startTimer() {
-            // Clear any existing interval
-            if (timerInterval) {
-                clearInterval(timerInterval);
-            }
-            
-            // Find timer elements
-            const timerElement = document.getElementById('timer') || 
-                                 document.querySelector('.timer') ||
-                                 document.querySelector('[id$="timer"]') ||
-                                 document.querySelector('[class$="timer"]');
-                                 
-            const progressElement = document.getElementById('timer-progress') || 
-                                    document.querySelector('.progress-bar') ||
-                                    document.querySelector('[class$="progress"]');
-            
-            // Get duration from input if available
-            const durationInput = document.getElementById('duration') ||
-                                  document.querySelector('[id$="duration"]') ||
-                                  document.querySelector('input[type="number"]');
-            
-            if (durationInput && !isNaN(parseInt(durationInput.value))) {
-                timerSeconds = parseInt(durationInput.value);
-                originalTimerSeconds = timerSeconds;
-            }
-            
-            // Update UI immediately
-            updateTimerDisplay(timerElement, progressElement);
-            
-            // Set interval for countdown
-            timerInterval = setInterval(() => {
-                if (timerSeconds <= 0) {
-                    clearInterval(timerInterval);
-                    if (typeof timerComplete === 'function') {
-                        timerComplete();
-                    } else {
-                        // Default completion behavior
-                        if (timerElement) {
-                            timerElement.textContent = "Time's up!";
-                            timerElement.style.color = "#ff9e64";
-                        }
-                    }
-                } else {
-                    timerSeconds--;
-                    updateTimerDisplay(timerElement, progressElement);
-                }
-            }, 1000);
-        }
-        
-        function updateTimerDisplay(timerElement, progressElement) {
-            if (timerElement) {
-                const minutes = Math.floor(timerSeconds / 60);
-                const seconds = timerSeconds % 60;
-                timerElement.textContent = `${minutes}:${seconds.toString().padStart(2, '0')}`;
-            }
-            
-            if (progressElement) {
-                const percentage = (timerSeconds / originalTimerSeconds) * 100;
-                progressElement.style.width = `${percentage}%`;
-            }
-        }
-        
-        function resetTimer() {
-            if (timerInterval) {
-                clearInterval(timerInterval);
-            }
-            timerSeconds = originalTimerSeconds;
-            
-            const timerElement = document.getElementById('timer') || 
-                                 document.querySelector('.timer') ||
-                                 document.querySelector('[id$="timer"]') ||
-                                 document.querySelector('[class$="timer"]');
-                                 
-            const progressElement = document.getElementById('timer-progress') || 
-                                    document.querySelector('.progress-bar') ||
-                                    document.querySelector('[class$="progress"]');
-                                    
-            updateTimerDisplay(timerElement, progressElement);
-        }
-        
-        function pauseTimer() {
-            if (timerInterval) {
-                clearInterval(timerInterval);
-                timerInterval = null;
-            }
-        }
-        """
-        
-        # Insert the function either before the closing script tag or add a new script tag
-        if "</script>" in html_content:
-            # Add before the last closing script tag
-            last_script_index = html_content.rfind("</script>")
-            html_content = html_content[:last_script_index] + start_timer_js + html_content[last_script_index:]
-        else:
-            # Add a new script tag
-            html_content += f"<script>{start_timer_js}</script>"
-    
-    # Fix the Start Timer button
-    if "startTimer" in html_content:
-        # Using BeautifulSoup would be ideal, but for simplicity we'll use string replacement
-        html_content = html_content.replace('id="start-timer"', 'id="start-timer" onclick="startTimer()"')
-        html_content = html_content.replace('id="startTimer"', 'id="startTimer" onclick="startTimer()"')
-        html_content = html_content.replace('class="start-timer"', 'class="start-timer" onclick="startTimer()"')
-        
-        # Find any Start Timer button and add onclick handler if missing
-        timer_btn_patterns = [
-            '<button[^>]*>\\s*Start\\s*Timer\\s*</button>',
-            '<button[^>]*>\\s*Start\\s*</button>',
-            '<button[^>]*>\\s*Begin\\s*Countdown\\s*</button>',
-            '<button[^>]*>\\s*Start\\s*Countdown\\s*</button>'
-        ]
-        
-        for pattern in timer_btn_patterns:
-            btn_matches = re.finditer(pattern, html_content, re.IGNORECASE)
-            for match in btn_matches:
-                btn_html = match.group(0)
-                # Check if it already has an onclick
-                if 'onclick' not in btn_html:
-                    fixed_btn = btn_html.replace('<button', '<button onclick="startTimer()"', 1)
-                    html_content = html_content.replace(btn_html, fixed_btn)
+    cache_key = code_fingerprint(code, language)
+    cached = await lookup_response_async("realworld", cache_key)
+    if cached:
+        return cached
     
-    return html_content
-
+    similar = await asyncio.to_thread(lookup_similar_response, "realworld", code, language)
+    if similar:
+        refresh_in_background_async("realworld", cache_key, lambda: generate_real_world_mapping_async(code, language, cache_key))
+        return similar
+    
+    return await generate_real_world_mapping_async(code, language, cache_key)
 
-def fix_grade_calculator_demo(html_content: str) -> str:
+async def generate_real_world_mapping_async(code: str, language: str, cache_key: str) -> Dict[str, str]:
     """
-    Fix common issues with grade calculator demos, particularly the missing calculateAverage function.
+    Get the real-world mapping from the combined call or its own call, falling back on failure.
     
     Args:
-        html_content: The HTML content of the demo
+        code: The user's code
+        language: The programming language
+        cache_key: Fingerprint of the code
         
     Returns:
-        str: Fixed HTML content
+        dict: Dictionary with real-world code mapping including title, description and real_world_code
     """
-    # Check if this is a grade calculator demo
-    if not any(term in html_content.lower() for term in ["grade", "average", "calculator", "calculate average", "grading", "student grade"]):
-        return html_content
-        
-    print("Applying grade calculator demo fixes...")
-    
-    # Check for common grading function references
-    needs_calculate_grades = "calculateGrades" in html_content and "function calculateGrades" not in html_content
-    needs_calculate_average = "calculateAverage" in html_content and "function calculateAverage" not in html_content
+    # One call generates the mapping, demo and complexity analysis for this code
+    if AI_COMBINED_GENERATION:
+        combined = await get_combined_part_async("realworld", code, language)
+        if "error" in combined:
+            return get_real_world_fallback(code, combined["error"], language)
+        if combined.get("result"):
+            return combined["result"]
     
-    # Add required functions
-    functions_to_add = ""
+    # Identical requests arriving together (a whole class on the same starter code) share one call
+    return await ai_single_flight.run(("realworld", cache_key), lambda: fetch_real_world_mapping_async(code, language, cache_key))
+
+async def fetch_real_world_mapping_async(code: str, language: str, cache_key: str) -> Dict[str, str]:
+    """
+    Call the API for a real-world mapping and cache the result, falling back on failure.
     
-    if needs_calculate_grades:
-        functions_to_add += """
-        function calculateGrades() {
-            // Get all student inputs
-            const studentRows = document.querySelectorAll('.student-row, .grade-row, tr');
-            const results = [];
-            
-            // Process each student's score
-            studentRows.forEach(row => {
-                // Look for score input
-                const nameElement = row.querySelector('.student-name') || 
-                                  row.querySelector('[id$="name"]') ||
-                                  row.querySelector('input[placeholder*="name" i]') ||
-                                  row.querySelector('td:first-child') ||
-                                  row.querySelector('div:first-child');
-                
-                const scoreElement = row.querySelector('input[type="number"]') || 
-                                  row.querySelector('.score-input') ||
-                                  row.querySelector('[id$="score"]') ||
-                                  row.querySelector('input[placeholder*="score" i]');
-                
-                const gradeOutputElement = row.querySelector('.grade-result') || 
-                                        row.querySelector('[id$="grade"]') ||
-                                        row.querySelector('.grade') ||
-                                        row.querySelector('td:last-child') ||
-                                        row.querySelector('div:last-child');
-                
-                if (scoreElement && gradeOutputElement) {
-                    // Get student name
-                    let studentName = "Student";
-                    if (nameElement) {
-                        studentName = nameElement.tagName === 'INPUT' ? 
-                                      nameElement.value || nameElement.placeholder || "Student" :
-                                      nameElement.textContent || "Student";
-                    }
-                    
-                    // Get score
-                    const score = parseFloat(scoreElement.value) || 0;
-                    
-                    // Calculate grade based on score
-                    let grade = "F";
-                    if (score >= 90) {
-                        grade = "A";
-                    } else if (score >= 80) {
-                        grade = "B";
-                    } else if (score >= 70) {
-                        grade = "C";
-                    } else if (score >= 60) {
-                        grade = "D";
-                    }
-                    
-                    // Display grade
-                    gradeOutputElement.textContent = grade;
-                    
-                    // Style the grade
-                    if (grade === "A") {
-                        gradeOutputElement.style.color = "#1DB954"; // Green for A
-                    } else if (grade === "B") {
-                        gradeOutputElement.style.color = "#7dcfff"; // Blue for B
-                    } else if (grade === "C") {
-                        gradeOutputElement.style.color = "#e0af68"; // Orange for C
-                    } else if (grade === "D") {
-                        gradeOutputElement.style.color = "#f7768e"; // Pink for D
-                    } else {
-                        gradeOutputElement.style.color = "#ff5555"; // Red for F
-                    }
-                    
-                    // Add to results
-                    results.push({ name: studentName, score: score, grade: grade });
-                }
-            });
-            
-            // Show success message
-            if (window.showSuccessMessage && results.length > 0) {
-                window.showSuccessMessage("Grades calculated successfully!");
-                
-                // 30% chance to show achievement
-                if (Math.random() < 0.3 && window.showAchievement) {
-                    window.showAchievement(
-                        "Grading Mastered!", 
-                        "You've successfully applied a grading system to evaluate performance."
-                    );
-                }
-            }
-            
-            return results;
-        }
-        """
-    
-    if needs_calculate_average:
-        functions_to_add += """
-        function calculateAverage() {
-            // Get all the input values
-            const inputs = document.querySelectorAll('input[type="number"]');
-            let sum = 0;
-            let count = 0;
-            
-            // Sum up all valid input values
-            inputs.forEach(input => {
-                const value = parseFloat(input.value);
-                if (!isNaN(value)) {
-                    sum += value;
-                    count++;
-                }
-            });
-            
-            // Calculate the average
-            const average = count > 0 ? sum / count : 0;
-            
-            // Display the result
-            const resultElement = document.getElementById('average-result') || 
-                                document.querySelector('.result') ||
-                                document.querySelector('[id$="result"]') ||
-                                document.querySelector('[id$="average"]') ||
-                                document.querySelector('[class$="result"]') ||
-                                document.querySelector('[class$="average"]');
-            
-            if (resultElement) {
-                resultElement.textContent = average.toFixed(2);
-                resultElement.style.color = "#1DB954";
-                resultElement.style.fontWeight = "bold";
-            }
-            
-            // Update the progress bar if it exists
-            const progressBar = document.querySelector('.progress-bar');
-            if (progressBar) {
-                const percentage = Math.min(100, (average / 100) * 100);
-                progressBar.style.width = `${percentage}%`;
-            }
-            
-            // Show success message
-            if (window.showSuccessMessage) {
-                window.showSuccessMessage("Average calculated successfully!");
-                
-                // 30% chance to show achievement
-                if (Math.random() < 0.3 && window.showAchievement) {
-                    window.showAchievement(
-                        "Calculation Mastered!", 
-                        "You've successfully calculated an average value!"
-                    );
-                }
-            }
-            
-            return average;
-        }
-        """
-    
-    # Add the functions to the HTML
-    if functions_to_add:
-        if "</script>" in html_content:
-            # Add before the last closing script tag
-            last_script_index = html_content.rfind("</script>")
-            html_content = html_content[:last_script_index] + functions_to_add + html_content[last_script_index:]
-        else:
-            # Add a new script tag
-            html_content += f"<script>{functions_to_add}</script>"
-    
-    # Fix button click handlers for calculateGrades
-    if needs_calculate_grades:
-        html_content = html_content.replace('id="calculate-grades"', 'id="calculate-grades" onclick="calculateGrades()"')
-        html_content = html_content.replace('id="calculateGrades"', 'id="calculateGrades" onclick="calculateGrades()"')
-        html_content = html_content.replace('class="calculate-grades"', 'class="calculate-grades" onclick="calculateGrades()"')
-        
-        # Find any Calculate Grades button and add onclick handler if missing
-        calculate_btn_patterns = [
-            '<button[^>]*>\\s*Calculate\\s*Grades\\s*</button>',
-            '<button[^>]*>\\s*Grade\\s*</button>',
-            '<button[^>]*>\\s*Compute\\s*Grades\\s*</button>',
-            '<button[^>]*>\\s*Assign\\s*Grades\\s*</button>'
-        ]
-        
-        for pattern in calculate_btn_patterns:
-            btn_matches = re.finditer(pattern, html_content, re.IGNORECASE)
-            for match in btn_matches:
-                btn_html = match.group(0)
-                # Check if it already has an onclick
-                if 'onclick' not in btn_html:
-                    fixed_btn = btn_html.replace('<button', '<button onclick="calculateGrades()"', 1)
-                    html_content = html_content.replace(btn_html, fixed_btn)
-    
-    # Fix button click handlers for calculateAverage
-    if needs_calculate_average:
-        html_content = html_content.replace('id="calculate-average"', 'id="calculate-average" onclick="calculateAverage()"')
-        html_content = html_content.replace('id="calculateAverage"', 'id="calculateAverage" onclick="calculateAverage()"')
-        html_content = html_content.replace('class="calculate-average"', 'class="calculate-average" onclick="calculateAverage()"')
-        
-        # Find any Calculate Average button and add onclick handler if missing
-        calculate_btn_patterns = [
-            '<button[^>]*>\\s*Calculate\\s*Average\\s*</button>',
-            '<button[^>]*>\\s*Calculate\\s*</button>',
-            '<button[^>]*>\\s*Compute\\s*Average\\s*</button>'
-        ]
+    Args:
+        code: The user's code
+        language: The programming language
+        cache_key: Fingerprint of the code
         
-        for pattern in calculate_btn_patterns:
-            btn_matches = re.finditer(pattern, html_content, re.IGNORECASE)
-            for match in btn_matches:
-                btn_html = match.group(0)
-                # Check if it already has an onclick
-                if 'onclick' not in btn_html:
-                    fixed_btn = btn_html.replace('<button', '<button onclick="calculateAverage()"', 1)
-                    html_content = html_content.replace(btn_html, fixed_btn)
+    Returns:
+        dict: Dictionary with real-world code mapping including title, description and real_world_code
+    """
+    try:
+        print(f"Using OpenAI API to generate real-world example for code snippet of length {len(code)}")
+        require_openai_api_key_format("real-world example")
+        content = await create_chat_completion_async("realworld", **build_real_world_request(code, language))
+        result = parse_real_world_response(content)
+        await asyncio.to_thread(save_response, "realworld", cache_key, result, code, language)
+        return result
+    except Exception as e:
+        return get_real_world_fallback(code, str(e), language)
+
+
+def fix_common_demo_issues(html_content: str) -> str:
+    """
+    Fix common issues with interactive demos, such as missing JavaScript functions.
     
+    Args:
+        html_content: The HTML content of the demo
+        
+    Returns:
+        str: Fixed HTML content
+    """
+    html_content, injected = postprocess_demo(html_content)
+    if injected:
+        print(f"Injected missing demo functions: {', '.join(injected)}")
     return html_content
 
 
-def get_fallback_example(code: str) -> Dict[str, str]:
+# Canned real-world examples per fallback category (code_features.FALLBACK_CATEGORIES)
+FALLBACK_EXAMPLES = {
+    "class": {
+        "title": "Business Domain Model",
+        "description": "Production applications use domain models to represent business entities.",
+        "real_world_code": "class Product:\n    def __init__(self, id, name, price, category_id):\n        self.id = id\n        self.name = name\n        self.price = price\n        self.category_id = category_id\n        self.is_active = True\n        self.inventory_count = 0\n        \n    def apply_discount(self, percentage):\n        self.price = round(self.price * (1 - percentage/100), 2)\n        return self.price\n        \n    def restock(self, quantity):\n        self.inventory_count += quantity\n        if not self.is_active and self.inventory_count > 0:\n            self.is_active = True"
+    },
+    "conditional": {
+        "title": "Data Validation Pipeline",
+        "description": "Conditional logic is often used for data validation and processing in ETL jobs.",
+        "real_world_code": "def validate_customer_data(customer):\n    validation_errors = []\n    \n    if not customer.get('email'):\n        validation_errors.append('Email is required')\n    elif not is_valid_email(customer['email']):\n        validation_errors.append('Email format is invalid')\n        \n    if not customer.get('name'):\n        validation_errors.append('Name is required')\n    \n    if customer.get('age') is not None:\n        if not isinstance(customer['age'], int):\n            validation_errors.append('Age must be a number')\n        elif customer['age'] < 18:\n            validation_errors.append('Customer must be at least 18 years old')\n    \n    return {\n        'is_valid': len(validation_errors) == 0,\n        'errors': validation_errors\n    }"
+    },
+    "loop": {
+        "title": "Data Processing Pipeline",
+        "description": "Loops are extensively used in data processing workflows for batch operations.",
+        "real_world_code": "def process_transaction_batch(transactions):\n    processed_count = 0\n    failed_count = 0\n    results = []\n    \n    for transaction in transactions:\n        try:\n            # Validate transaction\n            if not is_valid_transaction(transaction):\n                raise ValueError(f\"Invalid transaction format: {transaction['id']}\")\n                \n            # Process based on transaction type\n            if transaction['type'] == 'purchase':\n                result = process_purchase(transaction)\n            elif transaction['type'] == 'refund':\n                result = process_refund(transaction)\n            elif transaction['type'] == 'adjustment':\n                result = process_adjustment(transaction)\n            else:\n                raise ValueError(f\"Unknown transaction type: {transaction['type']}\")\n                \n            # Record success\n            processed_count += 1\n            results.append({\n                'transaction_id': transaction['id'],\n                'status': 'success',\n                'result': result\n            })\n            \n        except Exception as e:\n            # Record failure\n            failed_count += 1\n            logger.error(f\"Failed to process transaction {transaction.get('id')}: {str(e)}\")\n            results.append({\n                'transaction_id': transaction.get('id', 'unknown'),\n                'status': 'error',\n                'error': str(e)\n            })\n    \n    return {\n        'processed_count': processed_count,\n        'failed_count': failed_count,\n        'results': results\n    }"
+    },
+    "general": {
+        "title": "API Endpoint Handler",
+        "description": "Professional applications use structured code organization for API endpoints.",
+        "real_world_code": "def handle_customer_request(request_data):\n    # Input validation\n    validation_result = validate_customer_request(request_data)\n    if not validation_result['is_valid']:\n        return {\n            'status': 'error',\n            'code': 'VALIDATION_ERROR',\n            'message': 'Invalid request data',\n            'details': validation_result['errors']\n        }\n    \n    # Process the request based on operation type\n    operation = request_data.get('operation')\n    customer_id = request_data.get('customer_id')\n    \n    try:\n        if operation == 'get_profile':\n            result = customer_service.get_customer_profile(customer_id)\n        elif operation == 'update_profile':\n            result = customer_service.update_customer_profile(\n                customer_id, request_data.get('profile_data', {})\n            )\n        elif operation == 'get_orders':\n            result = order_service.get_customer_orders(\n                customer_id, \n                limit=request_data.get('limit', 10),\n                offset=request_data.get('offset', 0)\n            )\n        else:\n            return {\n                'status': 'error',\n                'code': 'UNSUPPORTED_OPERATION',\n                'message': f'Operation not supported: {operation}'\n            }\n        \n        return {\n            'status': 'success',\n            'data': result\n        }\n        \n    except CustomerNotFoundError:\n        return {\n            'status': 'error',\n            'code': 'CUSTOMER_NOT_FOUND',\n            'message': f'Customer not found: {customer_id}'\n        }\n    except Exception as e:\n        logger.error(f'Error processing customer request: {str(e)}')\n        return {\n            'status': 'error',\n            'code': 'INTERNAL_ERROR',\n            'message': 'An unexpected error occurred'\n        }"
+    }
+}
+
+def get_fallback_example(code: str, language: str = "python") -> Dict[str, str]:
     """
     Provide fallback code examples when OpenAI API is unavailable
     
     Args:
         code: The user's code
+        language: The programming language
         
     Returns:
         dict: Dictionary with fallback example
     """
-    # Determine the type of code and return appropriate fallback
-    if "class" in code:
-        return {
-            "title": "Business Domain Model",
-            "description": "Production applications use domain models to represent business entities.",
-            "real_world_code": "class Product:\n    def __init__(self, id, name, price, category_id):\n        self.id = id\n        self.name = name\n        self.price = price\n        self.category_id = category_id\n        self.is_active = True\n        self.inventory_count = 0\n        \n    def apply_discount(self, percentage):\n        self.price = round(self.price * (1 - percentage/100), 2)\n        return self.price\n        \n    def restock(self, quantity):\n        self.inventory_count += quantity\n        if not self.is_active and self.inventory_count > 0:\n            self.is_active = True"
-        }
-    elif "if" in code and "else" in code:
-        return {
-            "title": "Data Validation Pipeline",
-            "description": "Conditional logic is often used for data validation and processing in ETL jobs.",
-            "real_world_code": "def validate_customer_data(customer):\n    validation_errors = []\n    \n    if not customer.get('email'):\n        validation_errors.append('Email is required')\n    elif not is_valid_email(customer['email']):\n        validation_errors.append('Email format is invalid')\n        \n    if not customer.get('name'):\n        validation_errors.append('Name is required')\n    \n    if customer.get('age') is not None:\n        if not isinstance(customer['age'], int):\n            validation_errors.append('Age must be a number')\n        elif customer['age'] < 18:\n            validation_errors.append('Customer must be at least 18 years old')\n    \n    return {\n        'is_valid': len(validation_errors) == 0,\n        'errors': validation_errors\n    }"
-        }
-    elif "for" in code or "while" in code:
-        return {
-            "title": "Data Processing Pipeline",
-            "description": "Loops are extensively used in data processing workflows for batch operations.",
-            "real_world_code": "def process_transaction_batch(transactions):\n    processed_count = 0\n    failed_count = 0\n    results = []\n    \n    for transaction in transactions:\n        try:\n            # Validate transaction\n            if not is_valid_transaction(transaction):\n                raise ValueError(f\"Invalid transaction format: {transaction['id']}\")\n                \n            # Process based on transaction type\n            if transaction['type'] == 'purchase':\n                result = process_purchase(transaction)\n            elif transaction['type'] == 'refund':\n                result = process_refund(transaction)\n            elif transaction['type'] == 'adjustment':\n                result = process_adjustment(transaction)\n            else:\n                raise ValueError(f\"Unknown transaction type: {transaction['type']}\")\n                \n            # Record success\n            processed_count += 1\n            results.append({\n                'transaction_id': transaction['id'],\n                'status': 'success',\n                'result': result\n            })\n            \n        except Exception as e:\n            # Record failure\n            failed_count += 1\n            logger.error(f\"Failed to process transaction {transaction.get('id')}: {str(e)}\")\n            results.append({\n                'transaction_id': transaction.get('id', 'unknown'),\n                'status': 'error',\n                'error': str(e)\n            })\n    \n    return {\n        'processed_count': processed_count,\n        'failed_count': failed_count,\n        'results': results\n    }"
-        }
-    else:
+    return dict(FALLBACK_EXAMPLES[fallback_category(code, language)])
+
+def get_interactive_demo_placeholder(code: str) -> Optional[Dict[str, str]]:
+    """Placeholder shown when there is not enough code for a demo, or None if there is."""
+    if not code or len(code.strip()) < 10:
         return {
-            "title": "API Endpoint Handler",
-            "description": "Professional applications use structured code organization for API endpoints.",
-            "real_world_code": "def handle_customer_request(request_data):\n    # Input validation\n    validation_result = validate_customer_request(request_data)\n    if not validation_result['is_valid']:\n        return {\n            'status': 'error',\n            'code': 'VALIDATION_ERROR',\n            'message': 'Invalid request data',\n            'details': validation_result['errors']\n        }\n    \n    # Process the request based on operation type\n    operation = request_data.get('operation')\n    customer_id = request_data.get('customer_id')\n    \n    try:\n        if operation == 'get_profile':\n            result = customer_service.get_customer_profile(customer_id)\n        elif operation == 'update_profile':\n            result = customer_service.update_customer_profile(\n                customer_id, request_data.get('profile_data', {})\n            )\n        elif operation == 'get_orders':\n            result = order_service.get_customer_orders(\n                customer_id, \n                limit=request_data.get('limit', 10),\n                offset=request_data.get('offset', 0)\n            )\n        else:\n            return {\n                'status': 'error',\n                'code': 'UNSUPPORTED_OPERATION',\n                'message': f'Operation not supported: {operation}'\n            }\n        \n        return {\n            'status': 'success',\n            'data': result\n        }\n        \n    except CustomerNotFoundError:\n        return {\n            'status': 'error',\n            'code': 'CUSTOMER_NOT_FOUND',\n            'message': f'Customer not found: {customer_id}'\n        }\n    except Exception as e:\n        logger.error(f'Error processing customer request: {str(e)}')\n        return {\n            'status': 'error',\n            'code': 'INTERNAL_ERROR',\n            'message': 'An unexpected error occurred'\n        }"
+            "demo_html": "<div style='padding:15px; text-align:center;'>Write some code to see an interactive demo based on real-world usage scenarios.</div>"
         }
+    return None
 
-def get_interactive_demo(code: str, language: str = "python") -> Dict[str, str]:
+def get_auth_template_demo(code: str, language: str = "python") -> Optional[Dict[str, str]]:
     """
-    Generate an interactive demo HTML based on the user's code.
-    Use the real-world code examples to create practical, domain-specific demos.
+    Render the local authentication demo template for auth-related code.
     
     Args:
         code: The user's code
-        language: The programming language (default is python)
+        language: The programming language
         
     Returns:
-        dict: Dictionary with contextually relevant interactive elements
+        Optional[dict]: Demo HTML, or None if the code is not auth-related or the template failed
     """
-    import os
-    from openai import OpenAI
-    
-    if not code or len(code.strip()) < 10:
-        return {
-            "demo_html": "<div style='padding:15px; text-align:center;'>Write some code to see an interactive demo based on real-world usage scenarios.</div>"
-        }
+    # Check if code is authentication-related
+    if not is_auth_code(code, language):
+        return None
     
-    # Try using OpenAI API, with fallbacks if it fails
     try:
-        print(f"Using OpenAI API to generate interactive demo for code snippet of length {len(code)}")
-        
-        # Check if API key exists and is properly formatted
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key or len(api_key.strip()) < 30:
-            print("Invalid or missing OpenAI API key for interactive demo")
-            raise ValueError("Invalid OpenAI API key format. Please check your API key.")
-            
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
-        
-        # Check if code is authentication-related
-        is_auth_related = any(word in code.lower() for word in ['login', 'password', 'authenticate', 'credentials', 'signup', 'sign up', 'sign in', 'signin', 'oauth', 'jwt'])
+        # Use the specialized authentication demo template
+        return {"demo_html": auth_demo_template.get_auth_demo_html(code)}
+    except Exception as e:
+        print(f"Error generating authentication demo from template: {e}")
+        # Fall back to OpenAI prompt if template fails
+        return None
+
+def build_interactive_demo_request(code: str, language: str) -> Dict[str, Any]:
+    """
+    Build the chat completion arguments for an interactive demo.
+    
+    Args:
+        code: The user's code
+        language: The programming language
         
-        # Use our specialized auth demo template for authentication-related code
-        if is_auth_related:
-            try:
-                # Import auth_demo_template module
-                import auth_demo_template
-                
-                # Use the specialized authentication demo template
-                auth_html = auth_demo_template.get_auth_demo_html(code)
-                return {"demo_html": auth_html}
-            except Exception as e:
-                print(f"Error generating authentication demo from template: {e}")
-                # Fall back to OpenAI prompt if template fails
-            
-            # Default OpenAI prompt for auth demos if template fails
-            prompt = f"""
+    Returns:
+        dict: Arguments for create_chat_completion_async
+    """
+    if is_auth_code(code, language):
+        # Default OpenAI prompt for auth demos if template fails
+        prompt = render_prompt("""
             Create an interactive HTML demo of a modern authentication interface based on the following user code.
             
             USER CODE:
@@ -1699,424 +1506,267 @@ def get_interactive_demo(code: str, language: str = "python") -> Dict[str, str]:
             Do not require external libraries or dependencies.
             
             Output only the HTML code as a string that can be directly inserted into a webpage.
-            """
-        else:
-            # Use the language parameter from the function arguments
-            code_language = language.capitalize()
+            """, code=fit_code(code, language))
+    else:
+        prompt = render_prompt("""
+            You are a helpful coding tutor. I will give you a {code_language} code snippet.
             
-            prompt = f"""
-            You are a helpful coding tutor AI. I will provide you with a code snippet in {code_language}. First, **describe a real-world use case or scenario** where this code's logic might be applied in practice (e.g., as part of a login form, calculator, game, etc.). Keep the explanation simple and clear for beginners. 
-
-            Then, **write a complete interactive demo** in HTML, CSS, and JavaScript that implements the same logic. The demo should have input fields (such as text boxes or buttons) and show the output on the page. The JavaScript must mirror the original code's behavior but use only safe client-side operations (no `eval`, no server calls). 
-
-            **Output format:** Two sections. First, a short paragraph under **"Real-World Example:"** describing the scenario. Second, under **"Interactive Demo:"** provide a single code block with the full HTML/CSS/JS code for the demo.
+            First, describe in a short paragraph a real-world scenario where this logic is used (a login form,
+            calculator, game, ...), simply enough for beginners. Then write a complete, self-contained interactive
+            demo in HTML, CSS and JavaScript that implements the same logic in that scenario.
+            
+            Output format: two sections. Under "Real-World Example:" the paragraph; under "Interactive Demo:" a single
+            code block with the full HTML/CSS/JS.
             
             USER CODE:
             ```python
             {code}
             ```
             
-            **CRITICAL REQUIREMENTS: [READ CAREFULLY]**
-            - THE DEMO MUST BE 100% FUNCTIONAL with ALL CODE INCLUDED - NO EXCEPTIONS
-            - DO NOT REFERENCE ANY EXTERNAL FUNCTIONS WITHOUT IMPLEMENTING THEM
-            - Every button click handler must be defined inline or in a <script> section
-            - Check ALL function references - NEVER reference functions that aren't defined
-            - VERIFY all JavaScript variables are properly declared and initialized
-            - If you include a startTimer(), calculateAverage(), or any other function, YOU MUST IMPLEMENT IT FULLY
-            - All referenced variables must be properly defined with appropriate scope
-            - ALL USER INTERACTIONS must work out-of-box with no console errors
-            
-            **PYTHON SIMULATION REQUIREMENT:**
-            - **CRITICALLY IMPORTANT: Create JavaScript functions that accurately simulate the Python code's behavior**
-            - If the Python code has loops, create JavaScript functions that implement the same looping logic
-            - If Python has conditionals, implement the same conditional logic in JavaScript 
-            - Translate Python calculations directly to JavaScript equivalents
-            - Simulate Python function behavior exactly in corresponding JavaScript functions
-            - Use JavaScript arrays to simulate Python lists, JavaScript objects for Python dictionaries
-            - EVERY feature from the Python code should have a working JavaScript equivalent
-            
-            **MANDATORY DESIGN REQUIREMENTS:** 
-            The demo MUST strictly follow this design system:
-            - Tokyo-night-dark theme with #1a1b26 as the main background color
-            - Content areas and panels should use #24283b background color
-            - Text should be light colored (#c0caf5 for regular text, #ffffff for headings)
-            - Vibrant neon green (#1DB954) for buttons, highlights, and interactive elements
-            - Input fields should have dark backgrounds (#1f2335) with light text
-            - All user interface elements must have rounded corners (8px radius)
-            - Use glass-morphism effects with subtle backdrop filters
-            - Add subtle shadows to create depth (rgba(0,0,0,0.4) with 8px blur)
-            - Include hover effects on interactive elements
-            - Include at least one visual representation of the code's output (chart, progress bar, counter, animated visualization, etc.)
-            
-            **FUNCTIONAL REQUIREMENTS:** 
-            The demo MUST be FULLY FUNCTIONAL and HIGHLY INTERACTIVE:
-            1. Create a WORKING demonstration, not just visual mockups
-            2. All code functionality must be completely implemented in JavaScript - include ALL required functions
-            3. Demo MUST show actual computation/processing based on user inputs
-            4. Include DEFAULT VALUES for all inputs so users can immediately see results
-            5. All buttons must have WORKING event handlers that trigger actual operations
-            6. CLEARLY DISPLAY OUTPUTS with visual highlighting when values change
-            7. Include REAL-TIME UPDATES - changes should be immediately visible
-            8. Implement at least 1-2 DYNAMIC VISUALIZATIONS that update as values change (charts, animations, etc.)
-            9. Add helpful TOOLTIPS or instructions that explain how the demo works
-            10. Include VALIDATION for inputs where appropriate with clear error states
-            11. Use TRANSITIONS and ANIMATIONS to create a polished experience
-            12. IMPLEMENT ALL REQUIRED JAVASCRIPT FUNCTIONS - for example if you refer to a function like startTimer(), you MUST include its implementation
-            13. INCLUDE ALL NEEDED VARIABLES - define all variables that are referenced in your code
-            14. TEST YOUR IMPLEMENTATION - make sure the demo will work when buttons are clicked
-            15. ADD USER INSTRUCTIONS - provide clear instructions on how to use the demo at the top
-            16. AUTO-RUN ON LOAD - The demo should automatically show results when the page loads without requiring user interaction
-            17. SHOW INITIAL OUTPUT - Always display initial output values so users see results immediately
-            18. USE WINDOW.ONLOAD - Run initial calculations and visualizations when page loads using window.onload
-            19. AVOID EMPTY STATES - Never show empty result areas; always populate with initial values
-            20. PREVENT UNDEFINED REFERENCES - Test all JS functions and variables thoroughly
-            21. SHOW SUCCESS MESSAGES - Display clear success messages when users complete actions (e.g., "Task successfully added!", "Calculation complete!")
-            22. ADD SUCCESS NOTIFICATIONS - Include a notification system that shows green success messages that appear and fade out after actions
-            23. INCLUDE ACHIEVEMENT FEEDBACK - Give users positive feedback when they successfully demonstrate understanding of the concept
-            24. IMPLEMENT SUCCESS STATE - Every demo must include a success/completion state that congratulates the user
-            
-            **TIMER OR COUNTDOWN DEMOS - IMPORTANT:**
-            If the code involves timers, schedules, or countdowns:
-            1. INCLUDE A COMPLETE startTimer() FUNCTION that properly handles all timer functionality
-            2. Include startTimer(), pauseTimer(), resetTimer() functions that are fully implemented
-            3. Implement timer display updating that shows minutes:seconds format
-            4. Add progress bars or visual indicators that update as timer progresses
-            5. Include callback functions for timer completion events
-            
-            **CALCULATOR DEMOS - IMPORTANT:**
-            If creating a calculator or computation demo:
-            1. INCLUDE A COMPLETE calculateAverage(), calculate(), or equivalent function
-            2. Implement all computation logic needed for the calculations
-            3. Add validation checks for input ranges and types
-            4. Include visual feedback when calculations are performed
-            5. Show detailed computation results with appropriate formatting
-            
-            **IMPLEMENTATION EXAMPLES:**
-            - For math functions: interactive calculator with results visualization
-            - For loops/lists: interactive data manipulation with visual representation of the list
-            - For string operations: live text processing with before/after views
-            - For conditionals: interactive decision tree or flowchart that highlights execution path
-            - For user data: forms with validation and visual feedback
-            
-            The HTML should be self-contained with all CSS and JavaScript included.
-            I REPEAT: This demo MUST ACTUALLY WORK and demonstrate real functionality with no reference errors.
-            DOUBLE-CHECK all function and variable references for completeness before submission.
-            """
-        
-        # Make the API call with OpenAI
-        # using the ChatCompletion API with gpt-4o model which was released May 13, 2024
-        # do not change this unless explicitly requested by the user
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.7,
-            max_tokens=1500
-        )
-        
-        # Get the content
-        content = response.choices[0].message.content.strip()
-        
-        # Extract the real-world example and interactive demo
-        real_world_example = ""
-        demo_html = ""
-        
-        # Find the real-world example section
-        if "Real-World Example:" in content:
-            example_start = content.find("Real-World Example:") + len("Real-World Example:")
-            example_end = content.find("Interactive Demo:", example_start)
-            if example_end > example_start:
-                real_world_example = content[example_start:example_end].strip()
-        
-        # Find the interactive demo section
-        if "Interactive Demo:" in content:
-            demo_start = content.find("Interactive Demo:") + len("Interactive Demo:")
-            demo_html = content[demo_start:].strip()
-            
-            # If the demo HTML is wrapped in code blocks, remove them
-            if demo_html.startswith("```html"):
-                demo_html = demo_html.replace("```html", "", 1)
-                if demo_html.endswith("```"):
-                    demo_html = demo_html[:-3].strip()
-            elif demo_html.startswith("```"):
-                demo_html = demo_html.replace("```", "", 1)
-                if demo_html.endswith("```"):
-                    demo_html = demo_html[:-3].strip()
-        
-        # If we couldn't parse the sections properly, try to extract just the HTML
-        if not demo_html:
-            if "<html" in content:
-                start_idx = content.find("<html")
-                demo_html = content[start_idx:]
-            elif "<!DOCTYPE" in content:
-                start_idx = content.find("<!DOCTYPE")
-                demo_html = content[start_idx:]
-            elif "<div" in content:
-                start_idx = content.find("<div")
-                demo_html = content[start_idx:]
-        
-        # Add the real-world example as a header to the HTML if we found one
-        if real_world_example and demo_html:
-            real_world_div = f'''
-            <div style="margin-bottom: 20px; padding: 15px; background-color: #24283b; border-left: 4px solid #1DB954; border-radius: 8px; box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);">
-                <h3 style="margin-top: 0; color: #1DB954; font-weight: 600; margin-bottom: 10px; font-family: 'Segoe UI', Arial, sans-serif;">Real-World Application</h3>
-                <p style="margin: 0; line-height: 1.6; color: #c0caf5; font-family: 'Segoe UI', Arial, sans-serif;">{real_world_example}</p>
-            </div>
-            '''
-            
-            # Insert the real-world example div at the beginning of the body
-            if "<body" in demo_html:
-                body_start = demo_html.find("<body") + demo_html[demo_html.find("<body"):].find(">") + 1
-                demo_html = demo_html[:body_start] + real_world_div + demo_html[body_start:]
-            else:
-                # Just prepend it if we can't find the body tag
-                demo_html = real_world_div + demo_html
-            
-        # Apply common fixes to the demo
-        demo_html = fix_common_demo_issues(demo_html)
-        
-        print(f"Successfully generated interactive demo HTML of length {len(demo_html)}")
+            Correctness (the demo is run as-is):
+            - Define every function and variable you reference, including event handlers (e.g. startTimer(),
+              calculateAverage()); the page must run with no console errors.
+            - Mirror the code's behavior in JavaScript: the same loops, conditions and calculations; arrays for
+              lists, objects for dictionaries.
+            - Use only safe client-side code: no eval, no server calls, no external libraries.
+            
+            Design:
+            - Tokyo Night dark theme: page #1a1b26, panels #24283b, text #c0caf5, headings #ffffff, inputs #1f2335
+              with light text.
+            - Neon green #1DB954 for buttons and highlights; 8px rounded corners; subtle shadows
+              (rgba(0,0,0,0.4), 8px blur), glass-morphism and hover effects.
+            - At least one visual representation of the output (chart, progress bar, counter or animation) that
+              updates when values change.
+            
+            Behavior:
+            - Short usage instructions at the top and default values for every input.
+            - Run on load (window.onload) so results show immediately; never leave a result area empty.
+            - Working handlers on every button, input validation with clear errors, highlighted output changes and
+              smooth transitions.
+            - A success state: a green notification that fades out after each action, and a congratulation when
+              the user completes the demo.
+            - Timers: implement startTimer(), pauseTimer() and resetTimer() fully, with an mm:ss display, a progress
+              bar and a completion callback.
+            - Calculators: implement calculate() (or calculateAverage()) fully, with range and type checks and
+              formatted results.
+            
+            Ideas: math as a calculator with a chart; loops and lists as list manipulation with a visual list;
+            strings as live before/after text; conditionals as a flowchart highlighting the path taken; user data
+            as validated forms.
+            """, code_language=language.capitalize(), code=fit_code(code, language))
+
+    return {
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": 0.7,
+        "max_tokens": 1500
+    }
+
+def parse_interactive_demo_response(content: str) -> Dict[str, str]:
+    """
+    Extract the demo HTML (and real-world blurb) from a completion and apply common fixes.
+    
+    Args:
+        content: Raw completion content
         
-        return {"demo_html": demo_html}
+    Returns:
+        dict: Dictionary with demo_html
+    """
+    # Get the content
+    content = content.strip()
+    
+    # Extract the real-world example and interactive demo
+    real_world_example = ""
+    demo_html = ""
+    
+    # Find the real-world example section
+    if "Real-World Example:" in content:
+        example_start = content.find("Real-World Example:") + len("Real-World Example:")
+        example_end = content.find("Interactive Demo:", example_start)
+        if example_end > example_start:
+            real_world_example = content[example_start:example_end].strip()
+    
+    # Find the interactive demo section
+    if "Interactive Demo:" in content:
+        demo_start = content.find("Interactive Demo:") + len("Interactive Demo:")
+        demo_html = content[demo_start:].strip()
+        
+        # If the demo HTML is wrapped in code blocks, remove them
+        if demo_html.startswith("```html"):
+            demo_html = demo_html.replace("```html", "", 1)
+            if demo_html.endswith("```"):
+                demo_html = demo_html[:-3].strip()
+        elif demo_html.startswith("```"):
+            demo_html = demo_html.replace("```", "", 1)
+            if demo_html.endswith("```"):
+                demo_html = demo_html[:-3].strip()
+    
+    # If we couldn't parse the sections properly, try to extract just the HTML
+    if not demo_html:
+        if "<html" in content:
+            start_idx = content.find("<html")
+            demo_html = content[start_idx:]
+        elif "<!DOCTYPE" in content:
+            start_idx = content.find("<!DOCTYPE")
+            demo_html = content[start_idx:]
+        elif "<div" in content:
+            start_idx = content.find("<div")
+            demo_html = content[start_idx:]
+    
+    # Add the real-world example as a header to the HTML if we found one
+    if real_world_example and demo_html:
+        real_world_div = f'''
+        <div style="margin-bottom: 20px; padding: 15px; background-color: #24283b; border-left: 4px solid #1DB954; border-radius: 8px; box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);">
+            <h3 style="margin-top: 0; color: #1DB954; font-weight: 600; margin-bottom: 10px; font-family: 'Segoe UI', Arial, sans-serif;">Real-World Application</h3>
+            <p style="margin: 0; line-height: 1.6; color: #c0caf5; font-family: 'Segoe UI', Arial, sans-serif;">{real_world_example}</p>
+        </div>
+        '''
+        
+        # Insert the real-world example div at the beginning of the body
+        if "<body" in demo_html:
+            body_start = demo_html.find("<body") + demo_html[demo_html.find("<body"):].find(">") + 1
+            demo_html = demo_html[:body_start] + real_world_div + demo_html[body_start:]
+        else:
+            # Just prepend it if we can't find the body tag
+            demo_html = real_world_div + demo_html
         
-    except Exception as e:
-        error_message = str(e)
-        print(f"Error using OpenAI API for interactive demo: {error_message}")
+    # Apply common fixes to the demo
+    demo_html = fix_common_demo_issues(demo_html)
+    
+    print(f"Successfully generated interactive demo HTML of length {len(demo_html)}")
+    
+    return {"demo_html": demo_html}
+
+# Canned demo template per fallback category (code_features.FALLBACK_CATEGORIES)
+FALLBACK_DEMOS = {
+    "class": "fallback/class.html",
+    "conditional": "fallback/conditional.html",
+    "loop": "fallback/loop.html",
+    "general": "fallback/general.html",
+}
+
+def get_fallback_demo(code: str, language: str = "python") -> Dict[str, str]:
+    """
+    Pick the canned demo for the user's code.
+    
+    Args:
+        code: The user's code
+        language: The programming language
         
-        # Check for specific error conditions
-        if "insufficient_quota" in error_message or "exceeded your current quota" in error_message:
-            print("API quota exceeded. Please update your OpenAI API key or subscription.")
-            return {
-                "demo_html": f"""<div style="font-family: 'Segoe UI', Arial, sans-serif; padding: 20px; background-color: #1a1b26; color: #c0caf5; border-radius: 10px; box-shadow: 0 4px 20px rgba(0, 0, 0, 0.5); max-width: 500px; margin: 0 auto; text-align: center;">
-                    <svg width="60" height="60" viewBox="0 0 24 24" style="margin: 0 auto 15px auto; display: block; color: #ff9e64;">
-                        <path fill="currentColor" d="M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm0 18c-4.41 0-8-3.59-8-8s3.59-8 8-8 8 3.59 8 8-3.59 8-8 8zm-1-13h2v6h-2zm0 8h2v2h-2z"></path>
-                    </svg>
-                    <h2 style="margin-bottom: 15px; color: #ffffff;">API Quota Exceeded</h2>
-                    <p style="margin-bottom: 20px; line-height: 1.5;">
-                        We're currently using a fallback demo because the OpenAI API quota has been exceeded. 
-                        For AI-generated personalized interactive demos, please update your OpenAI API key.
-                    </p>
-                    <div style="background-color: #24283b; padding: 15px; border-radius: 8px; margin-bottom: 20px; border: 1px solid #414868; text-align: left;">
-                        <p style="margin-bottom: 10px; color: #a9b1d6; font-size: 14px;">
-                            A new API key with available quota will enable:
-                        </p>
-                        <ul style="color: #a9b1d6; font-size: 14px; padding-left: 20px; margin-bottom: 0;">
-                            <li style="margin-bottom: 5px;">Custom interactive demos based on your code</li>
-                            <li style="margin-bottom: 5px;">Real-world example generation</li>
-                            <li style="margin-bottom: 5px;">AI-powered coding assistance</li>
-                        </ul>
-                    </div>
-                    <div style="padding-top: 10px;">
-                        <button onclick="location.reload()" style="padding: 12px 20px; border: none; border-radius: 10px; background-color: #1DB954; color: black; font-weight: 600; cursor: pointer; transition: all 0.3s ease; font-size: 14px;">
-                            Try Again
-                        </button>
-                    </div>
-                </div>"""
-            }
+    Returns:
+        dict: Dictionary with the demo_html
+    """
+    return {"demo_html": render_template(FALLBACK_DEMOS[fallback_category(code, language)])}
+
+def get_interactive_demo_fallback(code: str, error_message: str, language: str = "python") -> Dict[str, str]:
+    """
+    Fallback demo used when the OpenAI call fails.
+    
+    Args:
+        code: The user's code
+        error_message: The error raised by the OpenAI call
+        language: The programming language
         
-        print("Falling back to pattern-based demos")
+    Returns:
+        dict: Dictionary with pattern-based demo_html
+    """
+    print(f"Error using OpenAI API for interactive demo: {error_message}")
+    
+    # Check for specific error conditions
+    if "insufficient_quota" in error_message or "exceeded your current quota" in error_message:
+        print("API quota exceeded. Please update your OpenAI API key or subscription.")
+        return {"demo_html": render_template("quota_exceeded.html")}
+    
+    print("Falling back to pattern-based demos")
     # Check for authentication-related code
-    if "login" in code.lower() or "password" in code.lower() or "authenticate" in code.lower() or "credentials" in code.lower():
+    if is_auth_code(code, language):
         try:
             # Try to use our custom auth demo template
-            # Import the auth_demo_template module
-            spec = importlib.util.spec_from_file_location("auth_demo_template", "auth_demo_template.py")
-            auth_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(auth_module)
-            
-            # Use the get_auth_demo_html function from the imported module
-            demo_html = auth_module.get_auth_demo_html(code)
+            demo_html = auth_demo_template.get_auth_demo_html(code)
             print("Using enhanced authentication demo template")
             return {"demo_html": demo_html}
         except Exception as e:
             print(f"Error using auth demo template: {e}, falling back to basic template")
-            # Extract usernames and passwords from the code if they exist
-            username_pattern = re.compile(r'username\s*=\s*[\'"]([^\'"]+)[\'"]|user\s*=\s*[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
-            password_pattern = re.compile(r'password\s*=\s*[\'"]([^\'"]+)[\'"]|pwd\s*=\s*[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
-            
-            # Find any usernames/passwords in the code
-            username_match = username_pattern.search(code)
-            password_match = password_pattern.search(code)
-            
-            # Default credentials
-            username = "admin"
-            password = "password123"
-            
-            # Use credentials from code if found
-            if username_match:
-                extracted_username = username_match.group(1) or username_match.group(2)
-                if extracted_username:
-                    username = extracted_username
-                    
-            if password_match:
-                extracted_password = password_match.group(1) or password_match.group(2)
-                if extracted_password:
-                    password = extracted_password
-            
-            return {
-                "demo_html": f"""<div style="font-family: 'Segoe UI', Arial, sans-serif; padding: 20px; background-color: #1a1b26; color: #c0caf5; border-radius: 10px; box-shadow: 0 4px 20px rgba(0, 0, 0, 0.5); max-width: 500px; margin: 0 auto;">
-                    <h2 style="text-align: center; margin-bottom: 20px; color: #ffffff;">Authentication Demo</h2>
-                    
-                    <div style="background-color: #24283b; padding: 20px; border-radius: 8px; margin-bottom: 20px; border: 1px solid #414868;">
-                        <div style="margin-bottom: 15px;">
-                            <label for="username" style="display: block; margin-bottom: 8px; font-weight: 500; color: #a9b1d6;">Username</label>
-                            <input type="text" id="username" value="" placeholder="Enter username" style="width: 100%; padding: 14px; border: 1px solid #414868; border-radius: 10px; background-color: #1f2335; color: #c0caf5; outline: none; transition: all 0.3s;">
-                        </div>
-                        
-                        <div style="margin-bottom: 20px;">
-                            <label for="password" style="display: block; margin-bottom: 8px; font-weight: 500; color: #a9b1d6;">Password</label>
-                            <div style="position: relative;">
-                                <input type="password" id="password" value="" placeholder="Enter password" style="width: 100%; padding: 14px; border: 1px solid #414868; border-radius: 10px; background-color: #1f2335; color: #c0caf5; outline: none; transition: all 0.3s;">
-                                <button onclick="togglePassword()" style="position: absolute; right: 12px; top: 50%; transform: translateY(-50%); background: none; border: none; color: #a9b1d6; cursor: pointer;">
-                                    <svg id="eye-icon" width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"><path d="M1 12s4-8 11-8 11 8 11 8-4 8-11 8-11-8-11-8z"></path><circle cx="12" cy="12" r="3"></circle></svg>
-                                </button>
-                            </div>
-                        </div>
-                        
-                        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px; font-size: 14px;">
-                            <div style="display: flex; align-items: center;">
-                                <input type="checkbox" id="remember-me" style="margin-right: 8px; accent-color: #1DB954;">
-                                <label for="remember-me" style="color: #a9b1d6;">Remember me</label>
-                            </div>
-                            <a href="#" style="color: #1DB954; text-decoration: none;">Forgot password?</a>
-                        </div>
-                        
-                        <button onclick="attemptLogin()" id="login-btn" style="width: 100%; padding: 14px; border: none; border-radius: 10px; background-color: #1DB954; color: black; font-weight: 600; cursor: pointer; transition: all 0.3s ease; font-size: 16px;">
-                            Log In
-                        </button>
-                    </div>
-                    
-                    <div id="auth-result" style="background-color: #24283b; padding: 15px; border-radius: 10px; margin-bottom: 20px; border: 1px solid #414868; min-height: 80px; display: none; text-align: center;">
-                        <!-- Authentication result will appear here -->
-                    </div>
-                    
-                    <div style="text-align: center; margin-top: 15px; font-size: 14px; color: #a9b1d6;">
-                        Don't have an account? <a href="#" style="color: #1DB954; text-decoration: none; font-weight: 500;">Sign up</a>
-                    </div>
-                    
-                    <script>
-                        // Toggle password visibility
-                        function togglePassword() {{
-                            const passwordInput = document.getElementById('password');
-                            const eyeIcon = document.getElementById('eye-icon');
-                            
-                            if (passwordInput.type === 'password') {{
-                                passwordInput.type = 'text';
-                                eyeIcon.innerHTML = '<path d="M17.94 17.94A10.07 10.07 0 0112 20c-7 0-11-8-11-8a18.45 18.45 0 015.06-5.94M9.9 4.24A9.12 9.12 0 0112 4c7 0 11 8 11 8a18.5 18.5 0 01-2.16 3.19m-6.72-1.07a3 3 0 11-4.24-4.24"></path><line x1="1" y1="1" x2="23" y2="23"></line>';
-                            }} else {{
-                                passwordInput.type = 'password';
-                                eyeIcon.innerHTML = '<path d="M1 12s4-8 11-8 11 8 11 8-4 8-11 8-11-8-11-8z"></path><circle cx="12" cy="12" r="3"></circle>';
-                            }}
-                        }}
-                        
-                        // Login function
-                        function attemptLogin() {{
-                            const username = document.getElementById('username').value;
-                            const password = document.getElementById('password').value;
-                            const authResult = document.getElementById('auth-result');
-                            const loginBtn = document.getElementById('login-btn');
-                            
-                            // Show loading state
-                            loginBtn.innerHTML = '<span class="spinner"></span>Logging in...';
-                            loginBtn.disabled = true;
-                            
-                            // Reset auth result
-                            authResult.style.display = 'none';
-                            
-                            // Simulate authentication process
-                            setTimeout(function() {{
-                                // Reset button
-                                loginBtn.innerHTML = 'Log In';
-                                loginBtn.disabled = false;
-                                
-                                // Validate credentials
-                                if (username === '{username}' && password === '{password}') {{
-                                    // Success
-                                    authResult.className = 'auth-result success';
-                                    authResult.style.backgroundColor = 'rgba(158, 206, 106, 0.1)';
-                                    authResult.style.border = '1px solid #9ece6a';
-                                    authResult.style.color = '#9ece6a';
-                                    authResult.innerHTML = `
-                                        <div style="font-size: 24px; margin-bottom: 10px;">✓</div>
-                                        <div style="font-weight: 600; margin-bottom: 5px;">Authentication Successful!</div>
-                                        <div>Welcome back, ${{username}}</div>
-                                        <div style="font-size: 12px; opacity: 0.7; margin-top: 8px;">Session started at ${{new Date().toLocaleTimeString()}}</div>
-                                    `;
-                                }} else {{
-                                    // Failure
-                                    authResult.className = 'auth-result error';
-                                    authResult.style.backgroundColor = 'rgba(247, 118, 142, 0.1)';
-                                    authResult.style.border = '1px solid #f7768e';
-                                    authResult.style.color = '#f7768e';
-                                    authResult.innerHTML = `
-                                        <div style="font-size: 24px; margin-bottom: 10px;">✕</div>
-                                        <div style="font-weight: 600; margin-bottom: 5px;">Authentication Failed!</div>
-                                        <div>Invalid username or password</div>
-                                        <div style="font-size: 12px; opacity: 0.8; margin-top: 8px;">Hint: Use {username}/{password}</div>
-                                    `;
-                                }}
-                                
-                                authResult.style.display = 'block';
-                            }}, 1500);
-                        }}
-                    
-                    // Add animation styles
-                    const styleEl = document.createElement('style');
-                    styleEl.textContent = `
-                        @keyframes spin {{
-                            to {{ transform: rotate(360deg); }}
-                        }}
-                        #username:focus, #password:focus {{
-                            border-color: #1DB954;
-                            box-shadow: 0 0 0 2px rgba(29, 185, 84, 0.25);
-                        }}
-                        #login-btn:hover {{
-                            background-color: #24D863;
-                            transform: translateY(-2px);
-                            box-shadow: 0 4px 8px rgba(29, 185, 84, 0.3);
-                        }}
-                    `;
-                    document.head.appendChild(styleEl);
-                </script>
-            </div>"""
-        }
-    elif "class" in code:
-        return {
-            "demo_html": "<div style=\"padding:20px; border:1px solid #ddd; border-radius:8px\">\n                <h4>Object Creator</h4>\n                <div>\n                    <div style=\"margin-bottom:10px;\">\n                        <label>Object Name:</label>\n                        <input type=\"text\" id=\"obj-name\" value=\"MyObject\" style=\"margin-left:10px;\" />\n                    </div>\n                    <div style=\"margin-bottom:10px;\">\n                        <label>Property Name:</label>\n                        <input type=\"text\" id=\"obj-prop\" value=\"value\" style=\"margin-left:10px;\" />\n                    </div>\n                    <div style=\"margin-bottom:10px;\">\n                        <label>Property Value:</label>\n                        <input type=\"text\" id=\"obj-val\" value=\"true\" style=\"margin-left:10px;\" />\n                    </div>\n                    <button onclick=\"createSimpleObject()\" style=\"padding:8px 16px; background:#1DB954; color:black; border:none; border-radius:4px;\">Create Object</button>\n                </div>\n                <div id=\"obj-result\" style=\"margin-top:15px; padding:10px; background:#f5f5f5; border-radius:4px; font-family:monospace;\">\n                    Object will appear here\n                </div>\n                <script>\n                    function createSimpleObject() {\n                        const name = document.getElementById('obj-name').value || 'MyObject';\n                        const prop = document.getElementById('obj-prop').value || 'value';\n                        const val = document.getElementById('obj-val').value || 'true';\n                        const resultEl = document.getElementById('obj-result');\n                        \n                        resultEl.innerHTML = `const ${name} = {<br>    ${prop}: ${val},<br>    created: \"${new Date().toISOString()}\",<br>    toString() { return \"${name} object\"; }<br>}`;\n                    }\n                </script>\n            </div>"
-        }
-    elif "if" in code and "else" in code:
-        return {
-            "demo_html": "<div style=\"padding:20px; border:1px solid #ddd; border-radius:8px\">\n                <h4>Conditional Flow Simulator</h4>\n                <div>\n                    <label>Input value:</label>\n                    <input type=\"text\" id=\"simple-input\" placeholder=\"Enter a value\" style=\"margin-left:10px;\" />\n                    <button onclick=\"runSimpleCondition()\" style=\"margin-left:10px; padding:5px 10px; background:#4a6bdf; color:white; border:none; border-radius:4px;\">Test</button>\n                </div>\n                <div id=\"simple-result\" style=\"margin-top:15px; padding:10px; background:#f5f5f5; border-radius:4px;\">\n                    Enter a value and click Test\n                </div>\n                <script>\n                    function runSimpleCondition() {\n                        const input = document.getElementById('simple-input').value;\n                        const resultEl = document.getElementById('simple-result');\n                        \n                        if (!input) {\n                            resultEl.innerHTML = '<span style=\"color:red;\">Please enter a value!</span>';\n                        } else if (isNaN(input)) {\n                            resultEl.innerHTML = `<span style=\"color:blue;\">${input} is text - entered branch 1</span>`;\n                        } else if (Number(input) > 10) {\n                            resultEl.innerHTML = `<span style=\"color:green;\">${input} is greater than 10 - entered branch 2</span>`;\n                        } else {\n                            resultEl.innerHTML = `<span style=\"color:orange;\">${input} is a number <= 10 - entered branch 3</span>`;\n                        }\n                    }\n                </script>\n            </div>"
-        }
-    elif "for" in code or "while" in code:
-        return {
-            "demo_html": "<div style=\"padding:20px; border:1px solid #ddd; border-radius:8px\">\n                <h4>Loop Visualizer</h4>\n                <div>\n                    <div style=\"margin-bottom:10px;\">\n                        <label>Number of iterations:</label>\n                        <input type=\"number\" id=\"loop-count\" min=\"1\" max=\"20\" value=\"5\" style=\"margin-left:10px; width:60px;\" />\n                    </div>\n                    <div style=\"margin-bottom:10px;\">\n                        <label>Loop type:</label>\n                        <select id=\"loop-type\" style=\"margin-left:10px;\">\n                            <option value=\"for\">For Loop</option>\n                            <option value=\"while\">While Loop</option>\n                        </select>\n                    </div>\n                    <button onclick=\"visualizeLoop()\" style=\"padding:5px 10px; background:#4a6bdf; color:white; border:none; border-radius:4px;\">Run Loop</button>\n                </div>\n                <div id=\"loop-visualization\" style=\"margin-top:15px; padding:10px; background:#f5f5f5; border-radius:4px;\">\n                    Configure and run the loop\n                </div>\n                <script>\n                    function visualizeLoop() {\n                        const count = parseInt(document.getElementById('loop-count').value) || 5;\n                        const type = document.getElementById('loop-type').value;\n                        const visualEl = document.getElementById('loop-visualization');\n                        \n                        visualEl.innerHTML = `<div style=\"font-family:monospace; margin-bottom:10px;\">${type === 'for' ? \n                            `for (let i = 0; i < ${count}; i++) {<br>    // Loop body<br>}` : \n                            `let i = 0;<br>while (i < ${count}) {<br>    // Loop body<br>    i++;<br>}`\n                        }</div><div>Execution:</div>`;\n                        \n                        // Simulate loop execution with delays\n                        let i = 0;\n                        const interval = setInterval(() => {\n                            visualEl.innerHTML += `<div>Iteration ${i}: Processing item ${i}</div>`;\n                            i++;\n                            if (i >= count) {\n                                clearInterval(interval);\n                                visualEl.innerHTML += `<div style=\"margin-top:10px;\">Loop completed after ${count} iterations</div>`;\n                            }\n                        }, 500);\n                    }\n                </script>\n            </div>"
-        }
-    else:
-        return {
-            "demo_html": "<div style=\"padding:20px; border:1px solid #ddd; border-radius:8px\">\n                <h4>Code Execution Simulator</h4>\n                <div style=\"margin-bottom:15px;\">\n                    <p>This interactive demo simulates the execution of your code.</p>\n                </div>\n                <div style=\"display:flex; margin-bottom:15px;\">\n                    <div style=\"flex:1; margin-right:10px;\">\n                        <label>Input 1:</label>\n                        <input type=\"text\" id=\"input1\" value=\"Test\" style=\"display:block; margin-top:5px; width:100%;\" />\n                    </div>\n                    <div style=\"flex:1;\">\n                        <label>Input 2:</label>\n                        <input type=\"number\" id=\"input2\" value=\"42\" style=\"display:block; margin-top:5px; width:100%;\" />\n                    </div>\n                </div>\n                <button onclick=\"processInputs()\" style=\"padding:8px 16px; background:#4a6bdf; color:white; border:none; border-radius:4px;\">Process</button>\n                <div id=\"generic-result\" style=\"margin-top:15px; padding:10px; background:#f5f5f5; border-radius:4px;\">\n                    Results will appear here\n                </div>\n                <script>\n                    function processInputs() {\n                        const input1 = document.getElementById('input1').value;\n                        const input2 = parseInt(document.getElementById('input2').value);\n                        const resultEl = document.getElementById('generic-result');\n                        \n                        // Simulate processing\n                        resultEl.innerHTML = '<div>Processing...</div>';\n                        \n                        setTimeout(() => {\n                            resultEl.innerHTML = `\n                                <div style=\"margin-bottom:10px;\"><strong>Input Processing Results:</strong></div>\n                                <div>Text Input: \"${input1}\" (${input1.length} characters)</div>\n                                <div>Number Input: ${input2} (${input2 % 2 === 0 ? 'even' : 'odd'} number)</div>\n                                <div style=\"margin-top:10px;\">Combined Result: \"${input1}-${input2}\"</div>\n                                <div>Timestamp: ${new Date().toLocaleTimeString()}</div>\n                            `;\n                        }, 1000);\n                    }\n                </script>\n            </div>"
-        }
+            username, password = auth_demo_template.extract_credentials(code)
+            return {"demo_html": render_template("auth_fallback.html", username=username, password=password)}
+    return get_fallback_demo(code, language)
 
+async def get_interactive_demo_async(code: str, language: str = "python") -> Dict[str, str]:
+    """
+    Generate an interactive demo HTML based on the user's code.
+    Use the real-world code examples to create practical, domain-specific demos.
+    
+    Args:
+        code: The user's code
+        language: The programming language (default is python)
+        
+    Returns:
+        dict: Dictionary with contextually relevant interactive elements
+    """
+    placeholder = get_interactive_demo_placeholder(code)
+    if placeholder:
+        return placeholder
+    
+    # Authentication code always gets the local template, with or without the API
+    auth_demo = get_auth_template_demo(code, language)
+    if auth_demo:
+        return auth_demo
+    
+    # Demos reproduce the code's names and literals, so only the exact same code shares one
+    cache_key = code_hash(code, language)
+    cached = await lookup_response_async("demo", cache_key)
+    if cached:
+        return cached
+    
+    if AI_COMBINED_GENERATION:
+        combined = await get_combined_part_async("demo", code, language)
+        if "error" in combined:
+            return get_interactive_demo_fallback(code, combined["error"], language)
+        if combined.get("result"):
+            return combined["result"]
+    
+    return await ai_single_flight.run(("demo", cache_key), lambda: fetch_interactive_demo_async(code, language, cache_key))
 
-def analyze_code_complexity(code: str, language: str = "python") -> Dict[str, Any]:
+async def fetch_interactive_demo_async(code: str, language: str, cache_key: str) -> Dict[str, str]:
     """
-    Analyze the complexity of code and provide explanations.
+    Generate an interactive demo through the API and cache it, falling back on failure.
     
     Args:
-        code: The code to analyze
+        code: The user's code
         language: The programming language
+        cache_key: Hash of the exact code
         
     Returns:
-        Dict: Analysis of code complexity with explanations
+        dict: Dictionary with contextually relevant interactive elements
     """
-    if not check_openai_api_key():
-        return get_fallback_complexity_analysis(code, language)
-    
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        print(f"Using OpenAI API to generate interactive demo for code snippet of length {len(code)}")
+        require_openai_api_key_format("interactive demo")
+        
+        auth_demo = get_auth_template_demo(code, language)
+        if auth_demo:
+            return auth_demo
+        
+        content = await create_chat_completion_async("demo", **build_interactive_demo_request(code, language))
+        result = parse_interactive_demo_response(content)
+        await asyncio.to_thread(save_response, "demo", cache_key, result)
+        return result
+    except Exception as e:
+        return get_interactive_demo_fallback(code, str(e), language)
+
+
+def build_complexity_request(code: str, language: str) -> Dict[str, Any]:
+    """
+    Build the chat completion arguments for a complexity analysis.
+    
+    Args:
+        code: The code to analyze
+        language: The programming language
         
-        # Define the prompt for OpenAI
-        prompt = f"""
+    Returns:
+        dict: Arguments for create_chat_completion_async
+    """
+    # Define the prompt for OpenAI
+    prompt = render_prompt("""
         Analyze the following {language} code for complexity and provide detailed explanations:
         
         ```{language}
@@ -2132,34 +1782,268 @@ def analyze_code_complexity(code: str, language: str = "python") -> Dict[str, An
         6. real_world_comparison: An analogy comparing the code's complexity to a real-world situation
         
         Return only valid JSON.
-        """
+        """, language=language, code=fit_code(code, language))
+    
+    return {
+        "messages": [
+            {"role": "system", "content": "You are a code complexity analyzer providing detailed, educational explanations."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.3,  # Lower temperature for more consistent results
+        "response_format": {"type": "json_object"}
+    }
+
+def parse_complexity_response(content: str) -> Dict[str, Any]:
+    """
+    Parse a complexity analysis completion.
+    
+    Args:
+        content: Raw completion content
         
-        # Call OpenAI API
-        response = client.chat.completions.create(
-            model="gpt-4o",  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024. do not change this unless explicitly requested by the user
-            messages=[
-                {"role": "system", "content": "You are a code complexity analyzer providing detailed, educational explanations."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,  # Lower temperature for more consistent results
-            response_format={"type": "json_object"}
-        )
+    Returns:
+        Dict: Analysis of code complexity with explanations
         
-        # Parse the response
-        content = response.choices[0].message.content
+    Raises:
+        ValueError: If the content is not a JSON object with every analysis field
+    """
+    try:
+        result = json.loads(content)
+    except (json.JSONDecodeError, TypeError) as json_err:
+        raise ValueError(f"Error parsing JSON from OpenAI response: {json_err}")
+    if not isinstance(result, dict) or not all(field in result for field in COMPLEXITY_FIELDS):
+        raise ValueError("Complexity analysis is missing fields")
+    return result
+
+async def analyze_code_complexity_async(code: str, language: str = "python") -> Dict[str, Any]:
+    """
+    Analyze the complexity of code and provide explanations.
+    
+    Args:
+        code: The code to analyze
+        language: The programming language
         
-        # Extract JSON from response
-        try:
-            analysis = json.loads(content)
-            return analysis
-        except (json.JSONDecodeError, AttributeError) as json_err:
-            print(f"Error parsing JSON from OpenAI response: {json_err}")
+    Returns:
+        Dict: Analysis of code complexity with explanations
+    """
+    if not await check_openai_api_key_async():
+        return get_fallback_complexity_analysis(code, language)
+    
+    cache_key = code_fingerprint(code, language)
+    cached = await lookup_response_async("complexity", cache_key)
+    if cached:
+        return cached
+    
+    similar = await asyncio.to_thread(lookup_similar_response, "complexity", code, language)
+    if similar:
+        refresh_in_background_async("complexity", cache_key, lambda: generate_complexity_analysis_async(code, language, cache_key))
+        return similar
+    
+    return await generate_complexity_analysis_async(code, language, cache_key)
+
+async def generate_complexity_analysis_async(code: str, language: str, cache_key: str) -> Dict[str, Any]:
+    """
+    Get the complexity analysis from the combined call or its own call, falling back on failure.
+    
+    Args:
+        code: The code to analyze
+        language: The programming language
+        cache_key: Fingerprint of the code
+        
+    Returns:
+        Dict: Analysis of code complexity with explanations
+    """
+    if AI_COMBINED_GENERATION:
+        combined = await get_combined_part_async("complexity", code, language)
+        if "error" in combined:
+            print(f"Error analyzing code complexity with OpenAI: {combined['error']}")
             return get_fallback_complexity_analysis(code, language)
-            
+        if combined.get("result"):
+            return combined["result"]
+    
+    try:
+        content = await create_chat_completion_async("complexity", **build_complexity_request(code, language))
+        result = parse_complexity_response(content)
+        await asyncio.to_thread(save_response, "complexity", cache_key, result, code, language)
+        return result
     except Exception as e:
         print(f"Error analyzing code complexity with OpenAI: {e}")
         return get_fallback_complexity_analysis(code, language)
 
+# Generate the real-world mapping, demo and complexity analysis for a program in one
+# JSON-mode call instead of three (set AI_COMBINED_GENERATION=0 to use separate calls)
+AI_COMBINED_GENERATION = os.environ.get("AI_COMBINED_GENERATION", "1") != "0"
+
+# Fields a complexity analysis must have to be served from the combined call
+COMPLEXITY_FIELDS = (
+    "complexity_score", "complexity_factors", "simplification_suggestions",
+    "explanation", "key_concepts", "real_world_comparison"
+)
+
+# Parts the combined call can produce, in prompt order
+COMBINED_PARTS = ("realworld", "demo", "complexity")
+
+# Per part: its key in the combined JSON reply, the prompt text describing it, and the
+# output tokens reserved for it (all three together is the 3000-token combined call)
+COMBINED_PART_SPECS = {
+    "realworld": ("real_world", """"real_world": an object with
+   - "title": a concise title for a real-world application of this pattern (e.g., "API Authentication System")
+   - "description": a brief description of how this pattern is used in professional settings
+   - "real_world_code": a clean, well-commented, professional-grade code example showing the pattern in production""", 1000),
+    "demo": ("demo_html", """"demo_html": a complete, self-contained interactive demo (HTML, CSS and JavaScript in one string) that
+   implements the same logic as the user's code in a realistic scenario. Every function referenced by an
+   event handler must be defined; include sample input and show the output on screen. Use a dark theme
+   with #1DB954 accents and no external libraries.""", 1500),
+    "complexity": ("complexity", """"complexity": an object with
+   - "complexity_score": a number from 1-10 (1 very simple, 10 extremely complex)
+   - "complexity_factors": array of factors that contribute to the complexity
+   - "simplification_suggestions": array of suggestions for simplifying the code
+   - "explanation": why the code is complex or simple
+   - "key_concepts": array of programming concepts used in the code
+   - "real_world_comparison": an analogy comparing the code's complexity to a real-world situation""", 500),
+}
+
+def combined_part_key(endpoint: str, code: str, language: str) -> str:
+    """Cache key of a combined part: demos reproduce the code's literals, so they are keyed on the exact code."""
+    return code_hash(code, language) if endpoint == "demo" else code_fingerprint(code, language)
+
+def build_combined_request(code: str, language: str, parts: Tuple[str, ...] = COMBINED_PARTS) -> Dict[str, Any]:
+    """
+    Build one chat completion request for several of the real-world mapping, demo and complexity analysis.
+    
+    Args:
+        code: The user's code
+        language: The programming language
+        parts: Endpoints to generate, in COMBINED_PARTS order
+        
+    Returns:
+        dict: Arguments for create_chat_completion_async
+    """
+    sections = "\n".join(f"{number}. {COMBINED_PART_SPECS[part][1]}" for number, part in enumerate(parts, 1))
+    prompt = render_prompt("""
+    You are a helpful coding tutor. Read the following {language_name} code once and produce {count}
+    artifacts for a beginner, returned together as a single JSON object.
+
+    USER CODE:
+    ```{language}
+    {code}
+    ```
+
+    Return a JSON object with exactly these keys:
+    {sections}
+
+    Return only valid JSON.
+    """, language_name=language.capitalize(), language=language, count=len(parts), sections=sections, code=fit_code(code, language))
+    
+    return {
+        "messages": [
+            {"role": "system", "content": "You are a coding tutor who explains code through real-world examples, interactive demos and complexity analysis."},
+            {"role": "user", "content": prompt}
+        ],
+        "response_format": {"type": "json_object"},
+        "temperature": 0.5,
+        "max_tokens": sum(COMBINED_PART_SPECS[part][2] for part in parts)
+    }
+
+def parse_combined_response(content: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a combined completion into per-endpoint results, dropping any part that is malformed.
+    
+    Args:
+        content: Raw completion content
+        
+    Returns:
+        dict: Results keyed by endpoint ("realworld", "demo", "complexity")
+    """
+    data = json.loads(content)
+    parts = {}
+    
+    real_world = data.get("real_world")
+    if isinstance(real_world, dict) and real_world.get("real_world_code"):
+        parts["realworld"] = normalize_real_world_result(real_world)
+    
+    demo_html = data.get("demo_html")
+    if isinstance(demo_html, str) and "<" in demo_html:
+        parts["demo"] = {"demo_html": fix_common_demo_issues(demo_html.strip())}
+    
+    complexity = data.get("complexity")
+    if isinstance(complexity, dict) and all(field in complexity for field in COMPLEXITY_FIELDS):
+        parts["complexity"] = complexity
+    
+    return parts
+
+async def generate_combined_analysis_async(code: str, language: str, parts: Tuple[str, ...] = COMBINED_PARTS) -> Dict[str, Any]:
+    """
+    Make the combined call and fan its parts into the per-endpoint caches.
+    
+    Args:
+        code: The user's code
+        language: The programming language
+        parts: Endpoints to generate
+        
+    Returns:
+        dict: {"parts": results keyed by endpoint} or {"error": message} if the call failed
+    """
+    try:
+        print(f"Using OpenAI API to generate {', '.join(parts)} for code snippet of length {len(code)}")
+        require_openai_api_key_format("combined analysis")
+        content = await create_chat_completion_async("combined", **build_combined_request(code, language, parts))
+        results = {endpoint: result for endpoint, result in parse_combined_response(content).items() if endpoint in parts}
+    except Exception as e:
+        print(f"Error generating combined analysis: {e}")
+        return {"error": str(e)}
+    
+    for endpoint, result in results.items():
+        # Demos are not indexed for near-duplicate lookups, since they carry the code's literals
+        indexed_code = None if endpoint == "demo" else code
+        await asyncio.to_thread(save_response, endpoint, combined_part_key(endpoint, code, language), result, indexed_code, language)
+    print(f"Combined analysis produced: {', '.join(results) or 'nothing usable'}")
+    return {"parts": results}
+
+async def combined_part_needed(endpoint: str, code: str, language: str) -> bool:
+    """
+    Check whether a part still has to be generated for this code.
+    
+    Args:
+        endpoint: "realworld", "demo" or "complexity"
+        code: The user's code
+        language: The programming language
+        
+    Returns:
+        bool: False if the part is cached or produced locally (placeholders, the auth template)
+    """
+    if endpoint == "realworld" and get_real_world_placeholder(code):
+        return False
+    if endpoint == "demo" and (get_interactive_demo_placeholder(code) or get_auth_template_demo(code, language)):
+        return False
+    return await lookup_response_async(endpoint, combined_part_key(endpoint, code, language)) is None
+
+async def get_combined_part_async(endpoint: str, code: str, language: str) -> Dict[str, Any]:
+    """
+    Get one endpoint's result from a combined call, sharing the call with concurrent requests.
+    
+    The call only asks for the parts missing from the caches. When the
+    caller's part is the only one missing, no combined call is made and the
+    caller uses its own, smaller prompt.
+    
+    Args:
+        endpoint: "realworld", "demo" or "complexity" (the caller has already missed its cache)
+        code: The user's code
+        language: The programming language
+        
+    Returns:
+        dict: {"result": the endpoint's result, or None if that part was unusable or not
+            requested}, or {"error": message} if the call failed
+    """
+    parts = tuple([part for part in COMBINED_PARTS if part == endpoint or await combined_part_needed(part, code, language)])
+    if len(parts) == 1:
+        return {"result": None}
+    # Keyed on the exact code, since the demo carries its literals
+    flight_key = ("combined", code_hash(code, language), parts)
+    combined = await ai_single_flight.run(flight_key, lambda: generate_combined_analysis_async(code, language, parts))
+    if "error" in combined:
+        return combined
+    return {"result": combined["parts"].get(endpoint)}
+
 def get_fallback_complexity_analysis(code: str, language: str = "python") -> Dict[str, Any]:
     """
     Provide a fallback complexity analysis when OpenAI API is unavailable
@@ -1,14 +1,20 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import uvicorn
 import os
+import asyncio
+import json
+import time
 
-from code_executor import execute_python_code, execute_javascript_code, execute_java_code
-from ai_service import get_ai_response, get_concept_context, get_ai_content, get_practice_problem, get_real_world_mapping, get_interactive_demo, check_openai_api_key, get_concept_examples, analyze_code_complexity
+from code_executor import execute_python_code, execute_javascript_code, execute_java_code, get_preflight_stats, apply_incremental_output, OUTPUT_FORMATS, EXECUTION_TIMEOUT_SECONDS
+from openai_client import close_openai_clients, close_async_openai_clients
+from demo_blobs import BLOB_HASH_RE, demo_blob_store, select_variant
+from ai_service import get_ai_response_async, stream_ai_response_async, get_concept_context, get_ai_content, get_practice_problem, get_real_world_mapping_async, get_interactive_demo_async, check_openai_api_key_async, validate_openai_api_key, get_openai_circuit_status, get_ai_call_stats, get_cache_stats, get_concept_examples_async, start_concept_warmer, analyze_code_complexity_async, get_fallback_example, get_fallback_demo
 
 # Check for OpenAI API key and log status
 openai_api_key = os.environ.get("OPENAI_API_KEY")
@@ -34,10 +40,38 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Templates
 templates = Jinja2Templates(directory="templates")
 
+# Demo blobs are addressed by content hash and never change
+DEMO_BLOB_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Parts /api/analyze-all runs, and seconds each may take before its fallback is sent.
+# The AI parts normally share one combined generation, so they get its whole budget.
+ANALYZE_ALL_TIMEOUTS = {
+    "execute": EXECUTION_TIMEOUT_SECONDS * 3,
+    "realworld": 65,
+    "demo": 65,
+    "complexity": 65,
+}
+
+@app.on_event("startup")
+async def startup_event():
+    # Precompute concept examples in the background and refresh them on a schedule
+    start_concept_warmer()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Release pooled OpenAI connections
+    close_openai_clients()
+    await close_async_openai_clients()
+
 # Data models
 class CodeExecutionRequest(BaseModel):
     code: str
     language: str
+    force: Optional[bool] = False
+    format: Optional[str] = "html"  # "html" or "structured"
+    # Opt-in incremental output (structured format only)
+    session_id: Optional[str] = None
+    last_output_hash: Optional[str] = None
 
 class AIAssistantRequest(BaseModel):
     question: str
@@ -48,6 +82,12 @@ class AIAssistantRequest(BaseModel):
 class CodeComplexityRequest(BaseModel):
     code: str
     language: Optional[str] = "python"
+
+class AnalyzeAllRequest(CodeExecutionRequest):
+    format: Optional[str] = "structured"
+    concept: Optional[str] = "general"
+    # Subset of ANALYZE_ALL_TIMEOUTS to run (default: all of them)
+    parts: Optional[List[str]] = None
     
 class APIStatusRequest(BaseModel):
     api_key: Optional[str] = None
@@ -56,19 +96,62 @@ class APIStatusRequest(BaseModel):
 async def read_root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
-@app.post("/api/execute")
-async def execute_code(request: CodeExecutionRequest):
+def run_code(request: CodeExecutionRequest, output_format: str) -> Dict[str, Any]:
+    """
+    Run the request's code with the executor for its language.
+    
+    Args:
+        request: The execution request
+        output_format: "html" or "structured"
+        
+    Returns:
+        Dict[str, Any]: The executor's result
+        
+    Raises:
+        HTTPException: If the language is not supported
+    """
     if request.language.lower() == "python":
-        result = execute_python_code(request.code)
+        return execute_python_code(request.code, force=bool(request.force), output_format=output_format)
     elif request.language.lower() == "javascript":
-        result = execute_javascript_code(request.code)
+        return execute_javascript_code(request.code, output_format=output_format)
     elif request.language.lower() == "java":
-        result = execute_java_code(request.code)
+        return execute_java_code(request.code, output_format=output_format)
     else:
         raise HTTPException(status_code=400, detail=f"Unsupported language: {request.language}")
-    
+
+def finish_execution_result(result: Dict[str, Any], request: CodeExecutionRequest, output_format: str) -> Dict[str, Any]:
+    result["format"] = output_format
+    if output_format == "structured" and request.session_id:
+        result = apply_incremental_output(result, request.session_id, request.last_output_hash)
     return result
 
+@app.post("/api/execute")
+async def execute_code(request: CodeExecutionRequest):
+    output_format = request.format or "html"
+    if output_format not in OUTPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {output_format}")
+    
+    # Executors block on subprocesses (and Java on a free scratch slot), so keep them off the event loop
+    result = await asyncio.to_thread(run_code, request, output_format)
+    return finish_execution_result(result, request, output_format)
+
+@app.get("/api/execute/stats")
+async def execute_stats():
+    """Counters for the static pre-flight check, including worker-seconds saved"""
+    return get_preflight_stats()
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Hit-rate counters for the AI response caches and the demo blob store"""
+    stats = get_cache_stats()
+    stats["demo_blobs"] = demo_blob_store.stats()
+    return stats
+
+@app.get("/api/ai/stats")
+async def ai_call_stats():
+    """Latency percentiles (per attempt and per call) and retry/hedge counters for AI calls"""
+    return get_ai_call_stats()
+
 @app.post("/api/realworld")
 async def get_real_world_example(request: Request):
     data = await request.json()
@@ -79,36 +162,31 @@ async def get_real_world_example(request: Request):
     print(f"Received real-world code request. Code length: {len(code)}, Language: {language}, Concept: {concept}")
     
     try:
-        result = get_real_world_mapping(code)
+        result = await get_real_world_mapping_async(code, language)
         print(f"Successfully generated real-world example with title: {result.get('title', 'Unknown')}")
         return result
     except Exception as e:
         print(f"Error in get_real_world_example: {e}")
-        # Return appropriate fallback based on code pattern
-        if "class" in code:
-            return {
-                "title": "Business Domain Model",
-                "description": "Production applications use domain models to represent business entities.",
-                "real_world_code": "class Product:\n    def __init__(self, id, name, price, category_id):\n        self.id = id\n        self.name = name\n        self.price = price\n        self.category_id = category_id\n        self.is_active = True\n        self.inventory_count = 0\n        \n    def apply_discount(self, percentage):\n        self.price = round(self.price * (1 - percentage/100), 2)\n        return self.price\n        \n    def restock(self, quantity):\n        self.inventory_count += quantity\n        if not self.is_active and self.inventory_count > 0:\n            self.is_active = True"
-            }
-        elif "if" in code and "else" in code:
-            return {
-                "title": "Data Validation Pipeline",
-                "description": "Conditional logic is often used for data validation and processing in ETL jobs.",
-                "real_world_code": "def validate_customer_data(customer):\n    validation_errors = []\n    \n    if not customer.get('email'):\n        validation_errors.append('Email is required')\n    elif not is_valid_email(customer['email']):\n        validation_errors.append('Email format is invalid')\n        \n    if not customer.get('name'):\n        validation_errors.append('Name is required')\n    \n    if customer.get('age') is not None:\n        if not isinstance(customer['age'], int):\n            validation_errors.append('Age must be a number')\n        elif customer['age'] < 18:\n            validation_errors.append('Customer must be at least 18 years old')\n    \n    return {\n        'is_valid': len(validation_errors) == 0,\n        'errors': validation_errors\n    }"
-            }
-        elif "for" in code or "while" in code:
-            return {
-                "title": "Data Processing Pipeline",
-                "description": "Loops are extensively used in data processing workflows for batch operations.",
-                "real_world_code": "def process_transaction_batch(transactions):\n    processed_count = 0\n    failed_count = 0\n    results = []\n    \n    for transaction in transactions:\n        try:\n            # Validate transaction\n            if not is_valid_transaction(transaction):\n                raise ValueError(f\"Invalid transaction format: {transaction['id']}\")\n                \n            # Process based on transaction type\n            if transaction['type'] == 'purchase':\n                result = process_purchase(transaction)\n            elif transaction['type'] == 'refund':\n                result = process_refund(transaction)\n            elif transaction['type'] == 'adjustment':\n                result = process_adjustment(transaction)\n            else:\n                raise ValueError(f\"Unknown transaction type: {transaction['type']}\")\n                \n            # Record success\n            processed_count += 1\n            results.append({\n                'transaction_id': transaction['id'],\n                'status': 'success',\n                'result': result\n            })\n            \n        except Exception as e:\n            # Record failure\n            failed_count += 1\n            logger.error(f\"Failed to process transaction {transaction.get('id')}: {str(e)}\")\n            results.append({\n                'transaction_id': transaction.get('id', 'unknown'),\n                'status': 'error',\n                'error': str(e)\n            })\n    \n    return {\n        'processed_count': processed_count,\n        'failed_count': failed_count,\n        'results': results\n    }"
-            }
-        else:
-            return {
-                "title": "API Endpoint Handler",
-                "description": "Professional applications use structured code organization for API endpoints.",
-                "real_world_code": "def handle_customer_request(request_data):\n    # Input validation\n    validation_result = validate_customer_request(request_data)\n    if not validation_result['is_valid']:\n        return {\n            'status': 'error',\n            'code': 'VALIDATION_ERROR',\n            'message': 'Invalid request data',\n            'details': validation_result['errors']\n        }\n    \n    # Process the request based on operation type\n    operation = request_data.get('operation')\n    customer_id = request_data.get('customer_id')\n    \n    try:\n        if operation == 'get_profile':\n            result = customer_service.get_customer_profile(customer_id)\n        elif operation == 'update_profile':\n            result = customer_service.update_customer_profile(\n                customer_id, request_data.get('profile_data', {})\n            )\n        elif operation == 'get_orders':\n            result = order_service.get_customer_orders(\n                customer_id, \n                limit=request_data.get('limit', 10),\n                offset=request_data.get('offset', 0)\n            )\n        else:\n            return {\n                'status': 'error',\n                'code': 'UNSUPPORTED_OPERATION',\n                'message': f'Operation not supported: {operation}'\n            }\n        \n        return {\n            'status': 'success',\n            'data': result\n        }\n        \n    except CustomerNotFoundError:\n        return {\n            'status': 'error',\n            'code': 'CUSTOMER_NOT_FOUND',\n            'message': f'Customer not found: {customer_id}'\n        }\n    except Exception as e:\n        logger.error(f'Error processing customer request: {str(e)}')\n        return {\n            'status': 'error',\n            'code': 'INTERNAL_ERROR',\n            'message': 'An unexpected error occurred'\n        }"
-            }
+        return get_fallback_example(code, language)
+
+async def store_demo_blob(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace a demo result's HTML with the URL and hash of its stored blob.
+    
+    Args:
+        result: A demo result with demo_html
+        
+    Returns:
+        Dict[str, Any]: The result with demo_url and demo_hash instead of demo_html
+    """
+    demo_html = result.get("demo_html")
+    if not demo_html:
+        return result
+    # Hashing is cheap, but a new demo is also compressed and written to disk
+    demo_hash = await asyncio.to_thread(demo_blob_store.put, demo_html)
+    reference = {key: value for key, value in result.items() if key != "demo_html"}
+    reference.update(demo_url=f"/api/realworld/demo/{demo_hash}", demo_hash=demo_hash)
+    return reference
 
 @app.post("/api/realworld/demo")
 async def get_interactive_demo_example(request: Request):
@@ -118,163 +196,40 @@ async def get_interactive_demo_example(request: Request):
     concept = data.get("concept", "general")
     
     try:
-        return get_interactive_demo(code)
+        result = await get_interactive_demo_async(code, language)
     except Exception as e:
         print(f"Error in get_interactive_demo_example: {e}")
-        # Return appropriate fallback based on code pattern
-        if "class" in code:
-            return {
-                "demo_html": """<div style="padding:20px; border:1px solid #ddd; border-radius:8px">
-                    <h4>Object Creator</h4>
-                    <div>
-                        <div style="margin-bottom:10px;">
-                            <label>Object Name:</label>
-                            <input type="text" id="obj-name" value="MyObject" style="margin-left:10px;" />
-                        </div>
-                        <div style="margin-bottom:10px;">
-                            <label>Property Name:</label>
-                            <input type="text" id="obj-prop" value="value" style="margin-left:10px;" />
-                        </div>
-                        <div style="margin-bottom:10px;">
-                            <label>Property Value:</label>
-                            <input type="text" id="obj-val" value="true" style="margin-left:10px;" />
-                        </div>
-                        <button onclick="createSimpleObject()" style="padding:8px 16px; background:#4a6bdf; color:white; border:none; border-radius:4px;">Create Object</button>
-                    </div>
-                    <div id="obj-result" style="margin-top:15px; padding:10px; background:#f5f5f5; border-radius:4px; font-family:monospace;">
-                        Object will appear here
-                    </div>
-                    <script>
-                        function createSimpleObject() {
-                            const name = document.getElementById('obj-name').value || 'MyObject';
-                            const prop = document.getElementById('obj-prop').value || 'value';
-                            const val = document.getElementById('obj-val').value || 'true';
-                            const resultEl = document.getElementById('obj-result');
-                            
-                            resultEl.innerHTML = `const ${name} = {<br>    ${prop}: ${val},<br>    created: "${new Date().toISOString()}",<br>    toString() { return "${name} object"; }<br>}`;
-                        }
-                    </script>
-                </div>"""
-            }
-        elif "if" in code and "else" in code:
-            return {
-                "demo_html": """<div style="padding:20px; border:1px solid #ddd; border-radius:8px">
-                    <h4>Conditional Flow Simulator</h4>
-                    <div>
-                        <label>Input value:</label>
-                        <input type="text" id="simple-input" placeholder="Enter a value" style="margin-left:10px;" />
-                        <button onclick="runSimpleCondition()" style="margin-left:10px; padding:5px 10px; background:#4a6bdf; color:white; border:none; border-radius:4px;">Test</button>
-                    </div>
-                    <div id="simple-result" style="margin-top:15px; padding:10px; background:#f5f5f5; border-radius:4px;">
-                        Enter a value and click Test
-                    </div>
-                    <script>
-                        function runSimpleCondition() {
-                            const input = document.getElementById('simple-input').value;
-                            const resultEl = document.getElementById('simple-result');
-                            
-                            if (!input) {
-                                resultEl.innerHTML = '<span style="color:red;">Please enter a value!</span>';
-                            } else if (isNaN(input)) {
-                                resultEl.innerHTML = `<span style="color:blue;">${input} is text - entered branch 1</span>`;
-                            } else if (Number(input) > 10) {
-                                resultEl.innerHTML = `<span style="color:green;">${input} is greater than 10 - entered branch 2</span>`;
-                            } else {
-                                resultEl.innerHTML = `<span style="color:orange;">${input} is a number <= 10 - entered branch 3</span>`;
-                            }
-                        }
-                    </script>
-                </div>"""
-            }
-        elif "for" in code or "while" in code:
-            return {
-                "demo_html": """<div style="padding:20px; border:1px solid #ddd; border-radius:8px">
-                    <h4>Loop Visualizer</h4>
-                    <div>
-                        <div style="margin-bottom:10px;">
-                            <label>Number of iterations:</label>
-                            <input type="number" id="loop-count" min="1" max="20" value="5" style="margin-left:10px; width:60px;" />
-                        </div>
-                        <div style="margin-bottom:10px;">
-                            <label>Loop type:</label>
-                            <select id="loop-type" style="margin-left:10px;">
-                                <option value="for">For Loop</option>
-                                <option value="while">While Loop</option>
-                            </select>
-                        </div>
-                        <button onclick="visualizeLoop()" style="padding:5px 10px; background:#4a6bdf; color:white; border:none; border-radius:4px;">Run Loop</button>
-                    </div>
-                    <div id="loop-visualization" style="margin-top:15px; padding:10px; background:#f5f5f5; border-radius:4px;">
-                        Configure and run the loop
-                    </div>
-                    <script>
-                        function visualizeLoop() {
-                            const count = parseInt(document.getElementById('loop-count').value) || 5;
-                            const type = document.getElementById('loop-type').value;
-                            const visualEl = document.getElementById('loop-visualization');
-                            
-                            visualEl.innerHTML = `<div style="font-family:monospace; margin-bottom:10px;">${type === 'for' ? 
-                                `for (let i = 0; i < ${count}; i++) {<br>    // Loop body<br>}` : 
-                                `let i = 0;<br>while (i < ${count}) {<br>    // Loop body<br>    i++;<br>}`
-                            }</div><div>Execution:</div>`;
-                            
-                            // Simulate loop execution with delays
-                            let i = 0;
-                            const interval = setInterval(() => {
-                                visualEl.innerHTML += `<div>Iteration ${i}: Processing item ${i}</div>`;
-                                i++;
-                                if (i >= count) {
-                                    clearInterval(interval);
-                                    visualEl.innerHTML += `<div style="margin-top:10px;">Loop completed after ${count} iterations</div>`;
-                                }
-                            }, 500);
-                        }
-                    </script>
-                </div>"""
-            }
-        else:
-            return {
-                "demo_html": """<div style="padding:20px; border:1px solid #ddd; border-radius:8px">
-                    <h4>Code Execution Simulator</h4>
-                    <div style="margin-bottom:15px;">
-                        <p>This interactive demo simulates the execution of your code.</p>
-                    </div>
-                    <div style="display:flex; margin-bottom:15px;">
-                        <div style="flex:1; margin-right:10px;">
-                            <label>Input 1:</label>
-                            <input type="text" id="input1" value="Test" style="display:block; margin-top:5px; width:100%;" />
-                        </div>
-                        <div style="flex:1;">
-                            <label>Input 2:</label>
-                            <input type="number" id="input2" value="42" style="display:block; margin-top:5px; width:100%;" />
-                        </div>
-                    </div>
-                    <button onclick="processInputs()" style="padding:8px 16px; background:#4a6bdf; color:white; border:none; border-radius:4px;">Process</button>
-                    <div id="generic-result" style="margin-top:15px; padding:10px; background:#f5f5f5; border-radius:4px;">
-                        Results will appear here
-                    </div>
-                    <script>
-                        function processInputs() {
-                            const input1 = document.getElementById('input1').value;
-                            const input2 = parseInt(document.getElementById('input2').value);
-                            const resultEl = document.getElementById('generic-result');
-                            
-                            // Simulate processing
-                            resultEl.innerHTML = '<div>Processing...</div>';
-                            
-                            setTimeout(() => {
-                                resultEl.innerHTML = `
-                                    <div style="margin-bottom:10px;"><strong>Input Processing Results:</strong></div>
-                                    <div>Text Input: "${input1}" (${input1.length} characters)</div>
-                                    <div>Number Input: ${input2} (${input2 % 2 === 0 ? 'even' : 'odd'} number)</div>
-                                    <div style="margin-top:10px;">Combined Result: "${input1}-${input2}"</div>
-                                    <div>Timestamp: ${new Date().toLocaleTimeString()}</div>
-                                `;
-                            }, 1000);
-                        }
-                    </script>
-                </div>"""
-            }
+        result = get_fallback_demo(code, language)
+    return await store_demo_blob(result)
+
+@app.get("/api/realworld/demo/{demo_hash}")
+async def get_demo_blob(demo_hash: str, request: Request):
+    """
+    Serve a stored demo by its hash, precompressed when the client accepts it.
+    
+    The content behind a hash never changes, so the response is cached as
+    immutable and a request that already has it (If-None-Match) gets a 304.
+    """
+    if not BLOB_HASH_RE.match(demo_hash):
+        raise HTTPException(status_code=404, detail="Demo not found")
+    headers = {"Cache-Control": DEMO_BLOB_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    # Each encoding has its own strong ETag; any of them means the client has this demo
+    if_none_match = request.headers.get("if-none-match", "")
+    cached_tags = {tag.strip().removeprefix("W/").strip('"').split("-")[0] for tag in if_none_match.split(",")}
+    if demo_hash in cached_tags or "*" in cached_tags:
+        headers["ETag"] = f'"{demo_hash}"'
+        return Response(status_code=304, headers=headers)
+    
+    variants = await asyncio.to_thread(demo_blob_store.get, demo_hash)
+    if variants is None:
+        raise HTTPException(status_code=404, detail="Demo not found")
+    encoding, body = select_variant(variants, request.headers.get("accept-encoding", ""))
+    if encoding == "identity":
+        headers["ETag"] = f'"{demo_hash}"'
+    else:
+        headers["ETag"] = f'"{demo_hash}-{encoding}"'
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
 
 @app.get("/api/ai/{topic}")
 async def get_ai_topic_content(topic: str):
@@ -324,7 +279,7 @@ async def ask_ai(request: AIAssistantRequest):
             print(f"Code context provided: {len(request.code)} characters")
             
         # Get response with fallback mechanisms in place
-        response = get_ai_response(
+        response = await get_ai_response_async(
             question=request.question,
             code=request.code,
             language=request.language or "python",  # Default to Python if None
@@ -349,6 +304,37 @@ async def ask_ai(request: AIAssistantRequest):
             "error": str(e)
         }
 
+@app.post("/api/ask/stream")
+async def ask_ai_stream(request: AIAssistantRequest):
+    """
+    Stream the AI assistant's answer as server-sent events.
+    
+    Each token is sent as ``data: {"token": ...}``; the stream ends with an
+    ``event: done`` (``{"source": "openai"|"fallback"}``) or ``event: error``.
+    """
+    print(f"AI Assistant Stream Request - Question: {request.question[:50]}...")
+    
+    async def event_stream():
+        async for event in stream_ai_response_async(
+            question=request.question,
+            code=request.code,
+            language=request.language or "python",
+            concept=request.concept or "general"
+        ):
+            if "token" in event:
+                yield f"data: {json.dumps({'token': event['token']})}\n\n"
+            elif "done" in event:
+                yield f"event: done\ndata: {json.dumps({'status': 'success', 'source': event['done']})}\n\n"
+            else:
+                yield f"event: error\ndata: {json.dumps({'status': 'error', 'error': event['error']})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/concept/{concept}")
 async def get_concept(concept: str):
     """
@@ -364,7 +350,7 @@ async def get_concept(concept: str):
     
     # Try to get AI-generated content for the concept
     try:
-        if check_openai_api_key():
+        if await check_openai_api_key_async():
             # Get AI content for this concept
             ai_content = get_ai_content(concept)
             
@@ -393,7 +379,7 @@ async def get_concept_examples_endpoint(concept: str, language: str = "python"):
     """Get AI-generated examples for a specific concept"""
     print(f"Getting AI-generated examples for concept: {concept}, language: {language}")
     try:
-        result = get_concept_examples(concept, language)
+        result = await get_concept_examples_async(concept, language)
         
         # For backward compatibility, add code_examples field if it doesn't exist
         if 'code' in result and 'code_examples' not in result:
@@ -421,7 +407,7 @@ async def analyze_code_complexity_endpoint(request: CodeComplexityRequest):
         # Default to 'python' if language is None
         language = request.language or 'python'
         print(f"Analyzing code complexity. Language: {language}")
-        result = analyze_code_complexity(request.code, language)
+        result = await analyze_code_complexity_async(request.code, language)
         return result
     except Exception as e:
         print(f"Error analyzing code complexity: {str(e)}")
@@ -430,43 +416,144 @@ async def analyze_code_complexity_endpoint(request: CodeComplexityRequest):
             "message": f"Error analyzing code complexity: {str(e)}"
         }
 
+async def run_analysis_part(part: str, request: AnalyzeAllRequest) -> Dict[str, Any]:
+    """
+    Produce one part of /api/analyze-all the way its standalone endpoint would.
+    
+    Args:
+        part: One of ANALYZE_ALL_TIMEOUTS
+        request: The analyze-all request
+        
+    Returns:
+        Dict[str, Any]: The part's result
+    """
+    language = request.language or "python"
+    if part == "execute":
+        output_format = request.format or "structured"
+        # The executors block on a subprocess, so they run in a thread next to the AI calls
+        result = await asyncio.to_thread(run_code, request, output_format)
+        return finish_execution_result(result, request, output_format)
+    if part == "realworld":
+        return await get_real_world_mapping_async(request.code, language)
+    if part == "demo":
+        return await get_interactive_demo_async(request.code, language)
+    return await analyze_code_complexity_async(request.code, language)
+
+def analysis_part_fallback(part: str, request: AnalyzeAllRequest, error: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Get the event to send for a part that failed or ran out of time.
+    
+    Args:
+        part: The part that failed
+        request: The analyze-all request
+        error: Description of the failure
+        
+    Returns:
+        Tuple[str, Dict[str, Any]]: Event name and payload
+    """
+    if part == "realworld":
+        return part, get_fallback_example(request.code, request.language)
+    if part == "demo":
+        return part, get_fallback_demo(request.code, request.language)
+    if part == "complexity":
+        return part, {"status": "error", "message": f"Error analyzing code complexity: {error}"}
+    return "error", {"part": part, "status": "error", "error": error}
+
+@app.post("/api/analyze-all")
+async def analyze_all(request: AnalyzeAllRequest):
+    """
+    Run execution, real-world mapping, demo and complexity analysis concurrently
+    and stream each part as server-sent events as soon as it is ready.
+    
+    Each part arrives as ``event: <part>`` carrying what its standalone endpoint
+    returns (a part that fails or times out sends that endpoint's fallback, or
+    ``event: error`` for execution). The stream ends with ``event: done`` and
+    per-part timings, so a full refresh takes as long as the slowest part.
+    """
+    output_format = request.format or "structured"
+    if output_format not in OUTPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {output_format}")
+    parts = request.parts or list(ANALYZE_ALL_TIMEOUTS)
+    unknown = [part for part in parts if part not in ANALYZE_ALL_TIMEOUTS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported parts: {', '.join(unknown)}")
+    
+    print(f"Analyze-all request. Code length: {len(request.code)}, Language: {request.language}, Parts: {parts}")
+    
+    timings: Dict[str, float] = {}
+    
+    async def run_part(part: str) -> Tuple[str, Dict[str, Any]]:
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(run_analysis_part(part, request), ANALYZE_ALL_TIMEOUTS[part])
+            event = (part, result)
+        except asyncio.TimeoutError:
+            print(f"Analyze-all part {part} timed out after {ANALYZE_ALL_TIMEOUTS[part]}s")
+            event = analysis_part_fallback(part, request, f"timed out after {ANALYZE_ALL_TIMEOUTS[part]} seconds")
+        except Exception as e:
+            error = getattr(e, "detail", None) or str(e)
+            print(f"Error in analyze-all part {part}: {error}")
+            event = analysis_part_fallback(part, request, error)
+        if event[0] == "demo":
+            # Like /api/realworld/demo, the demo (or its fallback) is sent as a blob URL, not inline
+            event = ("demo", await store_demo_blob(event[1]))
+        timings[part] = round((time.monotonic() - started) * 1000, 1)
+        return event
+    
+    async def event_stream():
+        started = time.monotonic()
+        tasks = [asyncio.ensure_future(run_part(part)) for part in dict.fromkeys(parts)]
+        try:
+            # Parts are sent in completion order, not request order
+            for next_part in asyncio.as_completed(tasks):
+                event, payload = await next_part
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+            done = {"status": "success", "timings_ms": timings, "total_ms": round((time.monotonic() - started) * 1000, 1)}
+            yield f"event: done\ndata: {json.dumps(done)}\n\n"
+        finally:
+            # Client went away: stop waiting (shared AI calls keep running for other callers)
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/check-openai-status")
 async def check_openai_status(request: APIStatusRequest):
     try:
         # If API key is provided in the request, use it
         if request.api_key:
-            # Temporarily override environment variable
-            import os
-            original_key = os.environ.get("OPENAI_API_KEY")
-            os.environ["OPENAI_API_KEY"] = request.api_key
-            
-            # Check API key and reset
-            is_valid = check_openai_api_key()
-            
-            # Restore original key if there was one
-            if original_key:
-                os.environ["OPENAI_API_KEY"] = original_key
-            else:
-                del os.environ["OPENAI_API_KEY"]
+            # Check the supplied key directly against the API; the process-wide key,
+            # its cached status and the circuit breaker are left untouched
+            is_valid = len(request.api_key.strip()) >= 30 and await asyncio.to_thread(validate_openai_api_key, request.api_key)
         else:
-            # Use the key from environment
-            is_valid = check_openai_api_key()
+            # Use the key from environment (cached validation result)
+            is_valid = await check_openai_api_key_async()
+        
+        # Breaker state shows whether AI features are currently served from fallbacks
+        circuit = get_openai_circuit_status()
         
         if is_valid:
             return {
                 "status": "ok",
-                "message": "OpenAI API key is valid"
+                "message": "OpenAI API key is valid",
+                "circuit": circuit
             }
         else:
             return {
                 "status": "error",
-                "message": "OpenAI API key is invalid or missing"
+                "message": "OpenAI API key is invalid or missing",
+                "circuit": circuit
             }
     except Exception as e:
         print(f"Error checking OpenAI API status: {str(e)}")
         return {
             "status": "error",
-            "message": f"Error checking API status: {str(e)}"
+            "message": f"Error checking API status: {str(e)}",
+            "circuit": get_openai_circuit_status()
         }
 
 if __name__ == "__main__":
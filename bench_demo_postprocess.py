@@ -0,0 +1,104 @@
+"""
+Benchmark the single-pass demo post-processor against the multi-pass fixes it replaced.
+
+The baseline is fix_common_demo_issues and the fix_grade_calculator_demo /
+fix_timer_functions / add_auto_run_functionality functions it called, loaded
+unchanged from ai_service.py at BASELINE_REVISION with git show, so the
+benchmark must run inside a clone with that history. Their progress prints
+are discarded while they are timed.
+
+    python bench_demo_postprocess.py                     # 10, 50 and 200 KB demos
+    python bench_demo_postprocess.py --size-kb 500 --repeat 20
+"""
+import argparse
+import ast
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import time
+from typing import Callable
+
+from demo_postprocessor import postprocess_demo
+
+# The last revision with the multi-pass fixes in ai_service.py
+BASELINE_REVISION = "f88e51a"
+BASELINE_FUNCTIONS = ("fix_common_demo_issues", "add_auto_run_functionality", "fix_timer_functions", "fix_grade_calculator_demo")
+
+# A typical generated demo; FILLER_ROW is repeated inside it to reach the requested size,
+# the way long demos grow (data tables, styles), without adding more buttons
+DEMO_TEMPLATE = """
+<div class="card">
+    <h3>Student Grade Calculator</h3>
+    <p>Enter the scores and press Calculate Average, or start the timer before the quiz.</p>
+    <input type="number" class="score" placeholder="Score" />
+    <button id="calculate-average">Calculate Average</button>
+    <button class="primary">Calculate Grades</button>
+    <button>Start Timer</button>
+    <table class="scores">{rows}</table>
+    <div id="result" class="result"></div>
+</div>
+<style>
+    .card {{ background: #1a1b26; color: #c0caf5; padding: 20px; border-radius: 8px; }}
+    .primary {{ background: #1DB954; color: black; }}
+</style>
+<script>
+    function renderScores(scores) {{
+        const list = document.getElementById('result');
+        list.innerHTML = scores.map(score => `<li>${{score}}</li>`).join('');
+        calculateAverage();
+        updateDisplay();
+    }}
+    window.onload = function() {{ renderScores([90, 85, 77]); }}
+</script>
+"""
+FILLER_ROW = '\n        <tr><td class="name">Student</td><td class="score">87</td><td class="grade">B+</td></tr>'
+
+def load_baseline() -> Callable[[str], str]:
+    """
+    Load the multi-pass fixes from git history.
+
+    Returns:
+        Callable[[str], str]: fix_common_demo_issues as it was at BASELINE_REVISION
+    """
+    source = subprocess.run(
+        ["git", "show", f"{BASELINE_REVISION}:ai_service.py"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+    ).stdout
+    module = ast.parse(source)
+    module.body = [ast.parse("import re").body[0]] + [
+        node for node in module.body if isinstance(node, ast.FunctionDef) and node.name in BASELINE_FUNCTIONS
+    ]
+    namespace: dict = {}
+    exec(compile(module, f"{BASELINE_REVISION}:ai_service.py", "exec"), namespace)
+    return namespace["fix_common_demo_issues"]
+
+def best_of(function: Callable[[str], object], html: str, repeat: int) -> float:
+    """Fastest of repeat runs, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            function(html)
+            timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark demo HTML post-processing")
+    parser.add_argument("--size-kb", type=int, action="append", help="demo size in KB (repeatable, default: 10, 50, 200)")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per size; the fastest is reported")
+    args = parser.parse_args()
+
+    baseline = load_baseline()
+    print(f"{'size':>8}  {'baseline':>12}  {'single-pass':>12}  {'speedup':>8}")
+    for size_kb in args.size_kb or [10, 50, 200]:
+        rows = FILLER_ROW * max(0, (size_kb * 1024 - len(DEMO_TEMPLATE)) // len(FILLER_ROW))
+        html = DEMO_TEMPLATE.format(rows=rows)
+        before = best_of(baseline, html, args.repeat)
+        after = best_of(postprocess_demo, html, args.repeat)
+        print(f"{len(html) // 1024:>6}KB  {before:>10.2f}ms  {after:>10.2f}ms  {before / after:>7.1f}x")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
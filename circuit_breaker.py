@@ -0,0 +1,198 @@
+"""
+Circuit breaker for OpenAI calls.
+
+When the key is out of quota or the API is down, every AI feature used to make
+the full network call and wait for the error before serving its fallback. The
+breaker counts failures by error class; once a class trips it, calls fail
+immediately with CircuitOpenError (which the callers' existing fallback paths
+handle) until a cool-down passes and a single trial call is let through.
+
+States:
+    closed      calls go through; failures are counted
+    open        calls are rejected immediately
+    half_open   one trial call is allowed; success closes, failure re-opens
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+# Per error class: consecutive failures that trip the breaker, and seconds it stays open
+ERROR_CLASS_POLICIES = {
+    "quota": {"threshold": 1, "open_seconds": 300},
+    "auth": {"threshold": 1, "open_seconds": 300},
+    "outage": {"threshold": 3, "open_seconds": 30},
+    "rate_limit": {"threshold": 5, "open_seconds": 10},
+}
+
+# Repeated trips of the same class double the open period up to this many seconds
+MAX_OPEN_SECONDS = 1800
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a call while the breaker is open."""
+
+def classify_openai_error(error: BaseException) -> Optional[str]:
+    """
+    Map an exception from the OpenAI SDK to a breaker error class.
+
+    Args:
+        error: The exception raised by the call
+
+    Returns:
+        Optional[str]: "quota", "auth", "outage" or "rate_limit", or None for
+            errors that say nothing about the API's health (bad request, parsing)
+    """
+    message = str(error).lower()
+    status = getattr(error, "status_code", None)
+    name = type(error).__name__
+
+    if "insufficient_quota" in message or "exceeded your current quota" in message:
+        return "quota"
+    if status == 401 or name == "AuthenticationError" or "invalid api key" in message or "incorrect api key" in message:
+        return "auth"
+    if status == 429 or name == "RateLimitError":
+        return "rate_limit"
+    if (status is not None and status >= 500) or name in ("APIConnectionError", "APITimeoutError", "InternalServerError"):
+        return "outage"
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return "outage"
+    return None
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker with per-error-class thresholds."""
+
+    def __init__(self, policies: Dict[str, Dict[str, float]] = ERROR_CLASS_POLICIES):
+        self.policies = policies
+        self.lock = threading.Lock()
+        self.state = "closed"
+        self.scope: Optional[str] = None
+        self.failures: Dict[str, int] = {}
+        self.trips: Dict[str, int] = {}
+        self.open_reason: Optional[str] = None
+        self.last_error = ""
+        self.opened_at = 0.0
+        self.open_seconds = 0.0
+        self.trial_in_flight = False
+        self.counters = {"rejected": 0, "opened": 0}
+
+    def reset(self, scope: Optional[str] = None) -> None:
+        """Close the breaker and forget all failures."""
+        with self.lock:
+            self._close()
+            self.trips.clear()
+            self.scope = scope
+
+    def _close(self) -> None:
+        self.state = "closed"
+        self.failures.clear()
+        self.open_reason = None
+        self.trial_in_flight = False
+
+    def before_call(self, scope: Optional[str] = None) -> None:
+        """
+        Check whether a call may go out.
+
+        Args:
+            scope: Identity of the credentials in use; the breaker resets when it changes,
+                so a new API key is not judged by the old key's quota errors
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with a trial already running
+        """
+        with self.lock:
+            if scope != self.scope:
+                self._close()
+                self.trips.clear()
+                self.scope = scope
+            if self.state == "closed":
+                return
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.open_seconds:
+                self.state = "half_open"
+            if self.state == "half_open" and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return
+            self.counters["rejected"] += 1
+            # Keep the original error text so callers' quota checks still recognize it
+            raise CircuitOpenError(f"OpenAI circuit open ({self.open_reason}): {self.last_error}")
+
+    def record_success(self) -> None:
+        """Record a successful call, closing a half-open breaker."""
+        with self.lock:
+            if self.state != "closed":
+                print("OpenAI circuit closed after successful trial call")
+                self.trips.clear()
+            self._close()
+
+    def record_failure(self, error: BaseException) -> None:
+        """
+        Record a failed call, opening the breaker if its error class reached the threshold.
+
+        Args:
+            error: The exception raised by the call
+        """
+        error_class = classify_openai_error(error)
+        with self.lock:
+            if error_class is None:
+                # Not a health signal; just let a half-open trial slot go
+                if self.state == "half_open":
+                    self.trial_in_flight = False
+                return
+
+            self.failures[error_class] = self.failures.get(error_class, 0) + 1
+            policy = self.policies[error_class]
+            if self.state == "half_open" or self.failures[error_class] >= policy["threshold"]:
+                trips = self.trips.get(error_class, 0)
+                self.trips[error_class] = trips + 1
+                self.state = "open"
+                self.open_reason = error_class
+                self.last_error = str(error)[:300]
+                self.opened_at = time.monotonic()
+                self.open_seconds = min(policy["open_seconds"] * (2 ** trips), MAX_OPEN_SECONDS)
+                self.trial_in_flight = False
+                self.counters["opened"] += 1
+                print(f"OpenAI circuit opened for {self.open_seconds:.0f}s ({error_class}): {self.last_error}")
+
+    @contextmanager
+    def guard(self, scope: Optional[str] = None) -> Iterator[None]:
+        """
+        Wrap one call: check the breaker, then record the outcome.
+
+        Args:
+            scope: Identity of the credentials in use (see before_call)
+
+        Raises:
+            CircuitOpenError: If the call is not allowed
+        """
+        self.before_call(scope)
+        try:
+            yield
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        except BaseException:
+            # Cancelled before an outcome; free the trial slot for the next caller
+            with self.lock:
+                self.trial_in_flight = False
+            raise
+        self.record_success()
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get the breaker state for status endpoints.
+
+        Returns:
+            Dict[str, Any]: State, reason, seconds until the next trial call, and counters
+        """
+        with self.lock:
+            status: Dict[str, Any] = {
+                "state": self.state,
+                "reason": self.open_reason,
+                "failures": dict(self.failures),
+            }
+            if self.state == "open":
+                remaining = self.open_seconds - (time.monotonic() - self.opened_at)
+                if remaining <= 0:
+                    status["state"] = "half_open"
+                status["retry_in_seconds"] = max(0, round(remaining, 1))
+            status.update(self.counters)
+        return status
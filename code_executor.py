@@ -1,19 +1,81 @@
+import ast
+import atexit
+import hashlib
+import itertools
+import queue
+import resource
+import shutil
+import signal
 import subprocess
 import tempfile
+import threading
+import time
 import os
 import traceback
-from typing import Dict, Any, Tuple, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from difflib import SequenceMatcher
+from typing import Dict, Any, Tuple, List, Optional, Iterator
 
-def execute_python_code(code: str) -> Dict[str, Any]:
+# Wall-clock limit for a single run; also what a pre-flight rejection saves
+EXECUTION_TIMEOUT_SECONDS = 5
+
+# range() loops longer than this are treated as non-terminating within the timeout
+MAX_STATIC_LOOP_ITERATIONS = 10 ** 9
+
+# Calls that hand control back to the user or leave the loop/program
+LOOP_EXIT_CALLS = {"input", "exit", "quit", "sys.exit", "os._exit"}
+
+# Statements and expressions that leave a loop or suspend it until its caller resumes it;
+# all but break also work from inside a nested loop
+NESTED_LOOP_EXIT_NODES = (ast.Return, ast.Raise, ast.Yield, ast.YieldFrom, ast.Await)
+LOOP_EXIT_NODES = (ast.Break,) + NESTED_LOOP_EXIT_NODES
+
+# try statements whose handlers catch an exception raised by a loop inside them
+TRY_NODES = (ast.Try, ast.TryStar) if hasattr(ast, "TryStar") else (ast.Try,)
+
+# Expressions that can raise the exception a guarding handler catches (next(), pop(), it[i], ...)
+RAISING_NODES = (ast.Call, ast.Subscript)
+
+# Message shown when a run is killed at the time limit
+TIMEOUT_MESSAGE = f"Execution timed out ({EXECUTION_TIMEOUT_SECONDS} seconds). Your code might have an infinite loop."
+
+# How often a program running in a scratch slot is checked against the slot's quota
+QUOTA_POLL_SECONDS = 0.1
+
+# Response formats accepted by the execute_* functions
+OUTPUT_FORMATS = ("html", "structured")
+
+# Per-session cache of the last structured output, used for incremental diffs
+OUTPUT_CACHE_MAX_SESSIONS = 1000
+OUTPUT_CACHE_MAX_LINES = 5000
+session_outputs: "OrderedDict[str, Tuple[str, List[str]]]" = OrderedDict()
+
+# Counters for the static pre-flight pass
+preflight_stats = {
+    "checked": 0,
+    "rejected": 0,
+    "forced": 0,
+    "worker_seconds_saved": 0
+}
+
+def execute_python_code(code: str, force: bool = False, output_format: str = "html") -> Dict[str, Any]:
     """
     Execute Python code in a safe environment with improved error reporting.
     
     Args:
         code (str): Python code to execute
+        force (bool): Run the code even if the pre-flight check flags a likely infinite loop
+        output_format (str): "html" for pre-rendered HTML, or "structured" for
+            output as a list of lines and errors as objects the client renders
         
     Returns:
         Dict[str, Any]: Dictionary containing execution results with detailed error information
     """
+    structured = output_format == "structured"
+    render_error = structure_python_error if structured else format_python_error
+    empty_output = [] if structured else ""
+    
     # First check for syntax errors before execution
     try:
         compile(code, '<string>', 'exec')
@@ -25,10 +87,10 @@ def execute_python_code(code: str) -> Dict[str, Any]:
         error_type = "SyntaxError"
         
         # Format error with line highlighting
-        error_details = format_python_error(code, error_type, error_msg, line_num, col_num, "syntax")
+        error_details = render_error(code, error_type, error_msg, line_num, col_num, "syntax")
         
         return {
-            "output": "",
+            "output": empty_output,
             "error": error_details,
             "success": False,
             "error_type": "syntax",
@@ -36,6 +98,27 @@ def execute_python_code(code: str) -> Dict[str, Any]:
             "column": col_num
         }
     
+    # Then reject loops that obviously cannot finish before the timeout
+    preflight_stats["checked"] += 1
+    likely_infinite = find_likely_infinite_loop(ast.parse(code))
+    if likely_infinite:
+        line_num, reason = likely_infinite
+        if force:
+            preflight_stats["forced"] += 1
+        else:
+            preflight_stats["rejected"] += 1
+            preflight_stats["worker_seconds_saved"] += EXECUTION_TIMEOUT_SECONDS
+            error_details = render_error(code, "LikelyInfiniteLoop", reason, line_num, 0, "likely_infinite")
+            
+            return {
+                "output": empty_output,
+                "error": error_details,
+                "success": False,
+                "error_type": "likely_infinite",
+                "line_number": line_num,
+                "can_force": True
+            }
+    
     try:
         # Create a temporary file
         with tempfile.NamedTemporaryFile(suffix=".py", delete=False) as temp_file:
@@ -64,18 +147,18 @@ sys.excepthook = excepthook
         )
         
         # Get output with timeout
-        stdout, stderr = process.communicate(timeout=5)
+        stdout, stderr = process.communicate(timeout=EXECUTION_TIMEOUT_SECONDS)
         
         # Clean up temporary file
         os.unlink(temp_file_path)
         
         if process.returncode != 0 and stderr:
             # Parse the error message to extract line number
-            error_type, error_msg, line_num, col_num = parse_python_error(stderr, len(debug_code.split('\n')) - 1)
-            error_details = format_python_error(code, error_type, error_msg, line_num, col_num, "runtime")
+            error_type, error_msg, line_num, col_num = parse_python_error(stderr, len(debug_code.split('\n')) - len(code.split('\n')))
+            error_details = render_error(code, error_type, error_msg, line_num, col_num, "runtime")
             
             return {
-                "output": stdout,
+                "output": output_lines(stdout) if structured else stdout,
                 "error": error_details,
                 "success": False,
                 "error_type": "runtime",
@@ -83,6 +166,14 @@ sys.excepthook = excepthook
                 "raw_error": stderr
             }
         
+        if structured:
+            return {
+                "output": output_lines(stdout),
+                "stderr": output_lines(stderr),
+                "error": None,
+                "success": process.returncode == 0
+            }
+        
         # Format successful output with line numbers
         formatted_output = ""
         if stdout:
@@ -98,23 +189,37 @@ sys.excepthook = excepthook
         if 'process' in locals():
             process.kill()
         return {
-            "output": "",
-            "error": "<div class='error-timeout'>Execution timed out (5 seconds). Your code might have an infinite loop.</div>",
+            "output": empty_output,
+            "error": simple_error("TimeoutError", TIMEOUT_MESSAGE, "timeout") if structured else f"<div class='error-timeout'>{TIMEOUT_MESSAGE}</div>",
             "success": False,
             "error_type": "timeout"
         }
     except Exception as e:
         return {
-            "output": "",
-            "error": f"<div class='execution-error'>Execution error: {str(e)}</div><div class='error-traceback'>{traceback.format_exc()}</div>",
+            "output": empty_output,
+            "error": simple_error("ExecutionError", f"{str(e)}\n{traceback.format_exc()}", "system") if structured else f"<div class='execution-error'>Execution error: {str(e)}</div><div class='error-traceback'>{traceback.format_exc()}</div>",
             "success": False,
             "error_type": "system"
         }
 
-def execute_javascript_code(code: str) -> Dict[str, Any]:
+def execute_javascript_code(code: str, output_format: str = "html") -> Dict[str, Any]:
     """
     Execute JavaScript code using Node.js.
     
+    Args:
+        code (str): JavaScript code to execute
+        output_format (str): "html" (raw text output) or "structured"
+        
+    Returns:
+        Dict[str, Any]: Dictionary containing execution results
+    """
+    result = run_javascript_code(code)
+    return structure_plain_result(result) if output_format == "structured" else result
+
+def run_javascript_code(code: str) -> Dict[str, Any]:
+    """
+    Run JavaScript code with Node.js and return its raw text output.
+    
     Args:
         code (str): JavaScript code to execute
         
@@ -136,7 +241,7 @@ def execute_javascript_code(code: str) -> Dict[str, Any]:
         )
         
         # Get output with timeout
-        stdout, stderr = process.communicate(timeout=5)
+        stdout, stderr = process.communicate(timeout=EXECUTION_TIMEOUT_SECONDS)
         
         # Clean up temporary file
         os.unlink(temp_file_path)
@@ -152,7 +257,7 @@ def execute_javascript_code(code: str) -> Dict[str, Any]:
             process.kill()
         return {
             "output": "",
-            "error": "<div class='error-timeout'>Execution timed out (5 seconds). Your code might have an infinite loop.</div>",
+            "error": f"<div class='error-timeout'>{TIMEOUT_MESSAGE}</div>",
             "success": False,
             "error_type": "timeout"
         }
@@ -163,6 +268,190 @@ def execute_javascript_code(code: str) -> Dict[str, Any]:
             "success": False
         }
 
+def find_likely_infinite_loop(tree: ast.AST) -> Optional[Tuple[int, str]]:
+    """
+    Statically look for loops that cannot finish within the execution timeout.
+    
+    Flags ``while`` loops on a constant true condition with no break, return,
+    raise, yield, await or input()/exit() call, and ``for`` loops over a range()
+    whose constant length exceeds MAX_STATIC_LOOP_ITERATIONS. Loops inside a
+    function are only checked if the module calls a function of that name,
+    since a function that is only defined never runs. A loop in the body of a
+    try with an except clause is not flagged if it calls or indexes anything,
+    since ending the loop with an exception (next() raising StopIteration,
+    pop() raising IndexError) is a common way out.
+    
+    Args:
+        tree (ast.AST): Parsed module
+        
+    Returns:
+        Optional[Tuple[int, str]]: Line number and explanation of the first
+        offending loop, or None if nothing was flagged
+    """
+    called = {call_name(node.func).rsplit(".", 1)[-1] for node in ast.walk(tree) if isinstance(node, ast.Call)}
+    # (node, whether an enclosing try catches exceptions raised in it)
+    pending: List[Tuple[ast.AST, bool]] = [(tree, False)]
+    while pending:
+        node, guarded = pending.pop(0)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if node.name not in called:
+                continue
+            # The function runs wherever it is called, not where it is defined
+            guarded = False
+        reason = None
+        if isinstance(node, ast.While) and is_constant_true(node.test):
+            reason = "'while' loop condition is always true and the loop body has no break, return or input()"
+        elif isinstance(node, ast.For):
+            iterations = static_range_length(node.iter)
+            if iterations is not None and iterations > MAX_STATIC_LOOP_ITERATIONS:
+                reason = f"'for' loop runs {iterations:,} times, which cannot finish within {EXECUTION_TIMEOUT_SECONDS} seconds"
+        if reason and not loop_can_exit(node.body) and not (guarded and loop_can_raise(node.body)):
+            return node.lineno, reason
+        if isinstance(node, TRY_NODES) and node.handlers:
+            pending.extend((child, True) for child in node.body)
+            pending.extend((child, guarded) for child in node.handlers + node.orelse + node.finalbody)
+            continue
+        pending.extend((child, guarded) for child in ast.iter_child_nodes(node))
+    return None
+
+def is_constant_true(node: ast.AST) -> bool:
+    """
+    Check whether a loop condition is a literal that is always truthy.
+    
+    Args:
+        node (ast.AST): Condition expression
+        
+    Returns:
+        bool: True for conditions such as ``True``, ``1`` or ``"yes"``
+    """
+    if isinstance(node, ast.Constant):
+        return bool(node.value)
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return isinstance(node.operand, ast.Constant) and not node.operand.value
+    return False
+
+def loop_can_exit(body: List[ast.stmt]) -> bool:
+    """
+    Check whether a loop body contains a statement that can leave the loop.
+    
+    A yield or await counts, since it hands control back to the caller,
+    which decides whether the loop goes on. A break inside a nested loop and
+    anything inside a nested function or class do not count, since they
+    cannot leave the enclosing loop.
+    
+    Args:
+        body (List[ast.stmt]): Statements of the loop body
+        
+    Returns:
+        bool: True if the loop may terminate on its own
+    """
+    pending = list(body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, LOOP_EXIT_NODES):
+            return True
+        if isinstance(node, ast.Call) and call_name(node.func) in LOOP_EXIT_CALLS:
+            return True
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            continue
+        if isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+            # A nested loop can still return, raise or call input() for us
+            pending.extend(n for n in ast.walk(node) if isinstance(n, NESTED_LOOP_EXIT_NODES + (ast.Call,)))
+            continue
+        pending.extend(ast.iter_child_nodes(node))
+    return False
+
+def loop_can_raise(body: List[ast.stmt]) -> bool:
+    """
+    Check whether a loop body calls or indexes anything, and so can end the loop with an exception.
+    
+    Args:
+        body (List[ast.stmt]): Statements of the loop body
+        
+    Returns:
+        bool: True if the body contains a call or a subscript
+    """
+    return any(isinstance(node, RAISING_NODES) for statement in body for node in ast.walk(statement))
+
+def call_name(func: ast.AST) -> str:
+    """
+    Get the dotted name of a called function (e.g. ``sys.exit``).
+    
+    Args:
+        func (ast.AST): The ``func`` attribute of an ast.Call
+        
+    Returns:
+        str: Dotted name, or an empty string for dynamic calls
+    """
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        prefix = call_name(func.value)
+        return f"{prefix}.{func.attr}" if prefix else func.attr
+    return ""
+
+def static_range_length(node: ast.AST) -> Optional[int]:
+    """
+    Get the number of iterations of a ``range(...)`` call with constant arguments.
+    
+    Args:
+        node (ast.AST): Iterable expression of a for loop
+        
+    Returns:
+        Optional[int]: Length of the range, or None if it cannot be determined statically
+    """
+    if not (isinstance(node, ast.Call) and call_name(node.func) == "range" and not node.keywords):
+        return None
+    args = [static_int_value(arg) for arg in node.args]
+    if not 1 <= len(args) <= 3 or any(arg is None for arg in args):
+        return None
+    try:
+        return len(range(*args))
+    except (ValueError, OverflowError):
+        return None
+
+def static_int_value(node: ast.AST) -> Optional[int]:
+    """
+    Evaluate a constant integer expression such as ``10**12`` or ``5 * 1000``.
+    
+    Args:
+        node (ast.AST): Expression to evaluate
+        
+    Returns:
+        Optional[int]: Value of the expression, or None if it is not a small constant integer expression
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, int) and not isinstance(node.value, bool):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = static_int_value(node.operand)
+        return -value if value is not None else None
+    if isinstance(node, ast.BinOp):
+        left = static_int_value(node.left)
+        right = static_int_value(node.right)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, ast.Add):
+            return left + right
+        if isinstance(node.op, ast.Sub):
+            return left - right
+        if isinstance(node.op, ast.Mult):
+            return left * right
+        if isinstance(node.op, ast.FloorDiv) and right != 0:
+            return left // right
+        if isinstance(node.op, ast.Pow) and 0 <= right and abs(left).bit_length() * right <= 4096:
+            # Cap the result size so the check itself stays cheap
+            return left ** right
+    return None
+
+def get_preflight_stats() -> Dict[str, int]:
+    """
+    Get counters for the static pre-flight pass.
+    
+    Returns:
+        Dict[str, int]: Programs checked, rejected and forced, and worker-seconds saved
+    """
+    return dict(preflight_stats)
+
 def format_output(output: str) -> str:
     """
     Format output with line numbers for better readability.
@@ -180,13 +469,152 @@ def format_output(output: str) -> str:
         # Skip empty lines at the end
         if i == len(lines) - 1 and not line.strip():
             continue
-        formatted_lines.append(f"<div class='output-line'>{line}</div>")
+        formatted_lines.append(f"<div class='output-line'>{html_escape(line)}</div>")
     
     if not formatted_lines:
         return "<div class='output-empty'>No output</div>"
     
     return "<div class='output-stdout'>" + ''.join(formatted_lines) + "</div>"
 
+def output_lines(output: str) -> List[str]:
+    """
+    Split raw program output into lines for the structured response format.
+    
+    Args:
+        output (str): Raw output from code execution
+        
+    Returns:
+        List[str]: Output lines without the trailing newline
+    """
+    if not output or not output.strip():
+        return []
+    return output.rstrip('\n').split('\n')
+
+def output_hash(lines: List[str]) -> str:
+    """
+    Hash a list of output lines so clients can refer to output they already display.
+    
+    Args:
+        lines (List[str]): Output lines
+        
+    Returns:
+        str: Short hex digest
+    """
+    return hashlib.sha256('\n'.join(lines).encode('utf-8')).hexdigest()[:16]
+
+def diff_output_lines(old: List[str], new: List[str]) -> List[list]:
+    """
+    Compute a compact line-level diff that turns ``old`` into ``new``.
+    
+    Operations are ``["=", n]`` (keep n lines), ``["-", n]`` (drop n lines)
+    and ``["+", [lines]]`` (insert lines), applied in order.
+    
+    Args:
+        old (List[str]): Lines the client already has
+        new (List[str]): Lines of the latest run
+        
+    Returns:
+        List[list]: Diff operations
+    """
+    ops: List[list] = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old, new, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(["=", i2 - i1])
+            continue
+        if i2 > i1:
+            ops.append(["-", i2 - i1])
+        if j2 > j1:
+            ops.append(["+", new[j1:j2]])
+    return ops
+
+def apply_incremental_output(result: Dict[str, Any], session_id: Optional[str], last_output_hash: Optional[str]) -> Dict[str, Any]:
+    """
+    Replace structured output with a diff against the client's last output when possible.
+    
+    The latest output is cached per session. If the client reports the hash
+    of the output it is displaying and that matches the cached output, the
+    response carries ``output_diff`` instead of the full ``output``, as long
+    as the diff is actually smaller. ``output_hash`` is always set.
+    
+    Args:
+        result (Dict[str, Any]): Structured execution result
+        session_id (Optional[str]): Client-chosen id for the editor session
+        last_output_hash (Optional[str]): ``output_hash`` of the output the client displays
+        
+    Returns:
+        Dict[str, Any]: The result, possibly with ``output`` swapped for ``output_diff``
+    """
+    lines = result.get("output") or []
+    new_hash = output_hash(lines)
+    result["output_hash"] = new_hash
+    if not session_id:
+        return result
+    
+    cached = session_outputs.pop(session_id, None)
+    if len(lines) <= OUTPUT_CACHE_MAX_LINES:
+        session_outputs[session_id] = (new_hash, lines)
+        while len(session_outputs) > OUTPUT_CACHE_MAX_SESSIONS:
+            session_outputs.popitem(last=False)
+    
+    if cached and last_output_hash and cached[0] == last_output_hash:
+        ops = diff_output_lines(cached[1], lines)
+        inserted = sum(len(line) + 1 for op in ops if op[0] == "+" for line in op[1])
+        if inserted + 8 * len(ops) < sum(len(line) + 1 for line in lines):
+            result["output"] = None
+            result["output_diff"] = {"base": last_output_hash, "ops": ops}
+    
+    return result
+
+def simple_error(error_type: str, error_msg: str, error_category: str) -> Dict[str, Any]:
+    """
+    Build a structured error object that has no source context.
+    
+    Args:
+        error_type (str): Type of error (e.g., TimeoutError)
+        error_msg (str): Error message
+        error_category (str): Category of error (timeout, system, compile, runtime)
+        
+    Returns:
+        Dict[str, Any]: Structured error object
+    """
+    return {
+        "type": error_type,
+        "message": error_msg,
+        "line": 0,
+        "column": 0,
+        "category": error_category,
+        "context": [],
+        "explanation": ""
+    }
+
+def structure_plain_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a raw-text execution result (JavaScript, Java) to the structured format.
+    
+    Args:
+        result (Dict[str, Any]): Result with "output" and "error" as plain text
+        
+    Returns:
+        Dict[str, Any]: Result with output lines and a structured error object
+    """
+    structured = dict(result)
+    structured["output"] = output_lines(result.get("output", ""))
+    structured["stderr"] = []
+    structured["error"] = None
+    
+    error_text = result.get("error") or ""
+    error_type = result.get("error_type")
+    if error_type == "timeout":
+        structured["error"] = simple_error("TimeoutError", TIMEOUT_MESSAGE, "timeout")
+    elif not result.get("success"):
+        category = error_type or "runtime"
+        label = "CompilationError" if category == "compile" else "Error"
+        structured["error"] = simple_error(label, error_text, category)
+    else:
+        structured["stderr"] = output_lines(error_text)
+    
+    return structured
+
 def parse_python_error(stderr: str, debug_line_offset: int) -> Tuple[str, str, int, int]:  # type: ignore
     """
     Parse Python error messages to extract error details.
@@ -259,9 +687,9 @@ def parse_python_error(stderr: str, debug_line_offset: int) -> Tuple[str, str, i
     
     return error_type, error_msg, line_num, col_num
 
-def format_python_error(code: str, error_type: str, error_msg: str, line_num: int, col_num: int, error_category: str) -> str:  # type: ignore
+def structure_python_error(code: str, error_type: str, error_msg: str, line_num: int, col_num: int, error_category: str) -> Dict[str, Any]:
     """
-    Format Python error messages with line highlighting for better readability.
+    Build a structured Python error with the surrounding source lines.
     
     Args:
         code (str): Original code
@@ -269,41 +697,76 @@ def format_python_error(code: str, error_type: str, error_msg: str, line_num: in
         error_msg (str): Error message
         line_num (int): Line number where error occurred
         col_num (int): Column number where error occurred
-        error_category (str): Category of error (syntax or runtime)
+        error_category (str): Category of error (syntax, runtime or likely_infinite)
         
     Returns:
-        str: Formatted HTML error message with line highlighting
+        Dict[str, Any]: Error object with type, message, position, context lines and explanation
     """
-    result = f"<div class='error-header'><span class='error-type'>{error_type}</span>: {error_msg}</div>"
-    
+    context = []
     if line_num > 0:
         code_lines = code.split('\n')
         if 0 <= line_num-1 < len(code_lines):
             # Determine the range of lines to show for context
             start_line = max(0, line_num - 3)
             end_line = min(len(code_lines), line_num + 2)
-            context_lines = []
-            
-            # Add line numbers and highlight the error line
             for i in range(start_line, end_line):
-                line = code_lines[i]
-                line_class = 'error-line' if i == line_num-1 else ''
-                line_num_display = str(i+1).rjust(3)
-                context_lines.append(f"<pre class='{line_class}'><span class='line-number'>{line_num_display}</span> {html_escape(line)}</pre>")
-                
-                # Add caret indicator for syntax errors if column is known
-                if i == line_num-1 and col_num > 0 and error_category == 'syntax':
-                    # Highlight the exact position of the error
-                    error_pos = min(col_num - 1, len(line))  # Ensure we don't go beyond line length
-                    caret_spacing = ' ' * error_pos
-                    context_lines.append(f"<pre class='error-indicator'><span class='line-number'>   </span> {caret_spacing}^</pre>")
-            
-            result += f"<div class='code-context'>{''.join(context_lines)}</div>"
+                context.append({"line": i + 1, "text": code_lines[i], "is_error": i == line_num-1})
     
     if error_category == 'runtime':
-        result += f"<div class='error-explanation'>This is a {error_category} error. Your code syntax is valid, but there was a problem during execution.</div>"
+        explanation = f"This is a {error_category} error. Your code syntax is valid, but there was a problem during execution."
+    elif error_category == 'likely_infinite':
+        explanation = f"This loop would run until the {EXECUTION_TIMEOUT_SECONDS} second time limit, so it was not executed. Add a way for it to stop, or run it anyway."
     else:
-        result += f"<div class='error-explanation'>This is a {error_category} error. You need to fix the syntax before the code can run.</div>"
+        explanation = f"This is a {error_category} error. You need to fix the syntax before the code can run."
+    
+    return {
+        "type": error_type,
+        "message": error_msg,
+        "line": line_num,
+        "column": col_num,
+        "category": error_category,
+        "context": context,
+        "explanation": explanation
+    }
+
+def format_python_error(code: str, error_type: str, error_msg: str, line_num: int, col_num: int, error_category: str) -> str:  # type: ignore
+    """
+    Format Python error messages with line highlighting for better readability.
+    
+    Args:
+        code (str): Original code
+        error_type (str): Type of error (e.g., SyntaxError, TypeError)
+        error_msg (str): Error message
+        line_num (int): Line number where error occurred
+        col_num (int): Column number where error occurred
+        error_category (str): Category of error (syntax or runtime)
+        
+    Returns:
+        str: Formatted HTML error message with line highlighting
+    """
+    details = structure_python_error(code, error_type, error_msg, line_num, col_num, error_category)
+    result = f"<div class='error-header'><span class='error-type'>{html_escape(error_type)}</span>: {html_escape(error_msg)}</div>"
+    
+    if details["context"]:
+        context_lines = []
+        
+        # Add line numbers and highlight the error line
+        for entry in details["context"]:
+            line = entry["text"]
+            line_class = 'error-line' if entry["is_error"] else ''
+            line_num_display = str(entry["line"]).rjust(3)
+            context_lines.append(f"<pre class='{line_class}'><span class='line-number'>{line_num_display}</span> {html_escape(line)}</pre>")
+            
+            # Add caret indicator for syntax errors if column is known
+            if entry["is_error"] and col_num > 0 and error_category == 'syntax':
+                # Highlight the exact position of the error
+                error_pos = min(col_num - 1, len(line))  # Ensure we don't go beyond line length
+                caret_spacing = ' ' * error_pos
+                context_lines.append(f"<pre class='error-indicator'><span class='line-number'>   </span> {caret_spacing}^</pre>")
+        
+        result += f"<div class='code-context'>{''.join(context_lines)}</div>"
+    
+    result += f"<div class='error-explanation'>{details['explanation']}</div>"
     
     return result
 
@@ -325,10 +788,256 @@ def html_escape(text: str) -> str:
         .replace("'", "&#39;")
     )
     
-def execute_java_code(code: str) -> Dict[str, Any]:
+class ScratchQuotaExceeded(Exception):
+    """Raised when a program run in a scratch slot writes more than the slot's quota."""
+    
+    def __init__(self, quota_bytes: int):
+        super().__init__(f"program exceeded the {quota_bytes // (1024 * 1024)} MB scratch space limit")
+        self.quota_bytes = quota_bytes
+
+class ScratchArena:
+    """
+    Fixed pool of reusable scratch directories for compiled-language runs.
+    
+    Each slot is a directory created once under tmpfs (``/dev/shm``) when
+    available and wiped when it is released. Programs started with ``run``
+    are held to a size quota while they run. A background sweeper reclaims
+    slots whose lease outlived ``lease_seconds`` (e.g. a handler that crashed
+    before releasing) and removes arenas left behind by dead worker processes.
+    
+    Every lease gets its own token, and ``release`` only frees the slot while
+    the caller's token still holds it, so a holder whose lease the sweeper
+    already reclaimed cannot free (and wipe) the slot of the next holder.
+    """
+    
+    def __init__(self, name: str, slots: int = 8, quota_bytes: int = 16 * 1024 * 1024,
+                 lease_seconds: float = 60, root: Optional[str] = None):
+        self.name = name
+        self.quota_bytes = quota_bytes
+        self.lease_seconds = lease_seconds
+        self.base_dir = root or (
+            "/dev/shm" if os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()
+        )
+        self.root = os.path.join(self.base_dir, f"cmr-{name}-{os.getpid()}")
+        self.slot_paths = [os.path.join(self.root, f"slot-{i}") for i in range(slots)]
+        self._free: "queue.Queue[int]" = queue.Queue()
+        # Slot index -> (lease token, time leased)
+        self._leases: Dict[int, Tuple[int, float]] = {}
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+        
+        self.remove_stale_arenas()
+        for index, path in enumerate(self.slot_paths):
+            os.makedirs(path, exist_ok=True)
+            self.wipe(path)
+            self._free.put(index)
+        atexit.register(self.close)
+    
+    def acquire(self, timeout: float = 10) -> Tuple[int, int]:
+        """Lease a free slot, waiting up to ``timeout`` seconds for one; returns (slot index, lease token)."""
+        try:
+            index = self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError(f"All {len(self.slot_paths)} {self.name} scratch slots are busy, please try again")
+        with self._lock:
+            token = next(self._tokens)
+            self._leases[index] = (token, time.monotonic())
+        return index, token
+    
+    def release(self, index: int, token: int) -> None:
+        """Wipe a slot and return it to the pool (no-op unless the lease with this token still holds it)."""
+        with self._lock:
+            lease = self._leases.get(index)
+            if lease is None or lease[0] != token:
+                return
+            del self._leases[index]
+        self.wipe(self.slot_paths[index])
+        self._free.put(index)
+    
+    @contextmanager
+    def slot(self, timeout: float = 10) -> Iterator[str]:
+        """Lease a slot for the duration of a ``with`` block and yield its path."""
+        index, token = self.acquire(timeout)
+        try:
+            yield self.slot_paths[index]
+        finally:
+            self.release(index, token)
+    
+    def run(self, path: str, args: List[str], timeout: float, **popen_kwargs: Any) -> Tuple[int, str, str]:
+        """
+        Run a program that writes into a slot, holding the slot to its quota while it runs.
+        
+        No single file may grow past the quota (RLIMIT_FSIZE on the child), and the
+        slot's total size is checked every ``QUOTA_POLL_SECONDS``; a program over the
+        quota is killed.
+        
+        Args:
+            path (str): The slot the program writes into
+            args (List[str]): Command line
+            timeout (float): Seconds the program may run
+            **popen_kwargs: Extra subprocess.Popen arguments (e.g. cwd)
+            
+        Returns:
+            Tuple[int, str, str]: Return code, stdout and stderr
+            
+        Raises:
+            ScratchQuotaExceeded: If the slot went over the quota
+            subprocess.TimeoutExpired: If the program ran past the timeout (it is killed first)
+        """
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **popen_kwargs)
+        deadline = time.monotonic() + timeout
+        try:
+            if hasattr(resource, "prlimit"):
+                try:
+                    # One byte over the quota, so a file cut off at the limit still shows up as over quota
+                    limit = self.quota_bytes + 1
+                    resource.prlimit(process.pid, resource.RLIMIT_FSIZE, (limit, limit))
+                except (OSError, ValueError):
+                    pass  # The process already exited; the polling below still applies
+            while True:
+                try:
+                    stdout, stderr = process.communicate(timeout=min(QUOTA_POLL_SECONDS, max(0.0, deadline - time.monotonic())))
+                    break
+                except subprocess.TimeoutExpired:
+                    # communicate() keeps the output read so far, so it can be retried
+                    if time.monotonic() >= deadline:
+                        raise
+                    if self.over_quota(path):
+                        raise ScratchQuotaExceeded(self.quota_bytes)
+        except BaseException:
+            # Kill before the slot is wiped and handed to the next run
+            process.kill()
+            process.communicate()
+            raise
+        if process.returncode == -signal.SIGXFSZ or self.over_quota(path):
+            raise ScratchQuotaExceeded(self.quota_bytes)
+        return process.returncode, stdout, stderr
+    
+    def over_quota(self, path: str) -> bool:
+        """Check whether a slot holds more than ``quota_bytes`` of files."""
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.lstat(os.path.join(dirpath, filename)).st_size
+                except OSError:
+                    pass
+                if total > self.quota_bytes:
+                    return True
+        return False
+    
+    @staticmethod
+    def wipe(path: str) -> None:
+        """Remove everything inside a slot directory, keeping the directory itself."""
+        try:
+            entries = list(os.scandir(path))
+        except FileNotFoundError:
+            os.makedirs(path, exist_ok=True)
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+    
+    def sweep(self) -> int:
+        """Reclaim slots whose lease expired; returns how many were reclaimed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [i for i, (_, started) in self._leases.items() if now - started > self.lease_seconds]
+            for index in expired:
+                del self._leases[index]
+        for index in expired:
+            self.wipe(self.slot_paths[index])
+            self._free.put(index)
+        return len(expired)
+    
+    def start_sweeper(self, interval: float = 30) -> None:
+        """Run ``sweep`` periodically in a daemon thread."""
+        if self._sweeper is not None:
+            return
+        
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    reclaimed = self.sweep()
+                    if reclaimed:
+                        print(f"Reclaimed {reclaimed} {self.name} scratch slot(s) after expired leases")
+                except Exception as e:
+                    print(f"Error sweeping {self.name} scratch arena: {e}")
+        
+        self._sweeper = threading.Thread(target=run, name=f"{self.name}-arena-sweeper", daemon=True)
+        self._sweeper.start()
+    
+    def remove_stale_arenas(self) -> None:
+        """Delete arenas of this kind left behind by worker processes that no longer exist."""
+        prefix = f"cmr-{self.name}-"
+        try:
+            entries = list(os.scandir(self.base_dir))
+        except OSError:
+            return
+        for entry in entries:
+            pid = entry.name[len(prefix):]
+            if not entry.name.startswith(prefix) or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            try:
+                os.kill(int(pid), 0)
+            except ProcessLookupError:
+                shutil.rmtree(entry.path, ignore_errors=True)
+            except OSError:
+                pass
+    
+    def close(self) -> None:
+        """Remove the arena from disk."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+_java_arena: Optional[ScratchArena] = None
+_java_arena_lock = threading.Lock()
+
+def get_java_arena() -> ScratchArena:
+    """
+    Get the process-wide scratch arena for Java runs, creating it on first use.
+    
+    Slot count and quota can be tuned with JAVA_SCRATCH_SLOTS and JAVA_SCRATCH_QUOTA_MB.
+    
+    Returns:
+        ScratchArena: Shared arena
+    """
+    global _java_arena
+    with _java_arena_lock:
+        if _java_arena is None:
+            _java_arena = ScratchArena(
+                "java",
+                slots=int(os.environ.get("JAVA_SCRATCH_SLOTS", "8")),
+                quota_bytes=int(os.environ.get("JAVA_SCRATCH_QUOTA_MB", "16")) * 1024 * 1024,
+                lease_seconds=EXECUTION_TIMEOUT_SECONDS * 4
+            )
+            _java_arena.start_sweeper()
+        return _java_arena
+
+def execute_java_code(code: str, output_format: str = "html") -> Dict[str, Any]:
     """
     Execute Java code.
     
+    Args:
+        code (str): Java code to execute
+        output_format (str): "html" (raw text output) or "structured"
+        
+    Returns:
+        Dict[str, Any]: Dictionary containing execution results
+    """
+    result = run_java_code(code)
+    return structure_plain_result(result) if output_format == "structured" else result
+
+def run_java_code(code: str) -> Dict[str, Any]:
+    """
+    Compile and run Java code in a scratch slot and return its raw text output.
+    
     Args:
         code (str): Java code to execute
         
@@ -341,59 +1050,55 @@ def execute_java_code(code: str) -> Dict[str, Any]:
     for line in lines:
         if "class " in line and "{" in line:
             parts = line.split("class ")[1].split("{")[0].strip()
-            class_name = parts.split()[0]
+            class_name = parts.split()[0] if parts else class_name
             break
     
+    # The class name becomes a file name inside a shared scratch slot
+    if not class_name.isidentifier():
+        class_name = "Main"
+    
     try:
-        # Create a temporary directory
-        temp_dir = tempfile.mkdtemp()
-        java_file_path = os.path.join(temp_dir, f"{class_name}.java")
-        
-        # Write the Java code to a file
-        with open(java_file_path, 'w') as java_file:
-            java_file.write(code)
-        
-        # Compile the Java code
-        compile_process = subprocess.Popen(
-            ["javac", java_file_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
+        arena = get_java_arena()
         
-        _, compile_stderr = compile_process.communicate(timeout=5)
-        
-        if compile_process.returncode != 0:
+        # Lease a reusable scratch directory; it is wiped when released
+        with arena.slot() as temp_dir:
+            java_file_path = os.path.join(temp_dir, f"{class_name}.java")
+            
+            # Write the Java code to a file
+            with open(java_file_path, 'w') as java_file:
+                java_file.write(code)
+            
+            # Compile the Java code
+            returncode, _, compile_stderr = arena.run(temp_dir, ["javac", java_file_path], EXECUTION_TIMEOUT_SECONDS)
+            
+            if returncode != 0:
+                return {
+                    "output": "",
+                    "error": f"Compilation error: {compile_stderr}",
+                    "success": False,
+                    "error_type": "compile"
+                }
+            
+            # Run the Java program
+            returncode, run_stdout, run_stderr = arena.run(
+                temp_dir, ["java", "-cp", temp_dir, class_name], EXECUTION_TIMEOUT_SECONDS, cwd=temp_dir
+            )
+            
             return {
-                "output": "",
-                "error": f"Compilation error: {compile_stderr}",
-                "success": False
+                "output": run_stdout,
+                "error": run_stderr,
+                "success": returncode == 0
             }
-        
-        # Run the Java program
-        run_process = subprocess.Popen(
-            ["java", "-cp", temp_dir, class_name],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        run_stdout, run_stderr = run_process.communicate(timeout=5)
-        
+    except ScratchQuotaExceeded as e:
         return {
-            "output": run_stdout,
-            "error": run_stderr,
-            "success": run_process.returncode == 0
+            "output": "",
+            "error": f"Execution error: {e}",
+            "success": False
         }
     except subprocess.TimeoutExpired:
-        # Make sure processes are properly cleaned up if they exist
-        if 'compile_process' in locals() and compile_process is not None:
-            compile_process.kill()
-        if 'run_process' in locals() and run_process is not None:
-            run_process.kill()
         return {
             "output": "",
-            "error": "<div class='error-timeout'>Execution timed out (5 seconds). Your code might have an infinite loop.</div>",
+            "error": f"<div class='error-timeout'>{TIMEOUT_MESSAGE}</div>",
             "success": False,
             "error_type": "timeout"
         }
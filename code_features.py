@@ -0,0 +1,256 @@
+"""
+Structural features of user code, for picking canned fallback content.
+
+The fallbacks used to be chosen with substring checks such as
+`"for" in code`, which match comments, strings and words like "before".
+extract_features() parses Python with ast and reads JavaScript/Java (or
+Python that does not parse) as a token stream without comments and strings,
+and counts the constructs a beginner's program is about. fallback_category()
+picks the highest-ranked fallback category the program has a feature of.
+Features are memoized by code fingerprint, so programs of the same shape are
+analyzed once.
+
+is_auth_code() decides whether a program gets the authentication demo from
+the names it defines and uses (variables, attributes, functions, parameters,
+imports), read the same way, so "login" in a comment or a printed message
+does not count. Names are not part of the fingerprint, so it is memoized by
+the exact code.
+"""
+import ast
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from response_cache import FALLBACK_TOKEN_RE, ResponseCache, code_fingerprint, code_hash
+
+FEATURE_NAMES = ("conditionals", "loops", "classes", "functions", "recursion", "comprehensions")
+
+# Fallback categories, most specific first, and the features that select each;
+# code with none of these features gets the general fallback
+FALLBACK_CATEGORIES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("class", ("classes",)),
+    ("conditional", ("conditionals",)),
+    ("loop", ("loops", "comprehensions", "recursion")),
+)
+GENERAL_CATEGORY = "general"
+
+# Keyword tokens counted for languages read as tokens
+TOKEN_FEATURES = {
+    "if": "conditionals",
+    "switch": "conditionals",
+    "?": "conditionals",
+    "for": "loops",
+    "while": "loops",
+    "class": "classes",
+    "function": "functions",
+    "def": "functions",
+}
+
+# Array methods that stand in for comprehensions in JavaScript and Java streams
+FUNCTIONAL_METHODS = frozenset({"map", "filter", "reduce", "forEach", "flatMap", "collect"})
+
+# Words followed by "(" that neither declare nor call a function, or precede a call rather than declare one
+CALL_LIKE_KEYWORDS = frozenset({
+    "if", "for", "while", "switch", "catch", "return", "function", "typeof", "new", "else",
+    "await", "throw", "yield", "in", "of", "case", "do", "elif", "and", "or", "not", "print"
+})
+
+IDENTIFIER_RE = re.compile(r"[A-Za-z_$][\w$]*$")
+
+# Words that make a name (lowercased, underscores removed) authentication-related:
+# userPassword, check_password, login_user, sign_up, jwt_token, ...
+AUTH_NAME_WORDS = ("login", "password", "authenticat", "credential", "signup", "signin", "oauth", "jwt")
+
+feature_cache = ResponseCache(1024, 24 * 3600)
+auth_cache = ResponseCache(1024, 24 * 3600)
+
+class FeatureCounter(ast.NodeVisitor):
+    """Count the structural features of a Python AST."""
+
+    def __init__(self):
+        self.features = dict.fromkeys(FEATURE_NAMES, 0)
+        self.function_stack: List[str] = []
+        self.recursive: set = set()
+
+    def visit_If(self, node):
+        self.features["conditionals"] += 1
+        self.generic_visit(node)
+
+    visit_IfExp = visit_If
+    visit_Match = visit_If
+
+    def visit_For(self, node):
+        self.features["loops"] += 1
+        self.generic_visit(node)
+
+    visit_AsyncFor = visit_For
+    visit_While = visit_For
+
+    def visit_ClassDef(self, node):
+        self.features["classes"] += 1
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        self.features["functions"] += 1
+        self.function_stack.append(node.name)
+        self.generic_visit(node)
+        self.function_stack.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ListComp(self, node):
+        self.features["comprehensions"] += 1
+        self.generic_visit(node)
+
+    visit_SetComp = visit_ListComp
+    visit_DictComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def visit_Call(self, node):
+        # f(...) inside def f, or self.f(...) inside a method f
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+        if name and self.function_stack and name == self.function_stack[-1]:
+            self.recursive.add(name)
+        self.generic_visit(node)
+
+def python_features(code: str) -> Optional[Dict[str, int]]:
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    counter = FeatureCounter()
+    counter.visit(tree)
+    counter.features["recursion"] = len(counter.recursive)
+    return counter.features
+
+def python_names(code: str) -> Optional[Set[str]]:
+    """Names a Python program defines or uses, or None if it does not parse."""
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    names: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast.keyword) and node.arg:
+            names.add(node.arg)
+        elif isinstance(node, ast.alias):
+            names.update(node.name.split("."))
+            if node.asname:
+                names.add(node.asname)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+    return names
+
+def token_names(code: str) -> Set[str]:
+    """Name tokens of a program, ignoring comments and string literals."""
+    return {match.group() for match in FALLBACK_TOKEN_RE.finditer(code) if match.lastgroup == "name"}
+
+def token_features(code: str) -> Dict[str, int]:
+    """Count features from the code's tokens, ignoring comments and string literals."""
+    features = dict.fromkeys(FEATURE_NAMES, 0)
+    tokens = [match.group() for match in FALLBACK_TOKEN_RE.finditer(code)
+              if match.lastgroup not in ("comment", "string")]
+    # Functions whose bodies enclose the current token: [(name, brace depth outside the body)]
+    open_functions: List[Tuple[str, int]] = []
+    pending: Optional[str] = None
+    depth = 0
+    recursive = set()
+    for index, token in enumerate(tokens):
+        previous = tokens[index - 1] if index else ""
+        following = tokens[index + 1] if index + 1 < len(tokens) else ""
+        if token in TOKEN_FEATURES:
+            features[TOKEN_FEATURES[token]] += 1
+        if token == "{":
+            if pending:
+                open_functions.append((pending, depth))
+                pending = None
+            depth += 1
+        elif token == "}":
+            depth -= 1
+            if open_functions and open_functions[-1][1] == depth:
+                open_functions.pop()
+        elif token == ";":
+            # A declaration without a body (interface or abstract method)
+            pending = None
+        elif previous == "." and token in FUNCTIONAL_METHODS:
+            features["comprehensions"] += 1
+        elif following == "(" and IDENTIFIER_RE.match(token) and token not in CALL_LIKE_KEYWORDS:
+            if previous in ("function", "def") or (IDENTIFIER_RE.match(previous) and previous not in CALL_LIKE_KEYWORDS):
+                # "function name(" or a Java-style "int name(" declaration (the keyword forms are already counted)
+                if previous not in ("function", "def"):
+                    features["functions"] += 1
+                pending = token
+            elif previous != "." and open_functions and token == open_functions[-1][0]:
+                recursive.add(token)
+    features["recursion"] = len(recursive)
+    return features
+
+def extract_features(code: str, language: str = "python", fingerprint: Optional[str] = None) -> Dict[str, int]:
+    """
+    Count the structural features of a program.
+
+    Args:
+        code: The user's code
+        language: The programming language
+        fingerprint: The code's fingerprint, if the caller already has it
+
+    Returns:
+        Dict[str, int]: Counts of conditionals, loops, classes, functions,
+            recursive functions and comprehensions
+    """
+    key = fingerprint or code_fingerprint(code, language)
+    cached = feature_cache.get(key)
+    if cached is not None:
+        return cached
+    features = python_features(code) if language == "python" else None
+    if features is None:
+        features = token_features(code)
+    feature_cache.set(key, features)
+    return features
+
+def fallback_category(code: str, language: str = "python") -> str:
+    """
+    Pick the fallback category for a program.
+
+    Args:
+        code: The user's code
+        language: The programming language
+
+    Returns:
+        str: The first FALLBACK_CATEGORIES entry the program has a feature of, or GENERAL_CATEGORY
+    """
+    features = extract_features(code, language)
+    for category, selectors in FALLBACK_CATEGORIES:
+        if any(features[name] for name in selectors):
+            return category
+    return GENERAL_CATEGORY
+
+def is_auth_code(code: str, language: str = "python") -> bool:
+    """
+    Check whether a program is about authentication (login forms, passwords, tokens).
+
+    Args:
+        code: The user's code
+        language: The programming language
+
+    Returns:
+        bool: True if a name the program defines or uses contains one of AUTH_NAME_WORDS
+    """
+    key = code_hash(code, language)
+    cached = auth_cache.get(key)
+    if cached is not None:
+        return cached
+    names = python_names(code) if language == "python" else None
+    if names is None:
+        names = token_names(code)
+    result = any(word in name.lower().replace("_", "") for name in names for word in AUTH_NAME_WORDS)
+    auth_cache.set(key, result)
+    return result
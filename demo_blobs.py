@@ -0,0 +1,300 @@
+"""
+Content-addressed storage for generated demo HTML.
+
+/api/realworld/demo used to return the demo's HTML inside its JSON, so the
+browser fetched the same multi-kilobyte page again on every view. Demos are
+now stored as blobs named by the SHA-256 of their HTML and the API returns
+only the blob's URL and hash. A blob never changes, so the blob route can
+send it with a strong ETag and Cache-Control: immutable. A repeat view, or
+a classroom of students getting the same demo, then costs a 304 or no
+request at all.
+
+Each blob is compressed once when it is stored (gzip, and brotli when the
+brotli package is installed) and the route sends the smallest variant the
+client accepts. Blobs are written to a directory shared by all workers, so
+any worker can serve a blob another one stored. Recently used blobs are also
+kept in memory.
+
+Configuration via environment variables:
+    DEMO_BLOB_DIR       directory for the blobs (default demo_blobs; empty keeps them in memory only)
+    DEMO_BLOB_MAX_MB    size above which the least recently written blobs are deleted (default 50)
+"""
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+DEMO_BLOB_DIR = os.environ.get("DEMO_BLOB_DIR", "demo_blobs")
+DEMO_BLOB_MAX_BYTES = int(float(os.environ.get("DEMO_BLOB_MAX_MB", "50")) * 1024 * 1024)
+
+# Blobs kept in memory per process
+DEMO_BLOB_MEMORY_ENTRIES = 256
+
+# Blobs are requested by hash, so anything else is rejected before touching the disk
+BLOB_HASH_RE = re.compile(r"[0-9a-f]{64}$")
+
+# Compressed variants, most preferred first: (Content-Encoding, file suffix)
+COMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Cleanup deletes blobs down to this fraction of the limit so it does not run on every write
+EVICTION_TARGET_RATIO = 0.9
+
+# Check the directory size every this many writes
+EVICTION_CHECK_INTERVAL = 50
+
+@lru_cache(maxsize=1)
+def get_brotli() -> Optional[Any]:
+    """The brotli module, or None if it is not installed (blobs are then only gzipped)."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+def blob_hash(html: str) -> str:
+    """SHA-256 of the demo's UTF-8 encoding, in hex."""
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """
+    Compress a blob with every available encoding.
+
+    Args:
+        body: The uncompressed blob
+
+    Returns:
+        Dict[str, bytes]: The blob per Content-Encoding ("identity" for the original);
+            variants that are not smaller than the original are left out
+    """
+    variants = {"identity": body}
+    # mtime=0 keeps the gzip bytes identical across workers and restarts
+    compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    brotli = get_brotli()
+    if brotli is not None:
+        compressed["br"] = brotli.compress(body, quality=11)
+    for encoding, data in compressed.items():
+        if len(data) < len(body):
+            variants[encoding] = data
+    return variants
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """
+    Parse an Accept-Encoding header.
+
+    Args:
+        accept_encoding: The header value
+
+    Returns:
+        List[str]: Lowercased encodings the client accepts (q=0 entries left out)
+    """
+    encodings = []
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q=") and params[2:] in ("0", "0.0", "0.00", "0.000"):
+            continue
+        if name.strip():
+            encodings.append(name.strip().lower())
+    return encodings
+
+def select_variant(variants: Dict[str, bytes], accept_encoding: str) -> Tuple[str, bytes]:
+    """
+    Pick the variant of a blob to send.
+
+    Args:
+        variants: The blob per Content-Encoding
+        accept_encoding: The request's Accept-Encoding header
+
+    Returns:
+        Tuple[str, bytes]: The Content-Encoding ("identity" if uncompressed) and the body
+    """
+    accepted = accepted_encodings(accept_encoding)
+    for encoding, _ in COMPRESSED_ENCODINGS:
+        if encoding in variants and (encoding in accepted or "*" in accepted):
+            return encoding, variants[encoding]
+    return "identity", variants["identity"]
+
+class DemoBlobStore:
+    """Thread-safe store of demo blobs on disk with an in-memory LRU in front."""
+
+    def __init__(self, directory: str = DEMO_BLOB_DIR, max_bytes: int = DEMO_BLOB_MAX_BYTES,
+                 memory_entries: int = DEMO_BLOB_MEMORY_ENTRIES):
+        """
+        Args:
+            directory: Directory shared by all workers (empty keeps blobs in memory only)
+            max_bytes: Size of the directory above which the oldest blobs are deleted
+            memory_entries: Blobs kept in memory
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory: "OrderedDict[str, Dict[str, bytes]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.counters = {"puts": 0, "stored": 0, "hits": 0, "disk_reads": 0, "misses": 0, "evictions": 0, "errors": 0}
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[counter] += amount
+
+    def remember(self, digest: str, variants: Dict[str, bytes]) -> None:
+        with self.lock:
+            self.memory[digest] = variants
+            self.memory.move_to_end(digest)
+            while len(self.memory) > self.memory_entries:
+                self.memory.popitem(last=False)
+
+    def path(self, digest: str, suffix: str = "") -> str:
+        return os.path.join(self.directory, f"{digest}.html{suffix}")
+
+    def put(self, html: str) -> str:
+        """
+        Store a demo, compressing it if it is new.
+
+        Args:
+            html: The demo HTML
+
+        Returns:
+            str: The blob hash
+        """
+        digest = blob_hash(html)
+        self.count("puts")
+        with self.lock:
+            if digest in self.memory:
+                self.memory.move_to_end(digest)
+                return digest
+        if self.directory and os.path.exists(self.path(digest)):
+            return digest
+
+        variants = compress_variants(html.encode("utf-8"))
+        self.remember(digest, variants)
+        self.count("stored")
+        if not self.directory:
+            return digest
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Compressed variants first, so a blob whose HTML file exists is complete
+            for encoding, suffix in COMPRESSED_ENCODINGS + (("identity", ""),):
+                if encoding in variants:
+                    self.write_file(self.path(digest, suffix), variants[encoding])
+        except OSError as e:
+            print(f"Error writing demo blob {digest}: {e}")
+            self.count("errors")
+            return digest
+
+        with self.lock:
+            self.writes += 1
+            check = self.writes % EVICTION_CHECK_INTERVAL == 1
+        if check:
+            self.evict()
+        return digest
+
+    def write_file(self, path: str, data: bytes) -> None:
+        # Written under a temporary name and renamed, so other workers never read a partial blob
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            if os.path.exists(temporary):
+                os.unlink(temporary)
+            raise
+
+    def get(self, digest: str) -> Optional[Dict[str, bytes]]:
+        """
+        Look up a blob.
+
+        Args:
+            digest: The blob hash
+
+        Returns:
+            Optional[Dict[str, bytes]]: The blob per Content-Encoding, or None if unknown
+        """
+        if not BLOB_HASH_RE.match(digest):
+            self.count("misses")
+            return None
+        with self.lock:
+            variants = self.memory.get(digest)
+            if variants is not None:
+                self.memory.move_to_end(digest)
+                self.counters["hits"] += 1
+                return variants
+        if not self.directory:
+            self.count("misses")
+            return None
+        try:
+            with open(self.path(digest), "rb") as handle:
+                variants = {"identity": handle.read()}
+            for encoding, suffix in COMPRESSED_ENCODINGS:
+                if os.path.exists(self.path(digest, suffix)):
+                    with open(self.path(digest, suffix), "rb") as handle:
+                        variants[encoding] = handle.read()
+        except FileNotFoundError:
+            self.count("misses")
+            return None
+        except OSError as e:
+            print(f"Error reading demo blob {digest}: {e}")
+            self.count("errors")
+            return None
+        self.remember(digest, variants)
+        self.count("disk_reads")
+        return variants
+
+    def evict(self) -> None:
+        """Delete the least recently written blobs until the directory is under the size limit."""
+        try:
+            files = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith(".tmp"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, entry.name, stat.st_size))
+            total = sum(size for _, _, size in files)
+            if total <= self.max_bytes:
+                return
+            # Group each blob's variants so they are deleted together
+            blobs: Dict[str, List[Any]] = {}
+            for mtime, name, size in files:
+                blob = blobs.setdefault(name.split(".", 1)[0], [mtime, 0, []])
+                blob[0] = min(blob[0], mtime)
+                blob[1] += size
+                blob[2].append(name)
+            target = int(self.max_bytes * EVICTION_TARGET_RATIO)
+            removed = 0
+            for _, size, names in sorted(blobs.values()):
+                if total <= target:
+                    break
+                for name in names:
+                    try:
+                        os.unlink(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        pass
+                total -= size
+                removed += 1
+        except OSError as e:
+            print(f"Error evicting demo blobs: {e}")
+            self.count("errors")
+            return
+        if removed:
+            self.count("evictions", removed)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get counters and the number of blobs in memory.
+
+        Returns:
+            Dict[str, Any]: Puts, newly stored blobs, memory hits, disk reads, misses,
+                evictions and errors in this process, plus blobs in memory
+        """
+        with self.lock:
+            stats: Dict[str, Any] = dict(self.counters)
+            stats["in_memory"] = len(self.memory)
+        stats["directory"] = self.directory or None
+        return stats
+
+demo_blob_store = DemoBlobStore()
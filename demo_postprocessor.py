@@ -0,0 +1,185 @@
+"""
+Single-pass post-processing of generated demo HTML.
+
+Generated demos often call functions they never define (a button with
+onclick="calculateAverage()" and no calculateAverage in the script), or
+have buttons that are never wired up. The fixes used to run as three
+functions that each re-scanned the whole page with str.find, `in`, .lower()
+and a dozen regex passes, and rebuilt the page after every fix.
+postprocess_demo() builds a symbol table of the JavaScript functions the page
+defines and references, looks for trigger elements only when a function needs
+wiring, and applies every fix in one rewrite:
+
+- shims for referenced but undefined functions are injected before the last
+  </script> (or in a new script block), followed by the notification and
+  auto-run scripts every demo gets
+- known button ids/classes and button labels get an onclick for the shim
+- the page's own window.onload is replaced by a stub, since the auto-run
+  script installs its own
+
+The JavaScript shims are templates under templates/demos/shims, loaded
+through demo_templates.
+"""
+import re
+from typing import List, Set, Tuple
+
+from demo_templates import render_template
+
+# Shims in injection order: (function name, template defining it)
+FUNCTION_SHIMS: Tuple[Tuple[str, str], ...] = (
+    ("calculateGrades", "shims/calculate_grades.js"),
+    ("calculateAverage", "shims/calculate_average.js"),
+    ("startTimer", "shims/start_timer.js"),
+    ("calculateFactorial", "shims/calculate_factorial.js"),
+    ("calculate", "shims/calculate.js"),
+    ("generateOutput", "shims/generate_output.js"),
+    ("processInput", "shims/process_input.js"),
+    ("updateDisplay", "shims/update_display.js"),
+    ("validateForm", "shims/validate_form.js"),
+)
+SHIM_NAMES = tuple(name for name, _ in FUNCTION_SHIMS)
+SHIM_NAME_SET = frozenset(SHIM_NAMES)
+
+# Scripts every demo gets after its shims
+NOTIFICATION_SYSTEM_TEMPLATE = "shims/notification_system.js"
+AUTO_RUN_TEMPLATE = "shims/auto_run.js"
+
+# Only counted as referenced when called, since "calculate" is also a common variable name
+CALL_ONLY_REFERENCES = frozenset({"calculate"})
+
+# Functions whose buttons are wired even when the page defines the function itself
+WIRED_WHEN_DEFINED = frozenset({"startTimer"})
+
+# Attributes that mark an element as the trigger of a shim function
+HANDLER_ATTRIBUTES = {
+    'id="start-timer"': "startTimer",
+    'id="startTimer"': "startTimer",
+    'class="start-timer"': "startTimer",
+    'id="calculate-grades"': "calculateGrades",
+    'id="calculateGrades"': "calculateGrades",
+    'class="calculate-grades"': "calculateGrades",
+    'id="calculate-average"': "calculateAverage",
+    'id="calculateAverage"': "calculateAverage",
+    'class="calculate-average"': "calculateAverage",
+}
+
+# Button labels (lowercased, whitespace removed) wired to a shim function when the button has no onclick
+BUTTON_LABEL_HANDLERS = {
+    "calculategrades": "calculateGrades",
+    "grade": "calculateGrades",
+    "computegrades": "calculateGrades",
+    "assigngrades": "calculateGrades",
+    "calculateaverage": "calculateAverage",
+    "calculate": "calculateAverage",
+    "computeaverage": "calculateAverage",
+    "starttimer": "startTimer",
+    "start": "startTimer",
+    "begincountdown": "startTimer",
+    "startcountdown": "startTimer",
+}
+
+ONLOAD_STUB = 'window.onload = function() { console.log("Auto-running enhanced initialization..."); /* Replaced by improved auto-run */ }'
+
+# Each scan below starts with a literal, which the regex engine finds at
+# substring-search speed; one alternation of all of them would be tried at
+# every position and is ~10x slower on a 200 KB demo
+BUTTON_RE = re.compile(r"<button\b(?P<attrs>[^>]*)>(?P<label>[^<]*)</button>", re.IGNORECASE)
+ATTRIBUTE_VALUE_RE = re.compile(
+    '="(?:' + "|".join(sorted({re.escape(attribute.split('"')[1]) for attribute in HANDLER_ATTRIBUTES})) + ')"'
+)
+ONLOAD_RE = re.compile(r"window\.onload\s*=\s*function\s*\(\s*\)\s*\{[^}]*\}")
+SCRIPT_RE = re.compile(r"<script\b[^>]*>(.*?)</script>", re.DOTALL)
+EVENT_ATTRIBUTE_RE = re.compile(r'on[a-z]+="([^"]*)"')
+
+# Runs over the extracted JavaScript only, which is a small part of a long demo
+SYMBOL_RE = re.compile(r"(?:\b(?P<keyword>function|const|let|var)\s+)?(?P<name>[A-Za-z_$][\w$]*)(?P<call>\s*\()?")
+
+def scan_symbols(html: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Find which shim functions a demo's JavaScript defines and which it references.
+
+    Only script blocks and inline event handlers are read, so a name that
+    appears in the page's text or a code sample does not count.
+
+    Args:
+        html: Demo HTML
+
+    Returns:
+        Tuple[Set[str], Set[str]]: Defined names and referenced names
+    """
+    code = [match.group(1) for match in SCRIPT_RE.finditer(html)]
+    code.extend(match.group(1) for match in EVENT_ATTRIBUTE_RE.finditer(html))
+    defined: Set[str] = set()
+    referenced: Set[str] = set()
+    for match in SYMBOL_RE.finditer("\n".join(code)):
+        name = match.group("name")
+        if name not in SHIM_NAME_SET:
+            continue
+        if match.group("keyword"):
+            defined.add(name)
+        elif match.group("call") or name not in CALL_ONLY_REFERENCES:
+            referenced.add(name)
+    return defined, referenced
+
+def handler_edits(html: str, wired: Set[str]) -> List[Tuple[int, int, str]]:
+    """
+    Find the trigger elements of the wired functions and the onclick each one gets.
+
+    Args:
+        html: Demo HTML
+        wired: Functions whose trigger elements are wired
+
+    Returns:
+        List[Tuple[int, int, str]]: (start, end, replacement) insertions
+    """
+    edits: List[Tuple[int, int, str]] = []
+    for match in ATTRIBUTE_VALUE_RE.finditer(html):
+        function = HANDLER_ATTRIBUTES.get(html[html.rfind(" ", 0, match.start()) + 1:match.end()])
+        if function in wired:
+            edits.append((match.end(), match.end(), f' onclick="{function}()"'))
+    for match in BUTTON_RE.finditer(html):
+        function = BUTTON_LABEL_HANDLERS.get("".join(match.group("label").split()).lower())
+        attrs = match.group("attrs")
+        if function in wired and "onclick" not in attrs and not any(
+            attribute in attrs and HANDLER_ATTRIBUTES[attribute] in wired for attribute in HANDLER_ATTRIBUTES
+        ):
+            position = match.start() + len("<button")
+            edits.append((position, position, f' onclick="{function}()"'))
+    return edits
+
+def postprocess_demo(html: str) -> Tuple[str, List[str]]:
+    """
+    Inject missing functions, wire up buttons and add the auto-run scripts in one rewrite.
+
+    Args:
+        html: Demo HTML
+
+    Returns:
+        Tuple[str, List[str]]: The fixed HTML and the names of the shims injected
+    """
+    defined, referenced = scan_symbols(html)
+    missing = [name for name in SHIM_NAMES if name in referenced and name not in defined]
+    wired = set(missing) | {name for name in WIRED_WHEN_DEFINED if name in referenced or name in defined}
+
+    # (start, end, replacement), applied left to right
+    edits = handler_edits(html, wired) if wired else []
+    if "window.onload" in html:
+        edits.extend((start, end, ONLOAD_STUB) for start, end in (match.span() for match in ONLOAD_RE.finditer(html)))
+
+    shims = dict(FUNCTION_SHIMS)
+    script = "".join(render_template(shims[name]) for name in missing)
+    script += render_template(NOTIFICATION_SYSTEM_TEMPLATE) + render_template(AUTO_RUN_TEMPLATE)
+    script_end = html.rfind("</script>")
+    if script_end >= 0:
+        edits.append((script_end, script_end, script))
+    else:
+        edits.append((len(html), len(html), f"\n<script>{script}</script>"))
+
+    pieces: List[str] = []
+    cursor = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[0]):
+        pieces.append(html[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(html[cursor:])
+    return "".join(pieces), missing
@@ -0,0 +1,61 @@
+"""
+HTML/JavaScript payloads for generated and fallback demos.
+
+The payloads (the JavaScript shims injected into generated demos, the
+canned fallback demos and the quota-exceeded page) live as template files
+under templates/demos/ instead of string literals in the Python modules, so
+they are not parsed or held in memory until a request needs one. Jinja2 is
+imported on first use, each template is compiled once, and a template
+without parameters is rendered once and reused.
+
+Templates are rendered without autoescaping: the payloads are trusted markup
+and scripts, and the few values substituted into them are placed exactly as
+the inline f-strings did.
+"""
+import os
+from functools import lru_cache
+from typing import Any
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates", "demos")
+
+@lru_cache(maxsize=1)
+def get_environment() -> Any:
+    """The Jinja2 environment for the demo templates, created on first use."""
+    import jinja2
+
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+        autoescape=False,
+        keep_trailing_newline=True,
+        # The files only change with a deploy, so compiled templates never need rechecking
+        auto_reload=False,
+        cache_size=-1,
+    )
+
+def render_template(name: str, **values: Any) -> str:
+    """
+    Render a demo template.
+
+    Args:
+        name: Template path relative to templates/demos, e.g. "quota_exceeded.html"
+        **values: Template parameters
+
+    Returns:
+        str: The rendered payload
+    """
+    if not values:
+        return static_payload(name)
+    return get_environment().get_template(name).render(**values)
+
+@lru_cache(maxsize=None)
+def static_payload(name: str) -> str:
+    """
+    Render a template without parameters once and keep the result.
+
+    Args:
+        name: Template path relative to templates/demos
+
+    Returns:
+        str: The rendered payload
+    """
+    return get_environment().get_template(name).render()
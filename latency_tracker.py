@@ -0,0 +1,75 @@
+"""
+Rolling latency percentiles per named operation.
+
+Used by ai_service.py to pick the hedging delay for each AI endpoint and to
+report tail latency (p95/p99) for attempts and end-to-end calls.
+"""
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+class LatencyTracker:
+    """Thread-safe window of recent latencies per operation name."""
+
+    def __init__(self, window: int = 500, min_samples: int = 20):
+        self.window = window
+        self.min_samples = min_samples
+        self.samples: Dict[str, Deque[float]] = {}
+        self.totals: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Record one latency sample.
+
+        Args:
+            name: Operation name (e.g. "realworld" or "realworld.attempt")
+            seconds: Observed latency
+        """
+        with self.lock:
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.window)
+                self.totals[name] = 0
+            self.samples[name].append(seconds)
+            self.totals[name] += 1
+
+    def percentile(self, name: str, pct: float) -> Optional[float]:
+        """
+        Get a latency percentile over the recent window.
+
+        Args:
+            name: Operation name
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Latency in seconds, or None with fewer than min_samples samples
+        """
+        with self.lock:
+            samples = sorted(self.samples.get(name, ()))
+        if len(samples) < self.min_samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get p50/p95/p99/max in milliseconds for every operation.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per operation, the sample counts and percentiles
+        """
+        with self.lock:
+            snapshot = {name: (sorted(samples), self.totals[name]) for name, samples in self.samples.items()}
+        stats = {}
+        for name, (samples, total) in snapshot.items():
+            def at(pct: float) -> float:
+                return round(samples[min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))] * 1000, 1)
+            stats[name] = {
+                "count": total,
+                "window": len(samples),
+                "p50_ms": at(50),
+                "p95_ms": at(95),
+                "p99_ms": at(99),
+                "max_ms": round(samples[-1] * 1000, 1),
+            }
+        return stats
@@ -0,0 +1,136 @@
+"""
+Process-wide OpenAI client manager.
+
+Creating an ``OpenAI()`` client per request means every AI call pays for a
+fresh TCP/TLS handshake. Clients created here are built lazily on first use,
+share one tuned HTTP connection pool with keep-alive per API key, and are
+reused by every function in ai_service.py. Request handlers use the
+``AsyncOpenAI`` variants so a slow completion never blocks the event loop.
+
+Tuning via environment variables:
+    OPENAI_TIMEOUT              total request timeout in seconds (default 30)
+    OPENAI_CONNECT_TIMEOUT      connect timeout in seconds (default 5)
+    OPENAI_MAX_CONNECTIONS      connection pool size (default 20)
+    OPENAI_MAX_KEEPALIVE        idle keep-alive connections kept open (default 10)
+    OPENAI_KEEPALIVE_EXPIRY     seconds an idle connection is kept (default 60)
+    OPENAI_MAX_RETRIES          SDK-level retries (default 0; ai_service.py retries
+                                within each endpoint's latency budget instead)
+    OPENAI_BASE_URL             API base URL (default: the OpenAI API); point it at
+                                openai_standin.py to benchmark offline
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+OPENAI_TIMEOUT_SECONDS = float(os.environ.get("OPENAI_TIMEOUT", "30"))
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", "20"))
+OPENAI_MAX_KEEPALIVE = int(os.environ.get("OPENAI_MAX_KEEPALIVE", "10"))
+OPENAI_KEEPALIVE_EXPIRY_SECONDS = float(os.environ.get("OPENAI_KEEPALIVE_EXPIRY", "60"))
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", "0"))
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL") or None
+
+# Keys can be swapped at runtime via /api/check-openai-status, so clients are
+# cached per key; only the most recently used few are kept open.
+MAX_CACHED_CLIENTS = 4
+
+_clients: "OrderedDict[str, Any]" = OrderedDict()
+_clients_lock = threading.Lock()
+_async_clients: "OrderedDict[str, Any]" = OrderedDict()
+
+def _http_client_options() -> dict:
+    """Timeout and pool settings shared by the sync and async HTTP clients."""
+    import httpx
+
+    return {
+        "timeout": httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=OPENAI_CONNECT_TIMEOUT_SECONDS),
+        "limits": httpx.Limits(
+            max_connections=OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+            keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    }
+
+def get_openai_client(api_key: Optional[str] = None) -> Any:
+    """
+    Get the shared OpenAI client for an API key, creating it on first use.
+    
+    Args:
+        api_key (Optional[str]): API key to use (defaults to OPENAI_API_KEY)
+    
+    Returns:
+        openai.OpenAI: Client backed by a pooled keep-alive HTTP connection
+    """
+    api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+    with _clients_lock:
+        client = _clients.get(api_key)
+        if client is not None:
+            _clients.move_to_end(api_key)
+            return client
+
+        import httpx
+        from openai import OpenAI
+
+        http_client = httpx.Client(**_http_client_options())
+        client = OpenAI(api_key=api_key, base_url=OPENAI_BASE_URL, http_client=http_client, max_retries=OPENAI_MAX_RETRIES)
+        _clients[api_key] = client
+
+        # Evicted clients may still be serving a request, so they are left
+        # to be closed when garbage collected rather than closed here
+        while len(_clients) > MAX_CACHED_CLIENTS:
+            _clients.popitem(last=False)
+
+        return client
+
+def close_openai_clients() -> None:
+    """Close every cached client and its connection pool (call on shutdown)."""
+    with _clients_lock:
+        while _clients:
+            _, client = _clients.popitem()
+            try:
+                client.close()
+            except Exception as e:
+                print(f"Error closing OpenAI client: {e}")
+
+def get_async_openai_client(api_key: Optional[str] = None) -> Any:
+    """
+    Get the shared AsyncOpenAI client for an API key, creating it on first use.
+    
+    Async clients must only be used from the event loop that serves the app.
+    
+    Args:
+        api_key (Optional[str]): API key to use (defaults to OPENAI_API_KEY)
+    
+    Returns:
+        openai.AsyncOpenAI: Client backed by a pooled keep-alive HTTP connection
+    """
+    api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+    with _clients_lock:
+        client = _async_clients.get(api_key)
+        if client is not None:
+            _async_clients.move_to_end(api_key)
+            return client
+
+        import httpx
+        from openai import AsyncOpenAI
+
+        http_client = httpx.AsyncClient(**_http_client_options())
+        client = AsyncOpenAI(api_key=api_key, base_url=OPENAI_BASE_URL, http_client=http_client, max_retries=OPENAI_MAX_RETRIES)
+        _async_clients[api_key] = client
+
+        while len(_async_clients) > MAX_CACHED_CLIENTS:
+            _async_clients.popitem(last=False)
+
+        return client
+
+async def close_async_openai_clients() -> None:
+    """Close every cached async client and its connection pool (call on shutdown)."""
+    with _clients_lock:
+        clients = list(_async_clients.values())
+        _async_clients.clear()
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"Error closing async OpenAI client: {e}")
@@ -0,0 +1,410 @@
+"""
+Local OpenAI-compatible stand-in server for load tests and benchmarks.
+
+Serves the parts of the OpenAI API that ai_service.py uses (chat completions,
+with JSON mode and streaming, and models.list) with configurable latency,
+injected errors and canned or templated responses, so the caches,
+single-flight coalescing, retries, hedging and the circuit breaker can be
+measured offline and reproducibly, without quota or network noise.
+
+Point the app at it with the OPENAI_BASE_URL switch in openai_client.py:
+
+    python openai_standin.py --port 8089 --latency lognormal:1.2,0.4 --seed 1
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 \\
+    OPENAI_API_KEY=sk-standin-000000000000000000000000 python app.py
+
+The key must still look like a real one (30+ characters); any key is accepted
+unless --auth-fail is set.
+
+Latency specs (seconds):
+    fixed:S               always S
+    uniform:LOW,HIGH      uniform between LOW and HIGH
+    normal:MEAN,STDDEV    normal, clipped at zero
+    lognormal:MEDIAN,SIGMA
+                          log-normal with a long tail, the usual shape of LLM latency
+Use --kind-latency KIND=SPEC to override it for one kind of request.
+
+Requests are classified from their prompt as one of: realworld, demo,
+complexity, combined, concept_examples or ask. A --responses file holds a
+JSON list of rules, tried in order before the built-in canned responses:
+
+    [{"kind": "realworld", "match": "class", "content": "{\\"title\\": \\"$model\\", ...}"}]
+
+"kind" and "match" (a substring of the prompt) are optional filters. Content
+is a string.Template with $model, $kind, $request_number and $prompt_chars.
+
+GET /stats reports requests, injected errors and tokens per kind; POST /config
+changes the latency and error settings of a running server (e.g. to trip the
+breaker with {"quota": true} halfway through a run); POST /stats/reset clears
+the counters.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import string
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+MODELS = ("gpt-4o", "gpt-4o-mini", "gpt-3.5-turbo")
+
+# Rough offline token estimate; good enough for relative numbers
+CHARS_PER_TOKEN = 4
+
+# Characters per streamed chunk
+STREAM_CHUNK_CHARS = 16
+
+CANNED_RESPONSES = {
+    "realworld": {
+        "title": "Order Validation Service",
+        "description": "E-commerce backends run checks like these before accepting an order.",
+        "real_world_code": "def validate_order(order):\n    errors = []\n    if not order.get('items'):\n        errors.append('Order has no items')\n    for item in order.get('items', []):\n        if item['quantity'] <= 0:\n            errors.append(f\"Invalid quantity for {item['sku']}\")\n    return {'is_valid': not errors, 'errors': errors}"
+    },
+    "complexity": {
+        "complexity_score": 3,
+        "complexity_factors": ["One loop over the input", "A single conditional branch"],
+        "simplification_suggestions": ["Extract the loop body into a named function"],
+        "explanation": "The code runs one pass over its data with a simple condition, so it is easy to follow.",
+        "key_concepts": ["loops", "conditionals"],
+        "real_world_comparison": "Like checking every item on a shopping list once."
+    },
+    "concept_examples": {
+        "title": "Checking a Temperature",
+        "description": "Conditionals let a program choose what to do based on data.",
+        "code": "temperature = 25\n\n# Decide what to wear\nif temperature > 20:\n    print('T-shirt weather')\nelse:\n    print('Bring a jacket')",
+        "explanation": "The program compares the temperature with 20 and prints one of two messages."
+    },
+    "ask": "Good question! Your code walks through the data once and decides what to do with each item. "
+           "Try adding a print statement inside the loop to watch each step as it happens.",
+}
+
+CANNED_DEMO_HTML = (
+    "<div style=\"padding:20px; background:#1a1b26; color:#c0caf5; border-radius:8px\">"
+    "<h3 style=\"color:#1DB954\">Order Checker</h3>"
+    "<input id=\"qty\" type=\"number\" value=\"2\" />"
+    "<button onclick=\"checkOrder()\">Check</button>"
+    "<div id=\"result\"></div>"
+    "<script>function checkOrder() {"
+    " const qty = Number(document.getElementById('qty').value);"
+    " document.getElementById('result').textContent = qty > 0 ? 'Order accepted' : 'Invalid quantity';"
+    "}</script></div>"
+)
+
+def parse_latency(spec: str) -> Tuple[str, List[float]]:
+    """
+    Parse a latency spec such as "lognormal:1.2,0.4".
+
+    Args:
+        spec: Distribution name and comma-separated parameters
+
+    Returns:
+        Tuple[str, List[float]]: Distribution name and parameters
+
+    Raises:
+        ValueError: If the distribution is unknown or has the wrong number of parameters
+    """
+    name, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value.strip()]
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+    if name not in expected:
+        raise ValueError(f"Unknown latency distribution: {name}")
+    if len(values) != expected[name]:
+        raise ValueError(f"{name} latency takes {expected[name]} parameter(s)")
+    return name, values
+
+def sample_latency(rng: random.Random, distribution: Tuple[str, List[float]]) -> float:
+    name, params = distribution
+    if name == "fixed":
+        return params[0]
+    if name == "uniform":
+        return rng.uniform(params[0], params[1])
+    if name == "normal":
+        return max(0.0, rng.gauss(params[0], params[1]))
+    return rng.lognormvariate(math.log(max(params[0], 1e-6)), params[1])
+
+def classify_request(prompt: str, json_mode: bool) -> str:
+    """
+    Tell which ai_service.py feature a chat request comes from.
+
+    Args:
+        prompt: All message contents joined
+        json_mode: Whether the request asked for a JSON object
+
+    Returns:
+        str: realworld, demo, complexity, combined, concept_examples or ask
+    """
+    # The combined call lists each part it asks for as a top-level key
+    if sum(f'"{key}":' in prompt for key in ("real_world", "demo_html", "complexity")) > 1:
+        return "combined"
+    if "Interactive Demo:" in prompt and not json_mode:
+        return "demo"
+    if "complexity_score" in prompt:
+        return "complexity"
+    if "real_world_code" in prompt:
+        return "realworld"
+    if json_mode and '"explanation"' in prompt:
+        return "concept_examples"
+    return "ask"
+
+def canned_content(kind: str) -> str:
+    if kind == "combined":
+        return json.dumps({
+            "real_world": CANNED_RESPONSES["realworld"],
+            "demo_html": CANNED_DEMO_HTML,
+            "complexity": CANNED_RESPONSES["complexity"],
+        })
+    if kind == "demo":
+        return f"Real-World Example: Online stores validate order quantities before checkout.\n\nInteractive Demo:\n{CANNED_DEMO_HTML}"
+    if kind == "ask":
+        return CANNED_RESPONSES["ask"]
+    return json.dumps(CANNED_RESPONSES[kind])
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+class StandInState:
+    """Settings and counters of a running stand-in server."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.lock = threading.Lock()
+        self.rng = random.Random(args.seed)
+        self.latency = parse_latency(args.latency)
+        self.kind_latency = {}
+        for override in args.kind_latency or []:
+            kind, _, spec = override.partition("=")
+            self.kind_latency[kind] = parse_latency(spec)
+        self.token_delay = args.token_delay
+        self.error_rate = args.error_rate
+        self.rate_limit_rate = args.rate_limit_rate
+        self.hang_rate = args.hang_rate
+        self.hang_seconds = args.hang_seconds
+        self.quota = args.quota
+        self.auth_fail = args.auth_fail
+        self.rules = []
+        if args.responses:
+            with open(args.responses, encoding="utf-8") as f:
+                self.rules = json.load(f)
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.request_number = 0
+            self.stats: Dict[str, Dict[str, int]] = {}
+
+    def count(self, kind: str, counter: str, amount: int = 1) -> None:
+        with self.lock:
+            stats = self.stats.setdefault(kind, {
+                "requests": 0, "streamed": 0, "server_errors": 0, "rate_limited": 0,
+                "quota_errors": 0, "auth_errors": 0, "hung": 0, "prompt_tokens": 0, "completion_tokens": 0,
+            })
+            stats[counter] += amount
+
+    def next_request_number(self) -> int:
+        with self.lock:
+            self.request_number += 1
+            return self.request_number
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.rng.random()
+
+    def sample(self, kind: str) -> float:
+        with self.lock:
+            return sample_latency(self.rng, self.kind_latency.get(kind, self.latency))
+
+    def update(self, changes: Dict[str, Any]) -> None:
+        """
+        Apply settings from POST /config.
+
+        Args:
+            changes: Any of latency, kind_latency ({kind: spec}), token_delay, error_rate,
+                rate_limit_rate, hang_rate, hang_seconds, quota, auth_fail
+        """
+        with self.lock:
+            for field, value in changes.items():
+                if field == "latency":
+                    self.latency = parse_latency(value)
+                elif field == "kind_latency":
+                    self.kind_latency = {kind: parse_latency(spec) for kind, spec in value.items()}
+                elif field in ("token_delay", "error_rate", "rate_limit_rate", "hang_rate", "hang_seconds"):
+                    setattr(self, field, float(value))
+                elif field in ("quota", "auth_fail"):
+                    setattr(self, field, bool(value))
+                else:
+                    raise ValueError(f"Unknown setting: {field}")
+
+    def settings(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "latency": self.latency,
+                "kind_latency": dict(self.kind_latency),
+                "token_delay": self.token_delay,
+                "error_rate": self.error_rate,
+                "rate_limit_rate": self.rate_limit_rate,
+                "hang_rate": self.hang_rate,
+                "hang_seconds": self.hang_seconds,
+                "quota": self.quota,
+                "auth_fail": self.auth_fail,
+            }
+
+    def content_for(self, kind: str, prompt: str, model: str, request_number: int) -> str:
+        for rule in self.rules:
+            if rule.get("kind") not in (None, kind) or rule.get("match", "") not in prompt:
+                continue
+            return string.Template(rule["content"]).safe_substitute(
+                model=model, kind=kind, request_number=request_number, prompt_chars=len(prompt)
+            )
+        return canned_content(kind)
+
+def error_response(status: int, message: str, error_type: str, code: Optional[str]) -> JSONResponse:
+    # Same body shape as the OpenAI API, so the SDK raises the matching exception class
+    return JSONResponse(status_code=status, content={"error": {"message": message, "type": error_type, "param": None, "code": code}})
+
+def create_app(state: StandInState) -> FastAPI:
+    app = FastAPI(title="OpenAI stand-in")
+
+    def auth_error() -> JSONResponse:
+        return error_response(401, "Incorrect API key provided (stand-in).", "invalid_request_error", "invalid_api_key")
+
+    @app.get("/v1/models")
+    async def list_models():
+        if state.auth_fail:
+            return auth_error()
+        return {"object": "list", "data": [{"id": model, "object": "model", "created": 0, "owned_by": "standin"} for model in MODELS]}
+
+    @app.get("/v1/models/{model}")
+    async def retrieve_model(model: str):
+        if state.auth_fail:
+            return auth_error()
+        return {"id": model, "object": "model", "created": 0, "owned_by": "standin"}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages") or []
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+        model = body.get("model", MODELS[0])
+        stream = bool(body.get("stream"))
+        kind = classify_request(prompt, json_mode)
+        request_number = state.next_request_number()
+        state.count(kind, "requests")
+
+        if state.auth_fail:
+            state.count(kind, "auth_errors")
+            return auth_error()
+        if state.quota:
+            state.count(kind, "quota_errors")
+            return error_response(429, "You exceeded your current quota, please check your plan and billing details.",
+                                  "insufficient_quota", "insufficient_quota")
+
+        latency = state.sample(kind)
+        roll = state.roll()
+        if roll < state.hang_rate:
+            # Never answers within any sane client timeout
+            state.count(kind, "hung")
+            await asyncio.sleep(state.hang_seconds)
+        elif roll < state.hang_rate + state.rate_limit_rate:
+            state.count(kind, "rate_limited")
+            return error_response(429, "Rate limit reached for requests (stand-in).", "requests", "rate_limit_exceeded")
+        elif roll < state.hang_rate + state.rate_limit_rate + state.error_rate:
+            # Servers usually fail after doing some of the work
+            await asyncio.sleep(latency / 2)
+            state.count(kind, "server_errors")
+            return error_response(500, "The server had an error while processing your request (stand-in).", "server_error", None)
+
+        content = state.content_for(kind, prompt, model, request_number)
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(content)
+        state.count(kind, "prompt_tokens", prompt_tokens)
+        state.count(kind, "completion_tokens", completion_tokens)
+        completion_id = f"chatcmpl-standin-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        if not stream:
+            await asyncio.sleep(latency)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            }
+
+        state.count(kind, "streamed")
+
+        async def chunks():
+            def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+                payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                           "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+                return f"data: {json.dumps(payload)}\n\n"
+
+            # The sampled latency is the time to first token
+            await asyncio.sleep(latency)
+            yield chunk({"role": "assistant", "content": ""})
+            for start in range(0, len(content), STREAM_CHUNK_CHARS):
+                yield chunk({"content": content[start:start + STREAM_CHUNK_CHARS]})
+                await asyncio.sleep(state.token_delay)
+            yield chunk({}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        with state.lock:
+            per_kind = {kind: dict(counts) for kind, counts in state.stats.items()}
+            total = state.request_number
+        return {"requests": total, "kinds": per_kind, "settings": state.settings()}
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        state.reset_stats()
+        return {"status": "ok"}
+
+    @app.post("/config")
+    async def configure(request: Request):
+        try:
+            state.update(await request.json())
+        except (ValueError, TypeError, AttributeError) as e:
+            return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+        return {"status": "ok", "settings": state.settings()}
+
+    return app
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="lognormal:1.0,0.5", help="latency of every request (see module docs)")
+    parser.add_argument("--kind-latency", action="append", metavar="KIND=SPEC",
+                        help="latency for one kind of request, e.g. demo=lognormal:4,0.4 (repeatable)")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with a 429")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="fraction of requests that never answer in time")
+    parser.add_argument("--hang-seconds", type=float, default=300.0, help="how long a hung request sleeps")
+    parser.add_argument("--quota", action="store_true", help="answer every completion with insufficient_quota")
+    parser.add_argument("--auth-fail", action="store_true", help="reject every request as an invalid API key")
+    parser.add_argument("--responses", help="JSON file of response rules (see module docs)")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible latencies and errors")
+    return parser
+
+def main() -> None:
+    args = build_parser().parse_args()
+
+    state = StandInState(args)
+    print(f"OpenAI stand-in listening on http://{args.host}:{args.port}/v1")
+    uvicorn.run(create_app(state), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Prompt building and token accounting for ai_service.py.
+
+Prompts are written as indented triple-quoted templates so they read well in
+the source; render_prompt() dedents and compacts them before the values are
+filled in, so the model is not sent the source indentation. User code longer
+than the prompt's code budget is trimmed by fit_code(), which keeps imports,
+signatures and control flow and elides the rest, instead of being pasted in
+whole.
+
+Tokens are counted offline with tiktoken when it is installed, and estimated
+from the text otherwise. TokenLedger keeps input/output totals per endpoint.
+
+Configuration via environment variables:
+    PROMPT_CODE_TOKEN_BUDGET    tokens of user code a prompt may contain (default 1500)
+"""
+import ast
+import bisect
+import os
+import re
+import textwrap
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+PROMPT_CODE_TOKEN_BUDGET = int(os.environ.get("PROMPT_CODE_TOKEN_BUDGET", "1500"))
+
+# Tokens added per chat message and for the reply primer (OpenAI's counting guide)
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMER_TOKENS = 3
+
+# Rough pieces a BPE tokenizer splits text into, for the estimate without tiktoken
+TOKEN_ESTIMATE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|\s+|[^\sA-Za-z\d]")
+
+# Share of the code budget filled before elision markers are accounted for
+FIT_CODE_FILL_RATIO = 0.9
+
+# Most of the budget the omission markers may take; once they reach it, only lines that
+# extend kept code (and so add no marker) are kept, instead of more scattered headers
+FIT_CODE_MARKER_SHARE = 0.25
+
+# Attempts at shrinking the selection until the trimmed code, markers included, fits
+FIT_CODE_MAX_PASSES = 4
+
+# Line ranks for fit_code: lower ranks are kept first
+RANK_OUTLINE = 0      # imports, class and function signatures
+RANK_FLOW = 1         # control-flow headers and block ends
+RANK_BODY_START = 2   # first lines of each block
+RANK_OTHER = 3
+
+# Lines of each block body that rank as RANK_BODY_START
+BODY_START_LINES = 2
+
+OUTLINE_LINE_RE = re.compile(
+    r"^\s*(?:import|from|package|#include|using|@)\b|\b(?:class|interface|enum|function|def)\b"
+    r"|^\s*(?:public|private|protected|static)\b.*\(.*\)\s*(?:throws\s+[\w.,\s]+)?\{?\s*$"
+)
+FLOW_LINE_RE = re.compile(r"^\s*(?:if|elif|else|for|while|do|switch|case|try|except|catch|finally|with|return)\b|^\s*[}\])]+[;,)]*\s*$")
+
+@lru_cache(maxsize=None)
+def compact_template(template: str) -> str:
+    """
+    Dedent a prompt template and drop trailing whitespace and repeated blank lines.
+
+    Args:
+        template: Template text as written in the source
+
+    Returns:
+        str: The compacted template
+    """
+    first, _, rest = template.partition("\n")
+    if first.strip():
+        # Text starts right after the opening quotes; only the following lines are indented
+        text = first.strip() + "\n" + textwrap.dedent(rest)
+    else:
+        text = textwrap.dedent(rest)
+    lines = [line.rstrip() for line in text.strip().split("\n")]
+    compacted: List[str] = []
+    for line in lines:
+        if not line and compacted and not compacted[-1]:
+            continue
+        compacted.append(line)
+    return "\n".join(compacted)
+
+def render_prompt(template: str, **values: Any) -> str:
+    """
+    Compact a template and fill in its str.format() fields.
+
+    Args:
+        template: Template text with {field} placeholders ({{ and }} for literal braces)
+        **values: Field values; inserted verbatim, so multi-line code keeps its indentation
+
+    Returns:
+        str: The prompt
+    """
+    return compact_template(template).format(**values)
+
+@lru_cache(maxsize=1)
+def get_encoding() -> Optional[Any]:
+    """The tiktoken encoding used by gpt-4o, or None if tiktoken is not installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use; offline hosts fall back to the estimate
+        print(f"Token encoding unavailable, estimating token counts: {e}")
+        return None
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens of a text without calling the API.
+
+    Args:
+        text: Any text
+
+    Returns:
+        int: Exact count with tiktoken, otherwise an estimate
+    """
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    # Long words and runs of whitespace usually take more than one token
+    return sum(1 + len(piece) // 8 if not piece.isspace() else 1 + len(piece) // 16
+               for piece in TOKEN_ESTIMATE_RE.findall(text))
+
+def count_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """
+    Count the input tokens of a chat request.
+
+    Args:
+        messages: Chat messages
+
+    Returns:
+        int: Token count including per-message overhead
+    """
+    total = REPLY_PRIMER_TOKENS
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS + count_tokens(str(message.get("content") or ""))
+    return total
+
+def rank_python_lines(code: str, lines: List[str]) -> Optional[List[int]]:
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+
+    ranks = [RANK_OTHER] * len(lines)
+
+    def mark(start: int, end: int, rank: int) -> None:
+        for index in range(start - 1, min(end, len(lines))):
+            ranks[index] = min(ranks[index], rank)
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            mark(node.lineno, node.end_lineno or node.lineno, RANK_OUTLINE)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            mark(start, node.body[0].lineno - 1 if node.body[0].lineno > node.lineno else node.lineno, RANK_OUTLINE)
+        elif isinstance(node, (ast.If, ast.For, ast.AsyncFor, ast.While, ast.Try, ast.With, ast.AsyncWith, ast.Return)):
+            mark(node.lineno, node.lineno, RANK_FLOW)
+        if isinstance(getattr(node, "body", None), list) and node.body and isinstance(node.body[0], ast.stmt):
+            first = node.body[0].lineno
+            mark(first, first + BODY_START_LINES - 1, RANK_BODY_START)
+    return ranks
+
+def rank_lines(code: str, lines: List[str], language: str) -> List[int]:
+    """Rank each line by how much it tells the model about the program's structure."""
+    if language == "python":
+        ranks = rank_python_lines(code, lines)
+        if ranks is not None:
+            return ranks
+
+    ranks = []
+    previous_opens_block = False
+    for line in lines:
+        if OUTLINE_LINE_RE.search(line):
+            rank = RANK_OUTLINE
+        elif FLOW_LINE_RE.search(line):
+            rank = RANK_FLOW
+        elif previous_opens_block:
+            rank = RANK_BODY_START
+        else:
+            rank = RANK_OTHER
+        ranks.append(rank)
+        stripped = line.rstrip()
+        previous_opens_block = stripped.endswith(("{", ":"))
+    return ranks
+
+def fit_code(code: str, language: str = "python", max_tokens: int = PROMPT_CODE_TOKEN_BUDGET) -> str:
+    """
+    Trim code to a token budget, keeping the lines that describe its structure.
+
+    Imports and signatures are kept first, then control-flow headers, then
+    the first lines of each block, then everything else in source order.
+    Each run of dropped lines becomes one "... N lines omitted" comment, and
+    the comment is paid for out of the budget: a line is only kept if it and
+    the comments it adds fit, and a run of dropped lines that costs no more
+    than its comment is kept instead.
+
+    Args:
+        code: The user's code
+        language: The programming language (picks the comment syntax and parser)
+        max_tokens: Token budget for the code
+
+    Returns:
+        str: The code unchanged if it fits, otherwise the trimmed code
+    """
+    if count_tokens(code) <= max_tokens:
+        return code
+
+    lines = code.split("\n")
+    ranks = rank_lines(code, lines, language)
+    order = sorted(range(len(lines)), key=lambda i: (ranks[i], i))
+    costs = [count_tokens(line) + 1 for line in lines]
+    comment = "#" if language == "python" else "//"
+    budget = max_tokens * FIT_CODE_FILL_RATIO
+    for _ in range(FIT_CODE_MAX_PASSES):
+        kept = select_lines(lines, order, costs, comment, budget)
+        fitted = elide_lines(lines, kept, comment)
+        total = count_tokens(fitted)
+        if total <= max_tokens:
+            break
+        # Token counts of joined lines are not exactly additive; shrink the budget by the overshoot and try again
+        budget *= max_tokens / total * FIT_CODE_FILL_RATIO
+    print(f"Trimmed {language} code from {len(lines)} to {len(kept)} lines to fit {max_tokens} tokens")
+    return fitted
+
+def omission_marker(lines: List[str], start: int, end: int, comment: str) -> str:
+    """The comment that replaces the dropped lines start..end-1."""
+    count = end - start
+    indent = re.match(r"\s*", lines[start]).group()
+    return f"{indent}{comment} ... {count} line{'' if count == 1 else 's'} omitted"
+
+def select_lines(lines: List[str], order: List[int], costs: List[int], comment: str, budget: float) -> set:
+    """
+    Pick the lines to keep, in order of preference, within a token budget that includes the omission markers.
+
+    Args:
+        lines: The code's lines
+        order: Line indexes, most important first
+        costs: Tokens of each line, newline included
+        comment: Line comment syntax of the language
+        budget: Tokens available for kept lines and markers
+
+    Returns:
+        set: Indexes of the kept lines
+    """
+    def marker_cost(start: int, end: int) -> int:
+        return count_tokens(omission_marker(lines, start, end, comment)) + 1 if end > start else 0
+
+    # Kept indexes in source order, with sentinels; everything between two neighbours is one gap
+    kept_sorted = [-1, len(lines)]
+    markers = marker_cost(0, len(lines))
+    used = markers
+    candidates = order
+    while candidates:
+        # Lines passed over for lack of marker budget are retried once a neighbour is kept
+        passed_over = []
+        for index in candidates:
+            position = bisect.bisect(kept_sorted, index)
+            before, after = kept_sorted[position - 1], kept_sorted[position]
+            added_markers = marker_cost(before + 1, index) + marker_cost(index + 1, after) - marker_cost(before + 1, after)
+            if added_markers > 0 and markers + added_markers > budget * FIT_CODE_MARKER_SHARE:
+                passed_over.append(index)
+            elif used + costs[index] + added_markers <= budget:
+                kept_sorted.insert(position, index)
+                used += costs[index] + added_markers
+                markers += added_markers
+        candidates = passed_over if len(passed_over) < len(candidates) else []
+
+    # A gap whose lines cost no more than its marker is cheaper to keep
+    kept = set(kept_sorted[1:-1])
+    for before, after in zip(kept_sorted, kept_sorted[1:]):
+        if after - before > 1 and sum(costs[before + 1:after]) <= marker_cost(before + 1, after):
+            kept.update(range(before + 1, after))
+    return kept
+
+def elide_lines(lines: List[str], kept: set, comment: str) -> str:
+    """Join the kept lines, replacing each run of dropped lines with one omission comment."""
+    fitted: List[str] = []
+    index = 0
+    while index < len(lines):
+        if index in kept:
+            fitted.append(lines[index])
+            index += 1
+            continue
+        start = index
+        while index < len(lines) and index not in kept:
+            index += 1
+        fitted.append(omission_marker(lines, start, index, comment))
+    return "\n".join(fitted)
+
+class TokenLedger:
+    """Thread-safe input/output token totals per endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals: Dict[str, Dict[str, int]] = {}
+
+    def record(self, endpoint: str, input_tokens: int, output_tokens: int, estimated_input_tokens: int) -> None:
+        """
+        Record the tokens of one completed call.
+
+        Args:
+            endpoint: Name of the calling feature
+            input_tokens: Prompt tokens (as billed when the API reports usage)
+            output_tokens: Completion tokens
+            estimated_input_tokens: Prompt tokens counted offline before the call
+        """
+        with self.lock:
+            totals = self.totals.setdefault(endpoint, {
+                "calls": 0, "input_tokens": 0, "output_tokens": 0, "estimated_input_tokens": 0
+            })
+            totals["calls"] += 1
+            totals["input_tokens"] += input_tokens
+            totals["output_tokens"] += output_tokens
+            totals["estimated_input_tokens"] += estimated_input_tokens
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get token totals and per-call averages for every endpoint.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per endpoint, the totals and average input/output tokens per call
+        """
+        with self.lock:
+            snapshot = {endpoint: dict(totals) for endpoint, totals in self.totals.items()}
+        for totals in snapshot.values():
+            totals["avg_input_tokens"] = round(totals["input_tokens"] / totals["calls"], 1)
+            totals["avg_output_tokens"] = round(totals["output_tokens"] / totals["calls"], 1)
+        return snapshot
@@ -0,0 +1,269 @@
+"""
+Outbound rate limiting for OpenAI calls.
+
+Every call takes one request and its token estimate (prompt plus max_tokens,
+which is what OpenAI counts against the tokens-per-minute limit) from two
+token buckets before it goes out. When the buckets are empty, calls wait in
+one priority queue: interactive endpoints go ahead of background work, and
+calls of equal priority go in arrival order. A call whose estimated queue
+wait would run past its deadline is shed right away with RateLimitShed,
+which the callers' fallback paths handle, instead of waiting only to time
+out. A call estimated at more tokens than the tokens-per-minute limit
+could never be granted, so it is rejected up front with RateLimitShed.
+
+Calls wait as asyncio tasks on the event loop that made them.
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+# Priority of calls made inside background_priority() (lower runs first)
+BACKGROUND_PRIORITY = 9
+
+# Priority override for the current thread or task; None means the endpoint's own priority
+call_priority: ContextVar[Optional[int]] = ContextVar("call_priority", default=None)
+
+class RateLimitShed(Exception):
+    """Raised instead of queueing a call that could not start before its deadline."""
+
+@contextmanager
+def background_priority(priority: int = BACKGROUND_PRIORITY) -> Iterator[None]:
+    """Run the calls made in this block (in this thread or task) at a background priority."""
+    token = call_priority.set(priority)
+    try:
+        yield
+    finally:
+        call_priority.reset(token)
+
+class TokenBucket:
+    """Bucket refilled continuously at a per-minute rate, holding at most one minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (amounts over capacity wait for the full refill)."""
+        missing = min(amount, self.capacity) - self.level
+        if amount > self.capacity:
+            missing += amount - self.capacity
+        return max(0.0, missing / self.rate)
+
+class Waiter:
+    """One queued call."""
+
+    def __init__(self, priority: int, sequence: int, endpoint: str, tokens: int, deadline: float,
+                 loop: asyncio.AbstractEventLoop):
+        self.priority = priority
+        self.sequence = sequence
+        self.endpoint = endpoint
+        self.tokens = tokens
+        self.deadline = deadline
+        self.loop = loop
+        self.enqueued = time.monotonic()
+        self.granted = False
+        self.event = asyncio.Event()
+
+    def __lt__(self, other: "Waiter") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+    def wake(self) -> None:
+        self.loop.call_soon_threadsafe(self.event.set)
+
+class OutboundScheduler:
+    """Requests-per-minute and tokens-per-minute limits with a priority queue of waiting calls."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, priorities: Dict[str, int],
+                 default_priority: int = 5, min_start_seconds: float = 0.0):
+        """
+        Args:
+            requests_per_minute: Request limit (0 disables it)
+            tokens_per_minute: Token limit (0 disables it)
+            priorities: Priority per endpoint (lower runs first)
+            default_priority: Priority of endpoints not in priorities
+            min_start_seconds: A call is shed unless it could start at least this long before its deadline
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.priorities = priorities
+        self.default_priority = default_priority
+        self.min_start_seconds = min_start_seconds
+        self.lock = threading.Lock()
+        self.queue: List[Waiter] = []
+        self.sequence = itertools.count()
+        self.counters: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests is not None or self.tokens is not None
+
+    def count(self, endpoint: str, counter: str, amount: float = 1) -> None:
+        stats = self.counters.setdefault(endpoint, {"granted": 0, "queued": 0, "shed": 0, "too_large": 0, "wait_seconds": 0.0})
+        stats[counter] += amount
+
+    def enqueue(self, endpoint: str, tokens: int, deadline: float, loop: asyncio.AbstractEventLoop) -> Waiter:
+        if self.tokens is not None and tokens > self.tokens.capacity:
+            # Even a full bucket could not cover it; queueing would only hold up the calls behind
+            with self.lock:
+                self.count(endpoint, "too_large")
+            raise RateLimitShed(
+                f"OpenAI call for {endpoint} is estimated at {tokens} tokens, more than the "
+                f"tokens-per-minute limit of {self.tokens.capacity:.0f} (OPENAI_TPM_LIMIT)"
+            )
+        priority = call_priority.get()
+        if priority is None:
+            priority = self.priorities.get(endpoint, self.default_priority)
+        waiter = Waiter(priority, next(self.sequence), endpoint, tokens, deadline, loop)
+        with self.lock:
+            heapq.heappush(self.queue, waiter)
+        return waiter
+
+    def dispatch(self, now: float) -> Optional[float]:
+        """
+        Grant queued calls in priority order while the buckets allow (lock held).
+
+        Returns:
+            Optional[float]: Seconds until the call at the head of the queue can go, or None if the queue is empty
+        """
+        for bucket in (self.requests, self.tokens):
+            if bucket is not None:
+                bucket.refill(now)
+        while self.queue:
+            head = self.queue[0]
+            wait = self.wait_for(1, head.tokens)
+            if wait > 0:
+                # The new head may have been waiting for someone else to go first
+                head.wake()
+                return wait
+            heapq.heappop(self.queue)
+            if self.requests is not None:
+                self.requests.level -= 1
+            if self.tokens is not None:
+                self.tokens.level -= head.tokens
+            head.granted = True
+            self.count(head.endpoint, "granted")
+            self.count(head.endpoint, "wait_seconds", now - head.enqueued)
+            head.wake()
+        return None
+
+    def wait_for(self, requests: int, tokens: int) -> float:
+        waits = [0.0]
+        if self.requests is not None:
+            waits.append(self.requests.wait_time(requests))
+        if self.tokens is not None:
+            waits.append(self.tokens.wait_time(tokens))
+        return max(waits)
+
+    def estimated_wait(self, waiter: Waiter) -> float:
+        """Seconds until the buckets could serve every call queued ahead of waiter, and waiter (lock held)."""
+        ahead = [other for other in self.queue if other < waiter]
+        return self.wait_for(len(ahead) + 1, sum(other.tokens for other in ahead) + waiter.tokens)
+
+    def poll(self, waiter: Waiter) -> Optional[float]:
+        """
+        Dispatch and decide what waiter does next.
+
+        Returns:
+            Optional[float]: None once granted, otherwise seconds to sleep before polling again
+
+        Raises:
+            RateLimitShed: If waiter could no longer start in time (it is removed from the queue)
+        """
+        now = time.monotonic()
+        with self.lock:
+            head_wait = self.dispatch(now)
+            if waiter.granted:
+                return None
+            wait = self.estimated_wait(waiter)
+            if now + wait > waiter.deadline - self.min_start_seconds:
+                self.queue.remove(waiter)
+                heapq.heapify(self.queue)
+                self.count(waiter.endpoint, "shed")
+                if self.queue:
+                    self.queue[0].wake()
+                raise RateLimitShed(
+                    f"OpenAI rate limit queue for {waiter.endpoint} would wait {wait:.1f}s, past its deadline"
+                )
+            if self.queue[0] is waiter:
+                return head_wait
+            # Not at the head: sleep until woken, but re-check the deadline estimate now and then
+            return max(0.05, min(wait, waiter.deadline - now))
+
+    async def acquire_async(self, endpoint: str, tokens: int, deadline: float) -> None:
+        """
+        Wait, without blocking the event loop, until a call may go out.
+
+        Args:
+            endpoint: Name of the calling feature, which picks the priority
+            tokens: Estimated tokens of the call
+            deadline: time.monotonic() value by which the call must finish
+
+        Raises:
+            RateLimitShed: If the call could not start before its deadline, or needs more
+                tokens than the tokens-per-minute limit
+        """
+        if not self.enabled:
+            return
+        waiter = self.enqueue(endpoint, tokens, deadline, asyncio.get_running_loop())
+        queued = False
+        try:
+            while True:
+                delay = self.poll(waiter)
+                if delay is None:
+                    return
+                if not queued:
+                    queued = True
+                    with self.lock:
+                        self.count(endpoint, "queued")
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                waiter.event.clear()
+        except asyncio.CancelledError:
+            # Give up our place (or our grant; the bucket is not refunded) so the queue keeps moving
+            with self.lock:
+                if waiter in self.queue:
+                    self.queue.remove(waiter)
+                    heapq.heapify(self.queue)
+                if self.queue:
+                    self.queue[0].wake()
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get bucket levels, the queue length and per-endpoint counters.
+
+        Returns:
+            Dict[str, Any]: Remaining requests and tokens, calls queued now, and per endpoint
+                the calls granted, queued, shed, rejected as too large for the token limit,
+                and their average queue wait in milliseconds
+        """
+        with self.lock:
+            now = time.monotonic()
+            for bucket in (self.requests, self.tokens):
+                if bucket is not None:
+                    bucket.refill(now)
+            stats: Dict[str, Any] = {
+                "enabled": self.enabled,
+                "requests_available": round(self.requests.level, 1) if self.requests else None,
+                "tokens_available": round(self.tokens.level) if self.tokens else None,
+                "queued_now": len(self.queue),
+            }
+            for endpoint, counts in self.counters.items():
+                endpoint_stats = {name: value for name, value in counts.items() if name != "wait_seconds"}
+                granted = counts["granted"]
+                endpoint_stats["avg_wait_ms"] = round(counts["wait_seconds"] / granted * 1000, 1) if granted else 0.0
+                stats[endpoint] = endpoint_stats
+        return stats
@@ -0,0 +1,358 @@
+"""
+In-memory caches for AI responses keyed by a normalized fingerprint of the user's code.
+
+Beginners submit the same few dozen patterns with different variable names,
+literals and formatting. code_fingerprint() reduces a program to its shape so
+that near-identical programs share one cached AI response. Responses that
+reproduce the code's own names and literals, such as demos, are keyed by
+code_hash() instead.
+"""
+import ast
+import asyncio
+import builtins
+import copy
+import hashlib
+import keyword
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+# Names that keep their meaning across programs and are never alpha-renamed
+BUILTIN_NAMES = frozenset(dir(builtins)) | {"self", "cls"}
+
+# Tokens for the language-agnostic fallback fingerprint (JavaScript, Java, or Python that does not parse)
+FALLBACK_TOKEN_RE = re.compile(
+    r"""(?P<comment>\#[^\n]*|//[^\n]*|/\*.*?\*/)"""
+    r"""|(?P<string>"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|`(?:\\.|[^`\\])*`)"""
+    r"""|(?P<number>\b\d+(?:\.\d+)?\b)"""
+    r"""|(?P<name>[A-Za-z_$][\w$]*)"""
+    r"""|(?P<op>\S)""",
+    re.DOTALL
+)
+
+# Keywords of the JavaScript/Java side that must survive alpha-renaming
+FALLBACK_KEYWORDS = frozenset(keyword.kwlist) | {
+    "function", "var", "let", "const", "new", "this", "switch", "case", "default", "do",
+    "typeof", "instanceof", "extends", "implements", "interface", "public", "private",
+    "protected", "static", "final", "void", "int", "long", "double", "float", "boolean",
+    "char", "String", "System", "console", "null", "undefined", "true", "false", "catch",
+    "throw", "throws", "package", "super", "enum", "abstract"
+}
+
+def bucket_literal(value: Any) -> str:
+    """
+    Map a literal to a coarse bucket so programs that differ only in data match.
+
+    Args:
+        value: A literal value from the source
+
+    Returns:
+        str: The bucket name
+    """
+    if value is None or isinstance(value, bool):
+        return repr(value)
+    if isinstance(value, (int, float)):
+        kind = "int" if isinstance(value, int) else "float"
+        if value == 0:
+            return f"{kind}:zero"
+        if value == 1:
+            return f"{kind}:one"
+        if value < 0:
+            return f"{kind}:negative"
+        return f"{kind}:small" if value < 100 else f"{kind}:large"
+    if isinstance(value, str):
+        if not value:
+            return "str:empty"
+        return "str:word" if len(value.split()) == 1 else "str:text"
+    return type(value).__name__
+
+class FingerprintNormalizer(ast.NodeTransformer):
+    """Alpha-rename user-defined identifiers and bucket literals in a Python AST."""
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+        self.imported: set = set()
+
+    def canonical(self, name: str) -> str:
+        if name in BUILTIN_NAMES or name in self.imported:
+            return name
+        if name not in self.names:
+            self.names[name] = f"v{len(self.names)}"
+        return self.names[name]
+
+    def visit_Import(self, node):
+        # Module names carry the meaning of the program (flask, requests, ...), keep them
+        for alias in node.names:
+            self.imported.add((alias.asname or alias.name).split(".")[0])
+        return node
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            self.imported.add(alias.asname or alias.name)
+        return node
+
+    def visit_Name(self, node):
+        node.id = self.canonical(node.id)
+        return node
+
+    def visit_arg(self, node):
+        node.arg = self.canonical(node.arg)
+        node.annotation = self.visit(node.annotation) if node.annotation else None
+        return node
+
+    def visit_FunctionDef(self, node):
+        node.name = self.canonical(node.name)
+        return self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        node.name = self.canonical(node.name)
+        return self.generic_visit(node)
+
+    def visit_Global(self, node):
+        node.names = [self.canonical(name) for name in node.names]
+        return node
+
+    visit_Nonlocal = visit_Global
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            node.name = self.canonical(node.name)
+        return self.generic_visit(node)
+
+    def visit_Constant(self, node):
+        return ast.Constant(value=bucket_literal(node.value))
+
+def python_fingerprint(code: str) -> Optional[str]:
+    """
+    Fingerprint Python source by its normalized AST.
+
+    Args:
+        code: Python source
+
+    Returns:
+        Optional[str]: Canonical dump of the AST, or None if the code does not parse
+    """
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+
+    normalizer = FingerprintNormalizer()
+    # Imports are visited first so later uses of imported names are kept
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            normalizer.visit(node)
+    tree = normalizer.visit(copy.deepcopy(tree))
+    return ast.dump(tree, annotate_fields=False)
+
+def token_fingerprint(code: str) -> str:
+    """
+    Fingerprint source in any C-like language or Python by a normalized token stream.
+
+    Args:
+        code: Source code
+
+    Returns:
+        str: Space-separated normalized tokens
+    """
+    names: Dict[str, str] = {}
+    tokens = []
+    for match in FALLBACK_TOKEN_RE.finditer(code):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "comment":
+            continue
+        if kind == "string":
+            tokens.append(bucket_literal(text[1:-1]))
+        elif kind == "number":
+            tokens.append(bucket_literal(float(text) if "." in text else int(text)))
+        elif kind == "name" and text not in FALLBACK_KEYWORDS and text not in BUILTIN_NAMES:
+            tokens.append(names.setdefault(text, f"v{len(names)}"))
+        else:
+            tokens.append(text)
+    return " ".join(tokens)
+
+def code_fingerprint(code: str, language: str = "python") -> str:
+    """
+    Compute a cache key that is equal for programs differing only in names, literals and formatting.
+
+    Args:
+        code: The user's code
+        language: The programming language
+
+    Returns:
+        str: Hex digest identifying the program's shape
+    """
+    canonical = python_fingerprint(code) if language == "python" else None
+    if canonical is None:
+        canonical = "tokens:" + token_fingerprint(code)
+    return hashlib.sha256(f"{language}\0{canonical}".encode("utf-8")).hexdigest()
+
+def code_hash(code: str, language: str = "python") -> str:
+    """
+    Compute a cache key for responses that depend on the exact code, such as demos built from its literals.
+
+    Args:
+        code: The user's code
+        language: The programming language
+
+    Returns:
+        str: Hex digest of the language and code
+    """
+    return hashlib.sha256(f"{language}\0exact\0{code}".encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """Thread-safe LRU cache with a per-entry TTL and hit-rate counters."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600,
+                 on_remove: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl_seconds: Default lifetime of an entry
+            on_remove: Called with the key of each entry that expires or is evicted
+                (outside the cache lock), e.g. to drop it from a search index
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.on_remove = on_remove
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
+
+    def removed(self, keys: List[str]) -> None:
+        if self.on_remove is not None:
+            for key in keys:
+                self.on_remove(key)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a fresh entry, counting the hit or miss.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[Any]: A copy of the cached value, or None if absent or expired
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            expired = entry is not None and time.monotonic() >= entry[1]
+            if expired:
+                del self.entries[key]
+                self.counters["expired"] += 1
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+            else:
+                self.entries.move_to_end(key)
+                self.counters["hits"] += 1
+                # Callers may modify the response, so never hand out the stored object
+                value = copy.deepcopy(entry[0])
+        if entry is None:
+            if expired:
+                self.removed([key])
+            return None
+        return value
+
+    def contains(self, key: str) -> bool:
+        """Check for a fresh entry without counting a lookup or refreshing its recency."""
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry is not None and time.monotonic() < entry[1]
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entries over capacity.
+
+        Args:
+            key: Cache key
+            value: Value to store (copied)
+            ttl_seconds: Lifetime of this entry (defaults to the cache TTL)
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        evicted = []
+        with self.lock:
+            self.entries[key] = (copy.deepcopy(value), time.monotonic() + ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                evicted.append(self.entries.popitem(last=False)[0])
+                self.counters["evictions"] += 1
+        self.removed(evicted)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self.lock:
+            keys = list(self.entries)
+            self.entries.clear()
+        self.removed(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit-rate counters for the cache.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, expirations, evictions, size and hit rate
+        """
+        with self.lock:
+            stats = dict(self.counters)
+            stats["size"] = len(self.entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent async calls into one.
+
+    The first caller for a key starts the call; callers arriving while it is
+    in flight await the same task instead of starting their own.
+    """
+
+    def __init__(self):
+        self.in_flight: Dict[Hashable, "asyncio.Task"] = {}
+        self.counters: Dict[str, Dict[str, int]] = {}
+
+    def count(self, key: Hashable, counter: str) -> None:
+        # Keys are (endpoint, fingerprint) tuples; counters are kept per endpoint
+        name = key[0] if isinstance(key, tuple) else "default"
+        stats = self.counters.setdefault(name, {"calls": 0, "coalesced": 0})
+        stats[counter] += 1
+
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run factory() for a key, or join the call already in flight for it.
+
+        Args:
+            key: Identity of the call; equal keys share one result
+            factory: Starts the call when no identical call is in flight
+
+        Returns:
+            Any: The result (a copy for callers that joined an in-flight call)
+        """
+        task = self.in_flight.get(key)
+        if task is None:
+            self.count(key, "calls")
+            task = asyncio.ensure_future(factory())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+            # Shielded so one client disconnecting does not cancel the call for everyone else
+            return await asyncio.shield(task)
+
+        self.count(key, "coalesced")
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get call counts per endpoint.
+
+        Returns:
+            Dict[str, Any]: Calls made and calls coalesced per endpoint, plus calls in flight
+        """
+        stats: Dict[str, Any] = {name: dict(counts) for name, counts in self.counters.items()}
+        stats["in_flight"] = len(self.in_flight)
+        return stats
@@ -0,0 +1,207 @@
+"""
+Durable AI response store shared by every worker process.
+
+The in-memory caches in ai_service.py are per process and are lost on
+restart, so each uvicorn worker (and each deploy) re-paid for the same
+gpt-4o generations. Responses are also written here, to one SQLite database
+in WAL mode so all workers can read concurrently while one writes.
+
+Entries are keyed by endpoint, prompt-template version, model and input
+fingerprint; bumping a template version orphans its old entries, which then
+age out. Bodies are stored as zlib-compressed JSON.
+
+Configuration via environment variables:
+    RESPONSE_STORE_PATH     database file (default llm_responses.db; empty disables the store)
+    RESPONSE_STORE_MAX_MB   size above which least recently used entries are evicted (default 100)
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+RESPONSE_STORE_PATH = os.environ.get("RESPONSE_STORE_PATH", "llm_responses.db")
+RESPONSE_STORE_MAX_BYTES = int(float(os.environ.get("RESPONSE_STORE_MAX_MB", "100")) * 1024 * 1024)
+
+# Eviction trims the store to this fraction of the limit so it does not run on every write
+EVICTION_TARGET_RATIO = 0.9
+
+# Check the store size every this many writes
+EVICTION_CHECK_INTERVAL = 50
+
+# Reads refresh last_access at most this often, to keep reads from becoming writes
+ACCESS_TOUCH_INTERVAL_SECONDS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    endpoint TEXT NOT NULL,
+    template_version TEXT NOT NULL,
+    model TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (endpoint, template_version, model, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+"""
+
+class ResponseStore:
+    """SQLite-backed response store with TTL and size-based eviction."""
+
+    def __init__(self, path: str = RESPONSE_STORE_PATH, max_bytes: int = RESPONSE_STORE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.writes = 0
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it (and the schema) on first use."""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self.local.conn = conn
+        return conn
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[counter] += amount
+
+    def get(self, endpoint: str, template_version: str, model: str, fingerprint: str) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a stored response.
+
+        Args:
+            endpoint: Feature the response belongs to
+            template_version: Version of the prompt template that produced it
+            model: Model that produced it
+            fingerprint: Fingerprint of the input
+
+        Returns:
+            Optional[Tuple[Any, float]]: The response and its remaining lifetime in seconds,
+                or None if absent, expired or the store is unavailable
+        """
+        if not self.enabled:
+            return None
+        key = (endpoint, template_version, model, fingerprint)
+        try:
+            conn = self.connection()
+            row = conn.execute(
+                "SELECT body, expires_at, last_access FROM responses "
+                "WHERE endpoint = ? AND template_version = ? AND model = ? AND fingerprint = ?",
+                key
+            ).fetchone()
+            now = time.time()
+            if row is None or row[1] <= now:
+                self.count("misses")
+                return None
+            if now - row[2] > ACCESS_TOUCH_INTERVAL_SECONDS:
+                conn.execute(
+                    "UPDATE responses SET last_access = ? "
+                    "WHERE endpoint = ? AND template_version = ? AND model = ? AND fingerprint = ?",
+                    (now, *key)
+                )
+            value = json.loads(zlib.decompress(row[0]).decode("utf-8"))
+        except (sqlite3.Error, zlib.error, ValueError) as e:
+            print(f"Error reading response store: {e}")
+            self.count("errors")
+            return None
+        self.count("hits")
+        return value, row[1] - now
+
+    def put(self, endpoint: str, template_version: str, model: str, fingerprint: str, value: Any, ttl_seconds: float) -> None:
+        """
+        Store a response, evicting expired and least recently used entries over the size limit.
+
+        Args:
+            endpoint: Feature the response belongs to
+            template_version: Version of the prompt template that produced it
+            model: Model that produced it
+            fingerprint: Fingerprint of the input
+            value: JSON-serializable response
+            ttl_seconds: Lifetime of the entry
+        """
+        if not self.enabled:
+            return
+        body = zlib.compress(json.dumps(value).encode("utf-8"))
+        now = time.time()
+        try:
+            conn = self.connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(endpoint, template_version, model, fingerprint, body, size, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (endpoint, template_version, model, fingerprint, body, len(body), now, now + ttl_seconds, now)
+            )
+        except sqlite3.Error as e:
+            print(f"Error writing response store: {e}")
+            self.count("errors")
+            return
+
+        with self.lock:
+            self.counters["writes"] += 1
+            self.writes += 1
+            check = self.writes % EVICTION_CHECK_INTERVAL == 1
+        if check:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete expired entries, then least recently used ones until under the size limit."""
+        try:
+            conn = self.connection()
+            removed = conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),)).rowcount
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - int(self.max_bytes * EVICTION_TARGET_RATIO)
+                # Walk entries oldest-access first, keeping a running total of freed bytes
+                cutoff = conn.execute(
+                    "SELECT last_access FROM ("
+                    "  SELECT last_access, SUM(size) OVER (ORDER BY last_access) AS freed FROM responses"
+                    ") WHERE freed >= ? LIMIT 1",
+                    (excess,)
+                ).fetchone()
+                if cutoff:
+                    removed += conn.execute("DELETE FROM responses WHERE last_access <= ?", cutoff).rowcount
+        except sqlite3.Error as e:
+            print(f"Error evicting from response store: {e}")
+            self.count("errors")
+            return
+        if removed:
+            self.count("evictions", removed)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get counters and the current size of the store.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, writes, evictions and errors in this process,
+                plus entries and bytes in the shared database
+        """
+        with self.lock:
+            stats = dict(self.counters)
+        stats["enabled"] = self.enabled
+        if self.enabled:
+            try:
+                entries, size = self.connection().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+                stats.update(entries=entries, bytes=size)
+            except sqlite3.Error as e:
+                print(f"Error reading response store stats: {e}")
+        return stats
+
+response_store = ResponseStore()
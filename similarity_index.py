@@ -0,0 +1,164 @@
+"""
+Near-duplicate lookup for previously analyzed code.
+
+code_fingerprint() only matches programs with exactly the same shape, so a
+student who changes one condition in the login example misses the cache.
+SimilarityIndex finds earlier snippets that are nearly the same: each snippet
+is reduced to overlapping shingles of its normalized tokens, the shingle set
+is summarized by a MinHash signature, and the signatures are bucketed by LSH
+banding so a lookup only compares against likely matches instead of every
+entry. The estimated Jaccard similarity of the shingle sets decides whether a
+candidate is close enough.
+
+The index holds signatures only (the responses stay in the response caches)
+and evicts the least recently used snippet once it is full. ai_service.py
+also removes a snippet once none of the caches it indexes holds a response
+for it any more.
+"""
+import hashlib
+import random
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple
+
+from response_cache import token_fingerprint
+
+# Tokens per shingle; a one-token edit changes at most this many shingles
+SHINGLE_TOKENS = 4
+
+# LSH bands x rows per band = MinHash signature length. With 16 bands of 4 rows,
+# a pair at similarity 0.75 shares a bucket with probability ~0.998 and a pair at 0.3 with ~0.12
+LSH_BANDS = 16
+LSH_ROWS = 4
+
+# Mersenne prime for the (a * x + b) mod p hash family
+MINHASH_PRIME = (1 << 61) - 1
+
+# Fixed seed so signatures stay comparable across processes and restarts
+MINHASH_SEED = 1729
+
+def shingle_hashes(code: str) -> Set[int]:
+    """
+    Hash the token shingles of a snippet.
+
+    Args:
+        code: Source code in any supported language
+
+    Returns:
+        Set[int]: 64-bit hashes of each run of SHINGLE_TOKENS normalized tokens
+    """
+    tokens = token_fingerprint(code).split()
+    if len(tokens) <= SHINGLE_TOKENS:
+        shingles = {" ".join(tokens)}
+    else:
+        shingles = {" ".join(tokens[i:i + SHINGLE_TOKENS]) for i in range(len(tokens) - SHINGLE_TOKENS + 1)}
+    return {int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big") for shingle in shingles}
+
+class SimilarityIndex:
+    """Thread-safe, size-bounded MinHash/LSH index of snippets keyed by code fingerprint."""
+
+    def __init__(self, max_entries: int = 2048, threshold: float = 0.75):
+        """
+        Args:
+            max_entries: Snippets kept before the least recently used is evicted
+            threshold: Minimum estimated Jaccard similarity for a match
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        generator = random.Random(MINHASH_SEED)
+        self.permutations = [
+            (generator.randrange(1, MINHASH_PRIME), generator.randrange(0, MINHASH_PRIME))
+            for _ in range(LSH_BANDS * LSH_ROWS)
+        ]
+        self.entries: "OrderedDict[str, Tuple[str, Tuple[int, ...]]]" = OrderedDict()
+        self.buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+        self.lock = threading.Lock()
+        self.counters = {"lookups": 0, "matches": 0, "candidates": 0, "evictions": 0}
+
+    def signature(self, code: str) -> Tuple[int, ...]:
+        """MinHash signature of the snippet's shingle set."""
+        hashes = shingle_hashes(code)
+        return tuple(min((a * value + b) % MINHASH_PRIME for value in hashes) for a, b in self.permutations)
+
+    def bands(self, language: str, signature: Tuple[int, ...]) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        # Language is part of the bucket so Python never matches JavaScript
+        return [(language, band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]) for band in range(LSH_BANDS)]
+
+    def add(self, key: str, code: str, language: str = "python") -> None:
+        """
+        Index a snippet, evicting the least recently used one over capacity.
+
+        Args:
+            key: Code fingerprint the snippet's responses are cached under
+            code: The snippet
+            language: The programming language
+        """
+        signature = self.signature(code)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return
+            self.entries[key] = (language, signature)
+            for bucket in self.bands(language, signature):
+                self.buckets.setdefault(bucket, set()).add(key)
+            while len(self.entries) > self.max_entries:
+                self.remove_entry(next(iter(self.entries)))
+                self.counters["evictions"] += 1
+
+    def remove(self, key: str) -> None:
+        """Drop a snippet, e.g. once its cached responses have expired."""
+        with self.lock:
+            if key in self.entries:
+                self.remove_entry(key)
+
+    def remove_entry(self, key: str) -> None:
+        language, signature = self.entries.pop(key)
+        for bucket in self.bands(language, signature):
+            keys = self.buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.buckets[bucket]
+
+    def query(self, code: str, language: str = "python") -> List[Tuple[str, float]]:
+        """
+        Find indexed snippets similar to code.
+
+        Args:
+            code: The snippet to look up
+            language: The programming language
+
+        Returns:
+            List[Tuple[str, float]]: (key, estimated similarity) at or above the threshold, most similar first
+        """
+        signature = self.signature(code)
+        with self.lock:
+            self.counters["lookups"] += 1
+            candidates: Set[str] = set()
+            for bucket in self.bands(language, signature):
+                candidates |= self.buckets.get(bucket, set())
+            self.counters["candidates"] += len(candidates)
+            matches = []
+            for key in candidates:
+                other = self.entries[key][1]
+                similarity = sum(1 for mine, theirs in zip(signature, other) if mine == theirs) / len(signature)
+                if similarity >= self.threshold:
+                    matches.append((key, round(similarity, 3)))
+            if matches:
+                self.counters["matches"] += 1
+                for key, _ in matches:
+                    self.entries.move_to_end(key)
+        return sorted(matches, key=lambda match: -match[1])
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get lookup counters and the index size.
+
+        Returns:
+            Dict[str, int]: Lookups, lookups with a match, candidates compared, evictions, size and bucket count
+        """
+        with self.lock:
+            stats = dict(self.counters)
+            stats["size"] = len(self.entries)
+            stats["buckets"] = len(self.buckets)
+        return stats
@@ -61,18 +61,21 @@ document.addEventListener('DOMContentLoaded', () => {
             
             console.log(`Sending AI question about ${concept} in ${language}`);
             
+            const payload = { question, code, language, concept };
+            
+            // Stream the answer token by token; fall back to the one-shot endpoint
+            // if the browser cannot read response streams or the stream fails to start
+            if (await streamAnswer(payload)) {
+                return;
+            }
+            
             // Send request to backend
             const response = await fetch('/api/ask', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json'
                 },
-                body: JSON.stringify({
-                    question,
-                    code,
-                    language,
-                    concept
-                })
+                body: JSON.stringify(payload)
             });
             
             // Remove thinking indicator
@@ -107,6 +110,118 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    // Function to read the answer from /api/ask/stream and render it as it arrives.
+    // Returns false if nothing was shown, so the caller can use /api/ask instead.
+    async function streamAnswer(payload) {
+        let response;
+        try {
+            response = await fetch('/api/ask/stream', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Accept': 'text/event-stream'
+                },
+                body: JSON.stringify(payload)
+            });
+        } catch (e) {
+            console.warn('AI assistant stream unavailable:', e);
+            return false;
+        }
+        
+        if (!response.ok || !response.body || !window.TextDecoder) {
+            return false;
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let text = '';
+        let messageDiv = null;
+        let renderPending = false;
+        
+        // Re-render at most once per frame while tokens are arriving
+        const scheduleRender = () => {
+            if (renderPending) return;
+            renderPending = true;
+            requestAnimationFrame(() => {
+                renderPending = false;
+                updateMessage(messageDiv, text);
+            });
+        };
+        
+        const handleEvent = (eventName, data) => {
+            if (eventName === 'error') {
+                text += '\n\n' + (data.error || 'The response was interrupted. Please try again.');
+            } else if (eventName === 'message' && typeof data.token === 'string') {
+                text += data.token;
+            } else {
+                return;
+            }
+            
+            // Swap the thinking indicator for the answer on the first token
+            if (!messageDiv) {
+                removeThinkingIndicator();
+                messageDiv = addMessage('ai', '');
+            }
+            scheduleRender();
+        };
+        
+        try {
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                
+                // Server-sent events are separated by a blank line
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    const rawEvent = buffer.slice(0, boundary);
+                    buffer = buffer.slice(boundary + 2);
+                    
+                    let eventName = 'message';
+                    let dataLines = [];
+                    rawEvent.split('\n').forEach(line => {
+                        if (line.startsWith('event:')) {
+                            eventName = line.slice(6).trim();
+                        } else if (line.startsWith('data:')) {
+                            dataLines.push(line.slice(5).trim());
+                        }
+                    });
+                    if (dataLines.length) {
+                        handleEvent(eventName, JSON.parse(dataLines.join('\n')));
+                    }
+                }
+            }
+        } catch (e) {
+            console.warn('AI assistant stream interrupted:', e);
+            if (!messageDiv) return false;
+            text += '\n\nThe response was interrupted. Please try again.';
+        }
+        
+        if (!messageDiv) return false;
+        updateMessage(messageDiv, text);
+        return true;
+    }
+
+    // Function to format AI markdown as HTML
+    function formatAIContent(content) {
+        // Simple markdown parsing for code blocks
+        content = content.replace(/```([\s\S]*?)```/g, '<pre><code>$1</code></pre>');
+        // Bold text
+        content = content.replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>');
+        // Italic text
+        content = content.replace(/\*(.*?)\*/g, '<em>$1</em>');
+        // Line breaks
+        content = content.replace(/\n/g, '<br>');
+        return content;
+    }
+
+    // Function to replace the text of an AI message that is still streaming
+    function updateMessage(messageDiv, content) {
+        messageDiv.innerHTML = `<p>${formatAIContent(content)}</p>`;
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }
+
     // Function to add message to chat
     function addMessage(role, content) {
         const messageDiv = document.createElement('div');
@@ -114,14 +229,7 @@ document.addEventListener('DOMContentLoaded', () => {
         
         // Handle markdown formatting for AI responses
         if (role === 'ai') {
-            // Simple markdown parsing for code blocks
-            content = content.replace(/```([\s\S]*?)```/g, '<pre><code>$1</code></pre>');
-            // Bold text
-            content = content.replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>');
-            // Italic text
-            content = content.replace(/\*(.*?)\*/g, '<em>$1</em>');
-            // Line breaks
-            content = content.replace(/\n/g, '<br>');
+            content = formatAIContent(content);
         }
         
         messageDiv.innerHTML = `<p>${content}</p>`;
@@ -129,6 +237,7 @@ document.addEventListener('DOMContentLoaded', () => {
         
         // Scroll to bottom
         chatMessages.scrollTop = chatMessages.scrollHeight;
+        return messageDiv;
     }
 
     // Function to add thinking indicator
@@ -8,6 +8,7 @@ import { InteractiveDemo } from './components/InteractiveDemo.js';
 import { PopupCanvas } from './components/PopupCanvas.js';
 import { Helpline } from './components/Helpline.js';
 import { PracticeArea } from './components/PracticeArea.js';
+import { loadDemoHtml } from './demo-blob.js';
 
 /**
  * Global function to check OpenAI API status
@@ -408,7 +409,7 @@ function setupEventListeners() {
     // Run code button
     const runCodeButton = document.getElementById('run-code');
     if (runCodeButton) {
-        runCodeButton.addEventListener('click', executeCode);
+        runCodeButton.addEventListener('click', () => executeCode());
     }
     
     // Toggle help button
@@ -700,7 +701,37 @@ function loadInitialContent() {
     }, 500);
 }
 
-async function executeCode() {
+// Last structured console output, so the server can send only a diff on re-runs
+const outputSession = {
+    id: (window.crypto && crypto.randomUUID) ? crypto.randomUUID() : `session-${Date.now()}-${Math.random().toString(36).slice(2)}`,
+    lines: null,
+    hash: null
+};
+
+/**
+ * Rebuild output lines from a base and the server's diff operations:
+ * ["=", n] keeps n lines, ["-", n] drops n lines, ["+", lines] inserts lines.
+ */
+function applyOutputDiff(base, ops) {
+    const lines = [];
+    let index = 0;
+    for (const [op, arg] of ops) {
+        if (op === '=') {
+            for (let i = 0; i < arg; i++) lines.push(base[index + i]);
+            index += arg;
+        } else if (op === '-') {
+            index += arg;
+        } else if (op === '+') {
+            for (const line of arg) lines.push(line);
+        }
+    }
+    return lines;
+}
+
+// Code shorter than this is not sent for real-world and demo generation
+const MIN_ANALYSIS_CODE_LENGTH = 30;
+
+async function executeCode(force = false) {
     // Get the code from the editor
     const editor = window.editor; // Assuming the editor instance is stored globally
     if (!editor) return;
@@ -720,28 +751,21 @@ async function executeCode() {
     }
     
     try {
-        // Execute the code via API
-        const response = await fetch('/api/execute', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify({ code, language })
-        });
+        // Short code leaves the real-world and demo panels to their concept examples
+        const analyzePanels = code.trim().length >= MIN_ANALYSIS_CODE_LENGTH;
         
-        if (!response.ok) {
-            throw new Error('Network response was not ok');
+        // One streamed request runs execution and every panel at once; each part renders as it arrives
+        if (await streamAnalyzeAll(code, language, force, analyzePanels)) {
+            if (!analyzePanels) {
+                updateRealWorldCode(code);
+                updateInteractiveDemo(code);
+            }
+            return;
         }
         
-        const result = await response.json();
-        
-        // Update the console output
-        if (result.success) {
-            updateConsoleOutput(result.output || '<div class="output-empty">No output</div>');
-        } else {
-            // Display error with proper formatting
-            updateConsoleOutput(result.error || '<div class="error-message">An unknown error occurred</div>');
-        }
+        // Streaming unavailable: execute, then refresh the panels
+        const result = await fetchExecution(code, language, force);
+        await renderExecutionResult(result, code, language, force);
         
         // Update the real-world code panel
         updateRealWorldCode(code);
@@ -757,6 +781,262 @@ async function executeCode() {
     }
 }
 
+async function fetchExecution(code, language, force) {
+    // Execute the code via API
+    const response = await fetch('/api/execute', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json'
+        },
+        body: JSON.stringify({
+            code,
+            language,
+            force,
+            format: 'structured',
+            session_id: outputSession.id,
+            last_output_hash: outputSession.hash
+        })
+    });
+    
+    if (!response.ok) {
+        throw new Error('Network response was not ok');
+    }
+    
+    return response.json();
+}
+
+async function renderExecutionResult(result, code, language, force) {
+    // Rebuild the full output if the server only sent what changed
+    if (result.output_diff) {
+        if (result.output_diff.base === outputSession.hash && outputSession.lines) {
+            result.output = applyOutputDiff(outputSession.lines, result.output_diff.ops);
+        } else {
+            // Out of sync with the server: drop our cached output and ask for it in full
+            outputSession.hash = null;
+            outputSession.lines = null;
+            result = await fetchExecution(code, language, force);
+        }
+    }
+    if (result.format === 'structured') {
+        outputSession.lines = result.output || [];
+        outputSession.hash = result.output_hash || null;
+    }
+    
+    // Update the console output
+    if (result.format === 'structured') {
+        renderStructuredResult(result);
+    } else if (result.success) {
+        updateConsoleOutput(result.output || '<div class="output-empty">No output</div>');
+    } else {
+        // Display error with proper formatting
+        updateConsoleOutput(result.error || '<div class="error-message">An unknown error occurred</div>');
+    }
+    
+    // Code rejected by the pre-flight check can still be run on request
+    const consoleOutput = document.querySelector('.console-output');
+    if (result.error_type === 'likely_infinite' && result.can_force && consoleOutput) {
+        const runAnywayBtn = document.createElement('button');
+        runAnywayBtn.className = 'secondary-button run-anyway-button';
+        runAnywayBtn.textContent = 'Run anyway';
+        runAnywayBtn.addEventListener('click', () => executeCode(true));
+        consoleOutput.appendChild(runAnywayBtn);
+    }
+}
+
+/**
+ * Run execution, real-world mapping, demo and complexity in one /api/analyze-all request
+ * and render each part as its server-sent event arrives.
+ * Returns false if the stream could not be opened, so the caller can fall back to /api/execute.
+ */
+async function streamAnalyzeAll(code, language, force, analyzePanels) {
+    const parts = analyzePanels ? ['execute', 'realworld', 'demo', 'complexity'] : ['execute'];
+    let response;
+    try {
+        response = await fetch('/api/analyze-all', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify({
+                code,
+                language,
+                concept: document.getElementById('concept-selector')?.value || 'general',
+                force,
+                format: 'structured',
+                session_id: outputSession.id,
+                last_output_hash: outputSession.hash,
+                parts
+            })
+        });
+    } catch (e) {
+        console.warn('Analyze-all stream unavailable:', e);
+        return false;
+    }
+    
+    if (!response.ok || !response.body || !window.TextDecoder) {
+        return false;
+    }
+    
+    if (analyzePanels) {
+        if (typeof window.showRealWorldLoading === 'function') window.showRealWorldLoading();
+        if (typeof window.showInteractiveDemoLoading === 'function') window.showInteractiveDemoLoading();
+    }
+    
+    // The demo header shows the real-world title, so a demo that arrives first waits for it
+    let realWorld = null;
+    let pendingDemo = null;
+    const renderDemo = (data) => {
+        if (typeof window.renderInteractiveDemoResult === 'function') {
+            window.renderInteractiveDemoResult(data, realWorld);
+        } else {
+            // The server has the demo cached by now
+            updateInteractiveDemo(code);
+        }
+    };
+    
+    const handleEvent = async (eventName, data) => {
+        if (eventName === 'execute') {
+            await renderExecutionResult(data, code, language, force);
+        } else if (eventName === 'error') {
+            updateConsoleOutput(`<div class="error-message">Error: ${data.error}</div>`);
+        } else if (eventName === 'realworld') {
+            realWorld = data;
+            if (typeof window.renderRealWorldResult === 'function') {
+                window.renderRealWorldResult(data);
+            } else {
+                updateRealWorldCode(code);
+            }
+            if (pendingDemo) {
+                renderDemo(pendingDemo);
+                pendingDemo = null;
+            }
+        } else if (eventName === 'demo') {
+            // The demo arrives as the URL of its blob, like /api/realworld/demo returns it
+            try {
+                data = await loadDemoHtml(data);
+            } catch (e) {
+                console.warn('Failed to load streamed demo:', e);
+                updateInteractiveDemo(code);
+                return;
+            }
+            if (realWorld) {
+                renderDemo(data);
+            } else {
+                pendingDemo = data;
+            }
+        } else if (eventName === 'complexity') {
+            // Shown instantly if the user opens the complexity analysis for this code
+            window.latestComplexityAnalysis = { code, language, analysis: data };
+        }
+    };
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    try {
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            // Server-sent events are separated by a blank line
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                const rawEvent = buffer.slice(0, boundary);
+                buffer = buffer.slice(boundary + 2);
+                
+                let eventName = 'message';
+                const dataLines = [];
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) {
+                        eventName = line.slice(6).trim();
+                    } else if (line.startsWith('data:')) {
+                        dataLines.push(line.slice(5).trim());
+                    }
+                });
+                if (dataLines.length) {
+                    await handleEvent(eventName, JSON.parse(dataLines.join('\n')));
+                }
+            }
+        }
+    } finally {
+        if (pendingDemo) {
+            renderDemo(pendingDemo);
+        }
+    }
+    return true;
+}
+
+/**
+ * Render a structured /api/execute result (output lines + error object) into the console.
+ * Text is inserted with textContent, so program output never needs escaping on the server.
+ */
+function renderStructuredResult(result) {
+    const consoleOutput = document.querySelector('.console-output');
+    if (!consoleOutput) return;
+    
+    const fragment = document.createDocumentFragment();
+    const makeElement = (tag, className, text) => {
+        const el = document.createElement(tag);
+        if (className) el.className = className;
+        if (text !== undefined) el.textContent = text;
+        return el;
+    };
+    
+    const appendLines = (lines, className) => {
+        if (!lines || lines.length === 0) return;
+        const block = makeElement('div', className);
+        lines.forEach(line => block.appendChild(makeElement('div', 'output-line', line)));
+        fragment.appendChild(block);
+    };
+    
+    appendLines(result.output, 'output-stdout');
+    appendLines(result.stderr, 'output-stderr');
+    
+    const error = result.error;
+    if (error) {
+        if (error.category === 'timeout') {
+            fragment.appendChild(makeElement('div', 'error-timeout', error.message));
+        } else {
+            const header = makeElement('div', 'error-header');
+            header.appendChild(makeElement('span', 'error-type', error.type));
+            header.appendChild(document.createTextNode(`: ${error.message}`));
+            fragment.appendChild(header);
+            
+            if (error.context && error.context.length > 0) {
+                const context = makeElement('div', 'code-context');
+                error.context.forEach(entry => {
+                    const pre = makeElement('pre', entry.is_error ? 'error-line' : '');
+                    pre.appendChild(makeElement('span', 'line-number', String(entry.line).padStart(3)));
+                    pre.appendChild(document.createTextNode(` ${entry.text}`));
+                    context.appendChild(pre);
+                    
+                    // Caret under the exact column of a syntax error
+                    if (entry.is_error && error.column > 0 && error.category === 'syntax') {
+                        const caret = makeElement('pre', 'error-indicator');
+                        caret.appendChild(makeElement('span', 'line-number', '   '));
+                        caret.appendChild(document.createTextNode(` ${' '.repeat(Math.min(error.column - 1, entry.text.length))}^`));
+                        context.appendChild(caret);
+                    }
+                });
+                fragment.appendChild(context);
+            }
+            
+            if (error.explanation) {
+                fragment.appendChild(makeElement('div', 'error-explanation', error.explanation));
+            }
+        }
+    }
+    
+    if (!fragment.hasChildNodes()) {
+        fragment.appendChild(makeElement('div', 'output-empty', 'No output'));
+    }
+    
+    consoleOutput.replaceChildren(fragment);
+    consoleOutput.scrollTop = consoleOutput.scrollHeight;
+}
+
 async function updateConsoleOutput(output) {
     const consoleOutput = document.querySelector('.console-output');
     if (consoleOutput) {
@@ -952,7 +1232,7 @@ async function updateInteractiveDemo(code) {
                 throw new Error(`Failed to fetch interactive demo: ${response.status} ${response.statusText}`);
             }
             
-            const data = await response.json();
+            const data = await loadDemoHtml(await response.json());
             console.log("Received demo data with html length:", data.demo_html ? data.demo_html.length : 0);
             
             // Update the GUI Demo section in the right panel
@@ -73,6 +73,13 @@ async function analyzeCodeComplexity(code, language = 'python') {
     // Show loading state
     showLoadingAnalysis();
     
+    // The last Run already analyzed this code (streamed by /api/analyze-all)
+    const latest = window.latestComplexityAnalysis;
+    if (latest && latest.code === code && latest.language === language && latest.analysis.status !== 'error') {
+        showComplexityAnalysis(latest.analysis);
+        return;
+    }
+    
     try {
         // Call the API
         const response = await fetch('/api/analyze-complexity', {
@@ -1,4 +1,6 @@
 // Code Editor component
+import { loadDemoHtml } from '../demo-blob.js';
+
 export function CodeEditor(root) {
     console.log('Initializing CodeEditor component');
     
@@ -179,7 +181,7 @@ print(result)</textarea>
                 throw new Error('Failed to fetch interactive demo');
             }
             
-            const data = await response.json();
+            const data = await loadDemoHtml(await response.json());
             
             // Update the GUI Demo section in the right panel
             const guiDemoRoot = document.getElementById('gui-demo-root');
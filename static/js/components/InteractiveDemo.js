@@ -1,4 +1,6 @@
 // Interactive Demo component
+import { loadDemoHtml } from '../demo-blob.js';
+
 export function InteractiveDemo(root) {
     // Create the interactive demo container
     const contentDiv = root.querySelector('.panel-content');
@@ -74,14 +76,7 @@ export function InteractiveDemo(root) {
     `;
     document.head.appendChild(styleEl);
     
-    // Expose a global update function
-    window.updateInteractiveDemo = async function(code) {
-        if (!code || code.length < 30) {
-            // Not enough code to process
-            return;
-        }
-        
-        // Show loading state
+    const showInteractiveDemoLoading = () => {
         contentDiv.innerHTML = `
             <div class="interactive-demo">
                 <div class="loading-state">
@@ -90,6 +85,83 @@ export function InteractiveDemo(root) {
                 </div>
             </div>
         `;
+    };
+    
+    const renderInteractiveDemoResult = (data, realWorld) => {
+        if (data && data.demo_html) {
+            // Title and description of the real-world example the demo is based on
+            const realWorldTitle = (realWorld && realWorld.title) || "Interactive Demo";
+            const realWorldDescription = (realWorld && realWorld.description) || "This demo shows how your code works in a real-world scenario.";
+            
+            // Render demo with context and details
+            contentDiv.innerHTML = `
+                <div class="interactive-demo">
+                    <div class="demo-header">
+                        <h3>${realWorldTitle}</h3>
+                        <p>${realWorldDescription}</p>
+                    </div>
+                    <div class="demo-preview">
+                        ${data.demo_html}
+                    </div>
+                </div>
+            `;
+            
+            // Execute any scripts in the demo HTML
+            const scripts = contentDiv.querySelectorAll('script');
+            scripts.forEach(script => {
+                if (script.textContent) {
+                    try {
+                        eval(script.textContent);
+                    } catch (e) {
+                        console.error('Error executing demo script:', e);
+                    }
+                }
+            });
+        } else if (data && data.html) {
+            // Fallback for older API format
+            contentDiv.innerHTML = `
+                <div class="interactive-demo">
+                    <div class="demo-preview">
+                        ${data.html}
+                    </div>
+                </div>
+            `;
+            
+            // Execute any scripts in the demo HTML
+            const scripts = contentDiv.querySelectorAll('script');
+            scripts.forEach(script => {
+                if (script.textContent) {
+                    try {
+                        eval(script.textContent);
+                    } catch (e) {
+                        console.error('Error executing demo script:', e);
+                    }
+                }
+            });
+        } else {
+            contentDiv.innerHTML = `
+                <div class="interactive-demo">
+                    <div class="empty-state">
+                        <p>No interactive demo available for this code.</p>
+                    </div>
+                </div>
+            `;
+        }
+    };
+    
+    // Let app.js render results streamed from /api/analyze-all without fetching them again
+    window.showInteractiveDemoLoading = showInteractiveDemoLoading;
+    window.renderInteractiveDemoResult = renderInteractiveDemoResult;
+    
+    // Expose a global update function
+    window.updateInteractiveDemo = async function(code) {
+        if (!code || code.length < 30) {
+            // Not enough code to process
+            return;
+        }
+        
+        // Show loading state
+        showInteractiveDemoLoading();
         
         try {
             // Get the current language
@@ -109,14 +181,11 @@ export function InteractiveDemo(root) {
                 throw new Error(`API Error: ${response.status}`);
             }
             
-            const data = await response.json();
+            const data = await loadDemoHtml(await response.json());
             
-            // Update the UI with the response
+            // Get the real-world details from the API to display alongside the demo
+            let realWorld = null;
             if (data && data.demo_html) {
-                // Get the real-world details from the API to display alongside the demo
-                let realWorldTitle = "Interactive Demo";
-                let realWorldDescription = "This demo shows how your code works in a real-world scenario.";
-                
                 try {
                     // Get the real-world code example that the demo is based on
                     const rwResponse = await fetch('/api/realworld', {
@@ -128,69 +197,16 @@ export function InteractiveDemo(root) {
                     });
                     
                     if (rwResponse.ok) {
-                        const rwData = await rwResponse.json();
-                        realWorldTitle = rwData.title || realWorldTitle;
-                        realWorldDescription = rwData.description || realWorldDescription;
+                        realWorld = await rwResponse.json();
                     }
                 } catch (e) {
                     console.error('Error fetching real-world details:', e);
                 }
-                
-                // Render demo with context and details
-                contentDiv.innerHTML = `
-                    <div class="interactive-demo">
-                        <div class="demo-header">
-                            <h3>${realWorldTitle}</h3>
-                            <p>${realWorldDescription}</p>
-                        </div>
-                        <div class="demo-preview">
-                            ${data.demo_html}
-                        </div>
-                    </div>
-                `;
-                
-                // Execute any scripts in the demo HTML
-                const scripts = contentDiv.querySelectorAll('script');
-                scripts.forEach(script => {
-                    if (script.textContent) {
-                        try {
-                            eval(script.textContent);
-                        } catch (e) {
-                            console.error('Error executing demo script:', e);
-                        }
-                    }
-                });
-            } else if (data && data.html) {
-                // Fallback for older API format
-                contentDiv.innerHTML = `
-                    <div class="interactive-demo">
-                        <div class="demo-preview">
-                            ${data.html}
-                        </div>
-                    </div>
-                `;
-                
-                // Execute any scripts in the demo HTML
-                const scripts = contentDiv.querySelectorAll('script');
-                scripts.forEach(script => {
-                    if (script.textContent) {
-                        try {
-                            eval(script.textContent);
-                        } catch (e) {
-                            console.error('Error executing demo script:', e);
-                        }
-                    }
-                });
-            } else {
-                contentDiv.innerHTML = `
-                    <div class="interactive-demo">
-                        <div class="empty-state">
-                            <p>No interactive demo available for this code.</p>
-                        </div>
-                    </div>
-                `;
             }
             
+            // Update the UI with the response
+            renderInteractiveDemoResult(data, realWorld);
+            
         } catch (error) {
             console.error('Error fetching interactive demo:', error);
             
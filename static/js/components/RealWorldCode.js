@@ -23,14 +23,7 @@ export function RealWorldCode(root) {
         language: 'python'
     });
     
-    // Expose a global update function
-    window.updateRealWorldCode = async function(code) {
-        if (!code || code.length < 30) {
-            // Not enough code to process
-            return;
-        }
-        
-        // Show loading state
+    const showRealWorldLoading = () => {
         contentDiv.innerHTML = `
             <div class="realworld-code">
                 <h3 class="realworld-title">Analyzing your code...</h3>
@@ -40,6 +33,31 @@ export function RealWorldCode(root) {
                 </div>
             </div>
         `;
+    };
+    
+    const renderRealWorldResult = (data) => {
+        const language = document.getElementById('language-selector').value || 'python';
+        updateRealWorldContent(contentDiv, {
+            title: data.title || 'Real-World Application',
+            description: data.description || 'Here\'s how your code applies to real-world scenarios.',
+            code: data.real_world_code || data.code || '// No real-world example available',
+            language: language
+        });
+    };
+    
+    // Let app.js render results streamed from /api/analyze-all without fetching them again
+    window.showRealWorldLoading = showRealWorldLoading;
+    window.renderRealWorldResult = renderRealWorldResult;
+    
+    // Expose a global update function
+    window.updateRealWorldCode = async function(code) {
+        if (!code || code.length < 30) {
+            // Not enough code to process
+            return;
+        }
+        
+        // Show loading state
+        showRealWorldLoading();
         
         try {
             // Get the current language
@@ -62,12 +80,7 @@ export function RealWorldCode(root) {
             const data = await response.json();
             
             // Update the UI with the response
-            updateRealWorldContent(contentDiv, {
-                title: data.title || 'Real-World Application',
-                description: data.description || 'Here\'s how your code applies to real-world scenarios.',
-                code: data.real_world_code || data.code || '// No real-world example available',
-                language: language
-            });
+            renderRealWorldResult(data);
             
         } catch (error) {
             console.error('Error fetching real-world code:', error);
@@ -0,0 +1,22 @@
+/**
+ * Demo Blob Module
+ * /api/realworld/demo returns the URL and hash of a stored demo instead of its HTML.
+ * Demo URLs are content-addressed and cached as immutable, so a demo seen before
+ * comes from the browser cache.
+ */
+
+/**
+ * Fill in demo_html for a /api/realworld/demo response
+ * @param {Object} data - The API response (demo_url and demo_hash, or demo_html)
+ * @returns {Promise<Object>} The response with demo_html
+ */
+export async function loadDemoHtml(data) {
+    if (!data || data.demo_html || !data.demo_url) {
+        return data;
+    }
+    const response = await fetch(data.demo_url);
+    if (!response.ok) {
+        throw new Error(`Failed to fetch demo ${data.demo_hash}: ${response.status} ${response.statusText}`);
+    }
+    return { ...data, demo_html: await response.text() };
+}
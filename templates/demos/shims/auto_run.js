@@ -0,0 +1,114 @@
+
+    // Add auto-run functionality
+    window.onload = function() {
+        console.log("Auto-running demo initialization...");
+        
+        // Initialize the notification system
+        createNotificationSystem();
+        
+        // Run any existing init function if available
+        if (typeof initDemo === 'function') {
+            try {
+                initDemo();
+            } catch (e) {
+                console.error("Error in initDemo:", e);
+            }
+        }
+        
+        // Try to auto-execute commonly used functions
+        const commonFunctions = [
+            'calculateFactorial', 'startTimer', 'calculateAverage', 'processInput', 
+            'runSimulation', 'updateChart', 'updateDisplay', 'visualize',
+            'calculate', 'update', 'showResult', 'generateOutput', 'runExample',
+            'displayFactorialResult', 'updateTimer', 'validateForm'
+        ];
+        
+        // Try to call common functions that might exist
+        let functionCalled = false;
+        for (const funcName of commonFunctions) {
+            if (typeof window[funcName] === 'function') {
+                console.log(`Auto-executing function: ${funcName}`);
+                try {
+                    window[funcName]();
+                    functionCalled = true;
+                    
+                    // Show success message for auto-executed function
+                    if (window.showSuccessMessage) {
+                        setTimeout(() => {
+                            window.showSuccessMessage(`Auto-initialized ${funcName.replace(/([A-Z])/g, ' $1').toLowerCase()} successfully!`);
+                        }, 1000);
+                    }
+                } catch (e) {
+                    console.error(`Error auto-executing ${funcName}:`, e);
+                }
+            }
+        }
+        
+        // If no functions were called, look for form inputs and populate with default values
+        if (!functionCalled) {
+            const inputs = document.querySelectorAll('input[type="number"]');
+            inputs.forEach(input => {
+                if (!input.value) {
+                    if (input.placeholder) {
+                        input.value = input.placeholder;
+                    } else if (input.min && input.max) {
+                        input.value = Math.floor((parseInt(input.min) + parseInt(input.max)) / 2);
+                    } else {
+                        input.value = 10; // Default value
+                    }
+                }
+            });
+            
+            // Try to call the functions again now that we have values
+            for (const funcName of commonFunctions) {
+                if (typeof window[funcName] === 'function') {
+                    try {
+                        window[funcName]();
+                        functionCalled = true;
+                        
+                        // Show success message for auto-executed function
+                        if (window.showSuccessMessage) {
+                            setTimeout(() => {
+                                window.showSuccessMessage(`Auto-initialized ${funcName.replace(/([A-Z])/g, ' $1').toLowerCase()} successfully!`);
+                            }, 1000);
+                        }
+                    } catch (e) {
+                        console.error(`Error in retry of ${funcName}:`, e);
+                    }
+                }
+            }
+        }
+        
+        // Simulate clicks on primary action buttons if no function was executed
+        if (!functionCalled) {
+            setTimeout(() => {
+                // Find any buttons that might be primary action buttons
+                const actionButtons = document.querySelectorAll(
+                    'button.primary, button.action, button.run, button.calculate, button.start, ' +
+                    'button:not([class]), input[type="button"], input[type="submit"]'
+                );
+                
+                if (actionButtons.length > 0) {
+                    console.log("Auto-clicking primary action button");
+                    try {
+                        actionButtons[0].click();
+                    } catch (e) {
+                        console.error("Error auto-clicking button:", e);
+                    }
+                }
+            }, 300);
+        }
+        
+        // Enhance button clicks to show success messages
+        setTimeout(() => {
+            enhanceButtonClicks();
+        }, 500);
+        
+        // Show initial achievement for loading the demo
+        if (window.showAchievement) {
+            setTimeout(() => {
+                window.showAchievement('Demo Loaded!', 'You're now exploring an interactive demonstration of this coding concept.');
+            }, 2000);
+        }
+    };
+    
\ No newline at end of file
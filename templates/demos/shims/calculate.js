@@ -0,0 +1,62 @@
+
+        // Auto-generated general calculation function
+        function calculate() {
+            // Try to find input elements
+            const inputs = document.querySelectorAll('input[type="number"], input[type="text"]');
+            const resultDisplay = document.getElementById('result') || 
+                                document.querySelector('.result') || 
+                                document.querySelector('[id$="result"]');
+            
+            if (inputs.length === 0 || !resultDisplay) return;
+            
+            // Look for specific calculators based on page content
+            const pageContent = document.body.innerHTML.toLowerCase();
+            
+            let result = null;
+            
+            // Check if this might be a BMI calculator
+            if (pageContent.includes('bmi') || pageContent.includes('body mass')) {
+                const height = parseFloat(inputs[0].value) || 175;
+                const weight = parseFloat(inputs[1].value) || 70;
+                result = (weight / ((height/100) * (height/100))).toFixed(2);
+                resultDisplay.textContent = `BMI: ${result}`;
+            }
+            // Check if this might be a temperature converter
+            else if (pageContent.includes('temperature') || pageContent.includes('celsius') || pageContent.includes('fahrenheit')) {
+                const temp = parseFloat(inputs[0].value) || 20;
+                const isCelsius = pageContent.indexOf('celsius') < pageContent.indexOf('fahrenheit');
+                
+                if (isCelsius) {
+                    result = ((temp * 9/5) + 32).toFixed(2);
+                    resultDisplay.textContent = `${temp}°C = ${result}°F`;
+                } else {
+                    result = ((temp - 32) * 5/9).toFixed(2);
+                    resultDisplay.textContent = `${temp}°F = ${result}°C`;
+                }
+            } 
+            // Default to basic arithmetic if not a specific calculator
+            else {
+                let total = 0;
+                if (inputs.length >= 2) {
+                    const num1 = parseFloat(inputs[0].value) || 0;
+                    const num2 = parseFloat(inputs[1].value) || 0;
+                    
+                    if (pageContent.includes('multiply') || pageContent.includes('product')) {
+                        result = num1 * num2;
+                    } else if (pageContent.includes('divide') || pageContent.includes('quotient')) {
+                        result = num1 / num2;
+                    } else if (pageContent.includes('subtract') || pageContent.includes('difference')) {
+                        result = num1 - num2;
+                    } else {
+                        result = num1 + num2;
+                    }
+                    
+                    resultDisplay.textContent = `Result: ${result}`;
+                }
+            }
+            
+            // Highlight the result with a visual effect
+            resultDisplay.style.color = '#1DB954';
+            resultDisplay.style.fontWeight = 'bold';
+        }
+        
\ No newline at end of file
@@ -0,0 +1,56 @@
+
+        function calculateAverage() {
+            // Get all the input values
+            const inputs = document.querySelectorAll('input[type="number"]');
+            let sum = 0;
+            let count = 0;
+            
+            // Sum up all valid input values
+            inputs.forEach(input => {
+                const value = parseFloat(input.value);
+                if (!isNaN(value)) {
+                    sum += value;
+                    count++;
+                }
+            });
+            
+            // Calculate the average
+            const average = count > 0 ? sum / count : 0;
+            
+            // Display the result
+            const resultElement = document.getElementById('average-result') || 
+                                document.querySelector('.result') ||
+                                document.querySelector('[id$="result"]') ||
+                                document.querySelector('[id$="average"]') ||
+                                document.querySelector('[class$="result"]') ||
+                                document.querySelector('[class$="average"]');
+            
+            if (resultElement) {
+                resultElement.textContent = average.toFixed(2);
+                resultElement.style.color = "#1DB954";
+                resultElement.style.fontWeight = "bold";
+            }
+            
+            // Update the progress bar if it exists
+            const progressBar = document.querySelector('.progress-bar');
+            if (progressBar) {
+                const percentage = Math.min(100, (average / 100) * 100);
+                progressBar.style.width = `${percentage}%`;
+            }
+            
+            // Show success message
+            if (window.showSuccessMessage) {
+                window.showSuccessMessage("Average calculated successfully!");
+                
+                // 30% chance to show achievement
+                if (Math.random() < 0.3 && window.showAchievement) {
+                    window.showAchievement(
+                        "Calculation Mastered!", 
+                        "You've successfully calculated an average value!"
+                    );
+                }
+            }
+            
+            return average;
+        }
+        
\ No newline at end of file
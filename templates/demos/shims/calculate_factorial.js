@@ -0,0 +1,39 @@
+
+        // Auto-generated factorial calculation function
+        function calculateFactorial(n) {
+            // Input validation - handle string inputs
+            n = parseInt(n);
+            
+            // Handle edge cases
+            if (isNaN(n)) return "Invalid input";
+            if (n < 0) return "Invalid input (negative)";
+            if (n === 0) return 1;
+            
+            // Calculate factorial
+            let result = 1;
+            for (let i = 2; i <= n; i++) {
+                result *= i;
+            }
+            
+            return result;
+        }
+        
+        // Display factorial result
+        function displayFactorialResult() {
+            const input = document.getElementById('number') ? 
+                          document.getElementById('number').value : 
+                          document.querySelector('input[type="number"]').value || 5;
+            
+            const result = calculateFactorial(input);
+            
+            // Find where to display the result
+            const resultElement = document.getElementById('result') || 
+                                 document.getElementById('factorial-result') ||
+                                 document.querySelector('.result');
+            
+            if (resultElement) {
+                resultElement.textContent = `Factorial: ${result}`;
+                resultElement.style.color = '#1DB954';
+            }
+        }
+        
\ No newline at end of file
@@ -0,0 +1,87 @@
+
+        function calculateGrades() {
+            // Get all student inputs
+            const studentRows = document.querySelectorAll('.student-row, .grade-row, tr');
+            const results = [];
+            
+            // Process each student's score
+            studentRows.forEach(row => {
+                // Look for score input
+                const nameElement = row.querySelector('.student-name') || 
+                                  row.querySelector('[id$="name"]') ||
+                                  row.querySelector('input[placeholder*="name" i]') ||
+                                  row.querySelector('td:first-child') ||
+                                  row.querySelector('div:first-child');
+                
+                const scoreElement = row.querySelector('input[type="number"]') || 
+                                  row.querySelector('.score-input') ||
+                                  row.querySelector('[id$="score"]') ||
+                                  row.querySelector('input[placeholder*="score" i]');
+                
+                const gradeOutputElement = row.querySelector('.grade-result') || 
+                                        row.querySelector('[id$="grade"]') ||
+                                        row.querySelector('.grade') ||
+                                        row.querySelector('td:last-child') ||
+                                        row.querySelector('div:last-child');
+                
+                if (scoreElement && gradeOutputElement) {
+                    // Get student name
+                    let studentName = "Student";
+                    if (nameElement) {
+                        studentName = nameElement.tagName === 'INPUT' ? 
+                                      nameElement.value || nameElement.placeholder || "Student" :
+                                      nameElement.textContent || "Student";
+                    }
+                    
+                    // Get score
+                    const score = parseFloat(scoreElement.value) || 0;
+                    
+                    // Calculate grade based on score
+                    let grade = "F";
+                    if (score >= 90) {
+                        grade = "A";
+                    } else if (score >= 80) {
+                        grade = "B";
+                    } else if (score >= 70) {
+                        grade = "C";
+                    } else if (score >= 60) {
+                        grade = "D";
+                    }
+                    
+                    // Display grade
+                    gradeOutputElement.textContent = grade;
+                    
+                    // Style the grade
+                    if (grade === "A") {
+                        gradeOutputElement.style.color = "#1DB954"; // Green for A
+                    } else if (grade === "B") {
+                        gradeOutputElement.style.color = "#7dcfff"; // Blue for B
+                    } else if (grade === "C") {
+                        gradeOutputElement.style.color = "#e0af68"; // Orange for C
+                    } else if (grade === "D") {
+                        gradeOutputElement.style.color = "#f7768e"; // Pink for D
+                    } else {
+                        gradeOutputElement.style.color = "#ff5555"; // Red for F
+                    }
+                    
+                    // Add to results
+                    results.push({ name: studentName, score: score, grade: grade });
+                }
+            });
+            
+            // Show success message
+            if (window.showSuccessMessage && results.length > 0) {
+                window.showSuccessMessage("Grades calculated successfully!");
+                
+                // 30% chance to show achievement
+                if (Math.random() < 0.3 && window.showAchievement) {
+                    window.showAchievement(
+                        "Grading Mastered!", 
+                        "You've successfully applied a grading system to evaluate performance."
+                    );
+                }
+            }
+            
+            return results;
+        }
+        
\ No newline at end of file
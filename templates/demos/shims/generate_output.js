@@ -0,0 +1,48 @@
+
+        // Auto-generated function to handle output generation
+        function generateOutput() {
+            // Find input elements
+            const textInput = document.querySelector('textarea') || 
+                            document.querySelector('input[type="text"]') ||
+                            document.getElementById('input');
+            
+            // Find output container
+            const outputElement = document.getElementById('output') || 
+                                document.querySelector('.output') ||
+                                document.getElementById('result') ||
+                                document.querySelector('.result');
+            
+            if (!textInput || !outputElement) return;
+            
+            const inputValue = textInput.value || textInput.placeholder || "Sample input text";
+            
+            // Determine what to do based on page content
+            const pageContent = document.body.innerHTML.toLowerCase();
+            
+            if (pageContent.includes('count word') || pageContent.includes('word count')) {
+                // Word counter
+                const wordCount = inputValue.split(/\s+/).filter(word => word.length > 0).length;
+                outputElement.textContent = `Word count: ${wordCount}`;
+            } 
+            else if (pageContent.includes('reverse')) {
+                // Text reverser
+                outputElement.textContent = inputValue.split('').reverse().join('');
+            }
+            else if (pageContent.includes('uppercase') || pageContent.includes('lowercase')) {
+                // Case converter
+                if (pageContent.indexOf('uppercase') < pageContent.indexOf('lowercase')) {
+                    outputElement.textContent = inputValue.toUpperCase();
+                } else {
+                    outputElement.textContent = inputValue.toLowerCase();
+                }
+            }
+            else {
+                // Generic output
+                outputElement.textContent = `Output: ${inputValue}`;
+            }
+            
+            // Highlight the output
+            outputElement.style.color = '#1DB954';
+            outputElement.style.fontWeight = 'bold';
+        }
+        
\ No newline at end of file
@@ -0,0 +1,238 @@
+
+    // Add notification system for success messages
+    function createNotificationSystem() {
+        // Create notification container if it doesn't exist
+        if (!document.getElementById('notification-container')) {
+            const container = document.createElement('div');
+            container.id = 'notification-container';
+            container.style.cssText = `
+                position: fixed;
+                top: 20px;
+                right: 20px;
+                z-index: 9999;
+                display: flex;
+                flex-direction: column;
+                align-items: flex-end;
+                max-width: 300px;
+            `;
+            document.body.appendChild(container);
+        }
+        
+        // Define showNotification function
+        window.showNotification = function(message, type = 'success') {
+            const container = document.getElementById('notification-container');
+            
+            // Create notification element
+            const notification = document.createElement('div');
+            notification.className = `notification ${type}`;
+            
+            // Set styles based on type
+            let bgColor = '#1DB954';
+            let textColor = '#fff';
+            let icon = '✓';
+            
+            if (type === 'error') {
+                bgColor = '#ff5555';
+                icon = '✕';
+            } else if (type === 'info') {
+                bgColor = '#7aa2f7';
+                icon = 'ℹ';
+            }
+            
+            notification.style.cssText = `
+                background-color: ${bgColor};
+                color: ${textColor};
+                border-radius: 8px;
+                padding: 12px 16px;
+                margin-bottom: 10px;
+                box-shadow: 0 4px 10px rgba(0, 0, 0, 0.3);
+                display: flex;
+                align-items: center;
+                opacity: 0;
+                transform: translateX(50px);
+                transition: all 0.3s ease;
+                max-width: 100%;
+                font-family: 'Segoe UI', Arial, sans-serif;
+            `;
+            
+            // Add icon
+            const iconSpan = document.createElement('span');
+            iconSpan.style.cssText = `
+                font-size: 18px;
+                margin-right: 10px;
+                font-weight: bold;
+            `;
+            iconSpan.textContent = icon;
+            
+            // Add message
+            const messageSpan = document.createElement('span');
+            messageSpan.textContent = message;
+            
+            // Assemble notification
+            notification.appendChild(iconSpan);
+            notification.appendChild(messageSpan);
+            container.appendChild(notification);
+            
+            // Animate in
+            setTimeout(() => {
+                notification.style.opacity = '1';
+                notification.style.transform = 'translateX(0)';
+            }, 10);
+            
+            // Automatically remove after delay
+            setTimeout(() => {
+                notification.style.opacity = '0';
+                notification.style.transform = 'translateX(50px)';
+                
+                // Remove from DOM after animation
+                setTimeout(() => {
+                    container.removeChild(notification);
+                }, 300);
+            }, 5000);
+            
+            return notification;
+        };
+        
+        // Define showSuccessMessage function for easy success messages
+        window.showSuccessMessage = function(message) {
+            return showNotification(message, 'success');
+        };
+        
+        // Define showErrorMessage function for error messages
+        window.showErrorMessage = function(message) {
+            return showNotification(message, 'error');
+        };
+        
+        // Define showAchievement function for special achievements
+        window.showAchievement = function(title, message) {
+            const container = document.getElementById('notification-container');
+            
+            // Create achievement notification
+            const achievement = document.createElement('div');
+            achievement.className = 'achievement';
+            achievement.style.cssText = `
+                background-color: #24283b;
+                color: #fff;
+                border-radius: 10px;
+                padding: 15px;
+                margin-bottom: 15px;
+                box-shadow: 0 4px 15px rgba(0, 0, 0, 0.4);
+                border-left: 4px solid #1DB954;
+                opacity: 0;
+                transform: translateX(50px);
+                transition: all 0.3s ease;
+                max-width: 100%;
+                font-family: 'Segoe UI', Arial, sans-serif;
+            `;
+            
+            // Add trophy icon
+            const icon = document.createElement('div');
+            icon.innerHTML = '🏆';
+            icon.style.cssText = `
+                font-size: 24px;
+                margin-bottom: 8px;
+                color: #1DB954;
+            `;
+            
+            // Add title
+            const titleElem = document.createElement('h3');
+            titleElem.textContent = title;
+            titleElem.style.cssText = `
+                margin: 0 0 5px 0;
+                font-size: 16px;
+                color: #1DB954;
+            `;
+            
+            // Add message
+            const messageElem = document.createElement('p');
+            messageElem.textContent = message;
+            messageElem.style.cssText = `
+                margin: 0;
+                font-size: 14px;
+                color: #c0caf5;
+            `;
+            
+            // Assemble achievement
+            achievement.appendChild(icon);
+            achievement.appendChild(titleElem);
+            achievement.appendChild(messageElem);
+            container.appendChild(achievement);
+            
+            // Animate in
+            setTimeout(() => {
+                achievement.style.opacity = '1';
+                achievement.style.transform = 'translateX(0)';
+            }, 10);
+            
+            // Automatically remove after longer delay (achievements are special)
+            setTimeout(() => {
+                achievement.style.opacity = '0';
+                achievement.style.transform = 'translateX(50px)';
+                
+                // Remove from DOM after animation
+                setTimeout(() => {
+                    container.removeChild(achievement);
+                }, 500);
+            }, 7000);
+            
+            return achievement;
+        };
+    }
+    
+    // Automatically call showSuccessMessage or showAchievement when certain actions are performed
+    function enhanceButtonClicks() {
+        const buttons = document.querySelectorAll('button, input[type="button"], input[type="submit"]');
+        buttons.forEach(button => {
+            // Skip if already enhanced
+            if (button.dataset.enhanced) return;
+            
+            // Get the original click handler
+            const originalOnClick = button.onclick;
+            
+            // Set a new click handler
+            button.onclick = function(event) {
+                // Call the original handler if it exists
+                let result = true;
+                if (originalOnClick) {
+                    result = originalOnClick.call(this, event);
+                }
+                
+                // Only show success if the original handler didn't return false
+                if (result !== false) {
+                    // Get button text to customize message
+                    const buttonText = button.textContent || button.value || 'Action';
+                    
+                    // Show appropriate success message based on button text
+                    if (buttonText.toLowerCase().includes('calculate') || 
+                        buttonText.toLowerCase().includes('compute')) {
+                        showSuccessMessage('Calculation completed successfully!');
+                    } else if (buttonText.toLowerCase().includes('add') || 
+                               buttonText.toLowerCase().includes('create')) {
+                        showSuccessMessage('Item added successfully!');
+                    } else if (buttonText.toLowerCase().includes('save') || 
+                               buttonText.toLowerCase().includes('update')) {
+                        showSuccessMessage('Changes saved successfully!');
+                    } else if (buttonText.toLowerCase().includes('submit') || 
+                               buttonText.toLowerCase().includes('send')) {
+                        showSuccessMessage('Form submitted successfully!');
+                    } else if (buttonText.toLowerCase().includes('delete') || 
+                               buttonText.toLowerCase().includes('remove')) {
+                        showSuccessMessage('Item removed successfully!');
+                    } else {
+                        showSuccessMessage('Action completed successfully!');
+                    }
+                    
+                    // 25% chance to show an achievement when buttons are clicked
+                    if (Math.random() < 0.25) {
+                        showAchievement('Concept Mastered!', 'You've successfully demonstrated your understanding of this concept.');
+                    }
+                }
+                
+                return result;
+            };
+            
+            // Mark as enhanced
+            button.dataset.enhanced = 'true';
+        });
+    }
+    
\ No newline at end of file
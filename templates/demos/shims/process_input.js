@@ -0,0 +1,35 @@
+
+        // Auto-generated function to process user inputs
+        function processInput() {
+            const inputs = document.querySelectorAll('input, textarea, select');
+            const resultElement = document.getElementById('result') || 
+                                document.querySelector('.result') ||
+                                document.getElementById('output') ||
+                                document.querySelector('.output');
+            
+            if (!resultElement) return;
+            
+            // Get all input values
+            const values = Array.from(inputs).map(input => input.value || input.placeholder || "");
+            
+            // Determine what to display based on page content
+            const pageContent = document.body.innerHTML.toLowerCase();
+            
+            if (values.length > 0) {
+                if (pageContent.includes('form') && pageContent.includes('submit')) {
+                    resultElement.innerHTML = `
+                        <div style="padding: 15px; background-color: #1a1b26; border-left: 4px solid #1DB954; margin-top: 20px;">
+                            <h3 style="color: #1DB954; margin-top: 0;">Form Submission Successful</h3>
+                            <p>Thank you for your submission. We've received the following information:</p>
+                            <ul style="color: #c0caf5;">
+                                ${values.map((val, i) => `<li><strong>${inputs[i].placeholder || 'Field ' + (i+1)}:</strong> ${val}</li>`).join('')}
+                            </ul>
+                        </div>
+                    `;
+                } else {
+                    resultElement.textContent = `Processed input: ${values.join(', ')}`;
+                    resultElement.style.color = '#1DB954';
+                }
+            }
+        }
+        
\ No newline at end of file
@@ -0,0 +1,93 @@
+
+        // Timer variables
+        let timerInterval;
+        let timerSeconds = 60;
+        let originalTimerSeconds = 60;
+        
+        function startTimer() {
+            // Clear any existing interval
+            if (timerInterval) {
+                clearInterval(timerInterval);
+            }
+            
+            // Find timer elements
+            const timerElement = document.getElementById('timer') || 
+                                 document.querySelector('.timer') ||
+                                 document.querySelector('[id$="timer"]') ||
+                                 document.querySelector('[class$="timer"]');
+                                 
+            const progressElement = document.getElementById('timer-progress') || 
+                                    document.querySelector('.progress-bar') ||
+                                    document.querySelector('[class$="progress"]');
+            
+            // Get duration from input if available
+            const durationInput = document.getElementById('duration') ||
+                                  document.querySelector('[id$="duration"]') ||
+                                  document.querySelector('input[type="number"]');
+            
+            if (durationInput && !isNaN(parseInt(durationInput.value))) {
+                timerSeconds = parseInt(durationInput.value);
+                originalTimerSeconds = timerSeconds;
+            }
+            
+            // Update UI immediately
+            updateTimerDisplay(timerElement, progressElement);
+            
+            // Set interval for countdown
+            timerInterval = setInterval(() => {
+                if (timerSeconds <= 0) {
+                    clearInterval(timerInterval);
+                    if (typeof timerComplete === 'function') {
+                        timerComplete();
+                    } else {
+                        // Default completion behavior
+                        if (timerElement) {
+                            timerElement.textContent = "Time's up!";
+                            timerElement.style.color = "#ff9e64";
+                        }
+                    }
+                } else {
+                    timerSeconds--;
+                    updateTimerDisplay(timerElement, progressElement);
+                }
+            }, 1000);
+        }
+        
+        function updateTimerDisplay(timerElement, progressElement) {
+            if (timerElement) {
+                const minutes = Math.floor(timerSeconds / 60);
+                const seconds = timerSeconds % 60;
+                timerElement.textContent = `${minutes}:${seconds.toString().padStart(2, '0')}`;
+            }
+            
+            if (progressElement) {
+                const percentage = (timerSeconds / originalTimerSeconds) * 100;
+                progressElement.style.width = `${percentage}%`;
+            }
+        }
+        
+        function resetTimer() {
+            if (timerInterval) {
+                clearInterval(timerInterval);
+            }
+            timerSeconds = originalTimerSeconds;
+            
+            const timerElement = document.getElementById('timer') || 
+                                 document.querySelector('.timer') ||
+                                 document.querySelector('[id$="timer"]') ||
+                                 document.querySelector('[class$="timer"]');
+                                 
+            const progressElement = document.getElementById('timer-progress') || 
+                                    document.querySelector('.progress-bar') ||
+                                    document.querySelector('[class$="progress"]');
+                                    
+            updateTimerDisplay(timerElement, progressElement);
+        }
+        
+        function pauseTimer() {
+            if (timerInterval) {
+                clearInterval(timerInterval);
+                timerInterval = null;
+            }
+        }
+        
\ No newline at end of file
@@ -0,0 +1,46 @@
+
+        // Auto-generated function to update display elements
+        function updateDisplay() {
+            const inputs = document.querySelectorAll('input, select, textarea');
+            const displayElement = document.getElementById('display') || 
+                                document.querySelector('.display') ||
+                                document.getElementById('output') ||
+                                document.querySelector('.output') ||
+                                document.getElementById('result') ||
+                                document.querySelector('.result');
+            
+            if (!displayElement) return;
+            
+            // Get all input values
+            const values = Array.from(inputs).map(input => input.value || input.placeholder || "");
+            
+            if (values.length > 0) {
+                // Check if this is likely a visual display demo
+                if (displayElement.tagName === 'CANVAS') {
+                    // Draw something on the canvas
+                    const ctx = displayElement.getContext('2d');
+                    ctx.clearRect(0, 0, displayElement.width, displayElement.height);
+                    
+                    const value = parseFloat(values[0]) || 50;
+                    const percentage = value / 100;
+                    
+                    // Draw progress bar
+                    ctx.fillStyle = '#24283b';
+                    ctx.fillRect(0, 0, displayElement.width, displayElement.height);
+                    
+                    ctx.fillStyle = '#1DB954';
+                    ctx.fillRect(0, 0, displayElement.width * percentage, displayElement.height);
+                    
+                    // Add text
+                    ctx.fillStyle = '#ffffff';
+                    ctx.font = '14px Arial';
+                    ctx.textAlign = 'center';
+                    ctx.fillText(`${value}%`, displayElement.width/2, displayElement.height/2 + 5);
+                } else {
+                    // Text-based display
+                    displayElement.textContent = `Display updated: ${values.join(', ')}`;
+                    displayElement.style.color = '#1DB954';
+                }
+            }
+        }
+        
\ No newline at end of file
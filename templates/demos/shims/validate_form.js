@@ -0,0 +1,92 @@
+
+        // Auto-generated form validation function
+        function validateForm() {
+            const form = document.querySelector('form');
+            const inputs = form ? form.querySelectorAll('input, select, textarea') : document.querySelectorAll('input, select, textarea');
+            const resultElement = document.getElementById('validation-result') || 
+                                document.getElementById('result') ||
+                                document.querySelector('.result');
+            
+            // Reset any previous validation styling
+            inputs.forEach(input => {
+                input.style.borderColor = '';
+                const errorLabel = input.parentNode.querySelector('.error-message');
+                if (errorLabel) errorLabel.remove();
+            });
+            
+            let isValid = true;
+            let errorMessages = [];
+            
+            // Validate each input
+            inputs.forEach(input => {
+                // Skip submit buttons or hidden fields
+                if (input.type === 'submit' || input.type === 'button' || input.type === 'hidden') return;
+                
+                let fieldName = input.placeholder || input.name || 'Field';
+                let errorMessage = null;
+                
+                // Required field validation
+                if (input.hasAttribute('required') && !input.value.trim()) {
+                    errorMessage = `${fieldName} is required`;
+                }
+                // Email validation
+                else if (input.type === 'email' && input.value && !/^\S+@\S+\.\S+$/.test(input.value)) {
+                    errorMessage = `Please enter a valid email address`;
+                }
+                // Number validation
+                else if (input.type === 'number') {
+                    const value = parseFloat(input.value);
+                    const min = parseFloat(input.min);
+                    const max = parseFloat(input.max);
+                    
+                    if (input.value && isNaN(value)) {
+                        errorMessage = `${fieldName} must be a number`;
+                    } else if (!isNaN(min) && value < min) {
+                        errorMessage = `${fieldName} cannot be less than ${min}`;
+                    } else if (!isNaN(max) && value > max) {
+                        errorMessage = `${fieldName} cannot be greater than ${max}`;
+                    }
+                }
+                
+                // If there's an error, highlight the field and show message
+                if (errorMessage) {
+                    isValid = false;
+                    errorMessages.push(errorMessage);
+                    
+                    // Highlight the input
+                    input.style.borderColor = '#ff5555';
+                    
+                    // Add error message below the input
+                    const errorLabel = document.createElement('div');
+                    errorLabel.className = 'error-message';
+                    errorLabel.textContent = errorMessage;
+                    errorLabel.style.color = '#ff5555';
+                    errorLabel.style.fontSize = '12px';
+                    errorLabel.style.marginTop = '5px';
+                    input.parentNode.appendChild(errorLabel);
+                }
+            });
+            
+            // Show overall validation result if element exists
+            if (resultElement) {
+                if (isValid) {
+                    resultElement.innerHTML = `
+                        <div style="padding: 10px; background-color: rgba(29, 185, 84, 0.1); border-left: 3px solid #1DB954; margin-top: 15px;">
+                            <p style="color: #1DB954; margin: 0;">Form is valid! Ready to submit.</p>
+                        </div>
+                    `;
+                } else {
+                    resultElement.innerHTML = `
+                        <div style="padding: 10px; background-color: rgba(255, 85, 85, 0.1); border-left: 3px solid #ff5555; margin-top: 15px;">
+                            <p style="color: #ff5555; margin: 0 0 5px 0;">Please fix the following errors:</p>
+                            <ul style="color: #ff5555; margin: 0; padding-left: 20px;">
+                                ${errorMessages.map(msg => `<li>${msg}</li>`).join('')}
+                            </ul>
+                        </div>
+                    `;
+                }
+            }
+            
+            return isValid;
+        }
+        
\ No newline at end of file
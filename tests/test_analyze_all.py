@@ -0,0 +1,99 @@
+import asyncio
+import importlib
+import json
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("jinja2")
+
+from fastapi.testclient import TestClient
+
+from demo_blobs import DemoBlobStore
+
+CODE = "for i in range(3):\n    print(i)\n"
+REAL_WORLD = {"title": "Batch job", "description": "Loops over records", "real_world_code": "for record in records: pass"}
+DEMO = {"demo_html": "<div id='demo'>Loop demo</div>"}
+COMPLEXITY = {"complexity_score": 1}
+
+@pytest.fixture
+def app_module(monkeypatch):
+    # app.py mounts static/ and templates/ relative to the working directory
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    module = importlib.import_module("app")
+    monkeypatch.setattr(module, "demo_blob_store", DemoBlobStore(""))
+
+    def answer(value, delay=0.0):
+        async def part(code, language):
+            await asyncio.sleep(delay)
+            return dict(value)
+        return part
+
+    monkeypatch.setattr(module, "get_real_world_mapping_async", answer(REAL_WORLD))
+    monkeypatch.setattr(module, "get_interactive_demo_async", answer(DEMO))
+    monkeypatch.setattr(module, "analyze_code_complexity_async", answer(COMPLEXITY))
+    module.answer = answer
+    return module
+
+def stream(module, **body):
+    response = TestClient(module.app).post("/api/analyze-all", json={"code": CODE, "language": "python", **body})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for raw in response.text.strip().split("\n\n"):
+        name, data = raw.split("\n", 1)
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+def test_every_part_is_streamed_then_done(app_module):
+    events = stream(app_module)
+    names = [name for name, _ in events]
+    assert sorted(names[:-1]) == ["complexity", "demo", "execute", "realworld"]
+    payloads = dict(events)
+    assert payloads["execute"]["output"] == ["0", "1", "2"]
+    assert payloads["execute"]["format"] == "structured"
+    assert payloads["realworld"] == REAL_WORLD
+    assert payloads["complexity"] == COMPLEXITY
+    assert names[-1] == "done"
+    assert set(payloads["done"]["timings_ms"]) == {"execute", "realworld", "demo", "complexity"}
+
+def test_demo_part_is_sent_as_a_blob(app_module):
+    demo = dict(stream(app_module, parts=["demo"]))["demo"]
+    assert "demo_html" not in demo
+    assert demo["demo_url"] == f"/api/realworld/demo/{demo['demo_hash']}"
+    assert app_module.demo_blob_store.get(demo["demo_hash"])["identity"].decode() == DEMO["demo_html"]
+
+def test_parts_arrive_in_completion_order(app_module, monkeypatch):
+    monkeypatch.setattr(app_module, "get_real_world_mapping_async", app_module.answer(REAL_WORLD, 0.3))
+    names = [name for name, _ in stream(app_module, parts=["realworld", "complexity"])]
+    assert names == ["complexity", "realworld", "done"]
+
+def test_part_that_times_out_gets_its_fallback(app_module, monkeypatch):
+    monkeypatch.setitem(app_module.ANALYZE_ALL_TIMEOUTS, "realworld", 0.05)
+    monkeypatch.setattr(app_module, "get_real_world_mapping_async", app_module.answer(REAL_WORLD, 5))
+    monkeypatch.setattr(app_module, "get_fallback_example", lambda code, language: {"title": "Fallback"})
+    events = dict(stream(app_module, parts=["realworld", "complexity"]))
+    assert events["realworld"] == {"title": "Fallback"}
+    assert events["complexity"] == COMPLEXITY
+
+def test_failed_parts_get_their_fallbacks(app_module, monkeypatch):
+    async def broken(code, language):
+        raise RuntimeError("model unavailable")
+
+    def broken_run(request, output_format):
+        raise RuntimeError("no interpreter")
+
+    monkeypatch.setattr(app_module, "analyze_code_complexity_async", broken)
+    monkeypatch.setattr(app_module, "run_code", broken_run)
+    events = dict(stream(app_module, parts=["execute", "complexity"]))
+    assert events["complexity"]["status"] == "error"
+    assert "model unavailable" in events["complexity"]["message"]
+    assert events["error"] == {"part": "execute", "status": "error", "error": "no interpreter"}
+    assert events["done"]["status"] == "success"
+
+def test_unknown_parts_and_formats_are_rejected(app_module):
+    client = TestClient(app_module.app)
+    assert client.post("/api/analyze-all", json={"code": CODE, "language": "python", "parts": ["lint"]}).status_code == 400
+    assert client.post("/api/analyze-all", json={"code": CODE, "language": "python", "format": "xml"}).status_code == 400
@@ -0,0 +1,102 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import ai_service
+from circuit_breaker import CircuitBreaker
+from latency_tracker import LatencyTracker
+from prompt_builder import TokenLedger
+from rate_limiter import OutboundScheduler
+
+QUESTION = "What does a for loop do?"
+
+def chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+class FakeStream:
+    def __init__(self, pieces, error=None):
+        self.pieces = list(pieces)
+        self.error = error
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.pieces:
+            return chunk(self.pieces.pop(0))
+        if self.error:
+            raise self.error
+        raise StopAsyncIteration
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(ai_service, "openai_breaker", CircuitBreaker())
+    monkeypatch.setattr(ai_service, "ai_scheduler", OutboundScheduler(0, 0, ai_service.AI_ENDPOINT_PRIORITIES))
+    monkeypatch.setattr(ai_service, "ai_latency", LatencyTracker(min_samples=1))
+    monkeypatch.setattr(ai_service, "ai_tokens", TokenLedger())
+
+    async def key_valid():
+        return True
+
+    monkeypatch.setattr(ai_service, "check_openai_api_key_async", key_valid)
+
+    def install(pieces, error=None, fail_on_create=None):
+        async def create(timeout, stream, **params):
+            assert stream is True
+            if fail_on_create:
+                raise fail_on_create
+            return FakeStream(pieces, error)
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(ai_service, "get_async_openai_client", lambda: client)
+
+    return install
+
+def collect():
+    async def main():
+        return [event async for event in ai_service.stream_ai_response_async(QUESTION)]
+
+    return asyncio.run(main())
+
+def fallback_answer():
+    return ai_service.get_fallback_ai_response(QUESTION, None, "python", "general")
+
+def test_tokens_are_streamed_as_they_arrive(api):
+    api(["A for ", "loop ", "repeats", ""])
+    events = collect()
+    assert events == [{"token": "A for "}, {"token": "loop "}, {"token": "repeats"}, {"done": "openai"}]
+    assert ai_service.ai_latency.stats()["ask.first_token"]["count"] == 1
+    assert ai_service.ai_tokens.stats()
+
+def test_invalid_key_streams_the_fallback(api, monkeypatch):
+    async def key_invalid():
+        return False
+
+    monkeypatch.setattr(ai_service, "check_openai_api_key_async", key_invalid)
+    api(["never sent"])
+    events = collect()
+    assert events[-1] == {"done": "fallback"}
+    tokens = [event["token"] for event in events[:-1]]
+    assert len(tokens) > 1
+    assert "".join(tokens) == fallback_answer()
+
+def test_failure_before_the_first_token_streams_the_fallback(api):
+    api([], fail_on_create=TimeoutError("connect timeout"))
+    events = collect()
+    assert events[-1] == {"done": "fallback"}
+    assert "".join(event["token"] for event in events[:-1]) == fallback_answer()
+
+def test_failure_after_tokens_ends_with_an_error(api):
+    api(["A for "], error=ConnectionError("reset"))
+    events = collect()
+    assert events[0] == {"token": "A for "}
+    assert list(events[1]) == ["error"]
+    assert len(events) == 2
+
+def test_chunks_join_back_to_the_text():
+    text = "  Loops repeat\n\ncode   while a condition holds.\n"
+    chunks = ai_service.chunk_text(text, 2)
+    assert "".join(chunks) == text
+    assert chunks[1] == "code   while "
+    assert ai_service.chunk_text("") == [""]
@@ -0,0 +1,79 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import ai_service
+from circuit_breaker import CircuitBreaker
+from rate_limiter import OutboundScheduler
+
+KEY = "sk-test-" + "x" * 40
+
+@pytest.fixture(autouse=True)
+def fresh_status(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", KEY)
+    # Keep the background refresher out of the tests
+    monkeypatch.setattr(ai_service, "start_api_key_refresher", lambda interval=30: None)
+    ai_service.invalidate_api_key_status()
+    yield
+    ai_service.invalidate_api_key_status()
+
+def stub_validation(monkeypatch, result):
+    calls = []
+    def validate(api_key):
+        calls.append(api_key)
+        return result
+    monkeypatch.setattr(ai_service, "validate_openai_api_key", validate)
+    return calls
+
+def test_result_is_cached(monkeypatch):
+    calls = stub_validation(monkeypatch, True)
+    assert ai_service.check_openai_api_key()
+    assert ai_service.check_openai_api_key()
+    assert ai_service.cached_api_key_status() is True
+    assert len(calls) == 1
+
+def test_invalid_key_ttl_backs_off(monkeypatch):
+    stub_validation(monkeypatch, False)
+    ttls = []
+    for _ in range(4):
+        assert not ai_service.check_openai_api_key(force_refresh=True)
+        _, _, failures = next(iter(ai_service.api_key_status.values()))
+        ttls.append(ai_service.api_key_ttl(False, failures))
+    base = ai_service.API_KEY_INVALID_TTL_SECONDS
+    assert ttls == [base, base * 2, base * 4, base * 8]
+
+def test_invalid_key_ttl_is_capped():
+    assert ai_service.api_key_ttl(False, 100) == ai_service.API_KEY_INVALID_MAX_TTL_SECONDS
+
+def test_valid_result_resets_the_backoff(monkeypatch):
+    stub_validation(monkeypatch, False)
+    for _ in range(3):
+        ai_service.check_openai_api_key(force_refresh=True)
+    stub_validation(monkeypatch, True)
+    ai_service.check_openai_api_key(force_refresh=True)
+    assert next(iter(ai_service.api_key_status.values()))[2] == 0
+
+def test_missing_key_is_not_validated(monkeypatch):
+    calls = stub_validation(monkeypatch, True)
+    monkeypatch.setenv("OPENAI_API_KEY", "short")
+    assert not ai_service.check_openai_api_key()
+    assert calls == []
+
+def test_rejected_key_forgets_the_cached_status(monkeypatch):
+    stub_validation(monkeypatch, True)
+    assert ai_service.check_openai_api_key()
+    monkeypatch.setattr(ai_service, "openai_breaker", CircuitBreaker())
+    monkeypatch.setattr(ai_service, "ai_scheduler", OutboundScheduler(0, 0, ai_service.AI_ENDPOINT_PRIORITIES))
+
+    class Unauthorized(Exception):
+        status_code = 401
+
+    async def create(timeout, **params):
+        raise Unauthorized("invalid api key")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(ai_service, "get_async_openai_client", lambda: client)
+    with pytest.raises(Unauthorized):
+        asyncio.run(ai_service.attempt_chat_completion_async("realworld", {"messages": []}, 1.0))
+    assert ai_service.cached_api_key_status() is None
@@ -0,0 +1,70 @@
+import json
+import os
+
+import pytest
+
+import ai_service
+import auth_demo_template
+from demo_templates import TEMPLATE_DIR
+
+@pytest.fixture
+def shell(monkeypatch):
+    # The real shell needs jinja2; its contents are checked separately below
+    monkeypatch.setattr(auth_demo_template, "shell_parts", lambda: ("<html>", "</html>"))
+    auth_demo_template.render_auth_demo.cache_clear()
+    yield
+    auth_demo_template.render_auth_demo.cache_clear()
+
+def credentials_in(html):
+    line = next(line for line in html.split("\n") if "const DEMO_CREDENTIALS = " in line)
+    return json.loads(line.split("const DEMO_CREDENTIALS = ", 1)[1].rstrip(";"))
+
+def test_credentials_are_read_from_the_code():
+    code = 'USERNAME = "alice"\npwd = \'s3cret\'\n'
+    assert auth_demo_template.extract_credentials(code) == ("alice", "s3cret")
+    assert auth_demo_template.extract_credentials('user = "bob"') == ("bob", "password123")
+
+def test_defaults_when_the_code_has_no_credentials():
+    assert auth_demo_template.extract_credentials("print('hello')") == ("admin", "password123")
+
+def test_credentials_cannot_close_the_script():
+    block = auth_demo_template.credentials_block("</script><script>alert(1)", 'quote"back\\slash')
+    assert block.count("</script>") == 1
+    assert block.endswith("</script>")
+    assert credentials_in(block) == {"username": "</script><script>alert(1)", "password": 'quote"back\\slash'}
+
+def test_same_credentials_reuse_the_rendered_demo(shell):
+    first = auth_demo_template.get_auth_demo_html('username = "alice"\npassword = "pw"')
+    again = auth_demo_template.get_auth_demo_html('if True:\n    username = "alice"\n    password = "pw"')
+    assert again is first
+    info = auth_demo_template.render_auth_demo.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert first.startswith("<html><script>") and first.endswith("</script></html>")
+    assert credentials_in(first) == {"username": "alice", "password": "pw"}
+
+def test_other_credentials_render_another_demo(shell):
+    alice = auth_demo_template.get_auth_demo_html('username = "alice"')
+    bob = auth_demo_template.get_auth_demo_html('username = "bob"')
+    assert credentials_in(alice)["username"] == "alice"
+    assert credentials_in(bob)["username"] == "bob"
+
+def test_api_fallback_reuses_the_memoized_demo(shell):
+    code = 'username = "alice"\npassword = "pw"\nlogin(username, password)'
+    first = ai_service.get_interactive_demo_fallback(code, "circuit open")["demo_html"]
+    again = ai_service.get_interactive_demo_fallback(code, "timeout")["demo_html"]
+    assert again is first
+    assert auth_demo_template.render_auth_demo.cache_info().hits == 1
+
+def test_shell_takes_the_block_before_the_script_that_reads_it():
+    with open(os.path.join(TEMPLATE_DIR, "auth_demo.html"), encoding="utf-8") as template:
+        html = template.read()
+    assert html.count(auth_demo_template.CREDENTIALS_MARKER) == 1
+    assert html.index("id=\"login-username\"") < html.index(auth_demo_template.CREDENTIALS_MARKER)
+    assert html.index(auth_demo_template.CREDENTIALS_MARKER) < html.index("DEMO_CREDENTIALS.username")
+
+def test_rendered_demo_uses_the_real_shell():
+    pytest.importorskip("jinja2")
+    auth_demo_template.render_auth_demo.cache_clear()
+    html = auth_demo_template.get_auth_demo_html('username = "carol"\npassword = "pw"')
+    assert auth_demo_template.CREDENTIALS_MARKER not in html
+    assert credentials_in(html) == {"username": "carol", "password": "pw"}
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import ai_service
+from circuit_breaker import CircuitBreaker
+from latency_tracker import LatencyTracker
+from prompt_builder import TokenLedger
+from rate_limiter import OutboundScheduler
+
+MESSAGES = [{"role": "user", "content": "Explain this loop"}]
+
+class StatusError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+class FakeClient:
+    """Stands in for AsyncOpenAI: each create() call runs the next scripted step."""
+
+    def __init__(self, *steps):
+        self.steps = list(steps)
+        self.calls = []
+        self.cancelled = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, timeout, **params):
+        number = len(self.calls)
+        self.calls.append(timeout)
+        step = self.steps[min(number, len(self.steps) - 1)]
+        try:
+            if isinstance(step, tuple):
+                delay, step = step
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(number)
+            raise
+        if isinstance(step, Exception):
+            raise step
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=step))], usage=None)
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(ai_service, "openai_breaker", CircuitBreaker())
+    monkeypatch.setattr(ai_service, "ai_scheduler", OutboundScheduler(0, 0, ai_service.AI_ENDPOINT_PRIORITIES))
+    monkeypatch.setattr(ai_service, "ai_latency", LatencyTracker())
+    monkeypatch.setattr(ai_service, "ai_tokens", TokenLedger())
+    monkeypatch.setattr(ai_service, "ai_call_counters", dict.fromkeys(ai_service.ai_call_counters, 0))
+    monkeypatch.setattr(ai_service, "AI_REQUEST_TIMEOUTS", {"realworld": 1.0})
+    monkeypatch.setattr(ai_service, "AI_MIN_ATTEMPT_SECONDS", 0.2)
+    monkeypatch.setattr(ai_service, "AI_HEDGED_ENDPOINTS", set())
+    monkeypatch.setattr(ai_service, "retry_delay", lambda attempt: 0.01)
+
+    def install(*steps):
+        client = FakeClient(*steps)
+        monkeypatch.setattr(ai_service, "get_async_openai_client", lambda: client)
+        return client
+
+    return install
+
+def complete():
+    return asyncio.run(ai_service.create_chat_completion_async("realworld", messages=MESSAGES))
+
+def test_transient_error_is_retried_within_the_deadline(api):
+    client = api(StatusError("Bad gateway", 502), "ok")
+    assert complete() == "ok"
+    assert len(client.calls) == 2
+    # The retry only gets what is left of the endpoint's budget
+    assert client.calls[1] < client.calls[0] <= 1.0
+    assert ai_service.ai_call_counters["retries"] == 1
+    assert ai_service.ai_latency.stats()["realworld"]["count"] == 1
+
+def test_gives_up_when_the_budget_runs_out(api, monkeypatch):
+    # Attempts at 0, 0.3 and 0.6s; a fourth would start with less than 0.2s left
+    monkeypatch.setattr(ai_service, "retry_delay", lambda attempt: 0.3)
+    client = api(StatusError("Service unavailable", 503))
+    started = time.monotonic()
+    with pytest.raises(StatusError):
+        complete()
+    assert time.monotonic() - started < 1.0
+    assert len(client.calls) == 3
+    assert ai_service.ai_call_counters["retries"] == 2
+    assert ai_service.ai_call_counters["failures"] == 1
+
+@pytest.mark.parametrize("error", [
+    StatusError("Incorrect API key provided", 401),
+    StatusError("You exceeded your current quota", 429),
+])
+def test_auth_and_quota_errors_are_not_retried(api, error):
+    client = api(error, "ok")
+    with pytest.raises(StatusError):
+        complete()
+    assert len(client.calls) == 1
+    assert ai_service.ai_call_counters["retries"] == 0
+
+def test_hedge_wins_and_the_slow_attempt_is_cancelled(api, monkeypatch):
+    monkeypatch.setattr(ai_service, "AI_HEDGED_ENDPOINTS", {"realworld"})
+    for _ in range(20):
+        ai_service.ai_latency.record("realworld.attempt", 0.05)
+    client = api((5, "slow"), (0.01, "hedged"))
+
+    async def main():
+        started = time.monotonic()
+        result = await ai_service.create_chat_completion_async("realworld", messages=MESSAGES)
+        elapsed = time.monotonic() - started
+        # Let the cancelled attempt unwind
+        await asyncio.sleep(0.01)
+        return result, elapsed
+
+    result, elapsed = asyncio.run(main())
+    assert result == "hedged"
+    assert elapsed < 0.5
+    assert client.cancelled == [0]
+    assert ai_service.ai_call_counters["hedges"] == 1
+    assert ai_service.ai_call_counters["hedge_wins"] == 1
+    # The cancelled attempt's time is kept, so the hedge delay does not drift down
+    assert ai_service.ai_latency.stats()["realworld.attempt"]["count"] == 22
+
+def test_no_hedge_without_enough_latency_samples(api, monkeypatch):
+    monkeypatch.setattr(ai_service, "AI_HEDGED_ENDPOINTS", {"realworld"})
+    client = api((0.1, "only"))
+    assert complete() == "only"
+    assert len(client.calls) == 1
+    assert ai_service.ai_call_counters["hedges"] == 0
@@ -0,0 +1,82 @@
+import pytest
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError, classify_openai_error
+
+POLICIES = {
+    "quota": {"threshold": 1, "open_seconds": 0.05},
+    "auth": {"threshold": 1, "open_seconds": 0.05},
+    "outage": {"threshold": 2, "open_seconds": 0.05},
+    "rate_limit": {"threshold": 3, "open_seconds": 0.05},
+}
+
+class StatusError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+def fail(breaker, error, scope="key"):
+    with pytest.raises(type(error)):
+        with breaker.guard(scope):
+            raise error
+
+def test_classification():
+    assert classify_openai_error(Exception("You exceeded your current quota")) == "quota"
+    assert classify_openai_error(StatusError("Incorrect API key provided", 401)) == "auth"
+    assert classify_openai_error(StatusError("Too many requests", 429)) == "rate_limit"
+    assert classify_openai_error(StatusError("Bad gateway", 502)) == "outage"
+    assert classify_openai_error(TimeoutError()) == "outage"
+    assert classify_openai_error(ValueError("bad JSON")) is None
+
+def test_opens_at_the_class_threshold():
+    breaker = CircuitBreaker(POLICIES)
+    fail(breaker, StatusError("Bad gateway", 502))
+    breaker.before_call("key")
+    fail(breaker, StatusError("Bad gateway", 502))
+    with pytest.raises(CircuitOpenError, match="outage"):
+        breaker.before_call("key")
+    assert breaker.status()["state"] == "open"
+    assert breaker.status()["rejected"] == 1
+
+def test_unclassified_errors_do_not_open():
+    breaker = CircuitBreaker(POLICIES)
+    for _ in range(5):
+        fail(breaker, ValueError("bad JSON"))
+    breaker.before_call("key")
+    assert breaker.status()["state"] == "closed"
+
+def test_half_open_allows_one_trial_that_closes_on_success():
+    breaker = CircuitBreaker(POLICIES)
+    fail(breaker, Exception("insufficient_quota"))
+    breaker.opened_at -= 1
+    breaker.before_call("key")
+    # A second caller is rejected while the trial runs
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("key")
+    breaker.record_success()
+    assert breaker.status()["state"] == "closed"
+
+def test_failed_trial_reopens_for_longer():
+    breaker = CircuitBreaker(POLICIES)
+    fail(breaker, Exception("insufficient_quota"))
+    first_period = breaker.open_seconds
+    breaker.opened_at -= 1
+    fail(breaker, Exception("insufficient_quota"))
+    assert breaker.status()["state"] == "open"
+    assert breaker.open_seconds == first_period * 2
+
+def test_new_scope_resets_the_breaker():
+    breaker = CircuitBreaker(POLICIES)
+    fail(breaker, StatusError("Incorrect API key provided", 401), scope="old-key")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("old-key")
+    breaker.before_call("new-key")
+    assert breaker.status()["state"] == "closed"
+
+def test_cancelled_trial_frees_the_slot():
+    breaker = CircuitBreaker(POLICIES)
+    fail(breaker, Exception("insufficient_quota"))
+    breaker.opened_at -= 1
+    with pytest.raises(KeyboardInterrupt):
+        with breaker.guard("key"):
+            raise KeyboardInterrupt
+    breaker.before_call("key")
@@ -0,0 +1,71 @@
+import ast
+
+from code_executor import execute_python_code, find_likely_infinite_loop, preflight_stats
+
+def flagged(code: str) -> bool:
+    return find_likely_infinite_loop(ast.parse(code)) is not None
+
+def test_constant_true_loop_without_exit_is_flagged():
+    assert flagged("i = 0\nwhile True:\n    i += 1\n")
+
+def test_loop_with_break_or_input_is_not_flagged():
+    assert not flagged("while True:\n    if input() == 'q':\n        break\n")
+    assert not flagged("while 1:\n    name = input()\n")
+
+def test_huge_static_range_is_flagged():
+    assert flagged("for i in range(10 ** 12):\n    pass\n")
+    assert not flagged("for i in range(10):\n    pass\n")
+
+def test_generator_loop_is_not_flagged():
+    code = "def gen():\n    i = 0\n    while True:\n        yield i\n        i += 1\n"
+    assert not flagged(code)
+    assert not flagged(code + "\nfor value in gen():\n    if value > 3:\n        break\n")
+
+def test_yield_from_and_await_count_as_exits():
+    assert not flagged("def chain(items):\n    while True:\n        yield from items\n\nchain([1])\n")
+    assert not flagged("async def poll(queue):\n    while True:\n        await queue.get()\n\npoll(None)\n")
+
+def test_loop_in_uncalled_function_is_not_flagged():
+    assert not flagged("def spin():\n    while True:\n        pass\n")
+
+def test_loop_in_called_function_or_method_is_flagged():
+    assert flagged("def spin():\n    while True:\n        pass\n\nspin()\n")
+    assert flagged("class Worker:\n    def run(self):\n        while True:\n            pass\n\nWorker().run()\n")
+
+def test_generator_runs_instead_of_being_rejected():
+    code = (
+        "def gen():\n    i = 0\n    while True:\n        yield i\n        i += 1\n\n"
+        "g = gen()\nprint(next(g), next(g))\n"
+    )
+    result = execute_python_code(code, output_format="structured")
+    assert result.get("error_type") != "likely_infinite"
+    assert result["success"]
+    assert result["output"] == ["0 1"]
+
+def test_loop_ended_by_a_caught_exception_is_not_flagged():
+    assert not flagged("it = iter([1, 2])\ntry:\n    while True:\n        print(next(it))\nexcept StopIteration:\n    pass\n")
+    assert not flagged("s = [1, 2]\ntry:\n    while True:\n        print(s.pop())\nexcept IndexError:\n    pass\n")
+
+def test_loop_in_try_that_cannot_raise_is_flagged():
+    assert flagged("try:\n    while True:\n        pass\nexcept KeyboardInterrupt:\n    pass\n")
+    # finally alone catches nothing
+    assert flagged("s = [1]\ntry:\n    while True:\n        s.pop()\nfinally:\n    pass\n")
+
+def test_caught_exception_loops_run():
+    result = execute_python_code("s = [1, 2]\ntry:\n    while True:\n        print(s.pop())\nexcept IndexError:\n    print('done')\n",
+                                 output_format="structured")
+    assert result["success"]
+    assert result["output"] == ["2", "1", "done"]
+
+def test_rejected_loop_can_be_forced():
+    # Flagged, but ends at once with an uncaught IndexError
+    code = "s = []\nwhile True:\n    s.pop()\n"
+    result = execute_python_code(code, output_format="structured")
+    assert result["error_type"] == "likely_infinite"
+    assert result["can_force"]
+    forced = preflight_stats["forced"]
+    result = execute_python_code(code, force=True, output_format="structured")
+    assert result.get("error_type") != "likely_infinite"
+    assert not result["success"]
+    assert "IndexError" in str(result["error"])
+    assert preflight_stats["forced"] == forced + 1
@@ -0,0 +1,88 @@
+import ai_service
+from code_features import extract_features, fallback_category, is_auth_code
+
+def test_words_in_comments_and_strings_do_not_count():
+    code = '# loop before the class\nmessage = "for while if class"\nprint(message)\n'
+    assert fallback_category(code) == "general"
+    assert extract_features(code)["loops"] == 0
+
+def test_python_features():
+    code = """
+class Counter:
+    def count(self, n):
+        if n <= 0:
+            return 0
+        return 1 + self.count(n - 1)
+
+squares = [x * x for x in range(5)]
+while squares:
+    squares.pop()
+"""
+    features = extract_features(code)
+    assert features == {"conditionals": 1, "loops": 1, "classes": 1, "functions": 1, "recursion": 1, "comprehensions": 1}
+
+def test_category_priority():
+    assert fallback_category("class A:\n    pass\nif True:\n    pass\n") == "class"
+    assert fallback_category("x = 3\nif x > 2:\n    print(x)\nfor i in range(x):\n    pass\n") == "conditional"
+    assert fallback_category("for i in range(3):\n    print(i)\n") == "loop"
+    assert fallback_category("def fact(n):\n    return 1 if n < 2 else n * fact(n - 1)\n") == "conditional"
+
+def test_recursion_alone_selects_the_loop_category():
+    assert fallback_category("def walk(n):\n    return walk(n - 1)\n") == "loop"
+
+def test_javascript_features():
+    code = """
+// if this were a class...
+function fib(n) {
+    return n < 2 ? n : fib(n - 1) + fib(n - 2);
+}
+const doubled = [1, 2, 3].map(x => x * 2);
+for (let i = 0; i < 3; i++) { console.log("while " + fib(i)); }
+"""
+    features = extract_features(code, "javascript")
+    assert features["functions"] == 1
+    assert features["recursion"] == 1
+    assert features["loops"] == 1
+    assert features["comprehensions"] == 1
+    assert features["conditionals"] == 1
+    assert features["classes"] == 0
+
+def test_java_method_declarations():
+    code = """
+public class Main {
+    static int factorial(int n) {
+        if (n <= 1) { return 1; }
+        return n * factorial(n - 1);
+    }
+    public static void main(String[] args) {
+        System.out.println(factorial(5));
+    }
+}
+"""
+    features = extract_features(code, "java")
+    assert features["classes"] == 1
+    assert features["functions"] == 2
+    assert features["recursion"] == 1
+    assert fallback_category(code, "java") == "class"
+
+def test_unparsable_python_is_read_as_tokens():
+    assert extract_features("for i in range(3)\n    print(i)")["loops"] == 1
+
+def test_auth_code_is_found_by_its_names():
+    assert is_auth_code('password = "hunter2"\nprint(password)\n')
+    assert is_auth_code("def check_login(user):\n    return user.is_valid\n")
+    assert is_auth_code("import jwt\ntoken = jwt.encode({}, 'key')\n")
+    assert is_auth_code("def register(sign_up_form):\n    pass\n")
+    assert is_auth_code("const userPassword = prompt();\nconsole.log(userPassword.length);", "javascript")
+
+def test_auth_words_in_comments_and_strings_do_not_count():
+    assert not is_auth_code('# TODO: login page\nprint("Please enter your password")\ntotal = 1 + 2\n')
+    assert not is_auth_code('// login later\nconsole.log("password");', "javascript")
+    # Unparsable Python is read as tokens
+    assert not is_auth_code('print("login"\nx = 1')
+
+def test_non_auth_code_gets_its_category_demo(monkeypatch):
+    monkeypatch.setattr(ai_service, "render_template", lambda name, **values: name)
+    code = '# the login screen comes later\nfor i in range(3):\n    print("password", i)\n'
+    assert ai_service.get_auth_template_demo(code) is None
+    assert ai_service.get_interactive_demo_fallback(code, "circuit open")["demo_html"] == ai_service.FALLBACK_DEMOS["loop"]
@@ -0,0 +1,80 @@
+import asyncio
+import json
+
+import pytest
+
+import ai_service
+from response_cache import code_fingerprint, code_hash
+
+CODE = "scores = [70, 85, 90]\nfor score in scores:\n    print(score * 2)\n"
+SAME_SHAPE = "marks = [10, 20, 30]\nfor mark in marks:\n    print(mark * 3)\n"
+
+REPLY = {
+    "real_world": {"title": "Grade report", "description": "Batch scoring", "real_world_code": "def report(): pass"},
+    "demo_html": "<div id='demo'>Scores</div>",
+    "complexity": {field: 1 for field in ai_service.COMPLEXITY_FIELDS},
+}
+
+@pytest.fixture
+def api(monkeypatch):
+    calls = []
+
+    async def completion(endpoint, **params):
+        calls.append((endpoint, params))
+        return json.dumps(REPLY)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-" + "x" * 40)
+    monkeypatch.setattr(ai_service, "create_chat_completion_async", completion)
+    # Demo post-processing is covered by its own tests
+    monkeypatch.setattr(ai_service, "fix_common_demo_issues", lambda html: html)
+    monkeypatch.setattr(ai_service.response_store, "path", "")
+    for cache in ai_service.response_caches.values():
+        cache.clear()
+    yield calls
+    for cache in ai_service.response_caches.values():
+        cache.clear()
+
+def requested_keys(params):
+    prompt = params["messages"][-1]["content"]
+    return [key for key in ("real_world", "demo_html", "complexity") if f'"{key}":' in prompt]
+
+def test_all_missing_parts_share_one_call(api):
+    result = asyncio.run(ai_service.get_combined_part_async("realworld", CODE, "python"))
+    assert result["result"]["title"] == "Grade report"
+    assert len(api) == 1
+    assert requested_keys(api[0][1]) == ["real_world", "demo_html", "complexity"]
+    assert api[0][1]["max_tokens"] == 3000
+    assert ai_service.demo_cache.get(code_hash(CODE, "python")) is not None
+    assert ai_service.complexity_cache.get(code_fingerprint(CODE, "python")) is not None
+
+def test_only_missing_parts_are_requested(api):
+    ai_service.complexity_cache.set(code_fingerprint(CODE, "python"), {"cached": True})
+    asyncio.run(ai_service.get_combined_part_async("realworld", CODE, "python"))
+    assert requested_keys(api[0][1]) == ["real_world", "demo_html"]
+    assert api[0][1]["max_tokens"] == 2500
+    # The cached analysis is not overwritten
+    assert ai_service.complexity_cache.get(code_fingerprint(CODE, "python")) == {"cached": True}
+
+def test_single_missing_part_uses_its_own_prompt(api):
+    ai_service.real_world_cache.set(code_fingerprint(CODE, "python"), {"cached": True})
+    ai_service.complexity_cache.set(code_fingerprint(CODE, "python"), {"cached": True})
+    assert asyncio.run(ai_service.get_combined_part_async("demo", CODE, "python")) == {"result": None}
+    assert api == []
+
+def test_demos_are_keyed_on_the_exact_code(api):
+    asyncio.run(ai_service.get_combined_part_async("realworld", CODE, "python"))
+    # Same shape, other literals: the mapping and analysis are shared, the demo is not
+    assert code_fingerprint(SAME_SHAPE, "python") == code_fingerprint(CODE, "python")
+    assert ai_service.real_world_cache.get(code_fingerprint(SAME_SHAPE, "python")) is not None
+    assert ai_service.demo_cache.get(code_hash(SAME_SHAPE, "python")) is None
+    asyncio.run(ai_service.get_combined_part_async("complexity", SAME_SHAPE, "python"))
+    assert api[-1][1]["max_tokens"] == 1500 + 500
+    assert requested_keys(api[-1][1]) == ["demo_html", "complexity"]
+
+def test_concurrent_endpoints_share_one_call(api):
+    async def main():
+        return await asyncio.gather(*(ai_service.get_combined_part_async(part, CODE, "python") for part in ai_service.COMBINED_PARTS))
+
+    results = asyncio.run(main())
+    assert len(api) == 1
+    assert all(result["result"] for result in results)
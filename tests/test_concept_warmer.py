@@ -0,0 +1,41 @@
+import asyncio
+import json
+
+import pytest
+
+import ai_service
+from rate_limiter import BACKGROUND_PRIORITY, call_priority
+
+EXAMPLE = {"title": "Loops", "description": "Repeat work", "code": "for i in range(3): pass", "explanation": "Runs three times"}
+
+@pytest.fixture
+def stubbed_api(monkeypatch):
+    calls = []
+    saved = {}
+
+    async def key_available():
+        return True
+
+    async def completion(endpoint, **params):
+        calls.append((endpoint, call_priority.get()))
+        return json.dumps(EXAMPLE)
+
+    monkeypatch.setattr(ai_service, "check_openai_api_key_async", key_available)
+    monkeypatch.setattr(ai_service, "create_chat_completion_async", completion)
+    monkeypatch.setattr(ai_service.response_store, "get", lambda *args: saved.get(args[-1]))
+    monkeypatch.setattr(ai_service, "save_response", lambda endpoint, key, value: saved.__setitem__(key, (value, 10 ** 9)))
+    return calls, saved
+
+def test_warm_up_uses_the_async_client_at_background_priority(stubbed_api):
+    calls, saved = stubbed_api
+    summary = ai_service.warm_concept_examples(concepts=["loops"], languages=["python", "java"])
+    assert summary == {"generated": 2, "fresh": 0, "failed": 0}
+    assert calls == [("concept_examples", BACKGROUND_PRIORITY)] * 2
+    assert saved[ai_service.concept_examples_key("loops", "java")][0] == EXAMPLE
+
+def test_fresh_pairs_are_skipped(stubbed_api):
+    calls, _ = stubbed_api
+    ai_service.warm_concept_examples(concepts=["loops"], languages=["python"])
+    summary = asyncio.run(ai_service.warm_concept_examples_async(concepts=["loops"], languages=["python"]))
+    assert summary == {"generated": 0, "fresh": 1, "failed": 0}
+    assert len(calls) == 1
@@ -0,0 +1,97 @@
+import gzip
+import os
+import random
+
+import pytest
+
+from demo_blobs import DemoBlobStore, accepted_encodings, blob_hash, compress_variants, select_variant
+
+DEMO = "<div class='demo'>" + "<p>Hello, demo</p>" * 200 + "</div>"
+
+def random_demo(seed, size=4000):
+    rng = random.Random(seed)
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz<>/ ") for _ in range(size))
+
+@pytest.fixture
+def store(tmp_path):
+    return DemoBlobStore(str(tmp_path))
+
+def test_round_trip(store):
+    digest = store.put(DEMO)
+    assert digest == blob_hash(DEMO)
+    variants = store.get(digest)
+    assert variants["identity"].decode("utf-8") == DEMO
+    assert gzip.decompress(variants["gzip"]) == variants["identity"]
+    assert store.put(DEMO) == digest
+    assert store.stats()["stored"] == 1
+
+def test_malformed_hash_is_rejected_without_touching_the_disk(store):
+    assert store.get("../" + "a" * 61) is None
+    assert store.get(blob_hash(DEMO).upper()) is None
+    assert store.get("0" * 64) is None
+    assert store.stats()["misses"] == 3
+
+def test_gzip_bytes_do_not_depend_on_the_time():
+    assert compress_variants(DEMO.encode())["gzip"] == compress_variants(DEMO.encode())["gzip"]
+
+def test_variant_that_is_not_smaller_is_left_out():
+    assert set(compress_variants(b"<p>")) == {"identity"}
+
+def test_accept_encoding_parsing():
+    assert accepted_encodings("gzip, deflate, br") == ["gzip", "deflate", "br"]
+    assert accepted_encodings("GZIP;q=0.5, br;q=0") == ["gzip"]
+    assert accepted_encodings("gzip; q=0.0") == []
+    assert accepted_encodings("") == []
+
+def test_variant_selection():
+    variants = {"identity": b"plain", "gzip": b"gz", "br": b"br"}
+    assert select_variant(variants, "gzip, br") == ("br", b"br")
+    assert select_variant(variants, "gzip") == ("gzip", b"gz")
+    assert select_variant(variants, "br;q=0, gzip") == ("gzip", b"gz")
+    assert select_variant(variants, "*") == ("br", b"br")
+    assert select_variant(variants, "gzip;q=0, br;q=0") == ("identity", b"plain")
+    assert select_variant({"identity": b"plain"}, "gzip, br") == ("identity", b"plain")
+
+def test_blob_stored_by_one_worker_is_served_by_another(tmp_path):
+    digest = DemoBlobStore(str(tmp_path)).put(DEMO)
+    other = DemoBlobStore(str(tmp_path))
+    assert other.get(digest)["identity"].decode("utf-8") == DEMO
+    assert other.stats()["disk_reads"] == 1
+    # Already on disk, so not compressed and written again
+    assert other.put(DEMO) == digest
+    assert other.stats()["stored"] == 0
+
+def test_no_temporary_files_are_left(store, tmp_path):
+    digest = store.put(DEMO)
+    names = os.listdir(tmp_path)
+    assert f"{digest}.html" in names
+    assert f"{digest}.html.gz" in names
+    assert not any(name.endswith(".tmp") for name in names)
+
+def test_least_recently_written_blobs_are_evicted(tmp_path):
+    store = DemoBlobStore(str(tmp_path), max_bytes=10000, memory_entries=0)
+    digests = [store.put(random_demo(seed)) for seed in range(5)]
+    for age, digest in enumerate(reversed(digests)):
+        for name in os.listdir(tmp_path):
+            if name.startswith(digest):
+                os.utime(tmp_path / name, (1000000 - age * 100, 1000000 - age * 100))
+    store.evict()
+    assert sum(entry.stat().st_size for entry in os.scandir(tmp_path)) <= 10000 * 0.9
+    remaining = {name.split(".", 1)[0] for name in os.listdir(tmp_path)}
+    assert digests[-1] in remaining
+    assert digests[0] not in remaining
+    # A blob's variants go together
+    for digest in remaining:
+        assert os.path.exists(tmp_path / f"{digest}.html")
+    assert store.get(digests[0]) is None
+    assert store.stats()["evictions"] >= 1
+
+def test_memory_only_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = DemoBlobStore("", memory_entries=2)
+    digests = [store.put(random_demo(seed, 500)) for seed in range(3)]
+    assert os.listdir(tmp_path) == []
+    assert store.get(digests[0]) is None
+    assert store.get(digests[2]) is not None
+    assert store.stats()["in_memory"] == 2
+    assert store.stats()["directory"] is None
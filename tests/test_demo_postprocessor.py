@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+from demo_postprocessor import ONLOAD_STUB, postprocess_demo
+
+# Pairs of generated demos and the output of the multi-pass fixes postprocess_demo
+# replaced (fix_common_demo_issues at f88e51a), recorded once
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "demo_postprocessor")
+GOLDEN_DEMOS = sorted(name[:-len(".input.html")] for name in os.listdir(GOLDEN_DIR) if name.endswith(".input.html"))
+
+def read_golden(name, kind):
+    with open(os.path.join(GOLDEN_DIR, f"{name}.{kind}.html"), encoding="utf-8") as golden:
+        return golden.read()
+
+@pytest.mark.parametrize("name", GOLDEN_DEMOS)
+def test_output_matches_the_multi_pass_fixes(name):
+    assert postprocess_demo(read_golden(name, "input"))[0] == read_golden(name, "expected")
+
+def test_reports_the_injected_shims():
+    assert postprocess_demo(read_golden("grade_buttons", "input"))[1] == ["calculateGrades", "calculateAverage"]
+    assert postprocess_demo(read_golden("timer_defined_by_the_page", "input"))[1] == []
+
+def test_own_onload_is_replaced():
+    fixed, _ = postprocess_demo(read_golden("own_onload", "input"))
+    assert ONLOAD_STUB in fixed
+    assert "window.onload = function() { processInput(); }" not in fixed
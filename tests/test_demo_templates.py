@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import ai_service
+import demo_templates
+from demo_postprocessor import AUTO_RUN_TEMPLATE, FUNCTION_SHIMS, NOTIFICATION_SYSTEM_TEMPLATE
+
+STATIC_TEMPLATES = sorted(
+    set(ai_service.FALLBACK_DEMOS.values())
+    | {template for _, template in FUNCTION_SHIMS}
+    | {NOTIFICATION_SYSTEM_TEMPLATE, AUTO_RUN_TEMPLATE, "quota_exceeded.html", "auth_demo.html"}
+)
+
+@pytest.fixture
+def jinja2():
+    return pytest.importorskip("jinja2")
+
+def read_template(name):
+    with open(os.path.join(demo_templates.TEMPLATE_DIR, name), encoding="utf-8") as template:
+        return template.read()
+
+def test_jinja2_is_not_imported_until_a_template_is_rendered():
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, demo_templates, ai_service; print('jinja2' in sys.modules)"],
+        cwd=os.path.dirname(os.path.dirname(demo_templates.TEMPLATE_DIR)),
+        capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+@pytest.mark.parametrize("name", STATIC_TEMPLATES)
+def test_template_files_exist(name):
+    assert read_template(name).strip()
+
+@pytest.mark.parametrize("name", STATIC_TEMPLATES)
+def test_static_templates_render_to_their_file(jinja2, name):
+    assert demo_templates.render_template(name) == read_template(name)
+
+def test_static_payload_is_rendered_once(jinja2):
+    assert demo_templates.render_template("quota_exceeded.html") is demo_templates.render_template("quota_exceeded.html")
+    assert demo_templates.get_environment() is demo_templates.get_environment()
+
+def test_parameters_are_substituted_without_escaping(jinja2):
+    html = demo_templates.render_template("auth_fallback.html", username="o'brien<&>", password="p\"w")
+    assert "username === 'o'brien<&>' && password === 'p\"w'" in html
+    assert "Hint: Use o'brien<&>/p\"w" in html
+    assert "{{" not in html
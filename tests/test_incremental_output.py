@@ -0,0 +1,83 @@
+from collections import OrderedDict
+
+import pytest
+
+import code_executor
+from code_executor import apply_incremental_output, diff_output_lines, output_hash
+
+OLD = [f"step {number}: total = {number * 10}" for number in range(200)]
+NEW = OLD[:50] + ["inserted line"] + OLD[50:120] + OLD[121:]
+
+def apply_ops(old, ops):
+    lines, position = [], 0
+    for op, value in ops:
+        if op == "=":
+            lines.extend(old[position:position + value])
+            position += value
+        elif op == "-":
+            position += value
+        else:
+            lines.extend(value)
+    assert position == len(old)
+    return lines
+
+@pytest.fixture(autouse=True)
+def sessions(monkeypatch):
+    cache = OrderedDict()
+    monkeypatch.setattr(code_executor, "session_outputs", cache)
+    return cache
+
+def run(session, lines, last_hash=None):
+    return apply_incremental_output({"output": list(lines), "success": True}, session, last_hash)
+
+@pytest.mark.parametrize("old, new", [
+    (OLD, NEW),
+    (OLD, OLD),
+    ([], OLD[:3]),
+    (OLD[:3], []),
+    (["a", "b", "c"], ["c", "b", "a"]),
+])
+def test_ops_turn_the_old_lines_into_the_new(old, new):
+    assert apply_ops(old, diff_output_lines(old, new)) == new
+
+def test_small_change_is_sent_as_a_diff():
+    first = run("editor", OLD)
+    assert first["output"] == OLD
+    second = run("editor", NEW, first["output_hash"])
+    assert second["output"] is None
+    assert second["output_diff"]["base"] == first["output_hash"]
+    assert apply_ops(OLD, second["output_diff"]["ops"]) == NEW
+    assert second["output_hash"] == output_hash(NEW)
+
+def test_hash_mismatch_gets_the_full_output():
+    run("editor", OLD)
+    result = run("editor", NEW, "0" * 16)
+    assert result["output"] == NEW
+    assert "output_diff" not in result
+
+def test_no_diff_without_a_session():
+    result = run(None, OLD, output_hash(OLD))
+    assert result["output"] == OLD
+    assert result["output_hash"] == output_hash(OLD)
+
+def test_full_output_is_kept_when_smaller_than_the_diff():
+    first = run("editor", ["a", "b"])
+    result = run("editor", ["x", "y"], first["output_hash"])
+    assert result["output"] == ["x", "y"]
+    assert "output_diff" not in result
+
+def test_least_recently_used_session_is_evicted(monkeypatch, sessions):
+    monkeypatch.setattr(code_executor, "OUTPUT_CACHE_MAX_SESSIONS", 2)
+    hashes = {session: run(session, OLD)["output_hash"] for session in ("a", "b")}
+    # Touching "a" makes "b" the least recently used
+    hashes["a"] = run("a", OLD, hashes["a"])["output_hash"]
+    run("c", OLD)
+    assert list(sessions) == ["a", "c"]
+    assert run("a", NEW, hashes["a"])["output"] is None
+    assert run("b", NEW, hashes["b"])["output"] == NEW
+
+def test_oversized_output_is_not_cached(monkeypatch, sessions):
+    monkeypatch.setattr(code_executor, "OUTPUT_CACHE_MAX_LINES", 100)
+    first = run("editor", OLD)
+    assert "editor" not in sessions
+    assert run("editor", NEW, first["output_hash"])["output"] == NEW
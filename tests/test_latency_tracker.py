@@ -0,0 +1,37 @@
+from latency_tracker import LatencyTracker
+
+def test_no_percentile_until_enough_samples():
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record("ask", 0.1)
+    tracker.record("ask", 0.2)
+    assert tracker.percentile("ask", 95) is None
+    assert tracker.percentile("other", 50) is None
+    tracker.record("ask", 0.3)
+    assert tracker.percentile("ask", 50) == 0.2
+
+def test_percentiles():
+    tracker = LatencyTracker(min_samples=1)
+    for value in range(1, 101):
+        tracker.record("ask", value / 100)
+    assert tracker.percentile("ask", 0) == 0.01
+    assert tracker.percentile("ask", 95) == 0.95
+    assert tracker.percentile("ask", 100) == 1.0
+
+def test_old_samples_leave_the_window():
+    tracker = LatencyTracker(window=10, min_samples=1)
+    for _ in range(10):
+        tracker.record("ask", 5.0)
+    for _ in range(10):
+        tracker.record("ask", 0.1)
+    assert tracker.percentile("ask", 99) == 0.1
+    stats = tracker.stats()["ask"]
+    assert stats["count"] == 20
+    assert stats["window"] == 10
+
+def test_stats_in_milliseconds():
+    tracker = LatencyTracker()
+    for seconds in (0.010, 0.020, 0.030, 0.040):
+        tracker.record("demo", seconds)
+    assert tracker.stats() == {
+        "demo": {"count": 4, "window": 4, "p50_ms": 30.0, "p95_ms": 40.0, "p99_ms": 40.0, "max_ms": 40.0}
+    }
@@ -0,0 +1,103 @@
+import json
+import random
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("uvicorn")
+
+from fastapi.testclient import TestClient
+
+import ai_service
+import openai_standin
+from openai_standin import StandInState, build_parser, classify_request, create_app, parse_latency, sample_latency
+
+CODE = "scores = [70, 85]\nfor score in scores:\n    print(score)\n"
+
+def kind_of(request):
+    prompt = "\n".join(message["content"] for message in request["messages"])
+    json_mode = (request.get("response_format") or {}).get("type") == "json_object"
+    return classify_request(prompt, json_mode)
+
+@pytest.mark.parametrize("request_builder, kind", [
+    (lambda: ai_service.build_real_world_request(CODE, "python"), "realworld"),
+    (lambda: ai_service.build_interactive_demo_request(CODE, "python"), "demo"),
+    (lambda: ai_service.build_complexity_request(CODE, "python"), "complexity"),
+    (lambda: ai_service.build_combined_request(CODE, "python"), "combined"),
+    (lambda: ai_service.build_combined_request(CODE, "python", ("realworld", "demo")), "combined"),
+    (lambda: ai_service.build_concept_examples_request("loops", "python"), "concept_examples"),
+    (lambda: ai_service.build_ai_response_request("What is a loop?", CODE, "python", "loops"), "ask"),
+])
+def test_requests_are_classified_by_feature(request_builder, kind):
+    assert kind_of(request_builder()) == kind
+
+def test_latency_specs():
+    assert parse_latency("fixed:0.5") == ("fixed", [0.5])
+    assert parse_latency("lognormal:1.2,0.4") == ("lognormal", [1.2, 0.4])
+    with pytest.raises(ValueError):
+        parse_latency("gamma:1,2")
+    with pytest.raises(ValueError):
+        parse_latency("uniform:1")
+    rng = random.Random(1)
+    assert sample_latency(rng, ("fixed", [0.5])) == 0.5
+    assert all(1 <= sample_latency(rng, ("uniform", [1, 2])) <= 2 for _ in range(100))
+    assert all(sample_latency(rng, ("normal", [0, 1])) >= 0 for _ in range(100))
+
+@pytest.fixture
+def client(tmp_path):
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps([{"kind": "ask", "match": "recursion", "content": "Request $request_number on $model"}]))
+    args = build_parser().parse_args(["--latency", "fixed:0", "--token-delay", "0", "--seed", "1", "--responses", str(rules)])
+    state = StandInState(args)
+    return TestClient(create_app(state)), state
+
+def chat(client, content, **body):
+    return client.post("/v1/chat/completions", json={"model": "gpt-4o", "messages": [{"role": "user", "content": content}], **body})
+
+def test_completion_has_the_openai_shape(client):
+    http, _ = client
+    response = chat(http, "Explain loops")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["choices"][0]["message"]["content"] == openai_standin.CANNED_RESPONSES["ask"]
+    assert body["usage"]["total_tokens"] == body["usage"]["prompt_tokens"] + body["usage"]["completion_tokens"]
+
+def test_response_rules_are_templated(client):
+    http, _ = client
+    chat(http, "Explain loops")
+    assert chat(http, "Explain recursion").json()["choices"][0]["message"]["content"] == "Request 2 on gpt-4o"
+
+def test_streamed_chunks_join_to_the_content(client):
+    http, _ = client
+    response = chat(http, "Explain loops", stream=True)
+    events = [line[len("data: "):] for line in response.text.split("\n") if line.startswith("data: ")]
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(event)["choices"][0] for event in events[:-1]]
+    assert "".join(choice["delta"].get("content", "") for choice in chunks) == openai_standin.CANNED_RESPONSES["ask"]
+    assert chunks[-1]["finish_reason"] == "stop"
+
+def test_injected_errors_use_the_openai_error_shape(client):
+    http, state = client
+    assert http.post("/config", json={"quota": True}).status_code == 200
+    response = chat(http, "Explain loops")
+    assert response.status_code == 429
+    assert response.json()["error"]["code"] == "insufficient_quota"
+
+    http.post("/config", json={"quota": False, "auth_fail": True})
+    assert chat(http, "Explain loops").status_code == 401
+    assert http.get("/v1/models").status_code == 401
+
+    http.post("/config", json={"auth_fail": False, "error_rate": 1.0})
+    assert chat(http, "Explain loops").status_code == 500
+    assert state.stats["ask"]["server_errors"] == 1
+
+def test_stats_and_config(client):
+    http, _ = client
+    chat(http, "Explain loops")
+    stats = http.get("/stats").json()
+    assert stats["requests"] == 1
+    assert stats["kinds"]["ask"]["requests"] == 1
+    assert http.post("/config", json={"colour": "blue"}).status_code == 400
+    http.post("/stats/reset")
+    assert http.get("/stats").json()["requests"] == 0
@@ -0,0 +1,90 @@
+import re
+
+from prompt_builder import compact_template, count_tokens, fit_code, render_prompt
+
+MARKER_RE = re.compile(r"^\s*(?:#|//) \.\.\. (\d+) lines? omitted$")
+
+def big_program(functions):
+    parts = ["import os", "import sys", ""]
+    for number in range(functions):
+        parts += [
+            f"def handler_{number}(request, limit={number}):",
+            "    total = 0",
+            "    for item in request.items:",
+            "        if item.value > limit:",
+            f"            total += item.value * {number}",
+            "        else:",
+            "            total -= 1",
+            f"    label = 'handler {number}'",
+            "    print(label, total)",
+            "    result = {'total': total, 'label': label}",
+            "    request.log(result)",
+            "    return result",
+            "",
+        ]
+    return "\n".join(parts)
+
+def test_code_within_budget_is_unchanged():
+    code = big_program(2)
+    assert fit_code(code, max_tokens=10000) == code
+
+def test_large_file_keeps_code_rather_than_markers():
+    code = big_program(460)
+    assert len(code.split("\n")) > 5900
+    fitted = fit_code(code, max_tokens=1500)
+    lines = fitted.split("\n")
+    markers = [line for line in lines if MARKER_RE.match(line)]
+    kept = [line for line in lines if not MARKER_RE.match(line)]
+    assert count_tokens(fitted) <= 1500
+    # About 9 tokens a line: a budget of 1500 holds at most ~165 lines of this code
+    assert len(kept) >= 100
+    assert len(markers) <= len(kept) / 4
+    assert sum(count_tokens(line) + 1 for line in markers) <= 0.25 * 1500
+
+def test_one_marker_per_gap_with_the_right_count():
+    code = big_program(460)
+    lines = fit_code(code, max_tokens=1500).split("\n")
+    assert not any(MARKER_RE.match(first) and MARKER_RE.match(second) for first, second in zip(lines, lines[1:]))
+    omitted = sum(int(MARKER_RE.match(line).group(1)) for line in lines if MARKER_RE.match(line))
+    kept = sum(1 for line in lines if not MARKER_RE.match(line))
+    assert omitted + kept == len(code.split("\n"))
+
+def test_single_line_marker_is_singular():
+    for line in fit_code(big_program(460), max_tokens=1500).split("\n"):
+        assert "... 1 lines omitted" not in line
+
+def test_gaps_are_only_dropped_when_that_saves_tokens():
+    code = big_program(460)
+    original = code.split("\n")
+    position = 0
+    for line in fit_code(code, max_tokens=1500).split("\n"):
+        match = MARKER_RE.match(line)
+        if not match:
+            assert line == original[position]
+            position += 1
+            continue
+        count = int(match.group(1))
+        dropped = sum(count_tokens(text) + 1 for text in original[position:position + count])
+        assert dropped > count_tokens(line) + 1
+        position += count
+    assert position == len(original)
+
+def test_structure_is_kept_first():
+    fitted = fit_code(big_program(460), max_tokens=1500)
+    assert fitted.startswith("import os\nimport sys\n")
+    assert "def handler_0(request, limit=0):" in fitted
+
+def test_other_languages_use_their_comment_syntax():
+    code = "\n".join(f"let value{i} = compute({i});" for i in range(2000))
+    fitted = fit_code(code, "javascript", max_tokens=300)
+    assert fitted.split("\n")[-1].startswith("// ... ")
+    assert count_tokens(fitted) <= 300
+
+def test_render_prompt_dedents_and_keeps_code_indentation():
+    prompt = render_prompt("""
+        Explain this code:
+
+        {code}
+        """, code="if x:\n    print(x)")
+    assert prompt == "Explain this code:\n\nif x:\n    print(x)"
+    assert compact_template("\n    a\n\n\n    b\n") == "a\n\nb"
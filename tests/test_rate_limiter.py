@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import pytest
+
+from rate_limiter import OutboundScheduler, RateLimitShed, TokenBucket, background_priority
+
+PRIORITIES = {"ask": 0, "realworld": 1}
+
+def acquire(scheduler, endpoint, tokens, deadline):
+    asyncio.run(scheduler.acquire_async(endpoint, tokens, deadline))
+
+def test_bucket_wait_time():
+    bucket = TokenBucket(60)
+    assert bucket.wait_time(60) == 0
+    bucket.level = 0
+    assert bucket.wait_time(30) == pytest.approx(30)
+
+def test_calls_within_the_limits_go_straight_out():
+    scheduler = OutboundScheduler(10, 1000, PRIORITIES)
+    for _ in range(3):
+        acquire(scheduler, "ask", 100, time.monotonic() + 5)
+    stats = scheduler.stats()
+    assert stats["ask"]["granted"] == 3
+    assert stats["ask"]["queued"] == 0
+    assert stats["tokens_available"] == pytest.approx(700, abs=1)
+
+def test_call_larger_than_the_token_limit_is_rejected_up_front():
+    scheduler = OutboundScheduler(10, 1000, PRIORITIES)
+    started = time.monotonic()
+    with pytest.raises(RateLimitShed, match="tokens-per-minute limit of 1000"):
+        acquire(scheduler, "realworld", 1500, time.monotonic() + 30)
+    assert time.monotonic() - started < 0.5
+    assert scheduler.stats()["realworld"]["too_large"] == 1
+    assert scheduler.queue == []
+    # The rejected call does not hold up the calls after it
+    acquire(scheduler, "ask", 1000, time.monotonic() + 5)
+
+def test_call_that_cannot_start_before_its_deadline_is_shed():
+    # One request a minute: the second call would wait ~60s
+    scheduler = OutboundScheduler(1, 0, PRIORITIES, min_start_seconds=0.5)
+    acquire(scheduler, "ask", 10, time.monotonic() + 5)
+    with pytest.raises(RateLimitShed, match="past its deadline"):
+        acquire(scheduler, "ask", 10, time.monotonic() + 5)
+    assert scheduler.stats()["ask"]["shed"] == 1
+
+def test_queued_calls_are_granted_by_priority():
+    # 600 requests a minute refills one request every 0.1s
+    scheduler = OutboundScheduler(600, 0, PRIORITIES)
+    scheduler.requests.level = 0
+    order = []
+
+    async def call(label, endpoint, delay):
+        await asyncio.sleep(delay)
+        await scheduler.acquire_async(endpoint, 10, time.monotonic() + 5)
+        order.append(label)
+
+    async def background_call():
+        with background_priority():
+            await call("warm-up", "ask", 0)
+
+    async def main():
+        await asyncio.gather(background_call(), call("realworld", "realworld", 0.01), call("ask", "ask", 0.02))
+
+    asyncio.run(main())
+    # Queued first, but at background priority it goes last
+    assert order == ["ask", "realworld", "warm-up"]
+
+def test_disabled_limits_never_wait():
+    scheduler = OutboundScheduler(0, 0, PRIORITIES)
+    assert not scheduler.enabled
+    acquire(scheduler, "ask", 10 ** 9, time.monotonic())
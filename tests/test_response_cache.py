@@ -0,0 +1,69 @@
+import time
+
+from response_cache import ResponseCache, bucket_literal, code_fingerprint
+
+def test_fingerprint_ignores_names_literals_and_formatting():
+    first = "score = 85\nif score >= 90:\n    print('A')\nelse:\n    print('B')\n"
+    second = "marks=72\nif marks>=60:  # pass mark\n    print( 'Pass' )\nelse:\n    print('Fail')\n"
+    assert code_fingerprint(first) == code_fingerprint(second)
+
+def test_fingerprint_tells_different_shapes_apart():
+    loop = "for i in range(10):\n    print(i)\n"
+    branch = "if x > 10:\n    print(x)\n"
+    assert code_fingerprint(loop) != code_fingerprint(branch)
+
+def test_fingerprint_keeps_builtins_and_imports():
+    assert code_fingerprint("import json\njson.dumps(x)") != code_fingerprint("import yaml\nyaml.dumps(x)")
+    assert code_fingerprint("print(len(items))") != code_fingerprint("print(sum(items))")
+
+def test_fingerprint_depends_on_language():
+    assert code_fingerprint("x = 1", "python") != code_fingerprint("x = 1", "javascript")
+
+def test_token_fingerprint_for_other_languages():
+    first = "let total = 0; // sum\nfor (let i = 0; i < 5; i++) { total += i; }"
+    second = "let acc = 0;\nfor (let k = 0; k < 9; k++) { acc += k; }"
+    assert code_fingerprint(first, "javascript") == code_fingerprint(second, "javascript")
+
+def test_unparsable_python_falls_back_to_tokens():
+    assert code_fingerprint("if x >:\n  pass") == code_fingerprint("if y >:\n  pass")
+
+def test_literal_buckets():
+    assert bucket_literal(0) == "int:zero"
+    assert bucket_literal(7) == "int:small"
+    assert bucket_literal(1000) == "int:large"
+    assert bucket_literal("hello") == "str:word"
+    assert bucket_literal("hello world") == "str:text"
+
+def test_cache_returns_copies():
+    cache = ResponseCache()
+    value = {"title": "Login"}
+    cache.set("key", value)
+    value["title"] = "changed"
+    cached = cache.get("key")
+    cached["title"] = "changed again"
+    assert cache.get("key") == {"title": "Login"}
+
+def test_cache_expires_entries():
+    cache = ResponseCache(ttl_seconds=60)
+    cache.set("key", "value", ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert cache.get("key") is None
+    assert cache.stats()["expired"] == 1
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_hit_rate():
+    cache = ResponseCache()
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
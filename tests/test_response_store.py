@@ -0,0 +1,52 @@
+import random
+import time
+
+import pytest
+
+from response_store import ResponseStore
+
+@pytest.fixture
+def store(tmp_path):
+    return ResponseStore(str(tmp_path / "responses.db"), max_bytes=1024 * 1024)
+
+def test_round_trip(store):
+    store.put("realworld", "v1", "gpt-4o", "abc", {"title": "Login"}, ttl_seconds=60)
+    value, remaining = store.get("realworld", "v1", "gpt-4o", "abc")
+    assert value == {"title": "Login"}
+    assert 0 < remaining <= 60
+
+def test_key_includes_template_version_and_model(store):
+    store.put("realworld", "v1", "gpt-4o", "abc", {"title": "Login"}, ttl_seconds=60)
+    assert store.get("realworld", "v2", "gpt-4o", "abc") is None
+    assert store.get("realworld", "v1", "other-model", "abc") is None
+
+def test_expired_entries_are_misses(store):
+    store.put("realworld", "v1", "gpt-4o", "abc", {"title": "Login"}, ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert store.get("realworld", "v1", "gpt-4o", "abc") is None
+    assert store.stats()["misses"] == 1
+
+def test_shared_between_store_instances(store):
+    store.put("demo", "v1", "gpt-4o", "abc", {"demo_html": "<p>hi</p>"}, ttl_seconds=60)
+    other = ResponseStore(store.path)
+    assert other.get("demo", "v1", "gpt-4o", "abc")[0] == {"demo_html": "<p>hi</p>"}
+
+def test_evicts_least_recently_used_over_the_size_limit(tmp_path):
+    store = ResponseStore(str(tmp_path / "responses.db"), max_bytes=4096)
+    # Random-looking bodies so compression does not shrink them under the limit
+    for index in range(8):
+        rng = random.Random(index)
+        body = {"text": "".join(chr(rng.randrange(33, 123)) for _ in range(1024))}
+        store.put("demo", "v1", "gpt-4o", str(index), body, ttl_seconds=60)
+    store.evict()
+    stats = store.stats()
+    assert stats["bytes"] <= 4096
+    assert stats["evictions"] > 0
+    assert store.get("demo", "v1", "gpt-4o", "7") is not None
+    assert store.get("demo", "v1", "gpt-4o", "0") is None
+
+def test_disabled_store_is_a_no_op():
+    store = ResponseStore("")
+    store.put("demo", "v1", "gpt-4o", "abc", {"a": 1}, ttl_seconds=60)
+    assert store.get("demo", "v1", "gpt-4o", "abc") is None
+    assert store.stats()["enabled"] is False
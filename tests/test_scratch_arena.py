@@ -0,0 +1,87 @@
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import pytest
+
+from code_executor import ScratchArena, ScratchQuotaExceeded
+
+@pytest.fixture
+def arena(tmp_path):
+    arena = ScratchArena("test", slots=1, quota_bytes=1024 * 1024, lease_seconds=60, root=str(tmp_path))
+    yield arena
+    arena.close()
+
+def write_files(count: int, size: int, pause: float = 0.0) -> str:
+    return (
+        "import time\n"
+        f"for i in range({count}):\n"
+        f"    open(f'out{{i}}.bin', 'wb').write(b'x' * {size})\n"
+        f"    time.sleep({pause})\n"
+        "time.sleep(5)\n"
+    )
+
+def test_slot_is_wiped_on_release(arena):
+    with arena.slot() as path:
+        open(os.path.join(path, "Main.java"), "w").write("class Main {}")
+    with arena.slot() as path:
+        assert os.listdir(path) == []
+
+def test_stale_release_does_not_free_the_next_holders_slot(arena):
+    index, stale_token = arena.acquire()
+    arena.lease_seconds = 0
+    time.sleep(0.01)
+    assert arena.sweep() == 1
+    arena.lease_seconds = 60
+
+    index_again, token = arena.acquire(timeout=1)
+    assert index_again == index
+    marker = os.path.join(arena.slot_paths[index], "in-use")
+    open(marker, "w").close()
+
+    # The first holder finishes late; its release must not touch the new lease
+    arena.release(index, stale_token)
+    assert os.path.exists(marker)
+    with pytest.raises(RuntimeError):
+        arena.acquire(timeout=0.05)
+
+    arena.release(index, token)
+    assert not os.path.exists(marker)
+    arena.release(index, token)  # A second release is a no-op
+    assert arena.acquire(timeout=0.05)[0] == index
+
+def test_run_returns_output(arena):
+    with arena.slot() as path:
+        returncode, stdout, stderr = arena.run(path, [sys.executable, "-c", "print('hi')"], 5)
+    assert (returncode, stdout, stderr) == (0, "hi\n", "")
+
+def test_run_stops_a_program_filling_the_slot(arena):
+    with arena.slot() as path:
+        started = time.monotonic()
+        with pytest.raises(ScratchQuotaExceeded):
+            # 8 files of 256 KB: each is under the per-file limit, the total is not
+            arena.run(path, [sys.executable, "-c", write_files(8, 256 * 1024, 0.02)], 10, cwd=path)
+        assert time.monotonic() - started < 3
+
+def test_run_stops_a_single_oversized_file(arena):
+    with arena.slot() as path:
+        with pytest.raises(ScratchQuotaExceeded):
+            arena.run(path, [sys.executable, "-c", write_files(1, 4 * 1024 * 1024)], 10, cwd=path)
+        sizes = [os.path.getsize(os.path.join(path, name)) for name in os.listdir(path)]
+        # The file size limit stops the write one byte past the quota
+        assert all(size <= arena.quota_bytes + 1 for size in sizes)
+
+def test_run_kills_the_program_at_the_timeout(arena):
+    with arena.slot() as path:
+        started = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            arena.run(path, [sys.executable, "-c", "import time; time.sleep(30)"], 0.5)
+        assert time.monotonic() - started < 3
+
+def test_run_without_prlimit_still_polls_the_quota(arena, monkeypatch):
+    monkeypatch.delattr(resource, "prlimit")
+    with arena.slot() as path:
+        with pytest.raises(ScratchQuotaExceeded):
+            arena.run(path, [sys.executable, "-c", write_files(8, 256 * 1024, 0.02)], 10, cwd=path)
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+import ai_service
+from response_cache import ResponseCache
+from similarity_index import SimilarityIndex
+
+LOGIN = """
+username = input("Username: ")
+password = input("Password: ")
+if username == "admin" and password == "secret":
+    print("Welcome back")
+    attempts = 0
+else:
+    print("Access denied")
+    attempts += 1
+"""
+
+LOGIN_EDITED = LOGIN.replace('"admin" and', '"admin" or')
+
+LOOP = """
+total = 0
+for number in range(1, 11):
+    if number % 2 == 0:
+        total += number
+print(total)
+"""
+
+def test_near_duplicate_is_found():
+    index = SimilarityIndex()
+    index.add("login", LOGIN)
+    matches = index.query(LOGIN_EDITED)
+    assert matches and matches[0][0] == "login"
+    assert 0.75 <= matches[0][1] < 1
+
+def test_unrelated_code_is_not_matched():
+    index = SimilarityIndex()
+    index.add("login", LOGIN)
+    assert index.query(LOOP) == []
+
+def test_languages_do_not_match_each_other():
+    index = SimilarityIndex()
+    index.add("login", LOGIN, "python")
+    assert index.query(LOGIN, "javascript") == []
+
+def test_removed_snippet_is_not_returned():
+    index = SimilarityIndex()
+    index.add("login", LOGIN)
+    index.remove("login")
+    assert index.query(LOGIN) == []
+    assert index.stats()["size"] == 0
+    assert index.stats()["buckets"] == 0
+
+def test_least_recently_used_snippet_is_evicted():
+    index = SimilarityIndex(max_entries=1)
+    index.add("login", LOGIN)
+    index.add("loop", LOOP)
+    assert index.query(LOGIN) == []
+    assert index.stats()["evictions"] == 1
+
+def test_cache_reports_expired_and_evicted_keys():
+    removed = []
+    cache = ResponseCache(max_entries=1, on_remove=removed.append)
+    cache.set("a", 1, ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert removed == ["a", "b"]
+
+@pytest.fixture
+def isolated_caches(monkeypatch):
+    monkeypatch.setattr(ai_service.response_store, "path", "")
+    monkeypatch.setattr(ai_service, "snippet_index", SimilarityIndex())
+    for cache in ai_service.response_caches.values():
+        cache.clear()
+    yield
+    for cache in ai_service.response_caches.values():
+        cache.clear()
+
+def test_index_entry_goes_when_its_responses_expire(isolated_caches):
+    ai_service.save_response("realworld", "login", {"title": "Login"}, LOGIN)
+    ai_service.real_world_cache.set("login", {"title": "Login"}, ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert ai_service.real_world_cache.get("login") is None
+    assert ai_service.snippet_index.query(LOGIN_EDITED) == []
+
+def test_index_entry_stays_while_another_endpoint_caches_it(isolated_caches):
+    ai_service.save_response("realworld", "login", {"title": "Login"}, LOGIN)
+    ai_service.save_response("complexity", "login", {"complexity_score": 2}, LOGIN)
+    ai_service.real_world_cache.clear()
+    assert ai_service.lookup_similar_response("complexity", LOGIN_EDITED, "python")["approximate"] is True
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from response_cache import SingleFlight
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"title": "Login"}
+
+    async def main():
+        return await asyncio.gather(*(flight.run(("realworld", "abc"), fetch) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [{"title": "Login"}] * 5
+    # Joined callers get copies, so one caller's changes do not leak into another's
+    assert len({id(result) for result in results}) == 5
+    assert flight.stats()["realworld"] == {"calls": 1, "coalesced": 4}
+    assert flight.stats()["in_flight"] == 0
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    async def main():
+        return await asyncio.gather(flight.run(("demo", "a"), lambda: fetch(1)), flight.run(("demo", "b"), lambda: fetch(2)))
+
+    assert asyncio.run(main()) == [1, 2]
+    assert flight.stats()["demo"] == {"calls": 2, "coalesced": 0}
+
+def test_errors_reach_every_caller_and_are_not_kept():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*(flight.run("key", fail) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(main()))
+    assert flight.in_flight == {}
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+    finished = []
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        finished.append(True)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flight.run("key", fetch))
+        second = asyncio.ensure_future(flight.run("key", fetch))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == "done"
+    assert finished == [True]
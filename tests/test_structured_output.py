@@ -0,0 +1,57 @@
+import json
+
+from code_executor import execute_python_code, output_lines, structure_plain_result
+
+def test_output_is_a_list_of_lines():
+    result = execute_python_code("print('a')\nprint()\nprint('<b>')\n", output_format="structured")
+    assert result["success"]
+    assert result["output"] == ["a", "", "<b>"]
+    assert result["error"] is None
+    assert result["stderr"] == []
+
+def test_html_format_is_unchanged():
+    result = execute_python_code("print('<b>')\n")
+    assert result["output"] == "<div class='output-stdout'><div class='output-line'>&lt;b&gt;</div></div>"
+
+def test_runtime_error_is_an_object_with_context():
+    code = "total = 0\nprint('before')\nvalue = 1 / total\nprint('after')"
+    result = execute_python_code(code, output_format="structured")
+    assert not result["success"]
+    assert result["error_type"] == "runtime"
+    assert result["output"] == ["before"]
+    error = result["error"]
+    assert error["type"] == "ZeroDivisionError"
+    assert "division by zero" in error["message"]
+    assert error["line"] == 3
+    assert error["category"] == "runtime"
+    assert [line["line"] for line in error["context"]] == [1, 2, 3, 4]
+    assert [line["text"] for line in error["context"] if line["is_error"]] == ["value = 1 / total"]
+    # Objects only, no markup, and JSON-serializable as sent
+    assert "<" not in json.dumps(error)
+
+def test_syntax_error_is_an_object():
+    result = execute_python_code("if True\n    print(1)\n", output_format="structured")
+    assert result["error_type"] == "syntax"
+    assert result["output"] == []
+    assert result["error"]["type"] == "SyntaxError"
+    assert result["error"]["line"] == 1
+    assert result["error"]["category"] == "syntax"
+
+def test_plain_results_are_structured():
+    ok = structure_plain_result({"output": "1\n2\n", "error": "warning: unused\n", "success": True})
+    assert ok["output"] == ["1", "2"]
+    assert ok["stderr"] == ["warning: unused"]
+    assert ok["error"] is None
+
+    failed = structure_plain_result({"output": "", "error": "Main.java:3: error", "success": False, "error_type": "compile"})
+    assert failed["error"]["type"] == "CompilationError"
+    assert failed["error"]["message"] == "Main.java:3: error"
+
+    timed_out = structure_plain_result({"output": "", "error": "<div>timeout</div>", "success": False, "error_type": "timeout"})
+    assert timed_out["error"]["type"] == "TimeoutError"
+    assert "<div>" not in timed_out["error"]["message"]
+
+def test_output_lines():
+    assert output_lines("") == []
+    assert output_lines("  \n") == []
+    assert output_lines("a\n\nb\n") == ["a", "", "b"]
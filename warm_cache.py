@@ -0,0 +1,29 @@
+"""
+Precompute AI concept examples into the shared response store.
+
+Run before or after a deploy so the first concept popups are served from the
+cache instead of live gpt-4o calls:
+
+    python warm_cache.py                  # fill missing or soon-to-expire pairs
+    python warm_cache.py --force          # regenerate everything
+    python warm_cache.py --concept loops --language python
+"""
+import argparse
+import sys
+
+from ai_service import CONCEPT_DESCRIPTIONS, CONCEPT_EXAMPLE_LANGUAGES, warm_concept_examples
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Precompute AI concept examples into the response store")
+    parser.add_argument("--force", action="store_true", help="regenerate examples even if a fresh one is stored")
+    parser.add_argument("--concept", action="append", choices=sorted(CONCEPT_DESCRIPTIONS),
+                        help="concept to warm (repeatable, default: all)")
+    parser.add_argument("--language", action="append", choices=CONCEPT_EXAMPLE_LANGUAGES,
+                        help="language to warm (repeatable, default: all)")
+    args = parser.parse_args()
+
+    summary = warm_concept_examples(force=args.force, concepts=args.concept, languages=args.language)
+    return 1 if summary["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())